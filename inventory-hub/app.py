@@ -293,9 +293,10 @@ from routes_config_attrs import (  # noqa: E402,F401
 # watchdog + /api/logs + the dashboard pulse live in routes_state_pulse.py.
 from routes_state_pulse import (  # noqa: E402,F401
     api_audit_session, api_state_buffer, api_state_queue, api_spools_refresh,
-    api_log_event, _check_audit_idle_timeout, api_get_logs_route,
+    api_log_event, _check_audit_idle_timeout, api_metrics, api_get_logs_route,
     _VALID_PULSE_SECTIONS, _pulse_section_logs, _pulse_section_locations,
     _pulse_section_manage, _pulse_section_printer_status, api_dashboard_pulse,
+    api_events,
 )
 # L316 step 11: the print-edge tracker + cancel-monitor daemon live in
 # print_monitor.py. Monitor tests patch/assign these symbols on
@@ -318,6 +319,9 @@ from print_monitor import (  # noqa: E402,F401
     _start_cancel_monitor,
 )
 # (_pulse_section_printer_status + /api/dashboard_pulse live in routes_state_pulse.py — L316 step 11)
+# Production serving (pooled workers, keep-alive, graceful drain) — used by
+# the __main__ launch below unless serve_mode / FCC_SERVE_MODE says "simple".
+import wsgi_server  # noqa: E402
 
 
 if __name__ == '__main__':
@@ -355,10 +359,14 @@ if __name__ == '__main__':
     # template through a 3-day uptime; this prevents that footgun.
     if _dev:
         app.config['TEMPLATES_AUTO_RELOAD'] = True
+    # Dev always runs Flask's own server (the reloader is part of it); prod
+    # takes serve_mode — the pooled server unless set to "simple".
+    _serve_mode = 'simple' if _dev else wsgi_server.serve_mode()
     # Start the dashboard-independent cancelled-print monitor in the SERVING
     # process only: with the dev reloader that's the child (WERKZEUG_RUN_MAIN);
-    # without it (prod) this single process. The reloader PARENT skips it so dev
-    # doesn't run two pollers.
+    # without it (prod, either serve mode) this single process. The reloader
+    # PARENT skips it so dev doesn't run two pollers. It starts before the
+    # port is bound, like everything above.
     if (not _dev) or os.environ.get('WERKZEUG_RUN_MAIN', '').lower() == 'true':
         # FilaBridge Phase-2 gate: relocate printer creds onto the Printer rows
         # (one-time, prime-only) BEFORE the cancel monitor starts, so its first
@@ -373,4 +381,7 @@ if __name__ == '__main__':
                 f"printer-creds seed raised at boot (monitor still starting): "
                 f"{_seed_boot_err}")
         print_monitor._start_cancel_monitor()
-    app.run(host='0.0.0.0', port=8000, use_reloader=_dev, debug=False)
\ No newline at end of file
+    if _serve_mode == 'pooled':
+        wsgi_server.serve(app, host='0.0.0.0', port=8000)
+    else:
+        app.run(host='0.0.0.0', port=8000, use_reloader=_dev, debug=False)
\ No newline at end of file
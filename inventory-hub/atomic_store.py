@@ -1,6 +1,7 @@
-"""Shared atomic-write helper for the small bind-mounted JSON stores
-(`cancel_fetch_store`, `cancel_review_store`, `print_deduct_ledger`,
-`print_tracker_store`).
+"""Shared atomic-write helper for the files under the bind-mounted `data/`
+(today `print_file_cache`; `cancel_fetch_store`, `cancel_review_store`,
+`print_deduct_ledger` and `print_tracker_store` used it for their JSON files
+until they moved into hub_store's SQLite database).
 
 Why this exists (Group 32.1): each store writes `data/<name>.json` via a
 temp-file + ``os.replace`` swap. In DEV that `data/` directory is bind-mounted
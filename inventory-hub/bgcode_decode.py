@@ -25,13 +25,15 @@ This decoder is READ-ONLY/decode-only (no encoder) and tolerant: it skips
 thumbnail/metadata blocks and only reconstructs the G-code body + a
 byte-position map so a `.bgcode` print-progress fraction (a position in the
 COMPRESSED file) can be translated to the matching offset in the decoded G-code.
+Blocks are decoded lazily (`iter_blocks`), so a cancel only decompresses as far
+as the print got (`decode_bgcode_until`).
 """
 from __future__ import annotations
 
 import re
 import struct
 import zlib
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Tuple
 
 BGCODE_MAGIC = b"GCDE"
 
@@ -61,7 +63,8 @@ _MAX_BLOCK_OUTPUT = 64 * 1024 * 1024
 # PrusaSlicer time-progress markers: `M73 P{percent} R{minutes}`. The printer's
 # reported `progress` is this time-based value, so inverting it through these
 # markers (percent -> reached byte) is exact; a raw byte mapping over-counts.
-_M73_RE = re.compile(r'\bM73\b[^\n]*?\bP(\d+)')
+# Matched per line (the first marker on it, positioned at the line start).
+_M73_LINE_B = re.compile(rb'^[^\n]*?\bM73\b[^\n]*?\bP(\d+)', re.MULTILINE)
 
 
 def is_bgcode(data) -> bool:
@@ -73,55 +76,64 @@ def is_bgcode(data) -> bool:
 
 # --- heatshrink decoder (window_sz2, lookahead_sz2) -------------------------
 
+# Bit reader: instead of pulling bits one at a time, each token reads the
+# 32-bit big-endian word that starts at the byte holding the cursor and shifts
+# the cursor's bit offset (0..7) out of the top — the tag, an 8-bit literal or
+# a whole (window + lookahead) backref are then one mask each. 1 + window +
+# lookahead + 7 must fit in 32 bits: fine for the (11,4)/(12,4) bgcode uses.
+_U32_BE = struct.Struct(">I").unpack_from
+
+
 def heatshrink_decode(data: bytes, window: int, lookahead: int) -> bytes:
     """Decode a heatshrink-compressed byte string. MSB-first bitstream: a 1-tag
     bit = an 8-bit literal; a 0-tag = a backref of (window)-bit index and
     (lookahead)-bit count, where distance = index+1 and length = count+1."""
     out = bytearray()
+    append = out.append
     nbits = len(data) * 8
+    # Zero pad so the 32-bit read near the end never runs off the buffer; the
+    # nbits checks below still stop at the real end of the stream.
+    buf = bytes(data) + b"\x00\x00\x00\x00"
+    ref_bits = 1 + window + lookahead
+    ref_shift = 32 - ref_bits
+    ref_mask = (1 << (window + lookahead)) - 1
+    cnt_mask = (1 << lookahead) - 1
     pos = 0
-
-    def get(n: int) -> Optional[int]:
-        nonlocal pos
-        if pos + n > nbits:
-            return None
-        v = 0
-        p = pos
-        for _ in range(n):
-            v = (v << 1) | ((data[p >> 3] >> (7 - (p & 7))) & 1)
-            p += 1
-        pos = p
-        return v
-
-    while True:
-        if len(out) > _MAX_BLOCK_OUTPUT:
-            break  # decompression-bomb guard
-        tag = get(1)
-        if tag is None:
-            break
-        if tag == 1:
-            b = get(8)
-            if b is None:
+    olen = 0
+    while olen <= _MAX_BLOCK_OUTPUT:   # decompression-bomb guard
+        w = _U32_BE(buf, pos >> 3)[0] << (pos & 7)
+        if w & 0x80000000:
+            if pos + 9 > nbits:
                 break
-            out.append(b)
+            append((w >> 23) & 0xFF)
+            pos += 9
+            olen += 1
+            continue
+        if pos + ref_bits > nbits:
+            break
+        v = (w >> ref_shift) & ref_mask
+        pos += ref_bits
+        dist = (v >> lookahead) + 1
+        length = (v & cnt_mask) + 1
+        # Backref into heatshrink's zero-initialized circular window: a
+        # distance larger than the output so far references not-yet-written
+        # (zero) slots, so negative positions yield 0x00 rather than an
+        # error (matches the reference decoder). For len(out) > 2^window a
+        # valid distance (<= 2^window) keeps `start` >= 0, so indexing the
+        # absolute output is equivalent to the circular buffer.
+        start = olen - dist
+        if start >= 0:
+            if dist >= length:
+                out += out[start:start + length]
+            else:
+                # Overlapping copy (a run): the output repeats the last
+                # `dist` bytes, so tile them instead of copying byte by byte.
+                out += (out[start:olen] * (length // dist + 1))[:length]
         else:
-            idx = get(window)
-            if idx is None:
-                break
-            cnt = get(lookahead)
-            if cnt is None:
-                break
-            # Backref into heatshrink's zero-initialized circular window: a
-            # distance larger than the output so far references not-yet-written
-            # (zero) slots, so negative positions yield 0x00 rather than an
-            # error (matches the reference decoder). For len(out) > 2^window a
-            # valid distance (<= 2^window) keeps `start` >= 0, so indexing the
-            # absolute output is equivalent to the circular buffer.
-            start = len(out) - (idx + 1)
-            length = cnt + 1
             for i in range(length):
                 src = start + i
-                out.append(out[src] if src >= 0 else 0)
+                append(out[src] if src >= 0 else 0)
+        olen += length
     return bytes(out)
 
 
@@ -138,6 +150,24 @@ _MP_CMD_NOSPACES_OFF = 0xF6
 _MP_LUT = b"0123456789. \nGX\x00"
 
 
+def _mp_tables(no_spaces: bool):
+    """(pairs, lut) for one no-spaces setting: ``lut`` is the nibble table and
+    ``pairs[byte]`` the two chars a packed byte decodes to (low nibble first),
+    or None when either nibble is a 0xF literal escape."""
+    lut = bytearray(_MP_LUT)
+    if no_spaces:
+        lut[11] = ord("E")
+    pairs = [None if (c & 0x0F) == 0x0F or (c >> 4) == 0x0F
+             else bytes((lut[c & 0x0F], lut[c >> 4]))
+             for c in range(256)]
+    return pairs, bytes(lut)
+
+
+_MP_PAIRS = {False: _mp_tables(False), True: _mp_tables(True)}
+# Packing disabled: every byte but the 0xFF escape is itself.
+_MP_PASSTHROUGH = [None if c == _MP_CMD else bytes((c,)) for c in range(256)]
+
+
 def meatpack_decode(data: bytes, packing: bool = False, no_spaces: bool = False):
     """Decode a MeatPack byte stream back to ASCII.
 
@@ -153,60 +183,59 @@ def meatpack_decode(data: bytes, packing: bool = False, no_spaces: bool = False)
     `packing`/`no_spaces` seed the state and the final state is returned, so a
     multi-block file can thread state across G-code block boundaries.
     Returns ``(bytes, packing, no_spaces)``.
+
+    Table-driven: the common byte (packed, no escape — or any byte with packing
+    off) is one lookup into a 256-entry table of its decoded chars; only 0xFF
+    framing and 0xF nibble escapes take the slow branch.
     """
     out = bytearray()
-    i = 0
-    n = len(data)
-
-    def lut(nib: int) -> int:
-        if nib == 11 and no_spaces:
-            return ord("E")
-        return _MP_LUT[nib]
-
-    while i < n:
-        c = data[i]
+    append = out.append
+    table = _MP_PAIRS[no_spaces][0] if packing else _MP_PASSTHROUGH
+    it = iter(data)
+    for c in it:
+        chars = table[c]
+        if chars is not None:
+            out += chars
+            continue
         if c == _MP_CMD:
-            if i + 1 < n and data[i + 1] == _MP_CMD:
+            nxt = next(it, None)
+            if nxt == _MP_CMD:
                 # 0xFF 0xFF <cmd>
-                i += 2
-                if i < n:
-                    cmd = data[i]
-                    i += 1
-                    if cmd == _MP_CMD_ENABLE:
-                        packing = True
-                    elif cmd == _MP_CMD_DISABLE:
-                        packing = False
-                    elif cmd == _MP_CMD_RESET:
-                        packing = False
-                        no_spaces = False
-                    elif cmd == _MP_CMD_NOSPACES_ON:
-                        no_spaces = True
-                    elif cmd == _MP_CMD_NOSPACES_OFF:
-                        no_spaces = False
+                cmd = next(it, None)
+                if cmd == _MP_CMD_ENABLE:
+                    packing = True
+                elif cmd == _MP_CMD_DISABLE:
+                    packing = False
+                elif cmd == _MP_CMD_RESET:
+                    packing = False
+                    no_spaces = False
+                elif cmd == _MP_CMD_NOSPACES_ON:
+                    no_spaces = True
+                elif cmd == _MP_CMD_NOSPACES_OFF:
+                    no_spaces = False
+                table = _MP_PAIRS[no_spaces][0] if packing else _MP_PASSTHROUGH
                 continue
             # lone 0xFF: both nibbles literal → next two bytes are the chars
-            i += 1
-            if i < n:
-                out.append(data[i]); i += 1
-            if i < n:
-                out.append(data[i]); i += 1
-            continue
-        i += 1
-        if not packing:
-            out.append(c)
+            if nxt is not None:
+                append(nxt)
+                nxt = next(it, None)
+                if nxt is not None:
+                    append(nxt)
             continue
-        low = c & 0x0F
-        high = (c >> 4) & 0x0F
-        if low == 0x0F:
-            if i < n:
-                out.append(data[i]); i += 1
+        # Packed byte with one 0xF nibble: that char is the next stream byte.
+        lut = _MP_PAIRS[no_spaces][1]
+        if c & 0x0F == 0x0F:
+            nxt = next(it, None)
+            if nxt is not None:
+                append(nxt)
         else:
-            out.append(lut(low))
-        if high == 0x0F:
-            if i < n:
-                out.append(data[i]); i += 1
+            append(lut[c & 0x0F])
+        if c >> 4 == 0x0F:
+            nxt = next(it, None)
+            if nxt is not None:
+                append(nxt)
         else:
-            out.append(lut(high))
+            append(lut[c >> 4])
     return bytes(out), packing, no_spaces
 
 
@@ -225,30 +254,31 @@ def _decompress(comp: int, data: bytes, usize: int) -> bytes:
     raise ValueError(f"bgcode: unknown compression {comp}")
 
 
-def decode_bgcode(raw: bytes) -> Dict:
-    """Decode a `.bgcode` file to ASCII G-code.
+def iter_blocks(raw: bytes) -> Iterator[Tuple[int, int, int, object]]:
+    """Walk the container and decode its blocks LAZILY, one per ``next()``.
 
-    Returns ``{"gcode": str, "gmap": [(bg_start, bg_end, dec_start, dec_end)],
-    "filesize": int}``. ``gmap`` maps each G-code block's byte span in the
-    COMPRESSED file to its span in the decoded text, so a print-progress
-    fraction (a position in the .bgcode file) can be mapped to the matching
-    decoded offset via :func:`progress_to_decoded_fraction`.
+    Yields ``(block_type, bg_start, bg_end, payload)`` in file order, where
+    ``bg_start``/``bg_end`` are the block's byte span in the file and
+    ``payload`` is the decoded G-code as UTF-8 ``bytes`` for a G-code block
+    (MeatPack state threaded across blocks), the INI text for a metadata block,
+    and None for anything else (thumbnails). A block is only decompressed when
+    the caller advances to it, so a consumer that stops early never pays for
+    the rest of the file.
+
+    Tolerant like the rest of the module: a truncated header ends the walk and
+    a single corrupt/truncated block (bad deflate, malformed bitstream) is
+    skipped — the rest of the file (other G-code blocks + the footer) still
+    decodes.
     """
     if not is_bgcode(raw):
         raise ValueError("not a bgcode file")
     n = len(raw)
     if n < 10:   # magic(4) + version(4) + checksum_type(2) — truncated header
-        return {"gcode": "", "gmap": [], "filesize": n,
-                "filament_g": "", "filament_mm": ""}
+        return
     checksum_type, = struct.unpack_from("<H", raw, 8)
     off = 10
-    parts: List[str] = []
-    gmap: List[Tuple[int, int, int, int]] = []
-    dec_pos = 0
     mp_packing = False   # MeatPack state threaded across G-code blocks
     mp_no_spaces = False
-    footer_g = ""
-    footer_mm = ""
     while off < n:
         bg_start = off
         if off + 8 > n:
@@ -279,56 +309,154 @@ def decode_bgcode(raw: bytes) -> Dict:
         if checksum_type != 0:
             off += 4  # CRC32
         bg_end = off
-        # Decompress + decode is wrapped so a single corrupt/truncated block
-        # (bad deflate, malformed bitstream) is skipped — the rest of the file
-        # (other G-code blocks + the footer) still decodes. gmap uses BYTE
-        # offsets to stay consistent with parse_partial_filament_usage, which
-        # slices on UTF-8 byte position.
         try:
             if btype == _BT_GCODE:
                 block = _decompress(comp, data, usize)
                 if enc in (_ENC_MEATPACK, _ENC_MEATPACK_COMMENTS):
                     block, mp_packing, mp_no_spaces = meatpack_decode(
                         block, mp_packing, mp_no_spaces)
-                text = block.decode("utf-8", "replace")
-                nbytes = len(text.encode("utf-8"))
-                gmap.append((bg_start, bg_end, dec_pos, dec_pos + nbytes))
-                dec_pos += nbytes
-                parts.append(text)
+                # Normalize to the UTF-8 of the text the parser sees, so byte
+                # offsets here match parse_partial_filament_usage's (a bad
+                # sequence becomes U+FFFD, 3 bytes). Real G-code is ASCII.
+                if not block.isascii():
+                    block = block.decode("utf-8", "replace").encode("utf-8")
+                payload = bytes(block)
             elif btype in _META_TYPES:
-                ini = _decompress(comp, data, usize).decode("utf-8", "replace")
-                if "filament used" in ini and not (footer_g and footer_mm):
-                    gm = re.search(r"filament used \[g\]\s*=\s*([0-9.,\s]+)", ini)
-                    mm = re.search(r"filament used \[mm\]\s*=\s*([0-9.,\s]+)", ini)
-                    if gm:
-                        footer_g = gm.group(1).strip()
-                    if mm:
-                        footer_mm = mm.group(1).strip()
+                payload = _decompress(comp, data, usize).decode("utf-8", "replace")
+            else:
+                payload = None
         except Exception:
             continue  # skip this block; offsets already advanced
+        yield btype, bg_start, bg_end, payload
+
 
-    gcode = "".join(parts)
+def _footer_lines(footer_g: str, footer_mm: str) -> str:
     # PrusaSlicer stores per-tool 'filament used' in the Print-Metadata block,
     # NOT as G-code comments, when slicing to bgcode. The prefix-parser needs
-    # those footers (they give the mm->g ratio), so append them. Appending past
-    # all the moves keeps the byte-position map intact (footers carry no E).
+    # those footers (they give the mm->g ratio), so they're appended after the
+    # moves — which keeps the byte-position map intact (footers carry no E).
     if footer_g and footer_mm:
-        gcode += f"\n; filament used [mm] = {footer_mm}\n; filament used [g] = {footer_g}\n"
+        return f"\n; filament used [mm] = {footer_mm}\n; filament used [g] = {footer_g}\n"
+    return ""
+
+
+def _walk_gcode(raw: bytes, stop=None) -> Dict:
+    """Drive :func:`iter_blocks`, collecting the G-code body, ``gmap``, the
+    M73 markers and the metadata footers. ``stop(state)`` is asked after each
+    G-code block; returning True abandons the walk there (no further block is
+    decompressed) and the result carries ``complete=False``."""
+    body = bytearray()
+    gmap: List[Tuple[int, int, int, int]] = []
     # M73 progress markers: PrusaSlicer emits `M73 P{percent} R{minutes}` lines
     # throughout, and the printer's reported `progress` IS this time-based value
     # (NOT a byte position). Capture each marker's (percent, decoded-byte-pos) so
     # progress_to_decoded_fraction can invert progress -> the exact byte reached;
     # a gcode-byte mapping over-counts because progress is time-based, not linear
-    # in bytes (validated 2026-06-12 against scale ground truth).
-    m73 = []
-    bpos = 0
-    for line in gcode.splitlines(keepends=True):
-        mk = _M73_RE.search(line)
-        if mk:
-            m73.append((int(mk.group(1)), bpos))
-        bpos += len(line.encode("utf-8"))
-    return {"gcode": gcode, "gmap": gmap, "filesize": n, "m73": m73,
-            "filament_g": footer_g, "filament_mm": footer_mm}
+    # in bytes (validated 2026-06-12 against scale ground truth). Scanned as the
+    # blocks arrive, whole lines only (a marker can straddle two blocks).
+    m73: List[Tuple[int, int]] = []
+    state = {"body": body, "m73": m73, "footer_g": "", "footer_mm": ""}
+    scanned = 0
+    complete = True
+    for btype, bg_start, bg_end, payload in iter_blocks(raw):
+        if btype == _BT_GCODE:
+            # gmap uses BYTE offsets to stay consistent with
+            # parse_partial_filament_usage, which slices on byte position.
+            gmap.append((bg_start, bg_end, len(body), len(body) + len(payload)))
+            body += payload
+            line_end = body.rfind(b"\n", scanned) + 1
+            if line_end > scanned:
+                m73.extend(_scan_m73(body, scanned, line_end))
+                scanned = line_end
+            if stop is not None and stop(state):
+                complete = False
+                break
+        elif btype in _META_TYPES:
+            ini = payload
+            if "filament used" in ini and not (state["footer_g"] and state["footer_mm"]):
+                gm = re.search(r"filament used \[g\]\s*=\s*([0-9.,\s]+)", ini)
+                mm = re.search(r"filament used \[mm\]\s*=\s*([0-9.,\s]+)", ini)
+                if gm:
+                    state["footer_g"] = gm.group(1).strip()
+                if mm:
+                    state["footer_mm"] = mm.group(1).strip()
+    if complete and scanned < len(body):
+        m73.extend(_scan_m73(body, scanned, len(body)))
+    return {"body": body, "gmap": gmap, "m73": m73, "complete": complete,
+            "filament_g": state["footer_g"], "filament_mm": state["footer_mm"]}
+
+
+def _scan_m73(body, start: int, end: int) -> List[Tuple[int, int]]:
+    """(percent, line-start byte) of each M73 marker line in body[start:end]."""
+    return [(int(m.group(1)), m.start()) for m in _M73_LINE_B.finditer(body, start, end)]
+
+
+def decode_bgcode(raw: bytes) -> Dict:
+    """Decode a `.bgcode` file to ASCII G-code.
+
+    Returns ``{"gcode": str, "gmap": [(bg_start, bg_end, dec_start, dec_end)],
+    "filesize": int}``. ``gmap`` maps each G-code block's byte span in the
+    COMPRESSED file to its span in the decoded text, so a print-progress
+    fraction (a position in the .bgcode file) can be mapped to the matching
+    decoded offset via :func:`progress_to_decoded_fraction`.
+    """
+    walk = _walk_gcode(raw)
+    gcode = walk["body"].decode("utf-8") + _footer_lines(walk["filament_g"], walk["filament_mm"])
+    return {"gcode": gcode, "gmap": walk["gmap"], "filesize": len(raw), "m73": walk["m73"],
+            "filament_g": walk["filament_g"], "filament_mm": walk["filament_mm"]}
+
+
+def decode_bgcode_until(raw: bytes, progress01: float) -> Dict:
+    """Decode a `.bgcode` file only as far as a cancelled print got.
+
+    The cancel deduct needs the G-code up to the reached position, not the
+    whole file — a print cancelled at 5% of a 50 MB job shouldn't decompress
+    the other 95%. This walks the blocks lazily and stops once the M73 markers
+    pin the reached byte (a marker PAST the progress percent has been decoded,
+    so the bracketing pair is known — markers are non-decreasing, as PrusaSlicer
+    writes them) and the footers are in hand (the Print-Metadata block precedes
+    the G-code in PrusaSlicer's layout).
+
+    Returns ``{"gcode": str, "fraction": float, "complete": bool}``, ready for
+    ``parse_partial_filament_usage(gcode, fraction)``:
+
+    - early stop (``complete`` False): ``gcode`` is the body through the last
+      line ending at or before the reached byte, plus the footer lines, and
+      ``fraction`` is 1.0 — the cut is already made, exactly at the byte
+      ``progress_to_decoded_fraction`` maps to (no float round-trip).
+    - otherwise (no/too few M73 markers, footers after the G-code, progress at
+      100%): the whole file was decoded and this is exactly
+      ``decode_bgcode`` + ``progress_to_decoded_fraction``; the full
+      ``decode_bgcode`` result rides along as ``decoded`` so a caller can keep it.
+    """
+    p = max(0.0, min(1.0, float(progress01)))
+    pct = p * 100.0
+    reached = {}
+
+    def stop(state):
+        if not (state["footer_g"] and state["footer_mm"]) or not state["body"]:
+            return False
+        if p <= 0.0:
+            reached["byte"] = 0
+            return True
+        m73 = state["m73"]
+        if p >= 1.0 or len(m73) < 2 or m73[-1][0] <= pct:
+            return False
+        reached["byte"] = _m73_byte_for_percent(m73, pct)
+        return True
+
+    walk = _walk_gcode(raw, stop)
+    footer = _footer_lines(walk["filament_g"], walk["filament_mm"])
+    body = walk["body"]
+    if not walk["complete"]:
+        cut = body.rfind(b"\n", 0, reached["byte"]) + 1
+        return {"gcode": body[:cut].decode("utf-8") + footer, "fraction": 1.0,
+                "complete": False}
+    dec = {"gcode": body.decode("utf-8") + footer, "gmap": walk["gmap"],
+           "filesize": len(raw), "m73": walk["m73"],
+           "filament_g": walk["filament_g"], "filament_mm": walk["filament_mm"]}
+    return {"gcode": dec["gcode"], "fraction": progress_to_decoded_fraction(dec, p),
+            "complete": True, "decoded": dec}
 
 
 def _m73_byte_for_percent(m73: List[Tuple[int, int]], pct: float) -> int:
@@ -14,7 +14,10 @@ compute → [cancel_review_store, computed] → confirm/dismiss. Kept SEPARATE f
 the review store so the /api/cancel_deduct/pending UI never surfaces a
 not-yet-computed entry.
 
-Keyed on (printer_name, job_id) like print_deduct_ledger / cancel_review_store.
+Keyed on (printer_name, job_id) like print_deduct_ledger / cancel_review_store,
+in hub_store's ``cancel_fetches`` table (SQLite) — no cap: an entry leaves when
+its fetch settles or print_monitor gives up on it. The pre-SQLite
+``data/pending_cancel_fetches.json`` is imported once.
 Survives a restart so an FCC reboot between cancel and screen-clear doesn't lose
 the pending deduct. Record shape:
   {printer_name, job_id, filename, progress, first_seen (epoch s), attempts,
@@ -22,73 +25,79 @@ the pending deduct. Record shape:
 """
 from __future__ import annotations
 
-import json
 import os
-import threading
+import sqlite3
 
-import atomic_store
+import hub_store
 
-# Overridable by tests (monkeypatch this attribute to a tmp path).
+# The pre-SQLite store file, imported into hub_store once. Overridable by
+# tests (monkeypatch this attribute to a tmp path).
 _STORE_PATH = os.path.join(os.path.dirname(__file__), "data", "pending_cancel_fetches.json")
-_LOCK = threading.RLock()
-_MAX_ENTRIES = 100
+_TABLE = "cancel_fetches"
 
 
-def _key(printer_name, job_id) -> str:
-    return f"{str(printer_name).strip()}::{str(job_id).strip()}"
+def _import_legacy(data: dict) -> int:
+    count = 0
+    for rec in data.values():
+        if isinstance(rec, dict) and "printer_name" in rec and "job_id" in rec:
+            try:
+                first_seen = float(rec["first_seen"])
+            except (KeyError, TypeError, ValueError):
+                first_seen = None
+            hub_store.put(_TABLE, rec["printer_name"], rec["job_id"], rec,
+                          only_new=True, created_at=first_seen)
+            count += 1
+    return count
 
 
-def _load() -> dict:
-    try:
-        with open(_STORE_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data if isinstance(data, dict) else {}
-    except (FileNotFoundError, json.JSONDecodeError, OSError, ValueError):
-        return {}
-
-
-def _save(data: dict) -> None:
-    if len(data) > _MAX_ENTRIES:
-        data = dict(list(data.items())[-_MAX_ENTRIES:])
-    os.makedirs(os.path.dirname(_STORE_PATH), exist_ok=True)
-    tmp = _STORE_PATH + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-    # 32.1 — retry on the Windows host↔container bind-mount sharing collision.
-    atomic_store.replace_with_retry(tmp, _STORE_PATH)
+def _ready() -> None:
+    hub_store.import_legacy_json("cancel_fetch_store", _STORE_PATH, _import_legacy)
 
 
 def add_pending(record: dict) -> None:
     """Stash / overwrite a pending fetch. `record` must carry `printer_name` +
     `job_id`. Re-adding the same key overwrites (idempotent — used to bump
     `attempts`/`last_status` without changing `first_seen`)."""
-    with _LOCK:
-        data = _load()
-        data[_key(record["printer_name"], record["job_id"])] = record
-        _save(data)
+    _ready()
+    hub_store.put(_TABLE, record["printer_name"], record["job_id"], record)
+
 
+# The reads below answer "nothing pending" when the database fails, as the
+# JSON file's loader did when it couldn't read the file.
 
 def has_pending(printer_name, job_id) -> bool:
-    with _LOCK:
-        return _key(printer_name, job_id) in _load()
+    try:
+        _ready()
+        return hub_store.exists(_TABLE, printer_name, job_id)
+    except sqlite3.Error as e:
+        hub_store.log_error("cancel_fetch_store", e)
+        return False
 
 
 def get_pending(printer_name, job_id):
-    with _LOCK:
-        return _load().get(_key(printer_name, job_id))
+    try:
+        _ready()
+        return hub_store.get(_TABLE, printer_name, job_id)
+    except sqlite3.Error as e:
+        hub_store.log_error("cancel_fetch_store", e)
+        return None
 
 
 def list_pending() -> list:
     """All pending fetch records (newest last, insertion order)."""
-    with _LOCK:
-        return list(_load().values())
+    try:
+        _ready()
+        return [rec for _p, _j, _at, rec in hub_store.records(_TABLE)]
+    except sqlite3.Error as e:
+        hub_store.log_error("cancel_fetch_store", e)
+        return []
 
 
 def pop_pending(printer_name, job_id):
     """Atomically remove + return the pending fetch record (or None)."""
-    with _LOCK:
-        data = _load()
-        rec = data.pop(_key(printer_name, job_id), None)
-        if rec is not None:
-            _save(data)
-        return rec
+    try:
+        _ready()
+        return hub_store.pop(_TABLE, printer_name, job_id)
+    except sqlite3.Error as e:
+        hub_store.log_error("cancel_fetch_store", e)
+        return None
@@ -8,80 +8,94 @@ if needed, and confirms (apply) or dismisses. This store survives a restart AND
 the activity-log scroll-off, so a pending review is never silently lost — the
 exact weight-drift problem §9 is built to solve.
 
-Keyed on (printer_name, job_id) like print_deduct_ledger; bounded to the most
-recent N. `pop_pending` is atomic under the lock so a double-click confirm/dismiss
-can't double-apply (the pop IS the claim — a concurrent second caller gets None).
+Keyed on (printer_name, job_id) like print_deduct_ledger, in hub_store's
+``cancel_reviews`` table (SQLite) — no cap: a review leaves only by confirm or
+dismiss. `pop_pending` is one transaction so a double-click confirm/dismiss
+can't double-apply (the pop IS the claim — a concurrent second caller gets
+None). The pre-SQLite ``data/pending_cancel_deducts.json`` is imported once.
 """
 from __future__ import annotations
 
-import json
 import os
-import threading
+import sqlite3
+import time
 
-import atomic_store
+import hub_store
 
-# Overridable by tests (monkeypatch this attribute to a tmp path).
+# The pre-SQLite store file, imported into hub_store once. Overridable by
+# tests (monkeypatch this attribute to a tmp path).
 _STORE_PATH = os.path.join(os.path.dirname(__file__), "data", "pending_cancel_deducts.json")
-_LOCK = threading.Lock()
-_MAX_ENTRIES = 100
+_TABLE = "cancel_reviews"
 
 
-def _key(printer_name, job_id) -> str:
-    return f"{str(printer_name).strip()}::{str(job_id).strip()}"
+def _created_at(rec: dict):
+    """The record's own ``created`` stamp (local "%Y-%m-%d %H:%M:%S") as
+    epoch seconds, or None when it has none."""
+    try:
+        return time.mktime(time.strptime(str(rec["created"]), "%Y-%m-%d %H:%M:%S"))
+    except (KeyError, ValueError, OverflowError):
+        return None
 
 
-def _load() -> dict:
-    try:
-        with open(_STORE_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data if isinstance(data, dict) else {}
-    except (FileNotFoundError, json.JSONDecodeError, OSError, ValueError):
-        return {}
+def _import_legacy(data: dict) -> int:
+    count = 0
+    for rec in data.values():
+        if isinstance(rec, dict) and "printer_name" in rec and "job_id" in rec:
+            hub_store.put(_TABLE, rec["printer_name"], rec["job_id"], rec,
+                          only_new=True, created_at=_created_at(rec))
+            count += 1
+    return count
 
 
-def _save(data: dict) -> None:
-    if len(data) > _MAX_ENTRIES:
-        data = dict(list(data.items())[-_MAX_ENTRIES:])
-    os.makedirs(os.path.dirname(_STORE_PATH), exist_ok=True)
-    tmp = _STORE_PATH + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-    # 32.1 — retry on the Windows host↔container bind-mount sharing collision.
-    atomic_store.replace_with_retry(tmp, _STORE_PATH)
+def _ready() -> None:
+    hub_store.import_legacy_json("cancel_review_store", _STORE_PATH, _import_legacy)
 
 
 def add_pending(record: dict) -> None:
     """Stash a pending review. `record` must carry `printer_name` + `job_id`.
     Re-adding the same key overwrites (idempotent)."""
-    with _LOCK:
-        data = _load()
-        data[_key(record["printer_name"], record["job_id"])] = record
-        _save(data)
+    _ready()
+    hub_store.put(_TABLE, record["printer_name"], record["job_id"], record)
 
 
+# The reads below answer "nothing pending" when the database fails, as the
+# JSON file's loader did when it couldn't read the file.
+
 def has_pending(printer_name, job_id) -> bool:
-    with _LOCK:
-        return _key(printer_name, job_id) in _load()
+    try:
+        _ready()
+        return hub_store.exists(_TABLE, printer_name, job_id)
+    except sqlite3.Error as e:
+        hub_store.log_error("cancel_review_store", e)
+        return False
 
 
 def get_pending(printer_name, job_id):
-    with _LOCK:
-        return _load().get(_key(printer_name, job_id))
+    try:
+        _ready()
+        return hub_store.get(_TABLE, printer_name, job_id)
+    except sqlite3.Error as e:
+        hub_store.log_error("cancel_review_store", e)
+        return None
 
 
 def list_pending() -> list:
     """All pending review records (newest last, insertion order)."""
-    with _LOCK:
-        return list(_load().values())
+    try:
+        _ready()
+        return [rec for _p, _j, _at, rec in hub_store.records(_TABLE)]
+    except sqlite3.Error as e:
+        hub_store.log_error("cancel_review_store", e)
+        return []
 
 
 def pop_pending(printer_name, job_id):
     """Atomically remove + return the pending record (or None). The atomic pop is
     the confirm/dismiss CLAIM: a concurrent second call gets None and no-ops, so
     a double-submit can't double-apply."""
-    with _LOCK:
-        data = _load()
-        rec = data.pop(_key(printer_name, job_id), None)
-        if rec is not None:
-            _save(data)
-        return rec
+    try:
+        _ready()
+        return hub_store.pop(_TABLE, printer_name, job_id)
+    except sqlite3.Error as e:
+        hub_store.log_error("cancel_review_store", e)
+        return None
@@ -1,9 +1,11 @@
+import copy
 import errno
 import json
 import os
 import sys
 import tempfile
 import threading
+import time
 import state
 import config_schema
 
@@ -77,11 +79,51 @@ def _try_load_backup():
     return data if isinstance(data, dict) else None
 
 
-def load_config():
-    defaults = {
+def _config_defaults():
+    return {
         "server_ip": "127.0.0.1",
         "spoolman_port": 7912,
         "sync_delay": 0.5,
+        # Pooled Spoolman transport (spoolman_http): default per-call timeout,
+        # retry budget for connect errors / idempotent 5xx, keep-alive sockets
+        # per host.
+        "spoolman_timeout": 5.0,
+        "spoolman_retries": 2,
+        "spoolman_pool_size": 16,
+        # Seconds a spool/filament list snapshot is reused (spoolman_cache);
+        # 0 = fetch on every read.
+        "spoolman_cache_ttl": 3.0,
+        # PATCHes in flight at once for bulk filament writes
+        # (spoolman_api.update_filaments / restore_filament_extras).
+        "spoolman_bulk_concurrency": 8,
+        # Seconds a printer's PrusaLink state is reused by readers
+        # (printer_state_hub); 0 = probe on every read.
+        "printer_state_max_age": 5.0,
+        # Printers probed at once by the cancel monitor / pulse
+        # (prusalink_poller's shared pool).
+        "prusalink_poll_concurrency": 32,
+        # Dashboards that may hold an /api/events push stream at once
+        # (event_stream); past that they poll. 0 = push off, everyone polls.
+        "push_max_clients": 16,
+        # HTTP serving (wsgi_server; read at startup — restart to apply).
+        # "pooled" = fixed worker pool + keep-alive + graceful drain;
+        # "simple" = Flask's built-in server (FCC_SERVE_MODE overrides).
+        "serve_mode": "pooled",
+        "serve_workers": 32,
+        # Connections that may wait for a worker before new ones get a 503.
+        "serve_queue": 64,
+        "serve_keepalive_s": 5.0,
+        # Seconds a SIGTERM waits for in-flight requests (docker stop: 10 s).
+        "serve_drain_s": 8.0,
+        # Disk budget (MB) for downloaded + decoded print files kept under
+        # data/print_file_cache (print_file_cache); 0 = never cache.
+        "print_file_cache_mb": 1024,
+        # Days a print's deduct-ledger row (the exactly-once guard in
+        # data/hub_store.sqlite3) is kept; 0 = forever.
+        "deduct_ledger_retention_days": 365,
+        # Activity-log entries kept in memory (state.RECENT_LOGS) and shown on
+        # the dashboard; clients fetch only the ones newer than they have.
+        "log_history_size": 200,
         "printer_map": {},
         "dryer_slots": [],
         # FilaBridge Phase-2 cutover: when True, FCC deducts filament on FINISHED
@@ -95,61 +137,106 @@ def load_config():
     # locations.json on first startup after M3. If it still exists in a
     # config.json, it's harmless — json.load simply doesn't care about
     # unknown keys — and can be removed manually.
-    
-    final_config = defaults.copy()
-    config_file, mode = get_config_path()
-    
-    if os.path.exists(config_file):
-        try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                loaded = json.load(f)
-                final_config.update(loaded)
-
-            current_mtime = str(os.path.getmtime(config_file))
-            tracker_file = os.path.join(BASE_DIR, '.config_mtime')
-            
-            last_mtime = None
-            if os.path.exists(tracker_file):
-                try:
-                    with open(tracker_file, 'r') as tf:
-                        last_mtime = tf.read().strip()
-                except:
-                    pass
-            
-            # Log only if state logger is available AND we haven't logged this specific version recently
-            if hasattr(state, 'logger'):
-                if last_mtime != current_mtime:
-                    if mode == "DEV":
-                        state.logger.warning(f"⚠️ LOADED DEV CONFIG: {config_file}")
-                    else:
-                        state.logger.info(f"✅ Loaded Prod Config: {config_file}")
-                    
-                    try:
-                        with open(tracker_file, 'w') as tf:
-                            tf.write(current_mtime)
-                    except:
-                        pass
-
-        except Exception as e: 
-            # config.json EXISTS but won't parse — e.g. corrupt or half-written
-            # by a crash during the non-atomic in-place overwrite. Do NOT silently
-            # fall through to localhost defaults (that turns a config-corruption
-            # incident into a baffling "Spoolman unreachable" outage). Auto-recover
-            # from the rolling backup if it parses, and log CRITICAL either way.
-            recovered = _try_load_backup()
-            if recovered is not None:
-                final_config.update(recovered)
-                if hasattr(state, 'logger'):
-                    state.logger.critical(
-                        f"config.json unreadable ({e}); RECOVERED from {get_config_backup_path()}. "
-                        "Re-save in the Config modal to repair the primary file.")
-            elif hasattr(state, 'logger'):
-                state.logger.critical(
-                    f"config.json unreadable ({e}) and no usable backup — running on DEFAULTS; "
-                    "the Spoolman host may be wrong until config.json is repaired.")
-    else:
-        if hasattr(state, 'logger'):
-            state.logger.warning(f"Config file not found at {config_file}")
+
+
+def get_default(key):
+    """The built-in default for a config key — the one place it lives."""
+    return _config_defaults()[key]
+
+
+def get_clamped(key, lo, hi, cast=float):
+    """Config `key` as `cast`, clamped to [lo, hi] so a hand-edited
+    config.json can't wedge the module reading it. A missing, unparseable or
+    NaN value reads as the key's default (get_default)."""
+    default = get_default(key)
+    try:
+        v = cast(load_config().get(key, default))
+    except (TypeError, ValueError):
+        v = cast(default)
+    if v != v:  # NaN
+        v = cast(default)
+    return max(lo, min(v, hi))
+
+
+# ---------------------------------------------------------------------------
+# Read cache
+#
+# get_api_urls() sits under every Spoolman call, and each one used to re-open
+# + json.load config.json and read (often rewrite) the .config_mtime tracker.
+# The finalized config is now cached, keyed on the file's (path, mtime_ns,
+# size, inode): a warm load_config() is one os.stat. Like locations_db's
+# store, a snapshot taken within _RACY_WINDOW_S of the file's mtime is
+# content-checked on each hit until a check lands past the window, so an
+# in-place rewrite (the single-file bind-mount save path) in the same
+# timestamp tick can't be missed. _write_merged_config installs what it just
+# wrote, so a save is visible to the next read without a re-parse.
+#
+# The cached object is SHARED, so it's handed out frozen (_FrozenDict /
+# _FrozenList): a reader that mutated it would change every other reader's
+# config. copy.copy / copy.deepcopy / dict() give a plain mutable copy.
+#
+# Degraded loads (unreadable primary → backup or defaults) are never cached:
+# they re-read and re-log CRITICAL on every call, as before, until repaired.
+# ---------------------------------------------------------------------------
+_RACY_WINDOW_S = 2.0
+
+_CONFIG_CACHE_LOCK = threading.Lock()
+_CONFIG_CACHE = {}  # "entry" -> {"key", "mtime", "racy", "text", "config"}
+_CONFIG_CACHE_STATS = {"hits": 0, "loads": 0, "racy_checks": 0, "installs": 0}
+
+
+def _frozen_error(self, *args, **kwargs):
+    raise TypeError("config returned by load_config() is shared and read-only; "
+                    "copy it (dict(cfg) / copy.deepcopy(cfg)) before modifying")
+
+
+class _FrozenDict(dict):
+    """dict that refuses mutation — still a dict for isinstance / json."""
+    __slots__ = ()
+    __setitem__ = __delitem__ = _frozen_error
+    clear = pop = popitem = setdefault = update = _frozen_error
+    __ior__ = _frozen_error
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {k: copy.deepcopy(v, memo) for k, v in self.items()}
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class _FrozenList(list):
+    """list that refuses mutation — compares equal to a plain list."""
+    __slots__ = ()
+    __setitem__ = __delitem__ = _frozen_error
+    append = extend = insert = pop = remove = clear = sort = reverse = _frozen_error
+    __iadd__ = __imul__ = _frozen_error
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(v, memo) for v in self]
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return _FrozenDict((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return _FrozenList(_freeze(v) for v in value)
+    return value
+
+
+def _finalize_config(loaded):
+    """Defaults + `loaded` + the runtime normalizations, frozen."""
+    final_config = _config_defaults()
+    if loaded:
+        final_config.update(loaded)
 
     # Defensive: the redaction sentinel is a reserved marker, never a real secret.
     # It only reaches disk if a REDACTED export was copied into place instead of
@@ -162,8 +249,141 @@ def load_config():
     # Force Uppercase Keys for Printer Map
     if 'printer_map' in final_config:
         final_config['printer_map'] = {k.upper(): v for k, v in final_config['printer_map'].items()}
-        
-    return final_config
+
+    return _freeze(final_config)
+
+
+def _cache_key(config_file, st):
+    if st is None:
+        return (config_file, None)
+    return (config_file, st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _install_config(config_file, st, text, cfg):
+    entry = {
+        "key": _cache_key(config_file, st),
+        "mtime": st.st_mtime if st is not None else None,
+        "racy": st is not None and time.time() - st.st_mtime < _RACY_WINDOW_S,
+        "text": text,
+        "config": cfg,
+    }
+    with _CONFIG_CACHE_LOCK:
+        _CONFIG_CACHE["entry"] = entry
+
+
+def _racy_hit(entry, config_file):
+    """Content-check a racy snapshot (see the Read cache note above)."""
+    checked_at = time.time()
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            same = f.read() == entry["text"]
+    except OSError:
+        return False
+    with _CONFIG_CACHE_LOCK:
+        _CONFIG_CACHE_STATS["racy_checks"] += 1
+        if same and checked_at - entry["mtime"] >= _RACY_WINDOW_S:
+            entry["racy"] = False
+    return same
+
+
+def _note_config_version(config_file, mode, st):
+    """Log which config file was loaded — once per on-disk version, tracked
+    across restarts in BASE_DIR/.config_mtime. Runs only when the cache
+    (re)loads, never on a warm read."""
+    if not hasattr(state, 'logger'):
+        return
+    current_mtime = str(st.st_mtime)
+    tracker_file = os.path.join(BASE_DIR, '.config_mtime')
+    last_mtime = None
+    if os.path.exists(tracker_file):
+        try:
+            with open(tracker_file, 'r') as tf:
+                last_mtime = tf.read().strip()
+        except:
+            pass
+    if last_mtime != current_mtime:
+        if mode == "DEV":
+            state.logger.warning(f"⚠️ LOADED DEV CONFIG: {config_file}")
+        else:
+            state.logger.info(f"✅ Loaded Prod Config: {config_file}")
+        try:
+            with open(tracker_file, 'w') as tf:
+                tf.write(current_mtime)
+        except:
+            pass
+
+
+def invalidate_config_cache():
+    """Drop the cached config; the next load_config() re-reads the file."""
+    with _CONFIG_CACHE_LOCK:
+        _CONFIG_CACHE.pop("entry", None)
+
+
+def get_config_cache_stats():
+    """Hit / load counters for /api/metrics."""
+    with _CONFIG_CACHE_LOCK:
+        return dict(_CONFIG_CACHE_STATS)
+
+
+def load_config():
+    """The RUNTIME config: defaults + config.json, printer_map keys uppercased,
+    the secret sentinel neutralized. Served from the read cache — the
+    returned mapping is shared and read-only (see the Read cache note)."""
+    config_file, mode = get_config_path()
+    try:
+        st = os.stat(config_file)
+    except OSError:
+        st = None
+    key = _cache_key(config_file, st)
+    with _CONFIG_CACHE_LOCK:
+        entry = _CONFIG_CACHE.get("entry")
+        if entry is None or entry["key"] != key:
+            entry = None
+    if entry is not None and (not entry["racy"] or _racy_hit(entry, config_file)):
+        with _CONFIG_CACHE_LOCK:
+            _CONFIG_CACHE_STATS["hits"] += 1
+        return entry["config"]
+
+    if st is None:
+        if hasattr(state, 'logger'):
+            state.logger.warning(f"Config file not found at {config_file}")
+        cfg = _finalize_config(None)
+        _install_config(config_file, None, None, cfg)
+        with _CONFIG_CACHE_LOCK:
+            _CONFIG_CACHE_STATS["loads"] += 1
+        return cfg
+
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            text = f.read()
+            st = os.fstat(f.fileno())
+        loaded = json.loads(text)
+        if not isinstance(loaded, dict):
+            raise ValueError(f"top-level JSON is {type(loaded).__name__}, not an object")
+    except Exception as e:
+        # config.json EXISTS but won't parse — e.g. corrupt or half-written
+        # by a crash during the non-atomic in-place overwrite. Do NOT silently
+        # fall through to localhost defaults (that turns a config-corruption
+        # incident into a baffling "Spoolman unreachable" outage). Auto-recover
+        # from the rolling backup if it parses, and log CRITICAL either way.
+        recovered = _try_load_backup()
+        if recovered is not None:
+            if hasattr(state, 'logger'):
+                state.logger.critical(
+                    f"config.json unreadable ({e}); RECOVERED from {get_config_backup_path()}. "
+                    "Re-save in the Config modal to repair the primary file.")
+        elif hasattr(state, 'logger'):
+            state.logger.critical(
+                f"config.json unreadable ({e}) and no usable backup — running on DEFAULTS; "
+                "the Spoolman host may be wrong until config.json is repaired.")
+        return _finalize_config(recovered)
+
+    _note_config_version(config_file, mode, st)
+    cfg = _finalize_config(loaded)
+    _install_config(config_file, st, text, cfg)
+    with _CONFIG_CACHE_LOCK:
+        _CONFIG_CACHE_STATS["loads"] += 1
+    return cfg
 
 def get_api_urls():
     cfg = load_config()
@@ -431,9 +651,32 @@ def _write_merged_config(changes):
                     state.logger.critical(LAST_CONFIG_ERROR)
                 return False, LAST_CONFIG_ERROR
 
+        # Still under the write lock: swap the verified file into the read
+        # cache so no reader sees the pre-save config after we return.
+        _reseed_config_cache(config_file, _mode)
         return True, None
 
 
+def _reseed_config_cache(config_file, mode):
+    """Install the just-written config file as the cached config (falls back
+    to invalidating, so the next read re-parses, if it can't be re-read)."""
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            text = f.read()
+            st = os.fstat(f.fileno())
+        loaded = json.loads(text)
+    except (OSError, ValueError):
+        invalidate_config_cache()
+        return
+    if not isinstance(loaded, dict):
+        invalidate_config_cache()
+        return
+    _note_config_version(config_file, mode, st)
+    _install_config(config_file, st, text, _finalize_config(loaded))
+    with _CONFIG_CACHE_LOCK:
+        _CONFIG_CACHE_STATS["installs"] += 1
+
+
 def _canonicalize_printer_map(new_map):
     """Validate + canonicalize an edited printer_map for save. Uppercases keys
     (matching load_config's normalization), rejects case-insensitive collisions,
@@ -68,12 +68,84 @@ CONFIG_SCHEMA = [
           help="Host running Spoolman."),
     Field("spoolman_port", "Spoolman port", "port", 7912,
           section="connection", scope="server", min=1, max=65535),
+    Field("spoolman_timeout", "Spoolman request timeout (seconds)", "float", 5.0,
+          section="connection", scope="server", min=0.5, max=120,
+          help="Default timeout for Spoolman calls that don't set their own."),
+    Field("spoolman_retries", "Spoolman retries", "int", 2,
+          section="connection", scope="server", min=0, max=10,
+          help="Retries for connection errors and 502/503/504 on reads. "
+               "Writes are only retried when the connection never opened."),
+    Field("spoolman_pool_size", "Spoolman connections per host", "int", 16,
+          section="connection", scope="server", min=1, max=128,
+          help="Keep-alive sockets held open to Spoolman. Extra concurrent "
+               "calls wait for a free socket instead of opening new ones."),
+    Field("spoolman_cache_ttl", "Spool list cache (seconds)", "float", 3.0,
+          section="connection", scope="server", min=0, max=300,
+          help="How long a fetched spool/filament list is reused across "
+               "requests. Edits made in FCC show up immediately; edits made "
+               "directly in Spoolman may take this long. 0 disables the cache."),
+    Field("spoolman_bulk_concurrency", "Bulk edit writes at once", "int", 8,
+          section="connection", scope="server", min=1, max=32,
+          help="How many filaments a bulk edit (attribute bulk-set, choice "
+               "removal / sweep) writes to Spoolman in parallel."),
+    Field("printer_state_max_age", "Printer state reuse (seconds)", "float", 5.0,
+          section="connection", scope="server", min=0, max=60,
+          help="How long a printer's PrusaLink state is shared between dashboards, "
+               "moves and the print monitor before it is probed again. The print "
+               "monitor itself always probes live. 0 probes on every read."),
+    Field("prusalink_poll_concurrency", "Printer probes at once", "int", 32,
+          section="connection", scope="server", min=1, max=256,
+          help="How many printers are probed in parallel by the print monitor and "
+               "the dashboard. Raise it for large farms; offline printers are "
+               "backed off automatically either way."),
+    Field("push_max_clients", "Live-update streams", "int", 16,
+          section="connection", scope="server", min=0, max=256,
+          help="How many open dashboards get changes pushed to them as they happen "
+               "(each holds one server connection). Dashboards past the limit keep "
+               "polling. 0 turns push off."),
+    Field("serve_mode", "Web server", "select", "pooled",
+          section="connection", scope="server", choices=["pooled", "simple"],
+          help="pooled: a fixed set of worker threads with keep-alive and a clean "
+               "shutdown (recommended). simple: Flask's built-in server, as older "
+               "versions ran. Takes effect on restart."),
+    Field("serve_workers", "Web server workers", "int", 32,
+          section="connection", scope="server", min=4, max=512,
+          help="Requests served at once by the pooled server. Live-update streams "
+               "use at most half of them. Takes effect on restart."),
+    Field("serve_queue", "Web server queue", "int", 64,
+          section="connection", scope="server", min=0, max=4096,
+          help="Connections that may wait for a free worker; past this the server "
+               "answers 'busy, retry' right away. Takes effect on restart."),
+    Field("serve_keepalive_s", "Keep-alive (seconds)", "float", 5.0,
+          section="connection", scope="server", min=1, max=300,
+          help="How long an idle browser connection is kept open for its next "
+               "request. Takes effect on restart."),
+    Field("serve_drain_s", "Shutdown grace (seconds)", "float", 8.0,
+          section="connection", scope="server", min=0, max=300,
+          help="On stop, how long requests already in progress get to finish. Keep "
+               "it under the container's stop timeout (10 s by default)."),
     Field("SCRAPER_API_KEY", "Scraper API key", "secret", "",
           section="connection", scope="server",
           help="Stored server-side; never sent to the browser. Leave blank to keep the current value."),
     Field("sync_delay", "Sync delay (seconds)", "float", 0.5,
           section="behavior", scope="server", min=0, max=10,
           help="Pause between Spoolman sync operations."),
+    Field("print_file_cache_mb", "Print file cache (MB)", "int", 1024,
+          section="behavior", scope="server", min=0, max=65536,
+          help="Disk space for print files downloaded from the printers (and their "
+               "decoded G-code), so a print's deduct, retries and runout split fetch "
+               "the file once. Least-recently-used files are dropped past this size. "
+               "0 turns the cache off."),
+    Field("deduct_ledger_retention_days", "Deduct history kept (days)", "int", 365,
+          section="behavior", scope="server", min=0, max=36500,
+          help="How long FCC remembers which prints it already deducted filament for "
+               "(the guard against deducting the same print twice after a restart). "
+               "0 keeps the history forever."),
+    Field("log_history_size", "Activity log history", "int", 200,
+          section="behavior", scope="server", min=10, max=5000,
+          help="How many activity-log entries the hub keeps in memory and the "
+               "dashboard log shows. Dashboards only download entries they "
+               "haven't seen, so a longer history costs memory, not bandwidth."),
     Field("fcc_owns_completion_deduct", "FCC owns completed-print deduct", "bool", False,
           section="behavior", scope="server",
           help="Phase-2 cutover: when ON, FCC deducts filament on FINISHED prints "
@@ -0,0 +1,243 @@
+"""Server-Sent Events push channel behind ``/api/events``.
+
+Every open dashboard used to poll: the buffer and the label queue every 2 s,
+the audit panel every 2 s while open, the cancel-review badge every 20 s and
+the dashboard pulse every 5-30 s. N kiosks meant N times that load on Flask
+(and, through the pulse, on Spoolman) even when nothing was happening.
+
+This module turns that around. A *topic* is a named piece of in-process
+state with a ``register``-ed source — a cheap callable returning its
+JSON-able snapshot (the buffer list, the queue, the logs heartbeat, …).
+``changed(*topics)`` samples the sources and, for each whose snapshot
+differs from the last one sent, appends an event to a bounded ring and wakes
+every stream. The trigger points are the places state changes: non-GET
+requests (routes_state_pulse's after_request hook), ``state.add_log_entry``
+and the print monitor's sweep. A stream's heartbeat (every
+``HEARTBEAT_S``) samples everything too, so a change made outside those
+paths still goes out within one heartbeat — and it runs the ``add_tick_hook``
+callbacks (the audit idle watchdog, which the polled /api/logs used to drive).
+
+Each event carries the topic's full snapshot, not a diff — a client that
+missed one just applies the next. Events are numbered (the SSE ``id``); a
+browser that reconnects sends ``Last-Event-ID`` and is replayed what it
+missed from the ring, or told to ``resync`` (refetch everything once) when
+the ring has moved past it.
+
+Streams hold a server thread each, so they are admitted up to
+``push_max_clients`` (config; 0 turns push off) — and, under the pooled
+server (wsgi_server), never more than ``limit_clients`` allows, so streams
+can't take every worker. A refused or dropped stream is not an error for
+the client: it falls back to its polling loops (inv_core.js ``fccPush``)
+until it reconnects. ``shutdown`` ends every stream (the server's drain).
+
+Python 3.9 runtime (the container image) — keep syntax 3.9-safe.
+"""
+import collections
+import json
+import threading
+
+import config_loader  # type: ignore
+
+# Seconds between keep-alive comments on an idle stream (also how soon a
+# dead client's thread is noticed and released, and the sampling safety net).
+HEARTBEAT_S = 15.0
+# Tells the browser how long to wait before reconnecting a dropped stream.
+RETRY_MS = 5000
+# Events kept for Last-Event-ID replay.
+RING_SIZE = 256
+
+# Guards everything below; streams wait on it for new events.
+_COND = threading.Condition()
+_SEQ = 0
+_RING = collections.deque(maxlen=RING_SIZE)  # (seq, topic, data JSON)
+_LAST = {}  # topic -> data JSON last sent
+_SOURCES = {}  # topic -> fn() returning the topic's JSON-able snapshot
+_TICK_HOOKS = []
+_CLIENTS = 0
+_CLIENT_CAP = None  # set by limit_clients (the serving worker budget)
+_CLOSING = False
+
+_STATS = {
+    "published": 0,
+    "unchanged": 0,
+    "connects": 0,
+    "rejected": 0,
+    "replayed": 0,
+    "resyncs": 0,
+    "sent": 0,
+}
+
+
+def max_clients():
+    v = config_loader.get_clamped("push_max_clients", 0, 256, int)
+    cap = _CLIENT_CAP
+    return v if cap is None else min(v, cap)
+
+
+def limit_clients(n):
+    """Admit at most `n` streams whatever push_max_clients says (None lifts
+    the cap). The pooled server sets it from its worker count."""
+    global _CLIENT_CAP
+    _CLIENT_CAP = None if n is None else max(0, int(n))
+
+
+def shutdown():
+    """End every open stream at its next wake-up and refuse new ones. The
+    server calls this as it starts draining: a stream never finishes on its
+    own, so without it the drain would wait out its whole timeout."""
+    global _CLOSING
+    with _COND:
+        _CLOSING = True
+        _COND.notify_all()
+
+
+def register(topic, source):
+    """Make `topic` sampled by ``changed()`` via ``source()``."""
+    with _COND:
+        _SOURCES[topic] = source
+
+
+def add_tick_hook(fn):
+    """Register ``fn()`` to run on every stream heartbeat. Idempotent."""
+    with _COND:
+        if fn not in _TICK_HOOKS:
+            _TICK_HOOKS.append(fn)
+
+
+def publish(topic, data):
+    """Send `data` as `topic`'s new snapshot — unless it equals the last one
+    sent, which is dropped. Returns the event's sequence number, or None."""
+    global _SEQ
+    text = json.dumps(data, separators=(",", ":"), default=str)
+    with _COND:
+        if _LAST.get(topic) == text:
+            _STATS["unchanged"] += 1
+            return None
+        _SEQ += 1
+        _LAST[topic] = text
+        _RING.append((_SEQ, topic, text))
+        _STATS["published"] += 1
+        _COND.notify_all()
+        return _SEQ
+
+
+def changed(*topics):
+    """Sample `topics` (all registered ones when none are named) and publish
+    those that differ from what was last sent. Never raises — a failing
+    source is skipped until the next call."""
+    with _COND:
+        sources = [(t, _SOURCES[t]) for t in (topics or list(_SOURCES)) if t in _SOURCES]
+    for topic, source in sources:
+        try:
+            publish(topic, source())
+        except Exception:
+            pass
+
+
+def _frame(seq, topic, text):
+    return f"id: {seq}\nevent: {topic}\ndata: {text}\n\n"
+
+
+def _parse_id(last_event_id):
+    try:
+        return int(str(last_event_id).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def open_stream():
+    """Admit one stream. Returns False when push is off or every slot is
+    taken (the caller answers so the client falls back to polling)."""
+    global _CLIENTS
+    limit = max_clients()
+    with _COND:
+        if _CLOSING or _CLIENTS >= limit:
+            _STATS["rejected"] += 1
+            return False
+        _CLIENTS += 1
+        _STATS["connects"] += 1
+        return True
+
+
+def close_stream():
+    global _CLIENTS
+    with _COND:
+        _CLIENTS = max(0, _CLIENTS - 1)
+
+
+def stream(last_event_id=None, heartbeat_s=None):
+    """The SSE body for one admitted client (see open_stream). Starts with
+    a replay from `last_event_id` (or ``resync`` when it can't), else a
+    ``hello`` carrying the current sequence — the client's cue to load the
+    state once — then relays every event as it is published. Runs until the
+    client goes away (the server closes the generator on the next failed
+    write, at the latest one heartbeat later) or shutdown(); the caller
+    releases the slot with close_stream."""
+    heartbeat_s = HEARTBEAT_S if heartbeat_s is None else heartbeat_s
+    yield f"retry: {RETRY_MS}\n\n"
+    since = _parse_id(last_event_id)
+    with _COND:
+        seq = _SEQ
+        backlog = None
+        if since is not None and since <= seq:
+            oldest = _RING[0][0] if _RING else seq + 1
+            if since + 1 >= oldest:
+                backlog = [e for e in _RING if e[0] > since]
+    if backlog is not None:
+        with _COND:
+            _STATS["replayed"] += len(backlog)
+        for event in backlog:
+            yield _frame(*event)
+    elif since is not None:
+        with _COND:
+            _STATS["resyncs"] += 1
+        yield _frame(seq, "resync", json.dumps({"seq": seq}))
+    else:
+        yield _frame(seq, "hello", json.dumps({"seq": seq}))
+    while True:
+        with _COND:
+            if _SEQ == seq and not _CLOSING:
+                _COND.wait(heartbeat_s)
+            if _CLOSING:
+                return
+            events = [e for e in _RING if e[0] > seq]
+            if events and events[0][0] > seq + 1:
+                # Fell behind the ring (a very slow client): start over.
+                _STATS["resyncs"] += 1
+                seq = _SEQ
+                events = [(seq, "resync", json.dumps({"seq": seq}))]
+        if not events:
+            _heartbeat()
+            with _COND:
+                idle = _SEQ == seq
+            if idle:
+                yield ": keepalive\n\n"
+            continue
+        for event in events:
+            seq = max(seq, event[0])
+            yield _frame(*event)
+        with _COND:
+            _STATS["sent"] += len(events)
+
+
+def _heartbeat():
+    with _COND:
+        hooks = list(_TICK_HOOKS)
+    for fn in hooks:
+        try:
+            fn()
+        except Exception:
+            pass
+    changed()
+
+
+def get_stats():
+    """Event / stream counters for /api/metrics."""
+    with _COND:
+        out = dict(_STATS)
+        out["clients"] = _CLIENTS
+        out["closing"] = _CLOSING
+        out["seq"] = _SEQ
+        out["topics"] = sorted(_SOURCES)
+    out["max_clients"] = max_clients()
+    return out
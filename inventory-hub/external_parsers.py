@@ -56,6 +56,7 @@ import re
 import json
 import state
 import config_loader
+import spoolman_http
 import urllib.parse
 import traceback
 from typing import Dict, Type, Any, List
@@ -98,7 +99,7 @@ class SpoolmanParser(BaseParser):
     def search(query: str) -> list[dict]:
         sm_url, _ = config_loader.get_api_urls()
         try:
-            r = requests.get(f"{sm_url}/api/v1/external/filament", timeout=5)
+            r = spoolman_http.get(f"{sm_url}/api/v1/external/filament", timeout=5)
             if not r.ok:
                 state.logger.warning(f"Spoolman External Search Failed: {r.status_code}")
                 return []
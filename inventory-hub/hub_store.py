@@ -0,0 +1,362 @@
+"""Embedded SQLite store behind the print-tracking persistence
+(`print_deduct_ledger`, `cancel_review_store`, `cancel_fetch_store`,
+`print_tracker_store`).
+
+Why this exists: each of those modules kept its own ``data/<name>.json`` and
+re-read the WHOLE file on every check (``was_deducted`` / ``has_pending`` run
+on every monitor tick) and rewrote the WHOLE file on every mutation (tmp +
+``atomic_store.replace_with_retry``), with a ``_MAX_ENTRIES`` cap that silently
+dropped the oldest history — including deduct-ledger rows, the only thing
+standing between a restart and a double deduct.
+
+This module holds them all in ONE database, ``data/hub_store.sqlite3``:
+
+- WAL journal (readers never block the writer, a crash mid-write leaves the
+  last committed state) with ``synchronous=NORMAL`` — a commit survives an
+  FCC / container crash; only an OS crash can lose the very last one, the
+  same exposure the un-fsynced JSON swap had. WAL's shared-memory index only
+  works when every connection runs on one host's local filesystem, and
+  ``data/`` is NOT guaranteed to be one: the dev compose bind-mounts the
+  whole app folder (``./:/app``) from the Windows host, where a host-side
+  pytest can open the same file as the container (see atomic_store). So the
+  mode is a choice, not an assumption: ``FCC_HUB_STORE_JOURNAL=delete``
+  (set by docker-compose.yml) selects the rollback journal with
+  ``synchronous=FULL``, and ``_connect`` checks the mode SQLite actually
+  granted — a filesystem that refuses WAL gets the same fallback instead of
+  silently running in whatever mode it was left in. /api/metrics shows the
+  mode in use (``journal_mode``).
+- keyed tables (``KEYED_TABLES``) share one shape: ``(printer, job_id)``
+  primary key — the old ``"printer::job"`` key — plus ``created_at`` /
+  ``updated_at`` (epoch s) and the record as a JSON ``body``. Lookups are
+  index seeks, a mutation touches one row, and listing follows insertion
+  order (rowid; an update keeps its row's place, like the old dict). Indexes
+  on ``job_id`` and ``created_at`` serve the by-job / by-time queries.
+- ``print_latch``: one row per printer for print_tracker_store's snapshot.
+- nothing is capped. Retention is each store's own policy (``prune``) — the
+  ledger ages rows out by ``deduct_ledger_retention_days``; the review and
+  fetch queues are drained by confirm / dismiss / give-up, never dropped.
+- a one-time importer (``import_legacy_json``): the first time a store is
+  touched, its old JSON file — if there is one — is loaded into the table,
+  recorded in ``legacy_imports`` and renamed ``<name>.json.imported``.
+
+One connection per process (``check_same_thread=False``) serialized by
+``_LOCK``: the stores are touched a few times per monitor tick, so a single
+writer is plenty, and ``BEGIN IMMEDIATE`` transactions keep a
+read-then-write (``pop``) atomic against another process on the same file.
+
+Python 3.9 runtime (the container image) — keep syntax 3.9-safe.
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import state  # type: ignore
+
+# Overridable by tests (monkeypatch this attribute to a tmp path).
+_DB_PATH = os.path.join(os.path.dirname(__file__), "data", "hub_store.sqlite3")
+
+# FCC_HUB_STORE_JOURNAL values. "wal" is the default; "delete" is the
+# rollback journal for a database on a shared / bind-mounted filesystem.
+JOURNAL_MODES = ("wal", "delete")
+
+KEYED_TABLES = ("deduct_ledger", "cancel_reviews", "cancel_fetches")
+
+_SCHEMA = "".join(
+    f"""
+CREATE TABLE IF NOT EXISTS {t} (
+    printer TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (printer, job_id)
+);
+CREATE INDEX IF NOT EXISTS {t}_job ON {t} (job_id);
+CREATE INDEX IF NOT EXISTS {t}_created ON {t} (created_at);
+""" for t in KEYED_TABLES) + """
+CREATE TABLE IF NOT EXISTS print_latch (
+    printer TEXT PRIMARY KEY,
+    entry TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS legacy_imports (
+    source TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    records INTEGER NOT NULL,
+    imported_at REAL NOT NULL
+);
+"""
+
+# Guards _CONN / _CONN_PATH / _JOURNAL / _TX_DEPTH / _IMPORT_CHECKED and
+# every use of the connection. Re-entrant so a store's importer can call the
+# normal API inside import_legacy_json's transaction.
+_LOCK = threading.RLock()
+_CONN = None
+_CONN_PATH = None
+_JOURNAL = None  # the journal mode the open connection actually runs in
+_TX_DEPTH = 0
+# (db path, source) pairs whose legacy file this process already dealt with.
+_IMPORT_CHECKED = set()
+
+# A store that can't reach the database logs it through log_error at most
+# this often per store: a broken file fails every monitor tick.
+_ERROR_LOG_EVERY_S = 60.0
+# Guards _ERROR_COUNT / _ERROR_LOGGED_AT.
+_ERROR_LOCK = threading.Lock()
+_ERROR_COUNT = 0
+_ERROR_LOGGED_AT = {}  # source -> time.monotonic() of its last logged error
+
+
+def journal_mode_setting():
+    """``FCC_HUB_STORE_JOURNAL`` if set to a known mode, else "wal"."""
+    mode = str(os.environ.get("FCC_HUB_STORE_JOURNAL", "")).strip().lower()
+    return mode if mode in JOURNAL_MODES else "wal"
+
+
+def _set_journal(conn, path):
+    """Put ``conn`` in the configured journal mode and return the mode it
+    ended up in. ``PRAGMA journal_mode`` answers with the mode in effect
+    rather than failing, so a WAL request the filesystem can't honour is
+    only visible in that answer: anything but "wal" falls back to the
+    rollback journal (with a full fsync per commit, which DELETE needs for
+    the durability WAL + NORMAL gives)."""
+    if journal_mode_setting() == "wal":
+        try:
+            granted = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        except sqlite3.Error as e:
+            granted = f"error: {e}"
+        if str(granted).lower() == "wal":
+            conn.execute("PRAGMA synchronous=NORMAL")
+            return "wal"
+        state.logger.warning(
+            f"hub_store: WAL unavailable for {path} ({granted}); using the rollback journal")
+    granted = conn.execute("PRAGMA journal_mode=DELETE").fetchone()[0]
+    conn.execute("PRAGMA synchronous=FULL")
+    return str(granted).lower()
+
+
+def _connect():
+    """The connection for the current _DB_PATH, opened (and the schema
+    created) on first use or after the path changed. Caller holds _LOCK."""
+    global _CONN, _CONN_PATH, _JOURNAL
+    path = _DB_PATH
+    if _CONN is not None and _CONN_PATH == path:
+        return _CONN
+    close()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+    try:
+        journal = _set_journal(conn, path)
+        conn.executescript(_SCHEMA)
+    except sqlite3.Error:
+        conn.close()
+        raise
+    _CONN, _CONN_PATH, _JOURNAL = conn, path, journal
+    return conn
+
+
+def close():
+    """Close the connection (the next call reopens it)."""
+    global _CONN, _CONN_PATH, _JOURNAL
+    with _LOCK:
+        if _CONN is not None:
+            try:
+                _CONN.close()
+            except sqlite3.Error:
+                pass
+        _CONN = _CONN_PATH = _JOURNAL = None
+
+
+@contextlib.contextmanager
+def transaction():
+    """``BEGIN IMMEDIATE`` … ``COMMIT`` (``ROLLBACK`` on error), yielding the
+    connection. Nested blocks join the outermost transaction."""
+    global _TX_DEPTH
+    with _LOCK:
+        conn = _connect()
+        if _TX_DEPTH:
+            _TX_DEPTH += 1
+            try:
+                yield conn
+            finally:
+                _TX_DEPTH -= 1
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        _TX_DEPTH = 1
+        try:
+            yield conn
+        except BaseException:
+            _TX_DEPTH = 0
+            conn.execute("ROLLBACK")
+            raise
+        _TX_DEPTH = 0
+        conn.execute("COMMIT")
+
+
+def query(sql, params=()):
+    """Run one read statement and return its rows (for a store's own table,
+    e.g. print_latch)."""
+    with _LOCK:
+        return _connect().execute(sql, params).fetchall()
+
+
+def _table(table):
+    if table not in KEYED_TABLES:
+        raise ValueError(f"hub_store: unknown table {table!r}")
+    return table
+
+
+def _norm(printer_name, job_id):
+    return str(printer_name).strip(), str(job_id).strip()
+
+
+def put(table, printer_name, job_id, body, only_new=False, created_at=None):
+    """Insert or replace the record for (printer, job). A replaced record
+    keeps its place in listing order and its created_at. ``only_new`` leaves
+    an existing record alone (the importer: the database wins);
+    ``created_at`` (epoch s) dates a new record other than now (the importer
+    carries the legacy record's own time over, so retention and ``since``
+    queries see when it really happened)."""
+    printer, job = _norm(printer_name, job_id)
+    now = time.time()
+    created = now if created_at is None else float(created_at)
+    conflict = "NOTHING" if only_new else "UPDATE SET body = excluded.body, updated_at = excluded.updated_at"
+    with _LOCK:
+        _connect().execute(
+            f"INSERT INTO {_table(table)} (printer, job_id, created_at, updated_at, body) "
+            f"VALUES (?, ?, ?, ?, ?) ON CONFLICT (printer, job_id) DO {conflict}",
+            (printer, job, created, now, json.dumps(body)))
+
+
+def get(table, printer_name, job_id):
+    """The record for (printer, job), or None."""
+    rows = query(f"SELECT body FROM {_table(table)} WHERE printer = ? AND job_id = ?",
+                 _norm(printer_name, job_id))
+    return json.loads(rows[0][0]) if rows else None
+
+
+def exists(table, printer_name, job_id) -> bool:
+    return bool(query(f"SELECT 1 FROM {_table(table)} WHERE printer = ? AND job_id = ?",
+                      _norm(printer_name, job_id)))
+
+
+def pop(table, printer_name, job_id):
+    """Atomically remove and return the record for (printer, job), or None —
+    a concurrent second caller (any thread or process) gets None."""
+    key = _norm(printer_name, job_id)
+    with transaction() as conn:
+        row = conn.execute(f"SELECT body FROM {_table(table)} WHERE printer = ? AND job_id = ?",
+                           key).fetchone()
+        if row is None:
+            return None
+        conn.execute(f"DELETE FROM {table} WHERE printer = ? AND job_id = ?", key)
+    return json.loads(row[0])
+
+
+def records(table, printer_name=None, job_id=None, since=None, limit=None):
+    """``[(printer, job_id, created_at, record), ...]`` in insertion order,
+    optionally filtered by printer, job id and ``created_at >= since``.
+    ``limit`` keeps the newest N."""
+    where, params = [], []
+    if printer_name is not None:
+        where.append("printer = ?")
+        params.append(str(printer_name).strip())
+    if job_id is not None:
+        where.append("job_id = ?")
+        params.append(str(job_id).strip())
+    if since is not None:
+        where.append("created_at >= ?")
+        params.append(float(since))
+    sql = f"SELECT printer, job_id, created_at, body FROM {_table(table)}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    if limit is not None:
+        sql += " ORDER BY rowid DESC LIMIT ?"
+        params.append(max(0, int(limit)))
+        rows = list(reversed(query(sql, params)))
+    else:
+        rows = query(sql + " ORDER BY rowid", params)
+    return [(p, j, c, json.loads(b)) for p, j, c, b in rows]
+
+
+def prune(table, before) -> int:
+    """Delete records created before ``before`` (epoch s); returns how many."""
+    with _LOCK:
+        cur = _connect().execute(f"DELETE FROM {_table(table)} WHERE created_at < ?",
+                                 (float(before),))
+        return cur.rowcount
+
+
+def import_legacy_json(source, path, load):
+    """Bring a store's pre-SQLite JSON file in, once. ``load(data)`` gets the
+    decoded file and writes it through this module's API (``put`` with
+    ``only_new=True``); it runs inside one transaction, so a failure imports
+    nothing and the file stays put for the next start. Afterwards the file
+    is renamed ``<path>.imported``. Checked once per process per database —
+    a missing file costs one ``os.path.exists``; an unreadable one is left
+    alone (and logged) rather than blocking the store."""
+    with _LOCK:
+        key = (_DB_PATH, source)
+        if key in _IMPORT_CHECKED:
+            return
+        if not os.path.exists(path) or query(
+                "SELECT 1 FROM legacy_imports WHERE source = ?", (source,)):
+            _IMPORT_CHECKED.add(key)
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            state.logger.warning(f"hub_store: {source}: legacy file {path} unreadable ({e}); not imported")
+            _IMPORT_CHECKED.add(key)
+            return
+        with transaction() as conn:
+            count = load(data if isinstance(data, dict) else {})
+            conn.execute("INSERT INTO legacy_imports (source, path, records, imported_at) "
+                         "VALUES (?, ?, ?, ?)", (source, path, int(count or 0), time.time()))
+        _IMPORT_CHECKED.add(key)
+    try:
+        os.replace(path, path + ".imported")
+    except OSError:
+        pass
+    state.logger.info(f"📦 hub_store: imported {count or 0} {source} record(s) from {path}")
+
+
+def log_error(source, error) -> None:
+    """Record a store's failed database call that it is falling back from
+    (a read answering "not there" / empty, as the JSON files did when they
+    couldn't be read). Logged once per ``_ERROR_LOG_EVERY_S`` per store;
+    every one is counted (``errors`` in /api/metrics)."""
+    global _ERROR_COUNT
+    now = time.monotonic()
+    with _ERROR_LOCK:
+        _ERROR_COUNT += 1
+        last = _ERROR_LOGGED_AT.get(source)
+        if last is not None and now - last < _ERROR_LOG_EVERY_S:
+            return
+        _ERROR_LOGGED_AT[source] = now
+    state.logger.error(f"hub_store: {source}: database error ({error}); falling back")
+
+
+def get_stats():
+    """Row counts per table, the journal mode in use, the database / WAL
+    size and the stores' fallen-back errors for /api/metrics."""
+    with _ERROR_LOCK:
+        errors = _ERROR_COUNT
+    with _LOCK:
+        out = {t: query(f"SELECT COUNT(*) FROM {t}")[0][0] for t in KEYED_TABLES}
+        out["print_latch"] = query("SELECT COUNT(*) FROM print_latch")[0][0]
+        out["journal_mode"] = _JOURNAL
+        out["errors"] = errors
+        path = _CONN_PATH
+    for name, suffix in (("db_bytes", ""), ("wal_bytes", "-wal")):
+        try:
+            out[name] = os.path.getsize(path + suffix)
+        except (OSError, TypeError):
+            out[name] = 0
+    return out
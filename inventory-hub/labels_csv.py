@@ -11,7 +11,7 @@ tests/test_l316_charact_label_*.py + tests/test_label_csv_export.py).
 Python 3.9 runtime (the container image) — keep syntax 3.9-safe.
 """
 from flask import request, jsonify  # type: ignore
-import requests  # type: ignore
+import spoolman_http  # type: ignore
 import csv
 import json
 import os
@@ -327,7 +327,7 @@ def api_print_batch_csv():
                     # 2. Try Spoolman API (Fallback)
                     sm_url, _ = config_loader.get_api_urls()
                     try:
-                        resp = requests.get(f"{sm_url}/api/v1/location/{item_id}", timeout=2)
+                        resp = spoolman_http.get(f"{sm_url}/api/v1/location/{item_id}", timeout=2)
                         if resp.ok:
                             s_data = resp.json()
                             name = s_data.get('name', str(item_id))
@@ -3,6 +3,8 @@ import json
 import csv
 import shutil
 import tempfile
+import threading
+import time
 import state  # type: ignore
 
 # Runtime state lives under `data/` so a broad .gitignore rule keeps it
@@ -113,41 +115,195 @@ def _ensure_json_migration():
     except Exception as e:
         state.logger.error(f"❌ Migration Error: {e}")
 
-def load_locations_list():
-    """Loads location configurations from the JSON file.
+# ---------------------------------------------------------------------------
+# Memory-resident store
+# ---------------------------------------------------------------------------
+# load_locations_list used to mkdir + run both migration probes + json.load the
+# whole file on EVERY call, and it sits under scans, moves, the pulse's
+# locations section, get_active_printer_map and build_parent_map — often
+# several times per request. The store keeps the parsed rows in memory, keyed
+# by JSON_FILE's (path, mtime_ns, size, inode) signature, so a read is one
+# os.stat and a hand edit / restore / git checkout that rewrites the file is
+# still picked up on the next call.
+#
+# Coarse filesystem timestamps: a rewrite landing in the same timestamp tick
+# as the load (same size, in place) keeps the signature. Like git's "racy
+# clean" rule, a snapshot loaded within _RACY_WINDOW_S of the file's mtime is
+# content-checked (read + compare, no parse) on each hit until a check runs
+# past the window.
+#
+# Writes serialise on _WRITE_LOCK in save_locations_list, which installs the
+# verified list as the new snapshot. Derived structures (parent map, printer
+# map, room map) are memoized ON the snapshot entry, so a reload or write
+# drops them all together.
+_RACY_WINDOW_S = 2.0
+
+_STORE_LOCK = threading.Lock()  # guards _STORE / _STORE_STATS; never held across I/O
+_WRITE_LOCK = threading.Lock()  # one save_locations_list at a time
+# "entry" -> {"sig", "mtime", "racy", "text", "rows", "derived"}. `rows` is
+# SHARED by every read-only caller — never mutate it; `text` is the JSON it
+# was parsed from, used to hand out private copies.
+_STORE = {}
+_STORE_STATS = {
+    "hits": 0,
+    "loads": 0,
+    "racy_checks": 0,
+    "writes": 0,
+    "derived_hits": 0,
+    "derived_builds": 0,
+}
+
+
+def _signature(path, st):
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _install(path, text, rows, st):
+    entry = {
+        "sig": _signature(path, st),
+        "mtime": st.st_mtime,
+        "racy": time.time() - st.st_mtime < _RACY_WINDOW_S,
+        "text": text,
+        "rows": rows,
+        "derived": {},
+    }
+    with _STORE_LOCK:
+        _STORE["entry"] = entry
+    return entry
+
+
+def _racy_hit(entry, path):
+    """Content-check a racy snapshot. True when the file still holds exactly
+    what the snapshot was parsed from."""
+    checked_at = time.time()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            same = f.read() == entry["text"]
+    except OSError:
+        return False
+    with _STORE_LOCK:
+        _STORE_STATS["racy_checks"] += 1
+        if same and checked_at - entry["mtime"] >= _RACY_WINDOW_S:
+            # Read after the window closed: any later rewrite gets a new mtime.
+            entry["racy"] = False
+    return same
+
+
+def _store_entry():
+    """The live snapshot for JSON_FILE, (re)loading it when the file changed.
+    None when there is no file or it can't be read (callers treat that as
+    []). Raises LocationsCorruptError on a parse failure — never cached, so
+    the next call after the operator fixes the file loads it."""
+    path = JSON_FILE
+    try:
+        sig = _signature(path, os.stat(path))
+    except OSError:
+        sig = None
+    if sig is not None:
+        with _STORE_LOCK:
+            entry = _STORE.get("entry")
+            if entry is None or entry["sig"] != sig:
+                entry = None
+        if entry is not None and (not entry["racy"] or _racy_hit(entry, path)):
+            with _STORE_LOCK:
+                _STORE_STATS["hits"] += 1
+            return entry
 
-    Returns [] only when the file legitimately doesn't exist or has a
-    non-list root (a fresh-install or schema-mismatch shape). On a real
-    JSON parse failure (corrupt file from a manual edit gone wrong, etc.)
-    we propagate as LocationsCorruptError so the operator sees the
-    failure on the very first request — silently returning [] previously
-    masked an XL-3 syntax error and surfaced as the entire dashboard
-    losing names/types/grouping.
-    """
     _ensure_data_dir()
     _ensure_runtime_migration()
     _ensure_json_migration()
 
-    if not os.path.exists(JSON_FILE):
-        return []
+    if not os.path.exists(path):
+        return None
 
     try:
-        with open(JSON_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+            st = os.fstat(f.fileno())
+        data = json.loads(text)
     except json.JSONDecodeError as e:
         state.logger.critical(
-            f"💥 locations.json corrupt at {JSON_FILE}:{e.lineno}:{e.colno} — {e.msg}. "
+            f"💥 locations.json corrupt at {path}:{e.lineno}:{e.colno} — {e.msg}. "
             "Fix the file (manual edit gone wrong?) before the dashboard can render."
         )
-        raise LocationsCorruptError(JSON_FILE, e) from e
+        raise LocationsCorruptError(path, e) from e
     except Exception as e:
         state.logger.error(f"JSON Read Error: {e}")
-        return []
+        return None
+
+    # Ensure we always serve a list
+    if not isinstance(data, list):
+        data, text = [], '[]'
+    entry = _install(path, text, data, st)
+    with _STORE_LOCK:
+        _STORE_STATS["loads"] += 1
+    return entry
+
+
+def _derived(name, build):
+    """``build(rows)`` over get_locations_view(), memoized on the store
+    snapshot when that is what the view returned (a substituted view is
+    built fresh every call). The value is SHARED until the next reload /
+    write — treat it as read-only."""
+    rows = get_locations_view()
+    with _STORE_LOCK:
+        entry = _STORE.get("entry")
+        if entry is None or entry["rows"] is not rows:
+            entry = None
+        elif name in entry["derived"]:
+            _STORE_STATS["derived_hits"] += 1
+            return entry["derived"][name]
+    value = build(rows)
+    if entry is None:
+        return value
+    with _STORE_LOCK:
+        value = entry["derived"].setdefault(name, value)
+        _STORE_STATS["derived_builds"] += 1
+    return value
+
+
+def invalidate_locations_cache():
+    """Drop the in-memory snapshot; the next read reloads from disk. For
+    code that rewrites JSON_FILE without going through save_locations_list."""
+    with _STORE_LOCK:
+        _STORE.pop("entry", None)
+
+
+def get_store_stats():
+    """Hit / load / derived-build counters for /api/metrics."""
+    with _STORE_LOCK:
+        out = dict(_STORE_STATS)
+        entry = _STORE.get("entry")
+        out["rows"] = len(entry["rows"]) if entry is not None else None
+    return out
+
+
+def get_locations_view():
+    """The current rows WITHOUT a copy — shared with every other reader, so
+    strictly read-only. Use load_locations_list() for load-modify-save."""
+    entry = _store_entry()
+    return entry["rows"] if entry is not None else []
 
-    # Ensure we always return a list
-    if isinstance(data, list):
-        return data
-    return []
+
+def load_locations_list():
+    """Loads location configurations from the JSON file.
+
+    Returns a private, mutable copy of the in-memory snapshot (reloaded when
+    the file changes on disk), so the load-modify-save pattern can't touch
+    what other readers see.
+
+    Returns [] only when the file legitimately doesn't exist or has a
+    non-list root (a fresh-install or schema-mismatch shape). On a real
+    JSON parse failure (corrupt file from a manual edit gone wrong, etc.)
+    we propagate as LocationsCorruptError so the operator sees the
+    failure on the very first request — silently returning [] previously
+    masked an XL-3 syntax error and surfaced as the entire dashboard
+    losing names/types/grouping.
+    """
+    entry = _store_entry()
+    if entry is None:
+        return []
+    return json.loads(entry["text"])
 
 
 class LocationsCorruptError(RuntimeError):
@@ -236,6 +392,37 @@ def _verify_locations_file(expected_list):
 
 
 def save_locations_list(new_list):
+    """Serialised entry point: one writer at a time (_WRITE_LOCK), and on a
+    verified write the store is re-seeded from exactly what landed on disk
+    — the next read neither re-parses nor races a half-finished writer.
+    See _save_locations_list_locked for the write itself."""
+    with _WRITE_LOCK:
+        ok = _save_locations_list_locked(new_list)
+        if ok:
+            _reseed_store_after_write()
+        return ok
+
+
+def _reseed_store_after_write():
+    """Install JSON_FILE (just written + verified) as the live snapshot."""
+    path = JSON_FILE
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+            st = os.fstat(f.fileno())
+        rows = json.loads(text)
+    except (OSError, ValueError):
+        invalidate_locations_cache()
+        return
+    if not isinstance(rows, list):
+        invalidate_locations_cache()
+        return
+    _install(path, text, rows, st)
+    with _STORE_LOCK:
+        _STORE_STATS["writes"] += 1
+
+
+def _save_locations_list_locked(new_list):
     """Saves location configurations to the JSON file via atomic write
     with a verify-after-write tripwire.
 
@@ -395,9 +582,12 @@ def build_parent_map(loc_list=None):
     hierarchy walks (is_descendant / resolve_room) without re-reading disk per
     call. Honors explicit parent_id via resolve_parent (with prefix fallback).
     Callers in per-spool loops should build this ONCE and pass it down.
+
+    With no loc_list the map comes from the store (built once per snapshot);
+    the caller gets its own copy.
     """
     if loc_list is None:
-        loc_list = load_locations_list()
+        return dict(_derived('parent_map', build_parent_map))
     pmap = {}
     for r in loc_list:
         if not isinstance(r, dict):
@@ -427,6 +617,145 @@ def _parent_of(loc_upper, parent_map, strict=False):
     return derive_parent_id_from_prefix(loc_upper)
 
 
+def _walk_up(start, parent_map, strict=False):
+    """The ancestor chain of an uppercased id, immediate-first, exactly as the
+    hop-by-hop walk sees it: stops at a root or at the first repeat."""
+    out = []
+    seen = {start}
+    cur = _parent_of(start, parent_map, strict=strict)
+    while cur and cur not in seen:
+        out.append(cur)
+        seen.add(cur)
+        cur = _parent_of(cur, parent_map, strict=strict)
+    return out
+
+
+# Unknown-id chains (spools at a LocationID with no row) memoized per index;
+# the cap only guards against an unbounded stream of junk ids.
+_HIERARCHY_MISS_CACHE_MAX = 4096
+
+
+class LocationHierarchy:
+    """Closure table over a parent map: every on-disk id's full ancestor chain
+    (immediate-first) precomputed once, plus the inverse (each id's subtree).
+
+    is_descendant / resolve_room / ancestors_of used to walk the parent map one
+    hop at a time on every call, and the per-spool loops on the move and render
+    paths repeated those walks hundreds of times. Here the descendant test is
+    a set lookup, the room is the chain's last element and the pseudo-prefix
+    cut-off is precomputed. The closure table (rather than Euler-tour
+    intervals) is used because the on-disk graph isn't guaranteed to be a tree:
+    a dangling parent_id continues by prefix derivation and a hand-edited cycle
+    must stop the walk exactly where the hop-by-hop walk stopped.
+
+    An id with no row (a spool at a not-yet-created LocationID) derives its
+    chain by prefix until it reaches a known id, then borrows that id's chain —
+    the same answer the walk gives. Non-strict semantics only; the write-time
+    cycle check (strict=True) keeps walking.
+
+    Build with build_hierarchy_index(). Immutable once built.
+    """
+
+    def __init__(self, parent_map):
+        self.parent_map = parent_map
+        self._chains = {}
+        self._sets = {}
+        self._cut = {}  # chain length before the first pseudo-prefix
+        self._subtree = {}
+        self._misses = {}
+        self.rooms = {}  # read-only {id: room} for every on-disk id
+        for lid in parent_map:
+            chain = tuple(_walk_up(lid, parent_map))
+            self._chains[lid] = chain
+            self._sets[lid] = frozenset(chain)
+            self._cut[lid] = _pseudo_cut(chain)
+            self.rooms[lid] = chain[-1] if chain else lid
+            for anc in chain:
+                self._subtree.setdefault(anc, []).append(lid)
+
+    def __len__(self):
+        return len(self._chains)
+
+    def _chain(self, loc_u):
+        """(chain, ancestor set, pseudo cut) for an uppercased id."""
+        chain = self._chains.get(loc_u)
+        if chain is not None:
+            return chain, self._sets[loc_u], self._cut[loc_u]
+        hit = self._misses.get(loc_u)
+        if hit is not None:
+            return hit
+        out = []
+        seen = {loc_u}
+        cur = derive_parent_id_from_prefix(loc_u)
+        while cur and cur not in seen and cur not in self._chains:
+            out.append(cur)
+            seen.add(cur)
+            cur = derive_parent_id_from_prefix(cur)
+        if cur and cur not in seen:
+            out.append(cur)
+            seen.add(cur)
+            for anc in self._chains[cur]:
+                if anc in seen:
+                    break
+                out.append(anc)
+                seen.add(anc)
+        chain = tuple(out)
+        hit = (chain, frozenset(chain), _pseudo_cut(chain))
+        if len(self._misses) < _HIERARCHY_MISS_CACHE_MAX:
+            self._misses[loc_u] = hit
+        return hit
+
+    def is_descendant(self, child, ancestor):
+        """True if `child` sits STRICTLY beneath `ancestor` (see the
+        module-level is_descendant)."""
+        child_u = str(child or '').strip().upper()
+        anc_u = str(ancestor or '').strip().upper()
+        if not child_u or not anc_u or child_u == anc_u:
+            return False
+        return anc_u in self._chain(child_u)[1]
+
+    def ancestors(self, loc_id, include_pseudo=False):
+        """Ancestor ids, immediate-first, as a tuple (see ancestors_of)."""
+        loc_u = str(loc_id or '').strip().upper()
+        if not loc_u:
+            return ()
+        chain, _set, cut = self._chain(loc_u)
+        return chain if include_pseudo else chain[:cut]
+
+    def room(self, loc_id):
+        """Top-level ancestor (see resolve_room); "" for an empty id."""
+        loc_u = str(loc_id or '').strip().upper()
+        if not loc_u:
+            return ""
+        room = self.rooms.get(loc_u)
+        if room is not None:
+            return room
+        chain = self._chain(loc_u)[0]
+        return chain[-1] if chain else loc_u
+
+    def descendants(self, loc_id):
+        """Every on-disk id strictly beneath `loc_id`, in row order. Ids
+        without a row are never enumerated (nothing knows about them)."""
+        return tuple(self._subtree.get(str(loc_id or '').strip().upper(), ()))
+
+
+def _pseudo_cut(chain):
+    for i, anc in enumerate(chain):
+        if anc in PSEUDO_ROOM_PREFIXES:
+            return i
+    return len(chain)
+
+
+def build_hierarchy_index(loc_list=None):
+    """LocationHierarchy for `loc_list` — or, with no loc_list, the store's
+    (built once per locations.json snapshot and shared; it's immutable).
+    Per-spool loops over a caller-built row list should build one up front
+    instead of passing a parent map into is_descendant / ancestors_of."""
+    if loc_list is None:
+        return _derived('hierarchy', build_hierarchy_index)
+    return LocationHierarchy(build_parent_map(loc_list))
+
+
 def is_descendant(child, ancestor, parent_map=None, loc_list=None, strict=False):
     """True if `child` sits STRICTLY beneath `ancestor` anywhere in the
     parent_id chain (self does NOT count — callers test exact equality
@@ -438,6 +767,9 @@ def is_descendant(child, ancestor, parent_map=None, loc_list=None, strict=False)
     walks the full chain so a room query reaches its cart-rows / a printer's
     toolheads.
 
+    With neither parent_map nor loc_list the store's hierarchy index answers
+    in one set lookup; an explicit map / list is walked hop by hop.
+
     `strict=True` (write-time cycle validation) walks only real parent_map
     edges — see `_parent_of`.
     """
@@ -445,16 +777,11 @@ def is_descendant(child, ancestor, parent_map=None, loc_list=None, strict=False)
     anc_u = str(ancestor or '').strip().upper()
     if not child_u or not anc_u or child_u == anc_u:
         return False
+    if parent_map is None and loc_list is None and not strict:
+        return build_hierarchy_index().is_descendant(child_u, anc_u)
     if parent_map is None:
-        parent_map = build_parent_map(loc_list)
-    seen = {child_u}
-    cur = _parent_of(child_u, parent_map, strict=strict)
-    while cur and cur not in seen:
-        if cur == anc_u:
-            return True
-        seen.add(cur)
-        cur = _parent_of(cur, parent_map, strict=strict)
-    return False
+        parent_map = _parent_map_for(loc_list)
+    return anc_u in _walk_up(child_u, parent_map, strict=strict)
 
 
 def resolve_room(row_or_id, parent_map=None, loc_list=None):
@@ -473,35 +800,46 @@ def resolve_room(row_or_id, parent_map=None, loc_list=None):
         start = str(row_or_id or '').strip().upper()
     if not start:
         return ""
+    if parent_map is None and loc_list is None:
+        return build_hierarchy_index().room(start)
     if parent_map is None:
-        parent_map = build_parent_map(loc_list)
-    seen = {start}
-    top = start
-    cur = _parent_of(start, parent_map)
-    while cur and cur not in seen:
-        top = cur
-        seen.add(cur)
-        cur = _parent_of(cur, parent_map)
-    return top
+        parent_map = _parent_map_for(loc_list)
+    chain = _walk_up(start, parent_map)
+    return chain[-1] if chain else start
+
+
+def _parent_map_for(loc_list):
+    """Parent map for an internal, read-only walk: the store's shared one
+    when no loc_list is given (no copy), else built from loc_list."""
+    if loc_list is None:
+        return _derived('parent_map', build_parent_map)
+    return build_parent_map(loc_list)
+
 
+def get_room_map():
+    """Read-only {LocationID_upper: room LocationID} for every on-disk row,
+    from the store's hierarchy index. Ids without a row aren't in it — use
+    resolve_room for those (it falls back to prefix derivation)."""
+    return build_hierarchy_index().rooms
 
-def ancestors_of(loc_id, parent_map, include_pseudo=False):
+
+def ancestors_of(loc_id, parent_map=None, include_pseudo=False):
     """Yield each ancestor LocationID (immediate-first) by walking the parent_id
     chain upward. Stops BEFORE a pseudo-prefix (PM/PJ/TST) unless include_pseudo
     is True — so a spool in a PM box never rolls up into a "PM room". Cycle
-    -guarded. Used by the /api/locations transitive subtree-occupancy rollup.
+    -guarded. parent_map=None reads the store's hierarchy index; a loop over
+    many ids should use LocationHierarchy.ancestors on one index instead.
     """
     cur = str(loc_id or '').strip().upper()
     if not cur:
         return
-    seen = {cur}
-    nxt = _parent_of(cur, parent_map)
-    while nxt and nxt not in seen:
+    if parent_map is None:
+        yield from build_hierarchy_index().ancestors(cur, include_pseudo=include_pseudo)
+        return
+    for nxt in _walk_up(cur, parent_map):
         if not include_pseudo and nxt in PSEUDO_ROOM_PREFIXES:
             return
         yield nxt
-        seen.add(nxt)
-        nxt = _parent_of(nxt, parent_map)
 
 
 def migrate_parent_ids_if_needed(loc_list):
@@ -802,7 +1140,13 @@ def get_active_printer_map(loc_list=None):
     with prime_only) and as a rollback net; nothing READS it here anymore. A
     Printer row with no toolheads[] therefore yields an empty entry, not a config
     read.
+
+    With no loc_list the map is built once per store snapshot; each caller
+    gets its own copy (entries included) so it may mutate freely.
     """
+    if loc_list is None:
+        shared = _derived('printer_map', build_printer_map_from_rows)
+        return {k: dict(v) for k, v in shared.items()}
     return build_printer_map_from_rows(loc_list)
 
 
@@ -836,7 +1180,7 @@ def get_printer_credentials(printer_name, loc_list=None):
     if not name:
         return None
     if loc_list is None:
-        loc_list = load_locations_list()
+        loc_list = get_locations_view()
     for row in (loc_list or []):
         if not isinstance(row, dict):
             continue
@@ -955,7 +1299,7 @@ def immediate_parent_for(loc_id, loc_list=None):
     (old) id excluded so an edit can't make a row its own parent.
     """
     if loc_list is None:
-        loc_list = load_locations_list()
+        loc_list = get_locations_view()
     existing_upper = {
         str(r.get('LocationID', '')).strip().upper()
         for r in loc_list
@@ -1350,7 +1694,7 @@ def validate_slot_targets(slot_targets, loc_list, printer_map):
 def get_dryer_box_bindings(loc_id):
     """Read slot_targets for a dryer box. Returns {} if the box has none
     or if loc_id isn't a Dryer Box."""
-    loc_list = load_locations_list()
+    loc_list = get_locations_view()
     _, row = _find_location(loc_list, loc_id)
     if not row or row.get('Type') != DRYER_BOX_TYPE:
         return None  # distinct from empty-dict to signal "not found"
@@ -1362,7 +1706,7 @@ def get_dryer_box_slot_order(loc_id):
     Defaults to 'ltr' when unset. Returns None if the location is missing or
     isn't a Dryer Box.
     """
-    loc_list = load_locations_list()
+    loc_list = get_locations_view()
     _, row = _find_location(loc_list, loc_id)
     if not row or row.get('Type') != DRYER_BOX_TYPE:
         return None
@@ -1557,7 +1901,7 @@ def get_bindings_for_machine(printer_name, printer_map):
     feed a specific toolhead, but Quick-Swap surfaces them so users can
     deposit buffered spools without leaving the toolhead view.
     """
-    loc_list = load_locations_list()
+    loc_list = get_locations_view()
     # Collect every toolhead location ID that belongs to this printer.
     machine_toolhead_ids = [
         loc_id.upper() for loc_id, cfg in (printer_map or {}).items()
@@ -1,8 +1,9 @@
+import copy
 import re
 import threading
 import typing
 import urllib.parse
-import requests
+import spoolman_http
 import state
 import config_loader
 import spoolman_api
@@ -326,12 +327,236 @@ def resolve_scan(text):
         
     return {'type': 'error', 'msg': 'Unknown Code'}
 
+# A slotless move of more spools than this takes _perform_bulk_move_writes.
+# Mirrors spoolman_api.LIVE_FANOUT_MAX: at or below it the batched read
+# would fan out per spool anyway, and a pool isn't worth starting.
+BULK_MOVE_THRESHOLD = 4
+
 # Thread-local re-entry depth for perform_smart_move. The auto-deploy chain
 # re-enters the wrapper synchronously on the same thread; depth 0 is the
 # outermost move, which owns the per-move printer-state probe cache (L3 fix A).
 _smart_move_depth = threading.local()
 
 
+def _record_move_source(undo_record, sid, spool_data):
+    """Note where `sid` is moving from (undo) and how to name it (logs).
+    Returns (current_loc, current_extra, display info)."""
+    current_loc = spool_data.get('location', '').strip().upper()
+    undo_record['moves'][sid] = current_loc
+    current_extra: dict = dict(spool_data.get('extra') or {})
+    info = spoolman_api.format_spool_display(spool_data)
+    # Capture the rich display label now (already computed for the forward-
+    # move log) so the Undo line can name the spool + source, not just a
+    # count — see perform_undo's readable from→to rendering.
+    undo_record['labels'][sid] = info['text']
+    return current_loc, current_extra, info
+
+
+def _plan_spool_move(target, target_slot, current_loc, current_extra,
+                     printer_map, loc_info_map, loc_list, is_toolhead):
+    """The Spoolman write that lands one spool on `target`.
+
+    Returns (kind, data): kind is "printer" / "dryer" / "generic" (picks the
+    log line, see _report_spool_move) and data the update_spool payload —
+    the spool's whole extra dict with container_slot and the ghost trail
+    (physical_source / physical_source_slot) set for the destination.
+    Reads nothing from Spoolman, so the serial loop and the bulk path plan
+    identical writes."""
+    new_extra: typing.Dict[str, typing.Any] = dict(current_extra)
+    # If moving to a non-slotted location, clear the slot
+    new_extra['container_slot'] = str(target_slot) if target_slot else ""
+
+    # PRINTER MOVE
+    if target in printer_map:
+        # Preserve ghost trail when the spool is already deployed to
+        # this exact toolhead. Without this guard, re-scanning a spool
+        # that's already on the toolhead would set physical_source to
+        # the toolhead itself — physical_source == location means "not
+        # a ghost," so the deployed indicator disappears and Return-
+        # to-Slot loses its home. Only overwrite physical_source when
+        # the spool is genuinely arriving from somewhere else.
+        existing_source = str(current_extra.get('physical_source', '') or '').strip().strip('"')
+        is_already_here = (current_loc == target) and bool(existing_source)
+        if is_already_here:
+            new_extra['physical_source'] = existing_source
+            new_extra['physical_source_slot'] = current_extra.get('physical_source_slot')
+        else:
+            new_extra['physical_source'] = current_loc
+            new_extra['physical_source_slot'] = current_extra.get('container_slot')
+
+        # 13.6 Part A — if the destination toolhead is the value of some
+        # dryer-box slot's `extra.slot_targets`, treat the spool as if
+        # it came from that slot so the box card lists it as a ghost in
+        # the bound slot (mirrors the slot→toolhead auto-deploy chain's
+        # forward direction). Only kicks in when there's no genuine
+        # source already (UNASSIGNED, buffer, room, etc.) — preserving
+        # the existing physical_source when the spool actually came
+        # from somewhere meaningful.
+        current_source_meaningful = bool(
+            str(new_extra.get('physical_source') or '').strip().strip('"')
+        )
+        if not current_source_meaningful:
+            bound_box, bound_slot = _find_box_slot_feeding_toolhead(target, loc_list)
+            if bound_box and bound_slot:
+                new_extra['physical_source'] = bound_box
+                new_extra['physical_source_slot'] = bound_slot
+                state.logger.info(
+                    f"🔗 Reverse-binding: toolhead {target} is fed by "
+                    f"{bound_box} slot {bound_slot} — synthesizing ghost source."
+                )
+        return "printer", {"location": target, "extra": new_extra}
+
+    # DRYER MOVE
+    if target in loc_info_map and loc_info_map[target].get('Type') == 'Dryer Box':
+        new_extra.pop('physical_source', None)
+        # [ALEX FIX] Clean up the source slot memory too, since we are home now.
+        new_extra.pop('physical_source_slot', None)
+        return "dryer", {"location": target, "extra": new_extra}
+
+    # GENERIC MOVE
+    # [Universal Fallback Ghost Logic]
+    if is_toolhead:
+        new_extra['physical_source'] = current_loc
+        new_extra['physical_source_slot'] = current_extra.get('container_slot')
+    else:
+        # L130 fix: when forcing a spool to a Room/Cart/Shelf
+        # (the typical Force-Location destinations), clear any
+        # stale ghost trail so the "deployed" indicator computed
+        # from physical_source (spoolman_api.search_inventory)
+        # doesn't keep flagging the spool as still on a toolhead.
+        # Mirrors the DRYER MOVE branch's pop() above.
+        new_extra.pop('physical_source', None)
+        new_extra.pop('physical_source_slot', None)
+    return "generic", {"location": target, "extra": new_extra}
+
+
+def _report_spool_move(kind, err, sid, info, target, target_slot, current_loc):
+    """Activity-log one spool's move (`err` None = the write landed, else the
+    Spoolman rejection) plus the printer move's box auto-attach."""
+    if kind == "printer":
+        if err is None:
+            state.add_log_entry(f"🖨️ {info['text']} -> {target}", "INFO", info['color'])
+            # Group 20.2: a spool deployed FROM a single-slot dryer box
+            # attaches that box to this toolhead so the box follows its
+            # spool (Core One "missing box" aid). current_loc is where the
+            # spool lived before this move. Best-effort — never fail the move.
+            try:
+                _att, _ad = locations_db.attach_single_slot_box_to_toolhead(current_loc, target)
+                if _att and _ad != "already attached":
+                    state.add_log_entry(f"🔗 Single-slot box auto-attached → {target} ({_ad})", "INFO")
+            except Exception as _ae:
+                state.logger.warning(f"20.2 box auto-attach skipped: {_ae}")
+        else:
+            # Surface Spoolman rejection so slot-assignment failures are
+            # visible. Pre-fix, Spoolman 400s here left the slot stuck
+            # with no user-visible signal — a class of bug behind the
+            # 2026-04-27 outage (Item 2 in Feature-Buglist).
+            state.add_log_entry(
+                f"❌ Failed to slot Spool #{sid} -> {target}: {err}", "ERROR", "ff4444"
+            )
+    elif kind == "dryer":
+        if err is None:
+            slot_txt = f" [Slot {target_slot}]" if target_slot else ""
+            state.add_log_entry(f"📦 {info['text']} -> Dryer {target}{slot_txt}", "INFO", info['color'])
+        else:
+            state.add_log_entry(
+                f"❌ Failed to move Spool #{sid} -> Dryer {target}: {err}", "ERROR", "ff4444"
+            )
+    else:
+        if err is None:
+            state.add_log_entry(f"🚚 {info['text']} -> {target}", "INFO", info['color'])
+        else:
+            state.add_log_entry(
+                f"❌ Failed to move Spool #{sid} -> {target}: {err}", "ERROR", "ff4444"
+            )
+
+
+def _perform_serial_move_writes(spools, target, target_slot, printer_map, loc_info_map,
+                                loc_list, is_toolhead, undo_record):
+    """Move `spools` one at a time: read, unseat whoever holds `target_slot`,
+    write, log. Each write sees the previous one (a shared slot unseats the
+    spool placed before it), which is why slotted moves stay here."""
+    for sid in spools:
+        spool_data = spoolman_api.get_spool(sid)
+        if not spool_data: continue
+        current_loc, current_extra, info = _record_move_source(undo_record, sid, spool_data)
+
+        # Handle Slot Assignment
+        if target_slot:
+            existing_items = spoolman_api.get_spools_at_location_detailed(target)
+            for existing in existing_items:
+                # [ALEX FIX] Improved comparison to catch string vs int mismatches
+                if str(existing.get('slot', '')).strip('"') == str(target_slot) and existing['id'] != int(sid):
+                    state.logger.info(f"🪑 Unseating Spool {existing['id']} from Slot {target_slot}")
+                    # Load the existing spool's full extra and MERGE — Spoolman's
+                    # PATCH replaces the entire `extra` object, so passing only
+                    # {container_slot: ''} would wipe physical_source, spool_type,
+                    # temps, etc. Read → clear just the slot → write whole extra.
+                    _existing_full = spoolman_api.get_spool(existing['id']) or {}
+                    _merged_extra = dict(_existing_full.get('extra') or {})
+                    _merged_extra['container_slot'] = ''
+                    if not spoolman_api.update_spool(existing['id'], {'extra': _merged_extra}):
+                        err = spoolman_api.LAST_SPOOLMAN_ERROR or "unknown error"
+                        state.add_log_entry(
+                            f"❌ Failed to unseat Spool #{existing['id']} from slot: {err}",
+                            "ERROR", "ff4444"
+                        )
+
+        kind, data = _plan_spool_move(target, target_slot, current_loc, current_extra,
+                                      printer_map, loc_info_map, loc_list, is_toolhead)
+        if spoolman_api.update_spool(sid, data):
+            err = None
+        else:
+            err = spoolman_api.LAST_SPOOLMAN_ERROR or "unknown error"
+        _report_spool_move(kind, err, sid, info, target, target_slot, current_loc)
+
+
+def _perform_bulk_move_writes(spools, target, printer_map, loc_info_map, loc_list,
+                              is_toolhead, undo_record):
+    """Slotless move of many spools at once.
+
+    The serial path pays a GET per spool to read it plus update_spool's own
+    reads, one spool after another — a 20-spool shelf was a long chain of
+    round-trips. Here every spool's record comes from ONE spool-list read
+    (get_raw_spools_by_ids, which drops the cached list first: these records
+    are written back without another GET), every write is planned up front
+    (_plan_spool_move, the serial path's own planner), and the PATCHes run
+    on spoolman_api.update_spools' bounded pool against those records. The
+    logs and box auto-attaches then follow in input order. Without a shared
+    slot no write depends on another, so the end state is the serial one;
+    a spool listed twice is moved once.
+
+    Only the incoming spools' own PATCHes are batched. Their filabridge and
+    box side effects (_report_spool_move) follow one spool at a time, and a
+    single-occupancy target's resident eject still runs first, spool by
+    spool, through perform_smart_eject (it unmaps filabridge and detaches
+    boxes, and the incoming map depends on it having finished). The
+    auto-deploy chain never follows a bulk move: it needs a Dryer Box slot,
+    and a slotted move takes the serial path."""
+    order, seen = [], set()
+    for sid in spools:
+        if str(sid) not in seen:
+            seen.add(str(sid))
+            order.append(sid)
+    records = spoolman_api.get_raw_spools_by_ids(order)
+    planned = []
+    for sid in order:
+        raw = records.get(str(sid))
+        if not raw:
+            continue
+        spool_data = spoolman_api.parse_inbound_data(copy.deepcopy(raw))
+        current_loc, current_extra, info = _record_move_source(undo_record, sid, spool_data)
+        kind, data = _plan_spool_move(target, None, current_loc, current_extra,
+                                      printer_map, loc_info_map, loc_list, is_toolhead)
+        planned.append((sid, kind, data, raw, info, current_loc))
+    results = spoolman_api.update_spools(
+        [(sid, data, raw) for sid, _kind, data, raw, _info, _loc in planned],
+        label=f"smart move -> {target}",
+    )
+    for (sid, kind, _data, _raw, info, current_loc), res in zip(planned, results):
+        _report_spool_move(kind, None if res["ok"] else res["msg"], sid, info, target, None, current_loc)
+
+
 def perform_smart_move(target, raw_spools, target_slot=None, origin='', auto_deploy=True, confirm_active_print=False):
     """Entry point for the slot-move pipeline.
 
@@ -340,6 +565,12 @@ def perform_smart_move(target, raw_spools, target_slot=None, origin='', auto_dep
     detects the OUTERMOST call and begins/clears the cache around it, while the
     recursive re-entry (depth > 0) leaves the outer cache untouched. All real
     work lives in _perform_smart_move_impl — this is a behaviour-neutral wrapper.
+
+    The outermost call also opens a spoolman_api.raw_spool_reads() scope: each
+    spool the move reads with get_spool is handed to its update_spool, which
+    then PATCHes without re-reading it (one GET + one PATCH per write instead
+    of three round-trips). Every spool write in the pipeline goes through
+    update_spool, which keeps the scope current.
     """
     depth = getattr(_smart_move_depth, "n", 0)
     owns_move = depth == 0
@@ -354,11 +585,18 @@ def perform_smart_move(target, raw_spools, target_slot=None, origin='', auto_dep
         except Exception:
             _pa = None
     try:
-        return _perform_smart_move_impl(
-            target, raw_spools, target_slot=target_slot, origin=origin,
-            auto_deploy=auto_deploy,
-            confirm_active_print=confirm_active_print,
-        )
+        if not owns_move:
+            return _perform_smart_move_impl(
+                target, raw_spools, target_slot=target_slot, origin=origin,
+                auto_deploy=auto_deploy,
+                confirm_active_print=confirm_active_print,
+            )
+        with spoolman_api.raw_spool_reads():
+            return _perform_smart_move_impl(
+                target, raw_spools, target_slot=target_slot, origin=origin,
+                auto_deploy=auto_deploy,
+                confirm_active_print=confirm_active_print,
+            )
     finally:
         _smart_move_depth.n = getattr(_smart_move_depth, "n", 1) - 1
         if owns_move and _pa is not None:
@@ -497,146 +735,15 @@ def _perform_smart_move_impl(target, raw_spools, target_slot=None, origin='', au
                     if ejected_data:
                         undo_record['ejections'][rid] = ejected_data.get('location', '')
 
-    for sid in spools:
-        spool_data = spoolman_api.get_spool(sid)
-        if not spool_data: continue
-        current_loc = spool_data.get('location', '').strip().upper()
-        undo_record['moves'][sid] = current_loc
-        current_extra: dict = dict(spool_data.get('extra') or {})
-        info = spoolman_api.format_spool_display(spool_data)
-        # Capture the rich display label now (already computed for the forward-
-        # move log) so the Undo line can name the spool + source, not just a
-        # count — see perform_undo's readable from→to rendering.
-        undo_record['labels'][sid] = info['text']
-        
-        new_extra: typing.Dict[str, typing.Any] = dict(current_extra)
-        
-# Handle Slot Assignment
-        if target_slot:
-            existing_items = spoolman_api.get_spools_at_location_detailed(target)
-            for existing in existing_items:
-                # [ALEX FIX] Improved comparison to catch string vs int mismatches
-                if str(existing.get('slot', '')).strip('"') == str(target_slot) and existing['id'] != int(sid):
-                    state.logger.info(f"🪑 Unseating Spool {existing['id']} from Slot {target_slot}")
-                    # Load the existing spool's full extra and MERGE — Spoolman's
-                    # PATCH replaces the entire `extra` object, so passing only
-                    # {container_slot: ''} would wipe physical_source, spool_type,
-                    # temps, etc. Read → clear just the slot → write whole extra.
-                    _existing_full = spoolman_api.get_spool(existing['id']) or {}
-                    _merged_extra = dict(_existing_full.get('extra') or {})
-                    _merged_extra['container_slot'] = ''
-                    if not spoolman_api.update_spool(existing['id'], {'extra': _merged_extra}):
-                        err = spoolman_api.LAST_SPOOLMAN_ERROR or "unknown error"
-                        state.add_log_entry(
-                            f"❌ Failed to unseat Spool #{existing['id']} from slot: {err}",
-                            "ERROR", "ff4444"
-                        )
-
-            new_extra['container_slot'] = str(target_slot)
-        else:
-            # If moving to a non-slotted location, clear the slot
-            new_extra['container_slot'] = ""
-
-        # PRINTER MOVE
-        if target in printer_map:
-            # Preserve ghost trail when the spool is already deployed to
-            # this exact toolhead. Without this guard, re-scanning a spool
-            # that's already on the toolhead would set physical_source to
-            # the toolhead itself — physical_source == location means "not
-            # a ghost," so the deployed indicator disappears and Return-
-            # to-Slot loses its home. Only overwrite physical_source when
-            # the spool is genuinely arriving from somewhere else.
-            existing_source = str(current_extra.get('physical_source', '') or '').strip().strip('"')
-            is_already_here = (current_loc == target) and bool(existing_source)
-            if is_already_here:
-                new_extra['physical_source'] = existing_source
-                new_extra['physical_source_slot'] = current_extra.get('physical_source_slot')
-            else:
-                new_extra['physical_source'] = current_loc
-                new_extra['physical_source_slot'] = current_extra.get('container_slot')
-
-            # 13.6 Part A — if the destination toolhead is the value of some
-            # dryer-box slot's `extra.slot_targets`, treat the spool as if
-            # it came from that slot so the box card lists it as a ghost in
-            # the bound slot (mirrors the slot→toolhead auto-deploy chain's
-            # forward direction). Only kicks in when there's no genuine
-            # source already (UNASSIGNED, buffer, room, etc.) — preserving
-            # the existing physical_source when the spool actually came
-            # from somewhere meaningful.
-            current_source_meaningful = bool(
-                str(new_extra.get('physical_source') or '').strip().strip('"')
-            )
-            if not current_source_meaningful:
-                bound_box, bound_slot = _find_box_slot_feeding_toolhead(target, loc_list)
-                if bound_box and bound_slot:
-                    new_extra['physical_source'] = bound_box
-                    new_extra['physical_source_slot'] = bound_slot
-                    state.logger.info(
-                        f"🔗 Reverse-binding: toolhead {target} is fed by "
-                        f"{bound_box} slot {bound_slot} — synthesizing ghost source."
-                    )
-
-            if spoolman_api.update_spool(sid, {"location": target, "extra": new_extra}):
-                state.add_log_entry(f"🖨️ {info['text']} -> {target}", "INFO", info['color'])
-                # Group 20.2: a spool deployed FROM a single-slot dryer box
-                # attaches that box to this toolhead so the box follows its
-                # spool (Core One "missing box" aid). current_loc is where the
-                # spool lived before this move. Best-effort — never fail the move.
-                try:
-                    _att, _ad = locations_db.attach_single_slot_box_to_toolhead(current_loc, target)
-                    if _att and _ad != "already attached":
-                        state.add_log_entry(f"🔗 Single-slot box auto-attached → {target} ({_ad})", "INFO")
-                except Exception as _ae:
-                    state.logger.warning(f"20.2 box auto-attach skipped: {_ae}")
-            else:
-                # Surface Spoolman rejection so slot-assignment failures are
-                # visible. Pre-fix, Spoolman 400s here left the slot stuck
-                # with no user-visible signal — a class of bug behind the
-                # 2026-04-27 outage (Item 2 in Feature-Buglist).
-                err = spoolman_api.LAST_SPOOLMAN_ERROR or "unknown error"
-                state.add_log_entry(
-                    f"❌ Failed to slot Spool #{sid} -> {target}: {err}", "ERROR", "ff4444"
-                )
-
-        # DRYER MOVE
-        elif target in loc_info_map and loc_info_map[target].get('Type') == 'Dryer Box':
-            new_extra.pop('physical_source', None)
-            # [ALEX FIX] Clean up the source slot memory too, since we are home now.
-            new_extra.pop('physical_source_slot', None)
-
-            if spoolman_api.update_spool(sid, {"location": target, "extra": new_extra}):
-                slot_txt = f" [Slot {target_slot}]" if target_slot else ""
-                state.add_log_entry(f"📦 {info['text']} -> Dryer {target}{slot_txt}", "INFO", info['color'])
-            else:
-                err = spoolman_api.LAST_SPOOLMAN_ERROR or "unknown error"
-                state.add_log_entry(
-                    f"❌ Failed to move Spool #{sid} -> Dryer {target}: {err}", "ERROR", "ff4444"
-                )
-
-        # GENERIC MOVE
-        else:
-            # [Universal Fallback Ghost Logic]
-            if is_toolhead:
-                 new_extra['physical_source'] = current_loc
-                 new_extra['physical_source_slot'] = current_extra.get('container_slot')
-            else:
-                # L130 fix: when forcing a spool to a Room/Cart/Shelf
-                # (the typical Force-Location destinations), clear any
-                # stale ghost trail so the "deployed" indicator computed
-                # from physical_source (spoolman_api.search_inventory)
-                # doesn't keep flagging the spool as still on a toolhead.
-                # Mirrors the DRYER MOVE branch's pop() above.
-                new_extra.pop('physical_source', None)
-                new_extra.pop('physical_source_slot', None)
-
-            if spoolman_api.update_spool(sid, {"location": target, "extra": new_extra}):
-                state.add_log_entry(f"🚚 {info['text']} -> {target}", "INFO", info['color'])
-            else:
-                err = spoolman_api.LAST_SPOOLMAN_ERROR or "unknown error"
-                state.add_log_entry(
-                    f"❌ Failed to move Spool #{sid} -> {target}: {err}", "ERROR", "ff4444"
-                )
-
+    # A slotless move of many spools (a whole shelf / bin) plans every write
+    # from one snapshot and runs them at once; everything else goes spool by
+    # spool. Both land the same writes (_plan_spool_move).
+    if len(spools) > BULK_MOVE_THRESHOLD and not target_slot:
+        _perform_bulk_move_writes(spools, target, printer_map, loc_info_map,
+                                  loc_list, is_toolhead, undo_record)
+    else:
+        _perform_serial_move_writes(spools, target, target_slot, printer_map,
+                                    loc_info_map, loc_list, is_toolhead, undo_record)
     state.UNDO_STACK.append(undo_record)
 
     # --- AUTO-DEPLOY CHAIN ---
@@ -1027,11 +1134,13 @@ def perform_undo():
     
     # Reassign each moved spool back to its origin location in Spoolman.
     for sid, loc in moves.items():
-        requests.patch(f"{sm_url}/api/v1/spool/{sid}", json={"location": loc})
+        spoolman_http.patch(f"{sm_url}/api/v1/spool/{sid}", json={"location": loc})
     # [ALEX FIX] Revert Smart Ejections
     ejections = last.get('ejections', {})
     for ejected_sid, original_loc in ejections.items():
-        requests.patch(f"{sm_url}/api/v1/spool/{ejected_sid}", json={"location": original_loc})
+        spoolman_http.patch(f"{sm_url}/api/v1/spool/{ejected_sid}", json={"location": original_loc})
+    # Raw PATCHes above bypass update_spool's snapshot write-through.
+    spoolman_api.invalidate_snapshots()
             
             
     # [ALEX FIX] Restore to Buffer Memory
@@ -1201,11 +1310,18 @@ def get_live_spools_data(spool_ids):
     Rapidly queries Spoolman for a specific list of Spool IDs and returns 
     their formatted display strings and colors.
     Used by the frontend to live-refresh the Dashboard Buffer and Location Manager UI.
+    The whole id set is resolved in one batch (spoolman_api.get_spools_by_ids)
+    rather than one Spoolman round-trip per id.
     """
+    try:
+        spools = spoolman_api.get_spools_by_ids(spool_ids)
+    except Exception as e:
+        state.logger.error(f"Failed to live-refresh spools {spool_ids}: {e}")
+        return {}
     results = {}
     for sid in spool_ids:
         try:
-            spool_data = spoolman_api.get_spool(sid)
+            spool_data = spools.get(str(sid))
             if spool_data:
                 info = spoolman_api.format_spool_display(spool_data)
                 
@@ -23,7 +23,7 @@ commit) so intra-module calls see the patches.
 Python 3.9 runtime (the container image) — keep syntax 3.9-safe.
 """
 from flask import request, jsonify  # type: ignore
-import requests  # type: ignore
+import spoolman_http  # type: ignore
 import time
 
 import state  # type: ignore
@@ -90,7 +90,7 @@ def api_get_multi_spool_filaments():
     sm_url, _ = config_loader.get_api_urls()
     try:
         # 1. Get ALL active spools
-        resp = requests.get(f"{sm_url}/api/v1/spool", timeout=10)
+        resp = spoolman_http.get(f"{sm_url}/api/v1/spool", timeout=10)
         if not resp.ok: return jsonify([])
         all_spools = resp.json()
         
@@ -165,7 +165,7 @@ def api_get_spools_by_filament():
         sm_req_url = f"{sm_url}/api/v1/spool?filament_id={fid}"
         if allow_archived:
             sm_req_url += "&allow_archived=true"
-        resp = requests.get(sm_req_url, timeout=5)
+        resp = spoolman_http.get(sm_req_url, timeout=5)
         if resp.ok:
             if allow_archived:
                 spools = resp.json()
@@ -208,7 +208,7 @@ def api_backfill_spool_weights(fid):
             }), 400
 
         sm_url, _ = config_loader.get_api_urls()
-        resp = requests.get(f"{sm_url}/api/v1/spool?filament_id={fid}&allow_archived=true", timeout=5)
+        resp = spoolman_http.get(f"{sm_url}/api/v1/spool?filament_id={fid}&allow_archived=true", timeout=5)
         if not resp.ok:
             return jsonify({"success": False, "msg": "Failed to fetch spools from Spoolman."}), 502
         spools = resp.json() or []
@@ -577,9 +577,15 @@ def _compute_cancel_usage(printer_name, filename, job_id, reached_fraction,
     whole fleet) and remaps the progress fraction from compressed-file space to
     the decoded text, so the prefix-parse runs correctly on real prints. The
     decoded text also carries the footer, so use_footer reads it from the same
-    download."""
-    prepared = prusalink_api.fetch_cancel_gcode(
-        ip_address, api_key, filename, reached_fraction)
+    download. The fetch runs in a begin_file_job scope, so the file is cached on
+    disk under this job: a deferred-fetch retry or the completion's follow-up
+    swap split reuses it instead of downloading + decoding it again."""
+    prusalink_api.begin_file_job(job_id)
+    try:
+        prepared = prusalink_api.fetch_cancel_gcode(
+            ip_address, api_key, filename, reached_fraction)
+    finally:
+        prusalink_api.clear_file_job()
     if not prepared or not prepared.get("gcode"):
         # Download failed. The dominant cause is NOT a permanent error: PrusaLink
         # 404s the raw-file download while the file is the SELECTED/active print
@@ -1018,9 +1024,13 @@ def _route_completion_to_review(printer_name, filename, job_id, usage_map, fb_ur
     # sid, so there's no confirm-side change either way.
     split_rows = None
     if swap_log and ip_address and api_key:
-        split = _compute_swap_split(
-            ip_address, api_key, filename, usage_map, swap_log,
-            start_spools, path_filament_g=_path_filament_g(printer_name))
+        prusalink_api.begin_file_job(job_id)   # reuse the footer deduct's cached file
+        try:
+            split = _compute_swap_split(
+                ip_address, api_key, filename, usage_map, swap_log,
+                start_spools, path_filament_g=_path_filament_g(printer_name))
+        finally:
+            prusalink_api.clear_file_job()
         if split:
             split_rows = _split_to_review_rows(split)
     auto_split = bool(split_rows)
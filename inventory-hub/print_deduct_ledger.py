@@ -16,21 +16,33 @@ Contract (mirrors the design):
     from the in-memory edge and accepts the tiny restart-window risk rather
     than skipping the cancel entirely.
 
-The file is bounded to the most-recent N entries (dict preserves insertion
-order on 3.7+), dropping the oldest head entries once it exceeds the cap.
+Rows live in hub_store's ``deduct_ledger`` table (SQLite, WAL): a check is
+one index seek instead of a re-read of the whole file, a record is one row
+instead of a rewrite of it, and history is no longer capped at the newest 200
+— rows age out after ``deduct_ledger_retention_days`` (config, default 365;
+0 keeps them forever), far past any print a restart could re-detect. The
+pre-SQLite ``data/print_deduct_ledger.json`` is imported once on first use.
 """
 from __future__ import annotations
 
-import json
 import os
+import sqlite3
 import threading
+import time
 
-import atomic_store
+import config_loader  # type: ignore
+import hub_store
 
-# Overridable by tests (monkeypatch this attribute to a tmp path).
+# The pre-SQLite ledger file, imported into hub_store once. Overridable by
+# tests (monkeypatch this attribute to a tmp path).
 _LEDGER_PATH = os.path.join(os.path.dirname(__file__), "data", "print_deduct_ledger.json")
+_TABLE = "deduct_ledger"
+
+_PRUNE_EVERY_S = 3600.0
+
+# Guards _LAST_PRUNE.
 _LOCK = threading.Lock()
-_MAX_ENTRIES = 200
+_LAST_PRUNE = 0.0
 
 
 def _key(printer_name, job_id) -> str:
@@ -41,24 +53,52 @@ def _is_blank_job(job_id) -> bool:
     return job_id in (None, "", "0", 0)
 
 
-def _load() -> dict:
+def _import_legacy(data: dict) -> int:
+    """{"printer::job": {"job_id", **meta}} → rows, in file order. The file
+    never timestamped its entries; each row is dated by the file's last
+    write — no entry is newer than that, so retention counts from at most
+    that moment rather than restarting at the import."""
     try:
-        with open(_LEDGER_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data if isinstance(data, dict) else {}
-    except (FileNotFoundError, json.JSONDecodeError, OSError, ValueError):
-        return {}
+        written = os.path.getmtime(_LEDGER_PATH)
+    except OSError:
+        written = None
+    count = 0
+    for key, meta in data.items():
+        if not isinstance(meta, dict):
+            continue
+        job_id = str(meta.get("job_id", "")).strip()
+        printer = key[:-len(job_id) - 2] if job_id and key.endswith("::" + job_id) else key.split("::", 1)[0]
+        hub_store.put(_TABLE, printer, job_id or key.split("::", 1)[-1], meta,
+                      only_new=True, created_at=written)
+        count += 1
+    return count
+
+
+def _ready() -> None:
+    hub_store.import_legacy_json("print_deduct_ledger", _LEDGER_PATH, _import_legacy)
+
+
+def _load() -> dict:
+    """The whole ledger as the old file's ``{"printer::job": meta}`` view
+    (oldest first) — for tests and debugging; the API reads by key."""
+    _ready()
+    return {_key(p, j): meta for p, j, _at, meta in hub_store.records(_TABLE)}
+
 
+def _retention_days() -> float:
+    return config_loader.get_clamped("deduct_ledger_retention_days", 0.0, 36500.0)
 
-def _save(data: dict) -> None:
-    if len(data) > _MAX_ENTRIES:
-        data = dict(list(data.items())[-_MAX_ENTRIES:])
-    os.makedirs(os.path.dirname(_LEDGER_PATH), exist_ok=True)
-    tmp = _LEDGER_PATH + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-    # 32.1 — retry on the Windows host↔container bind-mount sharing collision.
-    atomic_store.replace_with_retry(tmp, _LEDGER_PATH)
+
+def _maybe_prune() -> None:
+    """Apply the retention policy, at most once an hour."""
+    global _LAST_PRUNE
+    days = _retention_days()
+    now = time.time()
+    with _LOCK:
+        if days <= 0 or now - _LAST_PRUNE < _PRUNE_EVERY_S:
+            return
+        _LAST_PRUNE = now
+    hub_store.prune(_TABLE, now - days * 86400)
 
 
 def was_deducted(printer_name, job_id) -> bool:
@@ -66,15 +106,34 @@ def was_deducted(printer_name, job_id) -> bool:
     blank/zero job_id always returns False (can't dedup an id-less job)."""
     if _is_blank_job(job_id):
         return False
-    with _LOCK:
-        return _key(printer_name, job_id) in _load()
+    try:
+        _ready()
+        return hub_store.exists(_TABLE, printer_name, job_id)
+    except sqlite3.Error as e:
+        # An unreadable ledger answers "not deducted", as the JSON file did:
+        # the in-memory tracker still stops a same-process double-fire.
+        hub_store.log_error("print_deduct_ledger", e)
+        return False
 
 
 def record_deduct(printer_name, job_id, **meta) -> None:
     """Mark (printer, job) as deducted. No-op for a blank/zero job_id."""
     if _is_blank_job(job_id):
         return
-    with _LOCK:
-        data = _load()
-        data[_key(printer_name, job_id)] = {"job_id": str(job_id), **meta}
-        _save(data)
+    _ready()
+    hub_store.put(_TABLE, printer_name, job_id, {"job_id": str(job_id), **meta})
+    _maybe_prune()
+
+
+def list_deducts(printer_name=None, since=None, limit=None) -> list:
+    """Ledger entries, oldest first, optionally for one printer and/or
+    recorded at or after ``since`` (epoch s); ``limit`` keeps the newest N.
+    Each is the recorded meta plus ``printer_name`` and ``recorded_at``
+    (empty when the database can't be read)."""
+    try:
+        _ready()
+        rows = hub_store.records(_TABLE, printer_name, since=since, limit=limit)
+    except sqlite3.Error as e:
+        hub_store.log_error("print_deduct_ledger", e)
+        return []
+    return [dict(meta, printer_name=p, recorded_at=at) for p, _j, at, meta in rows]
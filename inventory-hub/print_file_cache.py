@@ -0,0 +1,300 @@
+"""Content-addressed on-disk cache of print files fetched from PrusaLink.
+
+Why this exists: the cancel / completion / swap-split deducts each download the
+WHOLE print file from the printer (a 60 s-timeout GET of up to tens of MB on an
+XL .bgcode) and decode it, and one print can take that path several times — a
+completion computes its footer deduct and then its runout split from two
+separate fetches, and the deferred-fetch retry
+(print_monitor._process_pending_cancel_fetches) re-runs the compute for the
+same job every tick until it settles. Each of those was a fresh download and a
+fresh heatshrink/MeatPack decode of bytes we already had.
+
+Layout (``data/print_file_cache/``):
+
+- ``<sha256>.raw``   the file exactly as PrusaLink served it
+- ``<sha256>.gcode`` its decoded G-code text (binary G-code only — a plain
+  .gcode file IS its text)
+- ``<sha256>.json``  per-file metadata derived from it: the decode's block /
+  M73 tables (``decode``) and the footer usage — filled in by prusalink_api
+  as each is first computed
+- ``index.json``     ``{"keys": {key: sha}, "blobs": {sha: {"bytes", "used"}}}``
+
+A key is ``(printer address, filename, job_id)``. PrusaLink job ids identify
+one print on one printer, so a re-sliced file re-uploaded under the same name
+is a new job and never served the old bytes; calls without a job id bypass the
+cache entirely. The bytes themselves are stored under their SHA-256, so a
+reprint of the same file (new job id → one new download) lands on the blob,
+decode and metadata already on disk.
+
+Eviction is LRU by blob: every hit bumps ``used`` — in memory; the index on
+disk catches up with the next store / metadata write (which is when eviction
+runs) or, on a read-only stretch, at most every ``_USE_FLUSH_S``, so a cache
+hit costs no disk write. A store / metadata write that takes the total past ``print_file_cache_mb`` (config; 0 disables the
+cache) drops least-recently-used blobs — and the keys pointing at them — until
+it fits. The blob just written is never the one evicted; a single file larger
+than the whole budget is simply not cached.
+
+Python 3.9 runtime (the container image) — keep syntax 3.9-safe.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+
+import atomic_store
+import config_loader  # type: ignore
+import state  # type: ignore
+
+# Overridable by tests (monkeypatch this attribute to a tmp dir).
+_CACHE_DIR = os.path.join(os.path.dirname(__file__), "data", "print_file_cache")
+_INDEX_NAME = "index.json"
+_LOCK = threading.RLock()
+
+# Cache hits not yet written to the index: (cache dir, sha) -> last use.
+# Folded into the index by every save (_account) so eviction sees them.
+_PENDING_USES = {}
+# Seconds between index writes made only to record hits.
+_USE_FLUSH_S = 300.0
+_LAST_USE_FLUSH = 0.0
+
+_STATS = {
+    "hits": 0,
+    "misses": 0,
+    "stores": 0,
+    "decoded_hits": 0,
+    "decoded_stores": 0,
+    "evictions": 0,
+}
+
+
+def _key(ip_address, filename, job_id) -> str:
+    return f"{str(ip_address).strip()}::{str(filename).lstrip('/')}::{str(job_id).strip()}"
+
+
+def _path(name: str) -> str:
+    return os.path.join(_CACHE_DIR, name)
+
+
+def _max_bytes() -> int:
+    return int(config_loader.get_clamped("print_file_cache_mb", 0.0, 65536.0) * (1 << 20))
+
+
+def _load_index() -> dict:
+    try:
+        with open(_path(_INDEX_NAME), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and isinstance(data.get("keys"), dict) \
+                and isinstance(data.get("blobs"), dict):
+            return data
+    except (FileNotFoundError, json.JSONDecodeError, OSError, ValueError):
+        pass
+    return {"keys": {}, "blobs": {}}
+
+
+def _write_file(name: str, data: bytes) -> None:
+    os.makedirs(_CACHE_DIR, exist_ok=True)
+    tmp = _path(name) + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    # 32.1 — retry on the Windows host↔container bind-mount sharing collision.
+    atomic_store.replace_with_retry(tmp, _path(name))
+
+
+def _save_index(index: dict) -> None:
+    _write_file(_INDEX_NAME, json.dumps(index, indent=2).encode("utf-8"))
+
+
+def _blob_files(sha: str):
+    return (sha + ".raw", sha + ".gcode", sha + ".json")
+
+
+def _blob_size(sha: str) -> int:
+    size = 0
+    for name in _blob_files(sha):
+        try:
+            size += os.path.getsize(_path(name))
+        except OSError:
+            pass
+    return size
+
+
+def _drop_blob(index: dict, sha: str) -> None:
+    for name in _blob_files(sha):
+        try:
+            os.remove(_path(name))
+        except OSError:
+            pass
+    index["blobs"].pop(sha, None)
+    index["keys"] = {k: v for k, v in index["keys"].items() if v != sha}
+
+
+def _fold_uses(index: dict) -> None:
+    """Write the pending hits for this cache dir into ``index``. Caller holds
+    _LOCK and saves the index."""
+    global _LAST_USE_FLUSH
+    for (cache_dir, sha), used in list(_PENDING_USES.items()):
+        if cache_dir != _CACHE_DIR:
+            continue
+        blob = index["blobs"].get(sha)
+        if blob is not None and used > (blob.get("used") or 0):
+            blob["used"] = used
+        del _PENDING_USES[(cache_dir, sha)]
+    _LAST_USE_FLUSH = time.monotonic()
+
+
+def _account(index: dict, sha: str) -> None:
+    """Re-measure ``sha``, mark it just used and evict down to the budget.
+    Caller holds _LOCK and saves the index."""
+    _fold_uses(index)
+    index["blobs"][sha] = {"bytes": _blob_size(sha), "used": time.time()}
+    limit = _max_bytes()
+    total = sum(int(b.get("bytes") or 0) for b in index["blobs"].values())
+    for old in sorted(index["blobs"], key=lambda s: index["blobs"][s].get("used") or 0):
+        if total <= limit:
+            break
+        if old == sha:
+            continue
+        total -= int(index["blobs"][old].get("bytes") or 0)
+        _drop_blob(index, old)
+        _STATS["evictions"] += 1
+
+
+def _known(index: dict, sha) -> bool:
+    return bool(sha) and sha in index["blobs"] and os.path.exists(_path(sha + ".raw"))
+
+
+def lookup(ip_address, filename, job_id):
+    """The cached file's sha for this print job, or None (miss, no job id, or
+    the cache is off). A hit counts as a use for LRU."""
+    if job_id in (None, "") or _max_bytes() <= 0:
+        return None
+    with _LOCK:
+        index = _load_index()
+        sha = index["keys"].get(_key(ip_address, filename, job_id))
+        if not _known(index, sha):
+            _STATS["misses"] += 1
+            return None
+        _PENDING_USES[(_CACHE_DIR, sha)] = time.time()
+        if time.monotonic() - _LAST_USE_FLUSH >= _USE_FLUSH_S:
+            _fold_uses(index)
+            try:
+                _save_index(index)
+            except OSError:
+                pass  # the LRU order is only advisory
+        _STATS["hits"] += 1
+        return sha
+
+
+def store(ip_address, filename, job_id, raw: bytes):
+    """Cache a freshly downloaded file for this job. Returns its sha, or None
+    when nothing was cached (no job id, cache off, larger than the budget, or
+    the write failed — caching is best-effort and never fails the caller)."""
+    if job_id in (None, "") or not raw:
+        return None
+    limit = _max_bytes()
+    if limit <= 0 or len(raw) > limit:
+        return None
+    sha = hashlib.sha256(raw).hexdigest()
+    try:
+        with _LOCK:
+            index = _load_index()
+            if not _known(index, sha):
+                _write_file(sha + ".raw", raw)
+            index["keys"][_key(ip_address, filename, job_id)] = sha
+            _account(index, sha)
+            _save_index(index)
+            _STATS["stores"] += 1
+        return sha
+    except OSError as e:
+        state.logger.warning(f"print_file_cache: could not store {filename}: {e}")
+        return None
+
+
+def read_raw(sha):
+    """The cached file's bytes as a read-only ``mmap`` (paged in from disk as
+    it is read, never copied onto the heap whole), or None if it has been
+    evicted since lookup."""
+    try:
+        with open(_path(sha + ".raw"), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+
+def get_meta(sha) -> dict:
+    """The per-file metadata recorded so far (``{}`` when none)."""
+    try:
+        with open(_path(sha + ".json"), "r", encoding="utf-8") as f:
+            data = json.load(f)
+            return data if isinstance(data, dict) else {}
+    except (FileNotFoundError, json.JSONDecodeError, OSError, ValueError):
+        return {}
+
+
+def update_meta(sha, fields: dict) -> None:
+    """Merge ``fields`` (JSON-serializable) into the file's metadata."""
+    try:
+        with _LOCK:
+            index = _load_index()
+            if not _known(index, sha):
+                return
+            meta = get_meta(sha)
+            meta.update(fields)
+            _write_file(sha + ".json", json.dumps(meta).encode("utf-8"))
+            _account(index, sha)
+            _save_index(index)
+    except OSError as e:
+        state.logger.warning(f"print_file_cache: could not update metadata for {sha}: {e}")
+
+
+def load_decoded(sha):
+    """A cached ``bgcode_decode.decode_bgcode`` result — the decoded text plus
+    its block / M73 tables — or None when this file hasn't been decoded yet."""
+    tables = get_meta(sha).get("decode")
+    if not isinstance(tables, dict):
+        return None
+    try:
+        with open(_path(sha + ".gcode"), "rb") as f:
+            text = f.read().decode("utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+    with _LOCK:
+        _STATS["decoded_hits"] += 1
+    return dict(tables, gcode=text)
+
+
+def store_decoded(sha, decoded: dict) -> None:
+    """Keep a ``decode_bgcode`` result for this file so it is never decoded
+    again while it stays cached."""
+    try:
+        with _LOCK:
+            index = _load_index()
+            if not _known(index, sha):
+                return
+            _write_file(sha + ".gcode", (decoded.get("gcode") or "").encode("utf-8"))
+            meta = get_meta(sha)
+            meta["decode"] = {k: v for k, v in decoded.items() if k != "gcode"}
+            _write_file(sha + ".json", json.dumps(meta).encode("utf-8"))
+            _account(index, sha)
+            _save_index(index)
+            _STATS["decoded_stores"] += 1
+    except OSError as e:
+        state.logger.warning(f"print_file_cache: could not store the decode of {sha}: {e}")
+
+
+def get_stats() -> dict:
+    """Hit / miss / store / eviction counters plus the on-disk footprint for
+    /api/metrics."""
+    with _LOCK:
+        out = dict(_STATS)
+        index = _load_index()
+        out["files"] = len(index["blobs"])
+        out["bytes"] = sum(int(b.get("bytes") or 0) for b in index["blobs"].values())
+        out["max_bytes"] = _max_bytes()
+    return out
@@ -4,8 +4,9 @@ Moved verbatim from app.py: the module-global print latch (_PRINT_TRACKER +
 _PRINT_TRACKER_LOCK) and state frozensets, the _CANCEL_DEDUCT_RUN_ASYNC
 test seam, _fcc_owns_completion_deduct, the cancel/completion/ambiguous
 edge handlers + dispatchers, _track_print_edge, the adaptive
-_cancel_monitor_tick / _cancel_monitor_loop daemon, the deferred-fetch
-retry queue, restart recovery, and the boot credential seed.
+_cancel_monitor_tick / _cancel_monitor_loop daemon with its per-printer
+probe schedule (wake_printer), the deferred-fetch retry queue, restart
+recovery, and the boot credential seed.
 
 Wiring notes:
 - Calls INTO print_deduct are module-qualified (print_deduct.deduct_completed_print
@@ -20,6 +21,7 @@ Wiring notes:
 
 Python 3.9 runtime (the container image) — keep syntax 3.9-safe.
 """
+import heapq
 import time
 import threading
 
@@ -27,10 +29,13 @@ import state  # type: ignore
 import config_loader  # type: ignore
 import locations_db  # type: ignore
 import prusalink_api  # type: ignore
+import prusalink_poller  # type: ignore
+import printer_state_hub  # type: ignore
 import print_deduct_ledger  # type: ignore
 import cancel_review_store  # type: ignore
 import cancel_fetch_store  # type: ignore
 import print_tracker_store  # type: ignore
+import event_stream  # type: ignore
 
 import print_deduct  # type: ignore
 import startup_migrations  # type: ignore
@@ -57,6 +62,9 @@ import startup_migrations  # type: ignore
 # {printer_name: {"state": str, "job_id", "filename", "progress", "file_meta"}}
 _PRINT_TRACKER = {}
 _PRINT_TRACKER_LOCK = threading.Lock()
+# Bumped under _PRINT_TRACKER_LOCK with every persisted snapshot, so
+# print_tracker_store can drop one that reaches it after a newer one.
+_PRINT_TRACKER_VERSION = 0
 
 # A print is "running" (so we latch the job) in any of these states — a pause is
 # still running. Mirrors the frontend Phase-0 _PRINT_INPROGRESS_STATES.
@@ -634,18 +642,180 @@ _CANCEL_FETCH_MAX_AGE_S = 72 * 3600
 _cancel_monitor_started = False
 _cancel_monitor_lock = threading.Lock()
 
+# PER-PRINTER schedule. The fleet-wide FAST/IDLE sleep let one printing machine
+# drag every idle and offline printer onto the 10s cadence with it. While the
+# monitor loop runs, each printer instead carries its own next-due time, set
+# from ITS last probe: in progress / on a terminal screen → FAST, idle/ready →
+# IDLE, offline → prusalink_poller's backoff (a first miss retries at FAST). A
+# tick probes only the printers that are due; the loop sleeps until the
+# earliest one is (never longer than IDLE, so the latch save and the deferred-
+# fetch retry keep their cadence). wake_printer() pulls a printer's probe to
+# NOW on the probe pool — a reader saw its state change, or its connection was
+# edited. A tick outside the loop (tests, one-off callers) sweeps everyone.
+_MONITOR_MIN_SLEEP_S = 1.0
+_PROBE_SCHED_LOCK = threading.Lock()
+# None until _cancel_monitor_loop arms it; then name -> {"due", "state"}.
+_PROBE_SCHEDULE = None
+# (due, name) min-heap over _PROBE_SCHEDULE. Lazy: an entry whose due no
+# longer matches the schedule (re-scheduled / woken since) is skipped.
+_PROBE_HEAP = []
+# Serializes a printer's sweep probe with a woken one so _track_print_edge
+# never sees the same printer from two threads at once.
+_PRINTER_PROBE_LOCKS = {}
+
+
+def _printer_probe_lock(name):
+    with _PROBE_SCHED_LOCK:
+        lock = _PRINTER_PROBE_LOCKS.get(name)
+        if lock is None:
+            lock = _PRINTER_PROBE_LOCKS[name] = threading.Lock()
+        return lock
+
+
+def _probe_and_track(name, fb_url):
+    """Probe one printer live and run the latch/edge detector on the result.
+    Returns the state (None = offline). Never raises."""
+    with _printer_probe_lock(name):
+        try:
+            # max_age=0: always a live probe. This sweep is what feeds
+            # printer_state_hub — the dashboard / move readers reuse what it
+            # publishes — and the edge detector must see the printer now.
+            state_info = prusalink_api.get_printer_state(fb_url, name, max_age=0)
+        except Exception:
+            state_info = None
+        try:
+            _track_print_edge(name, state_info, fb_url)
+        except Exception as e:
+            try:
+                state.logger.debug(f"cancel-monitor probe failed for {name}: {e}")
+            except Exception:
+                pass
+        return state_info
+
+
+def _printer_cadence_s(name, state_info):
+    """Seconds until `name` should be probed again after reading `state_info`."""
+    if state_info is None:
+        return max(float(_CANCEL_MONITOR_FAST_S), prusalink_poller.retry_in(name))
+    s = str(state_info.get('state', '')).upper()
+    if s and s not in _IDLE_READY_STATES:
+        return float(_CANCEL_MONITOR_FAST_S)
+    return float(_CANCEL_MONITOR_IDLE_S)
+
+
+def _schedule_printer(name, state_info, due=None):
+    """Record `name`'s latest state and its next due time. No-op unarmed.
+    Caller holds _PROBE_SCHED_LOCK."""
+    if _PROBE_SCHEDULE is None:
+        return
+    if due is None:
+        due = time.monotonic() + _printer_cadence_s(name, state_info)
+    _PROBE_SCHEDULE[name] = {"due": due, "state": state_info}
+    heapq.heappush(_PROBE_HEAP, (due, name))
+
+
+def _due_printers(names):
+    """The subset of `names` to probe this tick: everyone when unarmed,
+    otherwise the never-seen and the past-due. Forgets removed printers."""
+    with _PROBE_SCHED_LOCK:
+        if _PROBE_SCHEDULE is None:
+            return list(names)
+        wanted = set(names)
+        for gone in [n for n in _PROBE_SCHEDULE if n not in wanted]:
+            _PROBE_SCHEDULE.pop(gone, None)
+        due = {n for n in names if n not in _PROBE_SCHEDULE}
+        now = time.monotonic()
+        while _PROBE_HEAP and _PROBE_HEAP[0][0] <= now:
+            when, name = heapq.heappop(_PROBE_HEAP)
+            entry = _PROBE_SCHEDULE.get(name)
+            if entry is not None and entry["due"] == when:
+                due.add(name)
+        return [n for n in names if n in due]
+
+
+def _known_states(names, probed):
+    """Reschedule the printers just probed and return every printer's latest
+    state — this tick's probe, else the one from its last visit."""
+    with _PROBE_SCHED_LOCK:
+        for name, st in probed.items():
+            _schedule_printer(name, st)
+        sched = _PROBE_SCHEDULE or {}
+        return {n: probed[n] if n in probed else (sched.get(n) or {}).get("state")
+                for n in names}
+
+
+def _monitor_sleep_s(busy):
+    """How long the loop sleeps after a tick: until the next printer is due,
+    clamped to [_MONITOR_MIN_SLEEP_S, IDLE]; the fleet-wide FAST/IDLE cadence
+    when nothing is scheduled yet."""
+    fleet = _CANCEL_MONITOR_FAST_S if busy else _CANCEL_MONITOR_IDLE_S
+    with _PROBE_SCHED_LOCK:
+        if not _PROBE_SCHEDULE:
+            return fleet
+        while _PROBE_HEAP and (_PROBE_SCHEDULE.get(_PROBE_HEAP[0][1]) or {}).get("due") \
+                != _PROBE_HEAP[0][0]:
+            heapq.heappop(_PROBE_HEAP)
+        if not _PROBE_HEAP:
+            return fleet
+        wait = _PROBE_HEAP[0][0] - time.monotonic()
+    return max(_MONITOR_MIN_SLEEP_S, min(wait, float(_CANCEL_MONITOR_IDLE_S)))
+
+
+def _woken_probe(name, fb_url):
+    st = _probe_and_track(name, fb_url)
+    prusalink_poller.record(name, st)
+    with _PROBE_SCHED_LOCK:
+        _schedule_printer(name, st)
+    # A woken probe can latch an edge between ticks — persist it now rather
+    # than at the next tick (a no-op write when nothing changed).
+    _persist_print_tracker()
+    event_stream.changed("printer_state")
+
+
+def _persist_print_tracker():
+    """Hand the current latch to print_tracker_store (slice 7: an in-flight
+    print survives an FCC / host restart, reconciled on monitor start via
+    _recover_print_tracker_on_start). The store writes only what changed and
+    coalesces concurrent saves; best-effort — it swallows its own errors."""
+    global _PRINT_TRACKER_VERSION
+    with _PRINT_TRACKER_LOCK:
+        _PRINT_TRACKER_VERSION += 1
+        version = _PRINT_TRACKER_VERSION
+        snapshot = {k: dict(v) for k, v in _PRINT_TRACKER.items()}
+    print_tracker_store.save(snapshot, version=version)
+
+
+def wake_printer(name):
+    """Probe `name` now instead of at its next scheduled visit (its state just
+    changed under a reader, or its connection was edited) and clear its
+    offline backoff. Runs on the probe pool; returns False when the monitor
+    isn't running."""
+    with _PROBE_SCHED_LOCK:
+        if _PROBE_SCHEDULE is None or not name:
+            return False
+    try:
+        _, fb_url = config_loader.get_api_urls()
+    except Exception:
+        return False
+    prusalink_poller.reset(name)
+    prusalink_poller.submit(_woken_probe, name, fb_url)
+    return True
+
+
+def _on_reader_state_change(key, _state_info):
+    wake_printer(key[1])
+
 
 def _cancel_monitor_tick():
     """One detection sweep: probe every printer's state + run the latch/edge
-    detector, then service the deferred-fetch retry queue (§9.10) using the
-    states just probed. Per-printer probes fan out so a slow/offline printer
+    detector, then service the deferred-fetch retry queue (§9.10) using ONLY
+    the states probed this tick. Per-printer probes fan out so a slow/offline printer
     doesn't block the rest. Best-effort throughout.
 
     Returns True when the fleet is BUSY (any printer in-progress or on a terminal
     screen) so the loop can poll on the FAST cadence; False when everything is
     idle/offline (back off to the slow cadence). The return is the only signal
     the adaptive loop needs — it never raises."""
-    from concurrent.futures import ThreadPoolExecutor
     try:
         printer_map = locations_db.get_active_printer_map()
         _, fb_url = config_loader.get_api_urls()
@@ -656,39 +826,30 @@ def _cancel_monitor_tick():
     if not names:
         return False
 
-    probed = {}
-
-    def _probe(name):
-        try:
-            state_info = prusalink_api.get_printer_state(fb_url, name)
-        except Exception:
-            state_info = None
-        probed[name] = state_info  # distinct keys per thread → GIL-safe
-        try:
-            _track_print_edge(name, state_info, fb_url)
-        except Exception as e:
-            try:
-                state.logger.debug(f"cancel-monitor probe failed for {name}: {e}")
-            except Exception:
-                pass
-
-    workers = max(1, min(8, len(names)))
-    with ThreadPoolExecutor(max_workers=workers) as ex:
-        list(ex.map(_probe, names))
+    # Shared bounded pool with per-printer offline backoff (prusalink_poller):
+    # a backed-off printer isn't probed and reads as offline (None), which
+    # _track_print_edge already treats as "no edge, keep the latch". Under the
+    # running loop only the printers due on their own cadence are probed.
+    due = _due_printers(names)
+    probed = prusalink_poller.sweep(due, lambda n: _probe_and_track(n, fb_url))
+    known = _known_states(names, probed)
 
     # Prune tracker entries for printers no longer in the map so a removed /
     # renamed printer's stale latch can't linger or mis-fire on re-add.
     with _PRINT_TRACKER_LOCK:
         for stale in [p for p in _PRINT_TRACKER if p not in names]:
             _PRINT_TRACKER.pop(stale, None)
-        snapshot = {k: dict(v) for k, v in _PRINT_TRACKER.items()}
 
-    # Slice 7: persist the latch snapshot so an in-flight print survives an FCC /
-    # host restart (reconciled on monitor start via _recover_print_tracker_on_
-    # start). Best-effort — print_tracker_store.save swallows its own errors.
-    print_tracker_store.save(snapshot)
+    # Slice 7: persist the latch snapshot (only the rows that changed).
+    _persist_print_tracker()
+    # Push any printer state change / new cancel review to open dashboards.
+    event_stream.changed("printer_state", "reviews")
 
     # Retry any cancels whose gcode was download-locked at the edge (§9.10).
+    # Only printers probed THIS tick: a printer not due keeps a last-visit
+    # state up to _CANCEL_MONITOR_IDLE_S old (it may have started a new job
+    # since), and ticks come whenever ANY printer is due — gating on that
+    # state would retry its download every tick against its tiny HTTP pool.
     try:
         _process_pending_cancel_fetches(probed, fb_url)
     except Exception as e:
@@ -704,7 +865,7 @@ def _cancel_monitor_tick():
     # fetch lock drains soon after the screen clears. Offline (None/'') and
     # idle/ready → back off to the slow cadence.
     busy = False
-    for st in probed.values():
+    for st in known.values():
         s = str((st or {}).get('state', '')).upper()
         if s and s not in _IDLE_READY_STATES:
             busy = True
@@ -984,6 +1145,12 @@ def _cancel_monitor_loop():
             state.logger.warning(f"print-latch recovery pass failed: {e}")
         except Exception:
             pass
+    # Arm the per-printer schedule and let reader probes wake a printer.
+    global _PROBE_SCHEDULE
+    with _PROBE_SCHED_LOCK:
+        if _PROBE_SCHEDULE is None:
+            _PROBE_SCHEDULE = {}
+    printer_state_hub.add_listener(_on_reader_state_change)
     while True:
         busy = False
         try:
@@ -993,8 +1160,9 @@ def _cancel_monitor_loop():
                 state.logger.warning(f"cancel-monitor tick error: {e}")
             except Exception:
                 pass
-        # Adaptive cadence: fast while the fleet is busy, slow when idle.
-        time.sleep(_CANCEL_MONITOR_FAST_S if busy else _CANCEL_MONITOR_IDLE_S)
+        # Adaptive cadence: until the next printer is due on its own cadence
+        # (fleet-wide fast while busy / slow when idle before any is scheduled).
+        time.sleep(_monitor_sleep_s(busy))
 
 
 def _seed_printer_credentials_from_filabridge():
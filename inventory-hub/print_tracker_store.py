@@ -11,54 +11,205 @@ outage is missed. Persisting the latch each monitor tick + reconciling it on
 monitor start closes that gap.
 
 Single-snapshot store (NOT keyed records like cancel_fetch_store): the whole
-`{printer_name: entry}` dict, atomically replaced each tick and read once on
-monitor start. Best-effort — a read/write failure must never break the tick or
-the daemon start.
+`{printer_name: entry}` dict, read once on monitor start, as hub_store's
+``print_latch`` table (one row per printer). Best-effort — a read/write
+failure must never break the tick or the daemon start. The pre-SQLite
+``data/print_tracker_latch.json`` is imported once.
+
+Dirty-checked writes: the tick hands over the whole snapshot every few
+seconds, but between state edges nothing in it changes except the odd
+progress sample — an idle fleet's latch is identical for hours. ``save``
+keeps the JSON of each row as last committed (``_PERSISTED``) and writes only
+the printers whose entry differs (plus deletes for the ones that went), so an
+unchanged snapshot costs no transaction at all (``writes_avoided``).
+
+Coalescing: the tick and woken probes (print_monitor.wake_printer, on the
+probe pool) both persist, so saves can arrive in a burst from several
+threads. Only one thread writes at a time; a save that arrives while a write
+is running just stages its snapshot and returns, and the writer commits the
+newest staged snapshot before it lets go (``coalesced``). Snapshots carry the
+caller's ``version`` (taken under the tracker lock), so one that lost the race
+to the lock can never overwrite a newer one. Nothing is deferred to a timer:
+every save is on disk by the time the burst's writer returns — the same
+"committed each tick" guarantee as before, with fewer commits.
 """
 from __future__ import annotations
 
 import json
 import os
 import threading
+import time
 
-import atomic_store
+import hub_store
 
-# Overridable by tests (monkeypatch this attribute to a tmp path).
+# The pre-SQLite latch file, imported into hub_store once. Overridable by
+# tests (monkeypatch this attribute to a tmp path).
 _STORE_PATH = os.path.join(os.path.dirname(__file__), "data", "print_tracker_latch.json")
-_LOCK = threading.RLock()
 
+# Guards everything below. Never held across a write — the writer holds
+# _WRITING instead, so a save arriving mid-write only stages.
+_STATE_LOCK = threading.Lock()
+_WRITING = False
+# Newest snapshot not yet committed: (version, {printer: entry JSON}) or None.
+_STAGED = None
+# Highest version staged so far (older snapshots are dropped on arrival).
+_LAST_VERSION = None
+# {printer: entry JSON} as last committed to _PERSISTED_PATH; None = unknown
+# (first use, a failed write, clear(), a legacy import) → re-read the table.
+_PERSISTED = None
+_PERSISTED_PATH = None
+_STATS = {"saves": 0, "writes": 0, "rows_written": 0, "rows_deleted": 0,
+          "writes_avoided": 0, "coalesced": 0, "stale_dropped": 0, "failures": 0}
+_LAST_WRITE_AT = None
+
+
+def _write(conn, tracker: dict) -> None:
+    now = time.time()
+    conn.execute("DELETE FROM print_latch")
+    conn.executemany(
+        "INSERT INTO print_latch (printer, entry, updated_at) VALUES (?, ?, ?)",
+        [(str(name), json.dumps(entry), now) for name, entry in tracker.items()])
+
+
+def _import_legacy(data: dict) -> int:
+    global _PERSISTED
+    with hub_store.transaction() as conn:
+        if conn.execute("SELECT 1 FROM print_latch LIMIT 1").fetchone() is None:
+            _write(conn, data)
+    with _STATE_LOCK:
+        _PERSISTED = None
+    return len(data)
+
+
+def _ready() -> None:
+    hub_store.import_legacy_json("print_tracker_store", _STORE_PATH, _import_legacy)
+
+
+def _encode(tracker) -> dict:
+    return {str(name): json.dumps(entry) for name, entry in
+            (tracker.items() if isinstance(tracker, dict) else ())}
 
-def save(tracker: dict) -> None:
-    """Atomically persist the latch snapshot. Best-effort: swallow any error so a
-    write failure never breaks a monitor tick."""
+
+def _persisted_rows() -> dict:
+    """The committed rows for the current database (read once, then kept in
+    step by _commit). Called by the writer only."""
+    global _PERSISTED, _PERSISTED_PATH
+    with _STATE_LOCK:
+        if _PERSISTED is not None and _PERSISTED_PATH == hub_store._DB_PATH:
+            return _PERSISTED
+    rows = dict(hub_store.query("SELECT printer, entry FROM print_latch"))
+    with _STATE_LOCK:
+        _PERSISTED, _PERSISTED_PATH = rows, hub_store._DB_PATH
+    return rows
+
+
+def _commit(rows: dict) -> None:
+    """Bring the table to `rows`, touching only the printers that differ."""
+    global _PERSISTED, _LAST_WRITE_AT
+    current = _persisted_rows()
+    changed = [(name, text) for name, text in rows.items() if current.get(name) != text]
+    gone = [name for name in current if name not in rows]
+    if not changed and not gone:
+        with _STATE_LOCK:
+            _STATS["writes_avoided"] += 1
+        return
+    now = time.time()
+    with hub_store.transaction() as conn:
+        if gone:
+            conn.executemany("DELETE FROM print_latch WHERE printer = ?", [(n,) for n in gone])
+        if changed:
+            conn.executemany(
+                "INSERT INTO print_latch (printer, entry, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (printer) DO UPDATE SET entry = excluded.entry, "
+                "updated_at = excluded.updated_at",
+                [(name, text, now) for name, text in changed])
+    with _STATE_LOCK:
+        _PERSISTED = dict(rows)
+        _LAST_WRITE_AT = now
+        _STATS["writes"] += 1
+        _STATS["rows_written"] += len(changed)
+        _STATS["rows_deleted"] += len(gone)
+
+
+def save(tracker: dict, version=None) -> None:
+    """Persist the latch snapshot — only the rows that changed, and nothing
+    at all when it matches what's on disk. `version` (monotonic, optional)
+    orders snapshots taken on different threads: an older one than already
+    staged is dropped. Best-effort: swallow any error so a write failure
+    never breaks a monitor tick."""
+    global _WRITING, _STAGED, _LAST_VERSION, _PERSISTED
     try:
-        with _LOCK:
-            os.makedirs(os.path.dirname(_STORE_PATH), exist_ok=True)
-            tmp = _STORE_PATH + ".tmp"
-            with open(tmp, "w", encoding="utf-8") as f:
-                json.dump(tracker if isinstance(tracker, dict) else {}, f, indent=2)
-            # 32.1 — retry on the Windows host↔container bind-mount sharing collision.
-            atomic_store.replace_with_retry(tmp, _STORE_PATH)
+        rows = _encode(tracker)
     except Exception:
-        pass
+        return
+    with _STATE_LOCK:
+        _STATS["saves"] += 1
+        if version is not None:
+            if _LAST_VERSION is not None and version < _LAST_VERSION:
+                _STATS["stale_dropped"] += 1
+                return
+            _LAST_VERSION = version
+        if _STAGED is not None:
+            _STATS["coalesced"] += 1
+        _STAGED = (version, rows)
+        if _WRITING:
+            return
+        _WRITING = True
+    try:
+        while True:
+            with _STATE_LOCK:
+                if _STAGED is None:
+                    _WRITING = False
+                    return
+                _, rows = _STAGED
+                _STAGED = None
+            try:
+                _ready()
+                _commit(rows)
+            except Exception as e:
+                hub_store.log_error("print_tracker_store", e)
+                with _STATE_LOCK:
+                    _PERSISTED = None
+                    _STATS["failures"] += 1
+    except BaseException:
+        with _STATE_LOCK:
+            _WRITING = False
+        raise
 
 
 def load() -> dict:
-    """Return the persisted snapshot, or {} if missing/corrupt."""
+    """Return the persisted snapshot, or {} if missing/unreadable."""
     try:
-        with _LOCK:
-            with open(_STORE_PATH, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return data if isinstance(data, dict) else {}
-    except (FileNotFoundError, json.JSONDecodeError, OSError, ValueError):
+        _ready()
+        rows = hub_store.query("SELECT printer, entry FROM print_latch ORDER BY rowid")
+        return {name: json.loads(entry) for name, entry in rows}
+    except Exception as e:
+        hub_store.log_error("print_tracker_store", e)
         return {}
 
 
 def clear() -> None:
-    """Remove the snapshot file (best-effort)."""
+    """Drop the snapshot (best-effort)."""
+    global _PERSISTED, _STAGED, _LAST_VERSION
+    with _STATE_LOCK:
+        _STAGED = None
+        _LAST_VERSION = None
     try:
-        with _LOCK:
-            if os.path.exists(_STORE_PATH):
-                os.remove(_STORE_PATH)
-    except Exception:
-        pass
+        _ready()
+        with hub_store.transaction() as conn:
+            conn.execute("DELETE FROM print_latch")
+    except Exception as e:
+        hub_store.log_error("print_tracker_store", e)
+    with _STATE_LOCK:
+        _PERSISTED = None
+
+
+def get_stats():
+    """Save / write counters for /api/metrics: `writes_avoided` counts saves
+    that matched the committed latch, `coalesced` saves folded into a
+    concurrent writer's commit."""
+    with _STATE_LOCK:
+        out = dict(_STATS)
+        out["last_write_age_s"] = (round(time.time() - _LAST_WRITE_AT, 3)
+                                   if _LAST_WRITE_AT is not None else None)
+    return out
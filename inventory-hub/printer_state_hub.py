@@ -0,0 +1,168 @@
+"""Shared, timestamped PrusaLink state per printer.
+
+print_monitor._cancel_monitor_tick probes every printer every 10-30 s, and on
+top of that the dashboard pulse (one per open kiosk, every few seconds),
+/api/printer_state and every move's active-print guard
+(logic._active_print_info_for_location) each probed the same printers again —
+N kiosks meant N probes of every printer per pulse, each a PrusaLink GET with
+a multi-second timeout when the printer is offline.
+
+This module holds the latest probe result for each printer:
+
+- publish: every probe — the monitor's sweep or a reader's refresh — records
+  ``(state, monotonic time)`` here. The monitor always probes (``max_age=0``):
+  it IS the feed, and its edge detector must never act on a reused state.
+- freshness bound: a reader is served the recorded state while it is younger
+  than ``max_age`` seconds (default ``printer_state_max_age`` from config, 0
+  disables reuse — every read probes, the historical behaviour).
+- single-flight: readers of a stale printer queue on that printer's probe
+  lock; the first probes, the rest are served its result. So PrusaLink sees
+  at most one probe per printer per freshness window however many kiosks
+  are open.
+
+``None`` (printer offline / unreachable) is recorded like any other state:
+it is the expensive answer — a full connect timeout — and the one most worth
+not repeating. Readers get a private copy of the state dict.
+
+A reader probe that finds a printer in a different state than the last one
+recorded calls the ``add_listener`` callbacks — the cancel monitor uses that
+to pull its own probe of that printer forward rather than meet the change on
+its next scheduled visit. The feed (``max_age=0``) doesn't notify: that probe
+is the monitor's own.
+
+prusalink_api.get_printer_state is the front door; nothing else should call
+``get`` directly.
+
+Python 3.9 runtime (the container image) — keep syntax 3.9-safe.
+"""
+import threading
+import time
+
+import config_loader  # type: ignore
+import state  # type: ignore
+
+# Guards _ENTRIES / _PROBE_LOCKS / _STATS. Never held across a probe — probes
+# run under the per-printer lock from _probe_lock().
+_LOCK = threading.Lock()
+_PROBE_LOCKS = {}
+
+# key (filabridge_url, printer_name) -> {"state", "at" (monotonic)}
+_ENTRIES = {}
+
+# Callbacks fn(key, state) for a state change seen by a reader probe.
+_LISTENERS = []
+
+_STATS = {
+    "hits": 0,
+    "probes": 0,
+    "joined": 0,
+    "published": 0,
+}
+
+
+def _max_age():
+    return config_loader.get_clamped("printer_state_max_age", 0.0, 60.0)
+
+
+def _copy(state):
+    return dict(state) if isinstance(state, dict) else state
+
+
+def _probe_lock(key):
+    with _LOCK:
+        lock = _PROBE_LOCKS.get(key)
+        if lock is None:
+            lock = _PROBE_LOCKS[key] = threading.Lock()
+        return lock
+
+
+def _state_str(state):
+    return str((state or {}).get("state", "")).upper() if state is not None else None
+
+
+def add_listener(fn):
+    """Register ``fn(key, state)`` to be told when a reader probe sees a
+    printer's state change. Idempotent."""
+    with _LOCK:
+        if fn not in _LISTENERS:
+            _LISTENERS.append(fn)
+
+
+def _fresh(key, max_age):
+    """(True, state) if `key` was published within `max_age` seconds, else
+    (False, None). Caller holds _LOCK."""
+    entry = _ENTRIES.get(key)
+    if entry is None or max_age <= 0 or time.monotonic() - entry["at"] >= max_age:
+        return False, None
+    return True, entry["state"]
+
+
+def publish(key, state):
+    """Record a just-probed state for `key`."""
+    with _LOCK:
+        _ENTRIES[key] = {"state": _copy(state), "at": time.monotonic()}
+        _STATS["published"] += 1
+
+
+def get(key, probe, max_age=None):
+    """The state for `key`, served from the last publish while it is younger
+    than `max_age` seconds (None → config default; 0 → always probe).
+    Otherwise ``probe()`` is called — once across concurrent readers — and its
+    result published. Exceptions from ``probe`` propagate and publish nothing."""
+    if max_age is None:
+        max_age = _max_age()
+    with _LOCK:
+        hit, current = _fresh(key, max_age)
+        if hit:
+            _STATS["hits"] += 1
+            return _copy(current)
+    with _probe_lock(key):
+        # Someone else may have probed while we queued.
+        with _LOCK:
+            hit, current = _fresh(key, max_age)
+            if hit:
+                _STATS["joined"] += 1
+                return _copy(current)
+        current = probe()
+        with _LOCK:
+            _STATS["probes"] += 1
+            prev = _ENTRIES.get(key)
+            listeners = list(_LISTENERS)
+        publish(key, current)
+    if max_age > 0 and prev is not None and _state_str(prev["state"]) != _state_str(current):
+        for fn in listeners:
+            try:
+                fn(key, _copy(current))
+            except Exception as e:
+                state.logger.warning(f"printer_state_hub: listener failed for {key[1]}: {e}")
+    return _copy(current)
+
+
+def states():
+    """``{printer_name: STATE}`` (None = offline) from the last probe of each
+    printer — the push channel's ``printer_state`` topic. No probing."""
+    with _LOCK:
+        return {key[1]: _state_str(e["state"]) for key, e in sorted(_ENTRIES.items())}
+
+
+def invalidate():
+    """Forget every recorded state; the next read of each printer probes."""
+    with _LOCK:
+        _ENTRIES.clear()
+
+
+def get_stats():
+    """Hit/probe counters plus each printer's recorded state and age for
+    /api/metrics."""
+    now = time.monotonic()
+    with _LOCK:
+        out = dict(_STATS)
+        out["printers"] = {
+            key[1]: {
+                "state": (e["state"] or {}).get("state"),
+                "age_s": round(now - e["at"], 3),
+            }
+            for key, e in _ENTRIES.items()
+        }
+    out["max_age_s"] = _max_age()
+    return out
@@ -1,8 +1,14 @@
+import mmap
+import os
 import requests
 import re
+import tempfile
 import threading
-from typing import Dict, List, Optional
+import time
+from typing import Dict, List, Optional, Union
 import bgcode_decode  # binary-gcode (.bgcode) decoder for the cancel prefix-parse
+import print_file_cache  # type: ignore
+import printer_state_hub  # type: ignore
 
 # Per-operation memo for get_printer_state (L3 fix A). A single
 # perform_smart_move probes the SAME printer in BOTH its phase-1 and phase-2
@@ -25,6 +31,24 @@ def clear_probe_cache():
     _probe_cache.data = None
 
 
+# Per-operation print-job scope for print_file_cache. The deduct paths know the
+# job id of the file they're about to fetch; the fetch helpers below key the
+# on-disk cache on it. Scoped like the probe memo (print_deduct begins/clears it
+# around a compute) so the helpers' call shape stays (ip, key, filename, …). An
+# explicit ``job_id=`` argument wins; with neither, the cache is bypassed.
+_file_job = threading.local()
+
+
+def begin_file_job(job_id):
+    """Key this thread's print-file fetches on ``job_id`` until clear_file_job."""
+    _file_job.job_id = job_id
+
+
+def clear_file_job():
+    """End the print-job scope. Idempotent."""
+    _file_job.job_id = None
+
+
 def fetch_printer_credentials(filabridge_url: str, printer_name: str):
     """Return ``{'ip_address','api_key'}`` for a printer, or ``None``.
 
@@ -76,6 +100,8 @@ def fetch_all_filabridge_printers(filabridge_url: str) -> Dict[str, Dict]:
 
 def _parse_weights_from_match(match) -> Dict[int, float]:
     weights_str = match.group(1)
+    if isinstance(weights_str, bytes):
+        weights_str = weights_str.decode('ascii')   # [0-9.,\s] only
     weights = [w.strip() for w in weights_str.split(',')]
     usage = {}
     for idx, w in enumerate(weights):
@@ -88,59 +114,208 @@ def _parse_weights_from_match(match) -> Dict[int, float]:
     return usage
 
 
-def parse_footer_usage(gcode_content: str) -> Dict[int, float]:
+def parse_footer_usage(gcode_content: Union[str, bytes, memoryview]) -> Dict[int, float]:
     """Parse the slicer's full per-tool ``filament used [g]`` footer →
     ``{tool_index: grams}`` — the COMPLETE-print estimate (exactly what FilaBridge
     bills). Used by FCC's Phase-2 FINISHED-completion deduct (the footer is exact;
     the cancel prefix-parse is only for PARTIAL/cancelled prints). Same indexing
     space as ``parse_partial_filament_usage`` (the comma-separated array is tool
-    0,1,2,…). Empty dict when the footer is absent."""
+    0,1,2,…). Empty dict when the footer is absent. ``gcode_content`` may also be
+    the file's UTF-8 bytes (``bytes`` / ``mmap`` — scanned in place)."""
     if not gcode_content:
         return {}
-    m = re.search(r';?\s*filament used \[g\]\s*=\s*([0-9.,\s]+)', gcode_content)
+    if isinstance(gcode_content, str):
+        m = re.search(r';?\s*filament used \[g\]\s*=\s*([0-9.,\s]+)', gcode_content)
+    else:
+        m = _GCODE_G_FOOTER_B.search(_gcode_buffer(gcode_content))
     return _parse_weights_from_match(m) if m else {}
 
 
 # --- Cancelled-print partial usage (FilaBridge absorption §9.2, slice 3) ------
 
-def _download_file_bytes(ip_address: str, api_key: str, filename: str) -> Optional[bytes]:
+# Print files are streamed to disk in chunks of this size instead of buffered
+# whole with `resp.content` (a 100 MB XL file was one 100 MB bytes object, then
+# a decoded copy, then a re-encoded copy on a small kiosk host).
+_DOWNLOAD_CHUNK = 1 << 20
+
+# In-flight + completed download counters for /api/metrics. `active` maps a
+# download's URL to its progress so a slow XL fetch is visible while it runs.
+_DOWNLOAD_LOCK = threading.Lock()
+_DOWNLOAD_STATS = {"downloads": 0, "failures": 0, "bytes": 0}
+_DOWNLOAD_ACTIVE: Dict[str, Dict] = {}
+
+
+def _download_file_bytes(ip_address: str, api_key: str, filename: str,
+                         progress=None):
     """Download a print file's raw bytes from PrusaLink. After a print STOPS the
     file un-404s (it's locked + 404 while printing), so this works at cancel
-    time. Returns the bytes, or None on failure."""
+    time. Returns a read-only bytes-like buffer, or None on failure.
+
+    The body is streamed in ``_DOWNLOAD_CHUNK`` pieces into an unlinked temp
+    file (in print_file_cache's directory — disk, not a tmpfs /tmp) and handed
+    back as an ``mmap`` of it: heap use is about one chunk however big the
+    file, and the bytes are paged in from disk as the decoder / parser / cache
+    read them. Every consumer takes any bytes-like object (``bytes`` from a
+    test double works the same). ``progress(done, total)`` is called after each
+    chunk (``total`` None without a Content-Length); in-flight downloads also
+    show under ``print_downloads`` in /api/metrics."""
     filename = filename.lstrip('/')
     url = f"http://{ip_address}/{filename}"
     headers = {'X-Api-Key': api_key} if api_key else {}
+    done = 0
     try:
-        resp = requests.get(url, headers=headers, timeout=60)
-        if resp.ok:
-            return resp.content
-        print(f"download_gcode_content: HTTP {resp.status_code} for {filename}")
+        with requests.get(url, headers=headers, timeout=60, stream=True) as resp:
+            if not resp.ok:
+                print(f"download_gcode_content: HTTP {resp.status_code} for {filename}")
+                with _DOWNLOAD_LOCK:
+                    _DOWNLOAD_STATS["failures"] += 1
+                return None
+            try:
+                total = int(resp.headers.get("Content-Length") or 0) or None
+            except (TypeError, ValueError):
+                total = None
+            with _DOWNLOAD_LOCK:
+                _DOWNLOAD_ACTIVE[url] = {"bytes": 0, "total": total, "started": time.time()}
+            os.makedirs(print_file_cache._CACHE_DIR, exist_ok=True)
+            with tempfile.TemporaryFile(prefix="download-", dir=print_file_cache._CACHE_DIR) as tmp:
+                for chunk in resp.iter_content(_DOWNLOAD_CHUNK):
+                    if not chunk:
+                        continue
+                    tmp.write(chunk)
+                    done += len(chunk)
+                    with _DOWNLOAD_LOCK:
+                        _DOWNLOAD_ACTIVE[url]["bytes"] = done
+                    if progress is not None:
+                        progress(done, total)
+                tmp.flush()
+                # The mapping keeps the (already unlinked) file alive after the
+                # handle closes; it goes away when the buffer is released.
+                buf = mmap.mmap(tmp.fileno(), 0, access=mmap.ACCESS_READ) if done else b""
+        with _DOWNLOAD_LOCK:
+            _DOWNLOAD_STATS["downloads"] += 1
+            _DOWNLOAD_STATS["bytes"] += done
+        return buf
     except Exception as e:
         print(f"download_gcode_content failed for {filename}: {e}")
+        with _DOWNLOAD_LOCK:
+            _DOWNLOAD_STATS["failures"] += 1
+    finally:
+        with _DOWNLOAD_LOCK:
+            _DOWNLOAD_ACTIVE.pop(url, None)
     return None
 
 
-def download_gcode_content(ip_address: str, api_key: str, filename: str) -> Optional[str]:
+def get_download_stats() -> Dict:
+    """Print-file download counters plus the in-flight downloads' progress."""
+    with _DOWNLOAD_LOCK:
+        out = dict(_DOWNLOAD_STATS)
+        out["active"] = [dict(v, url=k) for k, v in _DOWNLOAD_ACTIVE.items()]
+    return out
+
+
+def _release(buf) -> None:
+    """Unmap a buffer from :func:`_print_file_bytes` as soon as its caller is
+    done with it. Left to the garbage collector, every fetch kept its mapping
+    (and, for a download, the unlinked temp file's disk blocks) alive for as
+    long as anything still referenced it. ``bytes`` (an empty file, a test
+    double) need nothing; a mapping some view still exports is left to the
+    collector."""
+    if isinstance(buf, mmap.mmap):
+        try:
+            buf.close()
+        except BufferError:
+            pass
+
+
+def _print_file_bytes(ip_address: str, api_key: str, filename: str, job_id=None):
+    """``(raw, sha)``: a print file's bytes from the on-disk print_file_cache when
+    this job's file is already there, else downloaded (and cached when there is a
+    job id — ``job_id`` or the begin_file_job scope — to key it on; ``sha`` is
+    None when it wasn't). ``(None, None)``
+    when the download fails. ``raw`` may be an ``mmap``: the caller owns it
+    and hands it to :func:`_release` when done."""
+    if job_id is None:
+        job_id = getattr(_file_job, "job_id", None)
+    sha = print_file_cache.lookup(ip_address, filename, job_id)
+    if sha is not None:
+        raw = print_file_cache.read_raw(sha)
+        if raw is not None:
+            return raw, sha
+    raw = _download_file_bytes(ip_address, api_key, filename)
+    if raw is None:
+        return None, None
+    try:
+        return raw, print_file_cache.store(ip_address, filename, job_id, raw)
+    except Exception:
+        _release(raw)
+        raise
+
+
+def _decoded_print_file(ip_address: str, api_key: str, filename: str,
+                        job_id=None, as_text: bool = True) -> Optional[Dict]:
+    """The whole print file as G-code: ``bgcode_decode.decode_bgcode``'s dict for
+    binary G-code (decoded once per cached file, then read back from the cache),
+    ``{"gcode": text}`` for plain text — or, with ``as_text=False``, the plain
+    file's own bytes-like buffer, for a caller that only scans it (no decoded
+    copy; the caller passes ``dec["gcode"]`` to :func:`_release`). ``"sha"``
+    carries the cache entry (None when uncached). None when the download
+    fails."""
+    raw, sha = _print_file_bytes(ip_address, api_key, filename, job_id)
+    if raw is None:
+        return None
+    keep = False
+    try:
+        if bgcode_decode.is_bgcode(raw):
+            dec = print_file_cache.load_decoded(sha) if sha else None
+            if dec is None:
+                dec = bgcode_decode.decode_bgcode(raw)
+                if sha:
+                    print_file_cache.store_decoded(sha, dec)
+        elif as_text:
+            dec = {"gcode": str(raw, "utf-8", "replace")}
+        else:
+            dec = {"gcode": raw}
+            keep = True
+    finally:
+        if not keep:
+            _release(raw)
+    dec["sha"] = sha
+    return dec
+
+
+def _file_footer_usage(dec: Dict) -> Dict[int, float]:
+    """``parse_footer_usage`` of a ``_decoded_print_file`` result (text or
+    buffer), kept in the cache entry's metadata (JSON keys are strings —
+    re-keyed to tool ints)."""
+    sha = dec.get("sha")
+    cached = print_file_cache.get_meta(sha).get("footer") if sha else None
+    if isinstance(cached, dict):
+        return {int(t): g for t, g in cached.items()}
+    footer = parse_footer_usage(dec.get("gcode") or "")
+    if sha and footer:
+        print_file_cache.update_meta(sha, {"footer": footer})
+    return footer
+
+
+def download_gcode_content(ip_address: str, api_key: str, filename: str,
+                           job_id=None) -> Optional[str]:
     """Download the full print file as ASCII G-code text, transparently decoding
     binary G-code (`.bgcode`) — its body is heatshrink+MeatPack compressed, so a
     naive text decode is garbage; `bgcode_decode` reconstructs the moves so the
     prefix-parse can run on Derek's real (binary) prints. Returns None on
     failure. (For binary gcode, prefer `fetch_cancel_gcode`, which also remaps
-    the progress fraction from compressed-file to decoded-text space.)"""
-    raw = _download_file_bytes(ip_address, api_key, filename)
-    if raw is None:
-        return None
+    the progress fraction from compressed-file to decoded-text space.) With a
+    ``job_id`` the file and its decode come from / go to print_file_cache."""
     try:
-        if bgcode_decode.is_bgcode(raw):
-            return bgcode_decode.decode_bgcode(raw).get("gcode") or None
-        return raw.decode("utf-8", "replace")
+        dec = _decoded_print_file(ip_address, api_key, filename, job_id)
+        return (dec or {}).get("gcode") or None
     except Exception as e:
         print(f"download_gcode_content: decode failed for {filename}: {e}")
         return None
 
 
 def fetch_cancel_gcode(ip_address: str, api_key: str, filename: str,
-                       reached_fraction: float) -> Optional[Dict]:
+                       reached_fraction: float, job_id=None) -> Optional[Dict]:
     """Download + decode a print file for the cancelled-print parser.
 
     Returns ``{"gcode": ascii_text, "fraction": effective_fraction}`` or None on
@@ -149,28 +324,129 @@ def fetch_cancel_gcode(ip_address: str, api_key: str, filename: str,
     DECODED text, so the prefix-parse slices at the right point even though the
     header/thumbnail/metadata blocks (which carry no extrusion) sit before the
     G-code in the file. For plain ASCII gcode the fraction passes through.
+
+    Binary G-code is only decoded as far as the print got
+    (:func:`bgcode_decode.decode_bgcode_until`): an early cancel returns the
+    body through the reached line + the footer, already cut (fraction 1.0),
+    without decompressing the rest of the file.
+
+    With a ``job_id`` the file comes from print_file_cache when this job already
+    fetched it (the deferred-fetch retry, a completion's follow-up split) and a
+    full decode made here or earlier is kept / reused.
     """
-    raw = _download_file_bytes(ip_address, api_key, filename)
+    raw, sha = _print_file_bytes(ip_address, api_key, filename, job_id)
     if raw is None:
         return None
     try:
         if bgcode_decode.is_bgcode(raw):
-            dec = bgcode_decode.decode_bgcode(raw)
+            full = print_file_cache.load_decoded(sha) if sha else None
+            if full is not None and full.get("gcode"):
+                return {"gcode": full["gcode"],
+                        "fraction": bgcode_decode.progress_to_decoded_fraction(full, reached_fraction)}
+            dec = bgcode_decode.decode_bgcode_until(raw, reached_fraction)
+            if sha and dec.get("decoded"):
+                print_file_cache.store_decoded(sha, dec["decoded"])
             if not dec.get("gcode"):
                 return None
-            return {"gcode": dec["gcode"],
-                    "fraction": bgcode_decode.progress_to_decoded_fraction(dec, reached_fraction)}
-        text = raw.decode("utf-8", "replace")
+            return {"gcode": dec["gcode"], "fraction": dec["fraction"]}
+        text = str(raw, "utf-8", "replace")
         return {"gcode": text, "fraction": max(0.0, min(1.0, float(reached_fraction)))}
     except Exception as e:
         print(f"fetch_cancel_gcode: failed for {filename}: {e}")
         return None
+    finally:
+        _release(raw)
 
 
 _GCODE_MM_RE = re.compile(r';?\s*filament used \[mm\]\s*=\s*([0-9.,\s]+)')
 
+# --- byte-level scanning for the cancel prefix-parse -------------------------
+# parse_partial_filament_usage runs on the cancel-deduct thread over the WHOLE
+# decoded file — tens of MB on an XL multi-tool print, ~2M lines. Walking it
+# line by line in Python (split, strip, upper, a regex or three, and a UTF-8
+# re-encode per line just to count bytes) took seconds on the kiosk box. The
+# scan now works on bytes: a str input is encoded ONCE (a bytes / mmap /
+# memoryview input not at all), byte offsets come straight from the buffer,
+# and the per-line work lives in compiled patterns so Python only visits the
+# handful of state-changing lines (Tn / M82 / M83 / G92). The E values of the
+# G0/G1 moves between two of those lines are pulled out by a findall per chunk
+# and summed (M83) or max'd (M82 high-water) in C.
+#
+# Each pattern mirrors one test of the old per-line walk, which worked on
+# `line.split(';', 1)[0].strip().upper()`: leading whitespace is skipped,
+# `;` ends the code, letters match either case, and a move's E is the first
+# E word followed by a number. The line patterns anchor on the PRECEDING
+# `\n` rather than a MULTILINE `^` — a literal first byte lets the engine
+# skip ahead instead of trying every offset (~3x faster on a 50 MB body);
+# the file's first line is scanned with a `\n` put in front of it. The footer
+# patterns drop the old `;?\s*` lead-in for the same reason — it never
+# changed group 1 or which occurrence matched.
+_GCODE_G_FOOTER_B = re.compile(rb'filament used \[g\]\s*=\s*([0-9.,\s]+)')
+_GCODE_MM_FOOTER_B = re.compile(rb'filament used \[mm\]\s*=\s*([0-9.,\s]+)')
+_GCODE_STATE_LINE_B = re.compile(
+    rb'\n[ \t\x0b\x0c]*(?:[Tt](\d+)(?![0-9])|[Mm]8([23])|[Gg]92([^\n;]*))[^\n]*')
+_GCODE_MOVE_E_B = re.compile(
+    rb'\n[ \t\x0b\x0c]*[Gg][01](?![0-9])'
+    rb'[^\n;Ee]*(?:[Ee](?!-?\.?\d)[^\n;Ee]*)*[Ee](-?\d*\.?\d+)')
+_GCODE_E_B = re.compile(rb'[Ee](-?\d*\.?\d+)')
+_GCODE_NEWLINE_B = re.compile(rb'\n')
+# Moves are folded in ~1 MiB line-aligned chunks so a 50 MB single-tool run
+# never materializes millions of E tokens at once.
+_GCODE_SCAN_CHUNK = 1 << 20
+
+
+def _gcode_buffer(gcode_content):
+    """A flat bytes-like view of the gcode that `re` can scan in place."""
+    if isinstance(gcode_content, str):
+        return gcode_content.encode('utf-8')
+    if isinstance(gcode_content, memoryview):
+        return gcode_content.cast('B')
+    return gcode_content
+
+
+def _line_end_before(buf, limit: int) -> int:
+    """Offset just past the last ``\\n`` in ``buf[:limit]`` (0 when there is
+    none) — i.e. where the last line wholly inside the first ``limit`` bytes
+    ends. Scans backwards in small windows (memoryview has no rfind)."""
+    hi = limit
+    while hi > 0:
+        lo = max(0, hi - 4096)
+        i = bytes(buf[lo:hi]).rfind(b'\n')
+        if i >= 0:
+            return lo + i + 1
+        hi = lo
+    return 0
+
+
+def _fold_moves(buf, start: int, stop: int, tool: int, relative_e: bool,
+                e_high: Dict[int, float], extruded_mm: Dict[int, float]) -> None:
+    """Fold the G0/G1 extrusion in ``buf[start:stop]`` (whole lines, no state
+    changes) into ``extruded_mm[tool]``. Under M83 that's the signed sum of the
+    E words; under M82 only E past the running high-water mark is new filament,
+    which over a run of moves is just ``max(E) - high_water`` when positive."""
+    find = _GCODE_MOVE_E_B.findall
+    while start < stop:
+        cut = stop
+        if stop - start > _GCODE_SCAN_CHUNK:
+            nl = _GCODE_NEWLINE_B.search(buf, start + _GCODE_SCAN_CHUNK, stop)
+            if nl:
+                cut = nl.start()   # the next chunk starts on the `\n`
+        values = find(buf, start, cut)
+        start = cut
+        if not values:
+            continue
+        if relative_e:
+            extruded_mm[tool] = extruded_mm.get(tool, 0.0) + sum(map(float, values))
+        else:
+            top = max(map(float, values))
+            hi = e_high.get(tool, 0.0)
+            if top > hi:
+                extruded_mm[tool] = extruded_mm.get(tool, 0.0) + (top - hi)
+                e_high[tool] = top
+
 
-def parse_partial_filament_usage(gcode_content: str, reached_fraction: float) -> Dict[int, float]:
+def parse_partial_filament_usage(gcode_content: Union[str, bytes, memoryview],
+                                 reached_fraction: float) -> Dict[int, float]:
     """Per-toolhead ACTUAL grams extruded up to a cancel point — the cancelled-
     print partial-deduction core (FilaBridge absorption design §9.2, rung 1).
 
@@ -187,9 +463,10 @@ def parse_partial_filament_usage(gcode_content: str, reached_fraction: float) ->
     result (the XL "untouched head deducts 0" invariant, satisfied natively).
 
     Args:
-        gcode_content: the FULL gcode file text (footer + body). ``reached_byte``
-            is computed against this content's length, so it must be the whole
-            file, not a Range subset.
+        gcode_content: the FULL gcode file (footer + body) — text, or its UTF-8
+            bytes as ``bytes`` / ``memoryview`` / ``mmap`` (scanned in place, no
+            copy). ``reached_byte`` is computed against this content's length,
+            so it must be the whole file, not a Range subset.
         reached_fraction: progress 0.0..1.0 (``progress`` percent / 100) — the
             fraction of the file reached when the print was cancelled.
 
@@ -202,15 +479,77 @@ def parse_partial_filament_usage(gcode_content: str, reached_fraction: float) ->
     Handles absolute (M82, default) and relative (M83) extrusion, ``G92 E<n>``
     extruder-origin resets, per-tool absolute-E context across ``T<n>`` changes
     (each tool changer head has its own E coordinate), and inline ``;`` comments.
+    Lines end at ``\\n`` (``\\r\\n`` included) — what every slicer emits.
     """
-    if not gcode_content:
-        return {}
+    return parse_cumulative_filament_usage(gcode_content, [reached_fraction])[0]
+
+
+def _scan_extrusion(span, pos: int, stop: int, walk: Dict) -> None:
+    """Advance the extrusion state machine ``walk`` over the whole lines of
+    ``span[pos:stop]`` (``pos`` on a ``\\n`` or the copy's leading one)."""
+    for m in _GCODE_STATE_LINE_B.finditer(span, pos, stop):
+        # Moves since the previous state change ran under the current state.
+        _fold_moves(span, pos, m.start(), walk["tool"], walk["relative_e"],
+                    walk["e_high"], walk["mm"])
+        pos = m.end()
+        tool, mode, g92_args = m.groups()
+        if tool is not None:
+            walk["tool"] = int(tool)
+            walk["saw_tool"] = True
+        elif mode is not None:
+            walk["relative_e"] = mode == b'3'
+        else:
+            em = _GCODE_E_B.search(g92_args)
+            if em:
+                # G92 E<v> redefines the E origin: reset the high-water mark
+                # so extrusion past <v> counts (filament already used stays
+                # counted).
+                walk["e_high"][walk["tool"]] = float(em.group(1))
+            else:
+                # Bare G92 (no params) resets all axes incl. E to 0 (RepRap)
+                # — reset the high-water mark too. (PrusaSlicer emits
+                # `G92 E0` explicitly, so this only guards hand/odd gcode.)
+                walk["e_high"][walk["tool"]] = 0.0
+    _fold_moves(span, pos, stop, walk["tool"], walk["relative_e"], walk["e_high"], walk["mm"])
+
+
+def _walk_grams(walk: Dict, g_per_mm: Dict[int, float]) -> Dict[int, float]:
+    """The walk's extrusion so far as ``{tool: grams}`` (the state is untouched,
+    so the walk can keep going to a later cut)."""
+    extruded_mm = walk["mm"]
+    # If we never saw a Tn but accumulated onto a default that has no g/mm,
+    # fold it onto the sole footer tool (single-material, no explicit select).
+    if not walk["saw_tool"] and len(g_per_mm) == 1 and extruded_mm:
+        extruded_mm = {next(iter(g_per_mm)): sum(extruded_mm.values())}
+    return {tool: round(mm * g_per_mm[tool], 4)
+            for tool, mm in extruded_mm.items() if mm > 0 and tool in g_per_mm}
+
+
+def parse_cumulative_filament_usage(gcode_content: Union[str, bytes, memoryview],
+                                    reached_fractions) -> List[Dict[int, float]]:
+    """:func:`parse_partial_filament_usage` at several cut points in ONE pass.
+
+    A runout / swap split needs the cumulative per-tool grams at every swap
+    boundary; parsing each from byte 0 cost k full scans of a file that can be
+    tens of MB. Here the cuts are visited in file order and the extrusion walk
+    is checkpointed at each one — snapshot the grams, keep walking — so k cuts
+    cost one scan up to the furthest. Each result is exactly what
+    ``parse_partial_filament_usage(gcode_content, fraction)`` returns for that
+    fraction (same line-end cut, same default-tool fold at that point).
+
+    Returns one ``{toolhead_index: grams}`` per entry of ``reached_fractions``,
+    in the order given (the fractions need not be sorted).
+    """
+    results: List[Dict[int, float]] = [{} for _ in reached_fractions]
+    if not gcode_content or not results:
+        return results
+    buf = _gcode_buffer(gcode_content)
 
     # --- per-tool grams-per-mm from the slicer footers ---------------------
-    g_match = re.search(r';?\s*filament used \[g\]\s*=\s*([0-9.,\s]+)', gcode_content)
-    mm_match = _GCODE_MM_RE.search(gcode_content)
+    g_match = _GCODE_G_FOOTER_B.search(buf)
+    mm_match = _GCODE_MM_FOOTER_B.search(buf)
     if not g_match or not mm_match:
-        return {}
+        return results
     grams = _parse_weights_from_match(g_match)
     mms = _parse_weights_from_match(mm_match)
     g_per_mm = {
@@ -219,91 +558,54 @@ def parse_partial_filament_usage(gcode_content: str, reached_fraction: float) ->
         if mm > 0 and tool in grams
     }
     if not g_per_mm:
-        return {}
-
-    # --- prefix-parse the body up to the reached byte position -------------
-    reached_fraction = max(0.0, min(1.0, float(reached_fraction)))
-    total_bytes = len(gcode_content.encode('utf-8'))
-    reached_byte = int(reached_fraction * total_bytes)
-    if reached_byte <= 0:
-        return {}
+        return results
+
+    # --- where each cut stops the prefix-parse ------------------------------
+    total_bytes = len(buf)
+    cuts = []
+    for i, fraction in enumerate(reached_fractions):
+        reached_byte = int(max(0.0, min(1.0, float(fraction))) * total_bytes)
+        if reached_byte <= 0:
+            continue
+        # Only lines that END at or before the reached byte count; the line the
+        # cancel landed inside was not (fully) executed.
+        end = total_bytes if reached_byte >= total_bytes else _line_end_before(buf, reached_byte)
+        if end <= 0:
+            continue
+        # The walk stops ON the `\n` ending the cut's last line, so the next
+        # leg's `\n`-anchored scan picks up the line after it.
+        stop = end - 1 if buf[end - 1] == 0x0A else end
+        cuts.append((stop, i))
+    if not cuts:
+        return results
+    cuts.sort()
 
     # When the gcode carries no explicit `Tn` (a single-material print whose
     # one tool is selected outside the body, common on MMU), attribute all
     # extrusion to the sole tool the footer marks as used. Multi-tool prints
     # have `Tn` changes and start at tool 0.
     default_tool = next(iter(g_per_mm)) if len(g_per_mm) == 1 else 0
-    active_tool = default_tool
-    relative_e = False           # M82 absolute (default) vs M83 relative
-    e_high: Dict[int, float] = {}   # per-tool high-water E since last G92 reset
-    extruded_mm: Dict[int, float] = {}
-    saw_tool = False
-    consumed = 0
-
-    for line in gcode_content.splitlines(keepends=True):
-        consumed += len(line.encode('utf-8'))
-        if consumed > reached_byte:
-            break
-        code = line.split(';', 1)[0].strip()
-        if not code:
-            continue
-        upper = code.upper()
-
-        tmatch = re.match(r'^T(\d+)(?![0-9])', upper)
-        if tmatch:
-            active_tool = int(tmatch.group(1))
-            saw_tool = True
-            continue
-        if upper.startswith('M82'):
-            relative_e = False
-            continue
-        if upper.startswith('M83'):
-            relative_e = True
-            continue
-        if upper.startswith('G92'):
-            em = re.search(r'E(-?\d*\.?\d+)', upper)
-            if em:
-                # G92 E<v> redefines the E origin: reset the high-water mark so
-                # extrusion past <v> counts (filament already used stays counted).
-                e_high[active_tool] = float(em.group(1))
-            else:
-                # Bare G92 (no params) resets all axes incl. E to 0 (RepRap) —
-                # reset the high-water mark too. (PrusaSlicer emits `G92 E0`
-                # explicitly, so this only guards hand/odd gcode.)
-                e_high[active_tool] = 0.0
-            continue
-        # Match G0/G1 with or WITHOUT a trailing space (Prusa no-spaces gcode
-        # emits `G1X92.3Y9.4E.001`); exclude G10/G11 etc.
-        if re.match(r'^G[01](?![0-9])', upper):
-            em = re.search(r'E(-?\d*\.?\d+)', upper)
-            if not em:
-                continue
-            e = float(em.group(1))
-            if relative_e:
-                # Net extrusion: a retract (negative) and its later re-prime
-                # cancel, so signed accumulation matches the slicer's count.
-                extruded_mm[active_tool] = extruded_mm.get(active_tool, 0.0) + e
-            else:
-                # High-water mark: only E that EXCEEDS the running max is new
-                # filament (a retract + re-prime below the max adds nothing).
-                hi = e_high.get(active_tool, 0.0)
-                if e > hi:
-                    extruded_mm[active_tool] = extruded_mm.get(active_tool, 0.0) + (e - hi)
-                    e_high[active_tool] = e
+    walk = {
+        "tool": default_tool,
+        "relative_e": False,      # M82 absolute (default) vs M83 relative
+        "e_high": {},             # per-tool high-water E since last G92 reset
+        "mm": {},                 # per-tool extruded mm so far
+        "saw_tool": False,
+    }
 
-    # If we never saw a Tn but accumulated onto a default that has no g/mm,
-    # fold it onto the sole footer tool (single-material, no explicit select).
-    if not saw_tool and len(g_per_mm) == 1 and extruded_mm:
-        sole = next(iter(g_per_mm))
-        merged = sum(extruded_mm.values())
-        extruded_mm = {sole: merged}
-
-    # --- convert extruded mm -> grams via the slicer's own ratio -----------
-    result = {}
-    for tool, mm in extruded_mm.items():
-        if mm > 0 and tool in g_per_mm:
-            result[tool] = round(mm * g_per_mm[tool], 4)
-    return result
+    # The first line is scanned from a copy with a `\n` put in front of it,
+    # the rest of the prefix in place from the `\n` that ends that line.
+    last_stop = cuts[-1][0]
+    first_nl = _GCODE_NEWLINE_B.search(buf, 0, last_stop)
+    head_end = first_nl.start() if first_nl else last_stop
+    _scan_extrusion(b'\n' + bytes(buf[0:head_end]), 0, head_end + 1, walk)
+    pos = head_end
+    for stop, i in cuts:
+        if stop > pos:
+            _scan_extrusion(buf, pos, stop, walk)
+            pos = stop
+        results[i] = _walk_grams(walk, g_per_mm)
+    return results
 
 
 # Marker PrusaSlicer emits immediately before each planned color change, e.g.
@@ -377,7 +679,7 @@ def parse_color_change_segments(gcode_content: str) -> List[Dict]:
 
 
 def compute_segment_usage(ip_address: str, api_key: str, filename: str,
-                          boundaries) -> Optional[Dict]:
+                          boundaries, job_id=None) -> Optional[Dict]:
     """22.3(b) runout/swap split: download+decode a print file ONCE and report the
     CUMULATIVE per-tool grams extruded up to each mid-print swap ``boundary`` — the
     input a per-segment apportionment needs (segment k grams = cum[k] − cum[k−1]).
@@ -385,53 +687,66 @@ def compute_segment_usage(ip_address: str, api_key: str, filename: str,
     ``boundaries`` is an ordered list of PrusaLink progress fractions (0..1, the same
     ``progress`` stored on each ``swap_log`` event). Each is remapped to the decoded
     G-code position via :func:`bgcode_decode.progress_to_decoded_fraction` (the M73
-    time-progress inversion, scale-validated 2026-06-12) and prefix-parsed with
-    :func:`parse_partial_filament_usage`.
+    time-progress inversion, scale-validated 2026-06-12) and all of them are
+    prefix-parsed in a single walk by :func:`parse_cumulative_filament_usage`.
 
     Returns ``{"footer": {tool: grams}, "cums": [ {tool: grams}, … ]}`` — the full-job
     footer plus one cumulative dict per boundary (same order as ``boundaries``) — or
     ``None`` on any download/decode/parse failure so the caller degrades to the
     full-footer manual-split review rather than writing a guessed number.
+
+    With a ``job_id`` the file, its decode and its footer usage come from
+    print_file_cache when the job's deduct already fetched them.
     """
-    raw = _download_file_bytes(ip_address, api_key, filename)
-    if raw is None:
-        return None
+    dec = None
     try:
-        if bgcode_decode.is_bgcode(raw):
-            dec = bgcode_decode.decode_bgcode(raw)
-            gcode = dec.get("gcode") or ""
+        dec = _decoded_print_file(ip_address, api_key, filename, job_id, as_text=False)
+        if dec is None:
+            return None
+        gcode = dec.get("gcode") or ""
+        if "gmap" in dec:   # binary G-code: remap through the M73 / block tables
             def _remap(p):
                 return bgcode_decode.progress_to_decoded_fraction(dec, p)
         else:
-            gcode = raw.decode("utf-8", "replace")
             def _remap(p):
                 return max(0.0, min(1.0, float(p)))
         if not gcode:
             return None
-        footer = parse_footer_usage(gcode)
+        footer = _file_footer_usage(dec)
         if not footer:
             return None
-        cums = [parse_partial_filament_usage(gcode, _remap(b)) for b in boundaries]
+        cums = parse_cumulative_filament_usage(gcode, [_remap(b) for b in boundaries])
         return {"footer": footer, "cums": cums}
     except Exception as e:
         print(f"compute_segment_usage: failed for {filename}: {e}")
         return None
+    finally:
+        if dec is not None:
+            _release(dec.get("gcode"))
 
 
-def get_printer_state(filabridge_url: str, printer_name: str) -> Optional[Dict]:
+def get_printer_state(filabridge_url: str, printer_name: str,
+                      max_age: Optional[float] = None) -> Optional[Dict]:
     """Cached front door for the PrusaLink state probe (L3 fix A).
 
     Memoizes per-operation when a probe cache is active (see begin_probe_cache),
     so a single perform_smart_move probes a given printer ONCE across its
-    phase-1/phase-2 auto-deploy recursion instead of twice. With no active cache
-    it just calls through, so every other caller (/api/printer_state, usage
-    deduction) is unchanged.
+    phase-1/phase-2 auto-deploy recursion instead of twice.
+
+    Underneath that, every read goes through printer_state_hub: the latest
+    probe of this printer — the cancel monitor's sweep or another reader's —
+    is reused while younger than ``max_age`` seconds (None → the
+    ``printer_state_max_age`` config default), and only a stale printer is
+    probed, once however many dashboards ask at the same moment.
+    ``max_age=0`` always probes (and publishes the result for everyone else);
+    the cancel monitor reads that way because it feeds the hub.
     """
     key = (filabridge_url, printer_name)
     cache = getattr(_probe_cache, "data", None)
     if cache is not None and key in cache:
         return cache[key]
-    result = _probe_printer_state(filabridge_url, printer_name)
+    result = printer_state_hub.get(
+        key, lambda: _probe_printer_state(filabridge_url, printer_name), max_age)
     if cache is not None:
         cache[key] = result
     return result
@@ -0,0 +1,168 @@
+"""Fleet-wide PrusaLink probe engine for the cancel monitor and the pulse.
+
+The cancel monitor's sweep and the dashboard's printer-status section each
+built a throwaway ThreadPoolExecutor capped at 8 workers per call. With 2 s
+probe timeouts (the v1 status probe, then the job fetch for a printing
+machine) a 40-printer farm ran in five or more waves, and every offline
+printer cost a full timeout per wave on every sweep — 10+ s sweeps that
+swallowed the monitor's 10 s FAST cadence.
+
+This module owns:
+
+- one long-lived probe pool, sized by ``prusalink_poll_concurrency`` (config,
+  default 32) and rebuilt only when that setting changes, so a sweep never
+  pays thread start-up and the bound sits well above the old 8;
+- per-printer offline backoff: a printer whose probe came back None (offline
+  / unreachable) is retried on the next sweep once — a one-tick blip must not
+  delay a real STOPPED edge — and after that skipped for 10 s, 20 s, 40 s ...
+  up to 120 s between attempts. Any answer clears it. Readers that can live
+  with "unknown" (the pulse widget) ask ``in_backoff`` and skip the probe too;
+- sweep latency: the last / max / mean wall time of a monitor sweep and how
+  many printers it probed or skipped, for /api/metrics.
+
+The probes themselves stay the blocking ``requests`` calls in prusalink_api
+(get_printer_state / get_printer_job) — the same functions, timeouts and
+fallbacks, and _track_print_edge runs on the probing worker exactly as before.
+
+Python 3.9 runtime (the container image) — keep syntax 3.9-safe.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import config_loader  # type: ignore
+
+_BACKOFF_BASE_S = 10.0
+_BACKOFF_MAX_S = 120.0
+
+# Guards _POOL / _POOL_SIZE / _OFFLINE / _STATS.
+_LOCK = threading.Lock()
+_POOL = None
+_POOL_SIZE = 0
+
+# printer_name -> {"failures": consecutive None probes, "retry_at": monotonic}
+_OFFLINE = {}
+
+_STATS = {
+    "sweeps": 0,
+    "probes": 0,
+    "skipped_backoff": 0,
+    "last_sweep_s": 0.0,
+    "max_sweep_s": 0.0,
+    "total_sweep_s": 0.0,
+}
+
+
+def concurrency():
+    """The configured probe bound (1..256)."""
+    return config_loader.get_clamped("prusalink_poll_concurrency", 1, 256, int)
+
+
+def _pool():
+    global _POOL, _POOL_SIZE
+    size = concurrency()
+    with _LOCK:
+        if _POOL is None or _POOL_SIZE != size:
+            old = _POOL
+            _POOL = ThreadPoolExecutor(max_workers=size, thread_name_prefix="prusalink-probe")
+            _POOL_SIZE = size
+            if old is not None:
+                old.shutdown(wait=False)
+        return _POOL
+
+
+def in_backoff(name):
+    """True while `name` is offline and not yet due for its next attempt."""
+    with _LOCK:
+        entry = _OFFLINE.get(name)
+        return entry is not None and time.monotonic() < entry["retry_at"]
+
+
+def retry_in(name):
+    """Seconds until a backed-off `name` is due again (0.0 when it isn't
+    backed off)."""
+    with _LOCK:
+        entry = _OFFLINE.get(name)
+        return max(0.0, entry["retry_at"] - time.monotonic()) if entry else 0.0
+
+
+def record(name, state):
+    """Feed a probe result into `name`'s backoff: None counts a failure,
+    anything else clears it."""
+    with _LOCK:
+        if state is not None:
+            _OFFLINE.pop(name, None)
+            return
+        entry = _OFFLINE.setdefault(name, {"failures": 0, "retry_at": 0.0})
+        entry["failures"] += 1
+        if entry["failures"] < 2:
+            entry["retry_at"] = 0.0   # one blip: probe again next sweep
+        else:
+            delay = min(_BACKOFF_BASE_S * (2 ** (entry["failures"] - 2)), _BACKOFF_MAX_S)
+            entry["retry_at"] = time.monotonic() + delay
+
+
+def sweep(names, probe):
+    """Run ``probe(name)`` for every printer not in backoff, all at once on
+    the shared pool, and return ``{name: result}`` for every name — None for
+    a skipped (backed-off) printer, the same as an offline one. ``probe``
+    returns the printer's state dict (None = offline) and must not raise."""
+    started = time.monotonic()
+    due = [n for n in names if not in_backoff(n)]
+    results = {n: None for n in names}
+    if due:
+        pool = _pool()
+        for name, state in zip(due, pool.map(probe, due)):
+            results[name] = state
+            record(name, state)
+    elapsed = time.monotonic() - started
+    with _LOCK:
+        _STATS["sweeps"] += 1
+        _STATS["probes"] += len(due)
+        _STATS["skipped_backoff"] += len(names) - len(due)
+        _STATS["last_sweep_s"] = round(elapsed, 3)
+        _STATS["max_sweep_s"] = round(max(_STATS["max_sweep_s"], elapsed), 3)
+        _STATS["total_sweep_s"] += elapsed
+    return results
+
+
+def map_printers(fn, items):
+    """``list(map(fn, items))`` on the shared pool — for per-printer fan-outs
+    outside the sweep (the pulse's printer-status section)."""
+    items = list(items)
+    if not items:
+        return []
+    return list(_pool().map(fn, items))
+
+
+def submit(fn, *args):
+    """Run ``fn(*args)`` on the shared pool without waiting for it (a one-off
+    probe woken outside the sweep). Returns the future."""
+    return _pool().submit(fn, *args)
+
+
+def reset(name=None):
+    """Forget one printer's backoff state (its connection was just edited),
+    or everyone's."""
+    with _LOCK:
+        if name is None:
+            _OFFLINE.clear()
+        else:
+            _OFFLINE.pop(name, None)
+
+
+def get_stats():
+    """Sweep latency, probe / skip counters and the printers currently backed
+    off for /api/metrics."""
+    now = time.monotonic()
+    with _LOCK:
+        out = dict(_STATS)
+        sweeps = out.pop("total_sweep_s")
+        out["mean_sweep_s"] = round(sweeps / out["sweeps"], 3) if out["sweeps"] else 0.0
+        out["offline"] = {
+            name: {"failures": e["failures"],
+                   "retry_in_s": round(max(0.0, e["retry_at"] - now), 3)}
+            for name, e in _OFFLINE.items()
+        }
+    out["concurrency"] = concurrency()
+    return out
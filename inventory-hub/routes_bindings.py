@@ -30,6 +30,7 @@ import locations_db  # type: ignore
 import spoolman_api  # type: ignore
 import logic  # type: ignore
 import prusalink_api  # type: ignore
+import print_monitor  # type: ignore
 
 from app_core import app
 
@@ -256,6 +257,9 @@ def api_put_printer_creds():
         # 29.B2 — only log the "updated" INFO line on an ACTUAL change; a no-op
         # PUT with identical creds no longer emits a misleading "updated" entry.
         state.add_log_entry(f"🔐 Printer connection updated for {name}", "INFO")
+        # New address / key: probe it now (clearing any offline backoff built
+        # up against the old one) instead of on its next scheduled visit.
+        print_monitor.wake_printer(name)
     return jsonify({"ok": True, "error": None})
 
 
@@ -4,14 +4,16 @@ Moved verbatim from app.py: the L18 config HTTP surface (GET/PUT /api/config,
 export with redacted secrets via app.response_class, import with dry-run
 diff) and the L58 filament-attributes manager (report, bulk_set, add_choice,
 the ~170-line destructive remove_choice schema migration, sweep_unused).
-Function-local `import requests as _req` / `import json as _json` kept
-verbatim (deliberate lazy imports). Offline behavior pinned by
+Function-local `import spoolman_http as _req` / `import json as _json` kept
+as deliberate lazy imports (the `_req` alias predates the pooled transport). Offline behavior pinned by
 tests/test_l316_charact_filament_attributes_unit.py.
 
 NOTE: this module stays FLAT at the inventory-hub root on purpose —
 tests/test_no_direct_extra_patch.py scans INV_HUB.glob('*.py')
-non-recursively for raw extra-PATCH calls, and remove_choice/sweep_unused
-carry the only sanctioned (noqa-marked) ones.
+non-recursively for raw extra-PATCH calls. remove_choice/sweep_unused used to
+carry the only sanctioned (noqa-marked) ones; their full-extras restores now
+go through spoolman_api.restore_filament_extras, as every filament write
+here goes through spoolman_api.
 
 api_audit_session did NOT move here: it calls _check_audit_idle_timeout,
 which is coupled to the /api/logs heartbeat — the trio moves together in
@@ -26,9 +28,21 @@ import state  # type: ignore
 import config_loader  # type: ignore
 import config_schema  # type: ignore
 import spoolman_api  # type: ignore
+import spoolman_cache  # type: ignore
+import spoolman_http  # type: ignore
 
 from app_core import app
 
+
+def _apply_spoolman_settings(saved):
+    """Connection settings "apply immediately": rebuild the pooled session
+    and/or drop the list snapshots when a save touched their keys."""
+    saved = set(saved or [])
+    if spoolman_http.SETTINGS_KEYS & saved:
+        spoolman_http.reset()  # rebuild the pool with the new timeout/retries/size
+    if spoolman_cache.SETTINGS_KEYS & saved:
+        spoolman_cache.invalidate()  # next read refetches under the new TTL
+
 @app.route('/api/config', methods=['GET'])
 def api_get_config():
     """L18 Config System — return the declarative schema + current values for
@@ -64,6 +78,7 @@ def api_put_config():
     result = config_loader.save_config(values)
     if result.get('ok'):
         saved = result.get('saved') or []
+        _apply_spoolman_settings(saved)
         if saved:
             state.add_log_entry(f"⚙️ Config updated: {', '.join(saved)}", "INFO")
         return jsonify(result)
@@ -153,6 +168,7 @@ def api_config_import():
         code = 409 if err.startswith('refusing to save') else 500
         state.add_log_entry(f"⚙️ Config import failed: {err}", "ERROR", "ff4444")
         return jsonify({"ok": False, "error": err, "ignored": ignored}), code
+    _apply_spoolman_settings(result.get('saved'))
     state.add_log_entry(
         f"⚙️ Config imported ({len(result.get('saved') or [])} settings, {len(ignored)} ignored)", "INFO")
     return jsonify({"ok": True, "saved": result.get('saved'), "ignored": ignored, "diff": diff})
@@ -172,7 +188,7 @@ def api_config_import():
 def api_filament_attributes_report():
     """Return a snapshot of every filament's filament_attributes value
     plus the canonical choice list and per-choice usage counts."""
-    import requests as _req
+    import spoolman_http as _req
     sm_url, _ = config_loader.get_api_urls()
     try:
         ch_resp = _req.get(f"{sm_url}/api/v1/field/filament", timeout=10)
@@ -238,11 +254,13 @@ def api_filament_attributes_bulk_set():
     filament in `filament_ids`. Per-filament set semantics (idempotent):
     `add` is union'd into the existing list, `remove` is subtracted.
 
-    Goes through spoolman_api.update_filament which merges the partial
-    {extra: {filament_attributes: ...}} payload against the existing
-    record's extras (CLAUDE.md write-surface convention — Spoolman's
-    PATCH replaces the whole `extra` dict, so partial payloads silently
-    wipe siblings otherwise). Surfaces LAST_SPOOLMAN_ERROR per-failure.
+    Goes through spoolman_api.update_filaments: one filament-list snapshot
+    for the existing attributes, PATCHes with bounded concurrency, and
+    update_filament merging the partial {extra: {filament_attributes: ...}}
+    payload against the record's extras (CLAUDE.md write-surface convention
+    — Spoolman's PATCH replaces the whole `extra` dict, so partial payloads
+    silently wipe siblings otherwise). Surfaces each failure's Spoolman
+    error per-id, in input order.
     """
     import json as _json
     payload = request.get_json(silent=True) or {}
@@ -257,25 +275,14 @@ def api_filament_attributes_bulk_set():
     add_set = {str(x) for x in add_list if str(x)}
     remove_set = {str(x) for x in remove_list if str(x)}
 
-    updated, unchanged, errors = 0, 0, []
-    for raw_id in ids:
-        try:
-            fid = int(raw_id)
-        except (ValueError, TypeError):
-            errors.append({"id": raw_id, "msg": "not an integer id"})
-            continue
-        fil = spoolman_api.get_filament(fid)
-        if not fil:
-            errors.append({"id": fid, "msg": "filament not found"})
-            continue
+    def _build(fil):
         existing_attrs = spoolman_api._parse_filament_attrs_value(
             (fil.get('extra') or {}).get('filament_attributes')
         )
         existing_set = set(existing_attrs)
         new_set = (existing_set | add_set) - remove_set
         if new_set == existing_set:
-            unchanged += 1
-            continue
+            return None
         # Preserve order: keep existing attrs that survive, then append
         # newly-added in user-specified order. Avoids gratuitous shuffles.
         merged = [a for a in existing_attrs if a in new_set]
@@ -283,13 +290,12 @@ def api_filament_attributes_bulk_set():
             sa = str(a)
             if sa in new_set and sa not in merged:
                 merged.append(sa)
-        result = spoolman_api.update_filament(
-            fid, {"extra": {"filament_attributes": _json.dumps(merged)}}
-        )
-        if result is None:
-            errors.append({"id": fid, "msg": spoolman_api.LAST_SPOOLMAN_ERROR or "unknown error"})
-            continue
-        updated += 1
+        return {"extra": {"filament_attributes": _json.dumps(merged)}}
+
+    results = spoolman_api.update_filaments(ids, _build, label="filament_attributes bulk_set")
+    updated = sum(1 for res in results if res["status"] == "updated")
+    unchanged = sum(1 for res in results if res["status"] == "unchanged")
+    errors = [{"id": res["id"], "msg": res["msg"]} for res in results if res["status"] == "error"]
 
     state.add_log_entry(
         f"🏷️ Filament Attributes bulk-set: +{sorted(add_set)} / -{sorted(remove_set)} "
@@ -355,7 +361,7 @@ def api_filament_attributes_remove_choice():
     restores.
     """
     import json as _json
-    import requests as _req
+    import spoolman_http as _req
     payload = request.get_json(silent=True) or {}
     choice = str(payload.get('choice', '')).strip()
     force = bool(payload.get('force'))
@@ -432,6 +438,9 @@ def api_filament_attributes_remove_choice():
             })
     except Exception as e:
         return jsonify({"success": False, "msg": f"Schema DELETE error: {e}"})
+    # The DELETE stripped filament_attributes from every filament's extras;
+    # the cached spool/filament lists no longer match Spoolman.
+    spoolman_api.invalidate_snapshots()
 
     payload_out = {
         "name": attr_field.get("name") or "Filament Attributes",
@@ -468,37 +477,26 @@ def api_filament_attributes_remove_choice():
     # dict back is what preserves siblings — partial PATCH on `extra`
     # makes Spoolman replace the whole sub-document. See sweep_unused
     # for the same fix rationale + the regression that pins it.
-    restored, restore_failures = 0, []
+    # The PATCHes go through spoolman_api.restore_filament_extras (bounded
+    # concurrency, per-filament results). 29.A4 — it catches ANY exception
+    # per filament: one raised mid-restore (AFTER the schema was already
+    # deleted + recreated) used to escape as a bare HTTP 500 with some
+    # filaments unrestored and NO restore_failures report.
+    extras_out_by_fid = {}
     for fid, extras_in in extras_snapshot.items():
         extras_out = dict(extras_in)
         if 'filament_attributes' in extras_out:
             attrs = spoolman_api._parse_filament_attrs_value(extras_out['filament_attributes'])
             cleaned = [a for a in attrs if a != choice]
             extras_out['filament_attributes'] = _json.dumps(cleaned)
-        # noqa: spoolman-extra-patch — extras_out is the FULL extras
-        # snapshot, not a partial dict, so Spoolman's replace-on-PATCH
-        # semantics preserve every sibling field. The choice was already
-        # filtered out of filament_attributes above. test_no_direct_extra_patch
-        # honors this marker as an audited exception.
-        try:
-            pr = _req.patch(  # noqa: spoolman-extra-patch
-                f"{sm_url}/api/v1/filament/{fid}",
-                json={"extra": extras_out},
-                timeout=10,
-            )
-            if pr.ok:
-                restored += 1
-            else:
-                restore_failures.append({"id": fid, "msg": f"HTTP {pr.status_code}: {pr.text[:120]}"})
-        except Exception as e:
-            # 29.A4 — broadened from _req.RequestException: any OTHER exception
-            # raised mid-restore (AFTER the schema was already deleted +
-            # recreated) previously escaped as a bare HTTP 500 with some
-            # filaments unrestored and NO restore_failures report. Catch it so
-            # a partial restore stays visible in restore_failures instead of
-            # surfacing as an opaque 500 over a half-migrated schema.
-            restore_failures.append({"id": fid, "msg": str(e)[:200]})
+        extras_out_by_fid[fid] = extras_out
+    results = spoolman_api.restore_filament_extras(
+        extras_out_by_fid, label=f"filament_attributes remove {choice!r}"
+    )
+    restored = sum(1 for res in results if res["ok"])
+    restore_failures = [{"id": res["id"], "msg": res["msg"]} for res in results if not res["ok"]]
 
+    spoolman_api.invalidate_snapshots()
     level = "INFO" if not restore_failures else "WARNING"
     color = "00ccff" if not restore_failures else "ffaa00"
     state.add_log_entry(
@@ -539,7 +537,7 @@ def api_filament_attributes_sweep_unused():
     will be silently dropped rather than risk wiping a tagged choice.
     """
     import json as _json
-    import requests as _req
+    import spoolman_http as _req
     payload = request.get_json(silent=True) or {}
     force = bool(payload.get('force'))
     selected_choices = payload.get('choices')
@@ -628,6 +626,9 @@ def api_filament_attributes_sweep_unused():
             })
     except Exception as e:
         return jsonify({"success": False, "msg": f"Schema DELETE error: {e}"})
+    # The DELETE stripped filament_attributes from every filament's extras;
+    # the cached spool/filament lists no longer match Spoolman.
+    spoolman_api.invalidate_snapshots()
 
     payload_out = {
         "name": attr_field.get("name") or "Filament Attributes",
@@ -658,7 +659,8 @@ def api_filament_attributes_sweep_unused():
     # is already correct — but we still pass it through to keep the wire
     # form consistent. The critical piece is sending the WHOLE dict so
     # Spoolman's replace-on-PATCH preserves siblings.
-    restored, restore_failures = 0, []
+    # Same restore engine (and 29.A4 catch-all) as remove_choice.
+    extras_out_by_fid = {}
     for fid, extras_in in extras_snapshot.items():
         extras_out = dict(extras_in)
         # Defensive: if any swept choice still appears in this filament's
@@ -667,28 +669,14 @@ def api_filament_attributes_sweep_unused():
             attrs = spoolman_api._parse_filament_attrs_value(extras_out['filament_attributes'])
             cleaned = [a for a in attrs if a not in unused_set]
             extras_out['filament_attributes'] = _json.dumps(cleaned)
-        # noqa: spoolman-extra-patch — extras_out is the FULL extras
-        # snapshot (siblings preserved); only filament_attributes is filtered.
-        # See test_no_direct_extra_patch for the bypass-marker contract.
-        try:
-            pr = _req.patch(  # noqa: spoolman-extra-patch
-                f"{sm_url}/api/v1/filament/{fid}",
-                json={"extra": extras_out},
-                timeout=10,
-            )
-            if pr.ok:
-                restored += 1
-            else:
-                restore_failures.append({"id": fid, "msg": f"HTTP {pr.status_code}: {pr.text[:120]}"})
-        except Exception as e:
-            # 29.A4 — broadened from _req.RequestException: any OTHER exception
-            # raised mid-restore (AFTER the schema was already deleted +
-            # recreated) previously escaped as a bare HTTP 500 with some
-            # filaments unrestored and NO restore_failures report. Catch it so
-            # a partial restore stays visible in restore_failures instead of
-            # surfacing as an opaque 500 over a half-migrated schema.
-            restore_failures.append({"id": fid, "msg": str(e)[:200]})
+        extras_out_by_fid[fid] = extras_out
+    results = spoolman_api.restore_filament_extras(
+        extras_out_by_fid, label="filament_attributes sweep_unused"
+    )
+    restored = sum(1 for res in results if res["ok"])
+    restore_failures = [{"id": res["id"], "msg": res["msg"]} for res in results if not res["ok"]]
 
+    spoolman_api.invalidate_snapshots()
     state.add_log_entry(
         f"🧹 Filament Attributes: swept {len(unused)} unused choice(s): {unused} "
         f"(restored {restored}/{len(extras_snapshot)} sibling records"
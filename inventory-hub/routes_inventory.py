@@ -20,7 +20,7 @@ Preserved quirks (do not 'fix' in a move — see the carve plan):
 Python 3.9 runtime (the container image) — keep syntax 3.9-safe.
 """
 from flask import request, jsonify  # type: ignore
-import requests  # type: ignore
+import spoolman_http  # type: ignore
 
 import state  # type: ignore
 import config_loader  # type: ignore
@@ -189,7 +189,7 @@ def api_filaments():
     """Proxy route to fetch Spoolman filaments, preventing CORS on port mismatch."""
     sm_url, _ = config_loader.get_api_urls()
     try:
-        r = requests.get(f"{sm_url}/api/v1/filament", timeout=5)
+        r = spoolman_http.get(f"{sm_url}/api/v1/filament", timeout=5)
         if r.ok:
             return jsonify({"success": True, "filaments": r.json()})
     except Exception as e:
@@ -280,10 +280,10 @@ def api_external_fields():
     sm_url, _ = config_loader.get_api_urls()
     out = {"filament": [], "spool": []}
     try:
-        rf = requests.get(f"{sm_url}/api/v1/field/filament", timeout=5)
+        rf = spoolman_http.get(f"{sm_url}/api/v1/field/filament", timeout=5)
         if rf.ok: out["filament"] = _enrich_field_order("filament", rf.json())
 
-        rs = requests.get(f"{sm_url}/api/v1/field/spool", timeout=5)
+        rs = spoolman_http.get(f"{sm_url}/api/v1/field/spool", timeout=5)
         if rs.ok: out["spool"] = _enrich_field_order("spool", rs.json())
 
         return jsonify({"success": True, "fields": out})
@@ -328,7 +328,7 @@ def api_spoolman_restore_field_order():
     for entity_type in ("filament", "spool"):
         order_list = FIELD_ORDER.get(entity_type, [])
         try:
-            r = requests.get(f"{sm_url}/api/v1/field/{entity_type}", timeout=10)
+            r = spoolman_http.get(f"{sm_url}/api/v1/field/{entity_type}", timeout=10)
             if not r.ok:
                 summary[entity_type]["errors"].append(f"GET failed: {r.status_code}")
                 continue
@@ -371,7 +371,7 @@ def api_spoolman_restore_field_order():
                 if prop in fld and fld[prop] is not None:
                     payload[prop] = fld[prop]
             try:
-                w = requests.post(
+                w = spoolman_http.post(
                     f"{sm_url}/api/v1/field/{entity_type}/{key}",
                     json=payload, timeout=10,
                 )
@@ -12,14 +12,15 @@ Preserved quirks (do not 'fix' in a move — see the carve plan):
   (Spoolman down -> counts read zero, page still renders).
 - api_delete_location relies on logic.perform_toolhead_delete_cascade
   MUTATING the passed-in list in place before the single save.
-- api_get_locations / api_merge_filament call Spoolman via the module-level
-  requests import directly (tests patch 'app.requests.get', which mutates
-  the shared requests module — keep the bare-module call style).
+- api_merge_filament calls Spoolman via the pooled spoolman_http transport
+  directly (tests patch 'spoolman_http.get' — keep the bare-module call
+  style). api_get_locations reads occupancy from spoolman_api's shared spool
+  index, whose snapshot fetch goes through the same spoolman_http.get.
 
 Python 3.9 runtime (the container image) — keep syntax 3.9-safe.
 """
 from flask import request, jsonify  # type: ignore
-import requests  # type: ignore
+import spoolman_http  # type: ignore
 
 import state  # type: ignore
 import config_loader  # type: ignore
@@ -81,43 +82,46 @@ def api_get_locations():
     unassigned_count: int = 0
     unknown_count: int = 0  # 18.1 — spools sitting at the virtual UNKNOWN bucket
 
-    sm_url, _ = config_loader.get_api_urls()
     try:
-        resp = requests.get(f"{sm_url}/api/v1/spool", timeout=5)
-        if resp.ok:
-            for s in resp.json():
-                if not isinstance(s, dict): continue
-                loc = str(s.get('location', '')).upper().strip()
-                if loc == 'UNASSIGNED': loc = "" # Coerce to true blank
-                extra = s.get('extra')
-                if not isinstance(extra, dict): extra = {}
-
-                if loc == 'UNKNOWN':
-                    unknown_count += 1
-                    # Don't add UNKNOWN to occupancy_map — it's a virtual
-                    # bucket with no on-disk row to attach to.
-                elif loc:
-                    if loc not in occupancy_map:
-                        occupancy_map[loc] = 1
-                    else:
-                        occupancy_map[loc] += 1
+        # The shared spool index (one spool-list snapshot, parsed once) rather
+        # than a private GET /api/v1/spool — the dashboard pulse's manage and
+        # printer_status sections read the same index, so a pulse fetches the
+        # spool list at most once (spoolman_cache.pinned). Read-only: the
+        # index is shared. Archived spools are skipped like Spoolman's default
+        # list did.
+        for s in spoolman_api.get_spool_index()['spools']:
+            if not isinstance(s, dict) or s.get('archived'): continue
+            loc = str(s.get('location', '')).upper().strip()
+            if loc == 'UNASSIGNED': loc = "" # Coerce to true blank
+            extra = s.get('extra')
+            if not isinstance(extra, dict): extra = {}
+
+            if loc == 'UNKNOWN':
+                unknown_count += 1
+                # Don't add UNKNOWN to occupancy_map — it's a virtual
+                # bucket with no on-disk row to attach to.
+            elif loc:
+                if loc not in occupancy_map:
+                    occupancy_map[loc] = 1
                 else:
-                    unassigned_count += 1 # type: ignore # pyre-ignore
-                
-                # [ALEX FIX] Ghost Occupancy Count
-                # Ensure deployed items still count towards their home box's total
-                p_source = str(extra.get('physical_source', '')).upper().strip().replace('"', '')
-                if p_source and p_source != loc:
-                    occupancy_map[p_source] = occupancy_map.get(p_source, 0) + 1
-
-                # L271 Phase 3.5 (review fix #2): record this spool for the
-                # distinct-count ancestor rollup. loc is '' for unassigned and
-                # 'UNKNOWN' for the lost bucket — neither rolls into a room.
-                spool_entries.append((
-                    s.get('id'),
-                    loc if (loc and loc != 'UNKNOWN') else '',
-                    p_source,
-                ))
+                    occupancy_map[loc] += 1
+            else:
+                unassigned_count += 1 # type: ignore # pyre-ignore
+            
+            # [ALEX FIX] Ghost Occupancy Count
+            # Ensure deployed items still count towards their home box's total
+            p_source = str(extra.get('physical_source', '')).upper().strip().replace('"', '')
+            if p_source and p_source != loc:
+                occupancy_map[p_source] = occupancy_map.get(p_source, 0) + 1
+
+            # L271 Phase 3.5 (review fix #2): record this spool for the
+            # distinct-count ancestor rollup. loc is '' for unassigned and
+            # 'UNKNOWN' for the lost bucket — neither rolls into a room.
+            spool_entries.append((
+                s.get('id'),
+                loc if (loc and loc != 'UNKNOWN') else '',
+                p_source,
+            ))
 
     except: pass
 
@@ -138,6 +142,9 @@ def api_get_locations():
     # occupancy_map (loc + ghost at the exact row) so a box keeps showing its
     # deployed ghosts.
     parent_map = locations_db.build_parent_map(csv_rows)
+    # One closure-table build, then each spool's rollup is a tuple lookup
+    # instead of a hop-by-hop walk per (spool, base).
+    hierarchy = locations_db.LocationHierarchy(parent_map)
 
     # Immediate-child counts so a row can be classified parent-vs-leaf for the
     # occupancy display (a real parent shows a subtree Total; a leaf shows
@@ -154,7 +161,7 @@ def api_get_locations():
         for base in (loc, ghost):
             if not base:
                 continue
-            ancs = list(locations_db.ancestors_of(base, parent_map))
+            ancs = hierarchy.ancestors(base)
             touched.add(base)
             touched.update(ancs)
             for anc in ancs:
@@ -576,7 +583,7 @@ def api_merge_filament(src_fid, dst_fid):
     # follow it to the target so we can safely delete the source.
     sm_url, _ = config_loader.get_api_urls()
     try:
-        r = requests.get(
+        r = spoolman_http.get(
             f"{sm_url}/api/v1/spool?filament_id={src_fid}&allow_archived=true",
             timeout=5,
         )
@@ -1,8 +1,8 @@
 """Print-queue + label-flag routes (L316 step 8).
 
-Moved verbatim from app.py: /api/print_queue/pending (raw requests.get to
-Spoolman with the inline URL-encoded extra filter — deliberately bypasses
-spoolman_api; tests patch 'requests.get' directly), mark_printed and
+Moved verbatim from app.py: /api/print_queue/pending (raw spoolman_http.get
+to Spoolman with the inline URL-encoded extra filter — deliberately bypasses
+spoolman_api; tests patch 'spoolman_http.get' directly), mark_printed and
 set_flag (full-extra read-modify-write Spoolman surfaces; their behavioral
 asymmetries — int-coercion, missing-id handling, HTTP-200 error bodies —
 are pinned by tests/test_l316_charact_queue_flags.py, do not normalize),
@@ -13,7 +13,7 @@ sibling preservation).
 Python 3.9 runtime (the container image) — keep syntax 3.9-safe.
 """
 from flask import request, jsonify  # type: ignore
-import requests  # type: ignore
+import spoolman_http  # type: ignore
 
 import state  # type: ignore
 import config_loader  # type: ignore
@@ -32,7 +32,7 @@ def api_print_queue_pending():
     try:
         # Fetch Spools
         if filter_type in ['all', 'spool']:
-            r_spools = requests.get(f"{sm_url}/api/v1/spool?extra=%7B%22needs_label_print%22%3Atrue%7D", timeout=2)
+            r_spools = spoolman_http.get(f"{sm_url}/api/v1/spool?extra=%7B%22needs_label_print%22%3Atrue%7D", timeout=2)
             if r_spools.ok:
                 for s in r_spools.json():
                     s['type'] = 'spool'
@@ -41,7 +41,7 @@ def api_print_queue_pending():
         
         # Fetch Filaments
         if filter_type in ['all', 'filament']:
-            r_fils = requests.get(f"{sm_url}/api/v1/filament?extra=%7B%22needs_label_print%22%3Atrue%7D", timeout=2)
+            r_fils = spoolman_http.get(f"{sm_url}/api/v1/filament?extra=%7B%22needs_label_print%22%3Atrue%7D", timeout=2)
             if r_fils.ok:
                 for f in r_fils.json():
                     f['type'] = 'filament'
@@ -13,13 +13,24 @@ Wiring notes:
   (module-qualified — the only text change in the move).
 - state.GLOBAL_BUFFER / GLOBAL_QUEUE are read AND whole-replaced as
   attributes of the state module (never from-imported).
+- /api/metrics exposes process-local counters (the pooled Spoolman
+  transport's stats) for monitoring.
 - No dependency on print_monitor (verified by scan) — the pulse
   printer-status section probes printers via prusalink_api directly.
+- /api/dashboard_pulse assembles its sections inside spoolman_cache.pinned()
+  (one spool snapshot per pulse) and answers a GET's matching If-None-Match
+  with 304 (_conditional_json).
+- /api/events is the SSE push channel (event_stream): the topic sources
+  (buffer, queue, logs, undo, audit, reviews, printer_state) are registered
+  at the bottom of this module, and an after_request hook samples them after
+  every state-changing request.
 
 Python 3.9 runtime (the container image) — keep syntax 3.9-safe.
 """
-from flask import request, jsonify  # type: ignore
-import requests  # type: ignore
+from flask import Response, request, jsonify  # type: ignore
+import spoolman_cache  # type: ignore
+import spoolman_http  # type: ignore
+import hashlib
 import time
 
 import state  # type: ignore
@@ -28,6 +39,14 @@ import locations_db  # type: ignore
 import spoolman_api  # type: ignore
 import logic  # type: ignore
 import prusalink_api  # type: ignore
+import print_file_cache  # type: ignore
+import printer_state_hub  # type: ignore
+import hub_store  # type: ignore
+import print_tracker_store  # type: ignore
+import prusalink_poller  # type: ignore
+import cancel_review_store  # type: ignore
+import event_stream  # type: ignore
+import wsgi_server  # type: ignore
 
 import routes_locations  # type: ignore
 
@@ -166,24 +185,84 @@ def _check_audit_idle_timeout():
             "WARNING", "ffaa00",
         )
         state.reset_audit()
+        event_stream.changed("audit", "logs")
+
+
+@app.route('/api/metrics', methods=['GET'])
+def api_metrics():
+    """Process-local performance counters for monitoring. `spoolman_http`
+    carries the pooled Spoolman transport's request/error/retry counts and
+    per-host pool state (connections opened vs. requests served — a healthy
+    keep-alive pool opens a handful of sockets for thousands of requests).
+    `spoolman_cache` carries the spool/filament snapshot hit/fetch counters;
+    `locations_store` / `config_cache` the in-memory locations.json and
+    config.json snapshots' hit/reload counters; `print_file_cache` the on-disk
+    print-file cache's hits, stores, evictions and footprint; `print_downloads`
+    the streamed PrusaLink file downloads (totals + in-flight progress);
+    `printer_state_hub` the shared PrusaLink state's probe/hit counters and
+    each printer's last state and its age; `prusalink_poller` the monitor
+    sweep's latency, probe/skip counts and the printers in offline backoff;
+    `spoolman_bulk` the bulk filament writes' counters and the progress of
+    any running right now; `hub_store` the row counts and on-disk size of
+    the SQLite store behind the deduct ledger, cancel queues and print
+    latch; `print_tracker_store` the latch saves, the writes they actually
+    cost and the ones skipped as unchanged or coalesced; `event_stream` the
+    push channel's connected / refused streams and events sent; `http_server`
+    the pooled server's busy / queued workers, keep-alive reuse and refused
+    connections (running=false under the simple server)."""
+    return jsonify({
+        "spoolman_http": spoolman_http.get_stats(),
+        "spoolman_cache": spoolman_cache.get_stats(),
+        "locations_store": locations_db.get_store_stats(),
+        "config_cache": config_loader.get_config_cache_stats(),
+        "print_file_cache": print_file_cache.get_stats(),
+        "print_downloads": prusalink_api.get_download_stats(),
+        "printer_state_hub": printer_state_hub.get_stats(),
+        "prusalink_poller": prusalink_poller.get_stats(),
+        "spoolman_bulk": spoolman_api.get_bulk_stats(),
+        "hub_store": hub_store.get_stats(),
+        "print_tracker_store": print_tracker_store.get_stats(),
+        "event_stream": event_stream.get_stats(),
+        "http_server": wsgi_server.get_stats(),
+    })
+
+
+def _logs_fields(since=None, limit=None):
+    """The activity-log part of the /api/logs payload: the entries after the
+    client's cursor `since` (state.logs_since), the new cursor and whether
+    the client must replace its list rather than prepend (``reset``), plus
+    the ring size so it trims its copy to the same history."""
+    entries, seq, reset = state.logs_since(since, limit=limit)
+    return {
+        "logs": entries,
+        "seq": seq,
+        "reset": reset,
+        "history": state.log_history_size(),
+    }
 
 
 @app.route('/api/logs', methods=['GET'])
-def api_get_logs_route():
+def api_get_logs_route(since=None):
+    """Log heartbeat. ``?since=<seq>`` (the ``seq`` of the last response)
+    returns only the entries written after it; without it, the whole
+    history with reset=true. The pulse passes its own ``logs_since``."""
     # Cheap pre-flight: clear any abandoned audit session before the
     # frontend sees audit_active=True and auto-opens the panel.
     _check_audit_idle_timeout()
     sm_url, _ = config_loader.get_api_urls()
     sm_ok = False
-    try: sm_ok = requests.get(f"{sm_url}/api/v1/health", timeout=3).ok
+    try: sm_ok = spoolman_http.get(f"{sm_url}/api/v1/health", timeout=3).ok
     except: pass
 
-    return jsonify({
-        "logs": state.RECENT_LOGS,
+    if since is None:
+        since = request.args.get('since')
+    payload = _logs_fields(since)
+    payload.update({
         "undo_available": len(state.UNDO_STACK) > 0,
         "audit_active": state.AUDIT_SESSION.get('active', False),
         "status": {"spoolman": sm_ok}
     })
+    return jsonify(payload)
 
 
 # ---------------------------------------------------------------------------
@@ -211,8 +290,9 @@ def _pulse_section_logs():
     """Invoke the /api/logs handler and unwrap its JSON. Preserves the
     audit-idle-watchdog side effect because the bulk endpoint REPLACES the
     legacy heartbeat that used to drive it - losing it would silently break
-    audit cancellation."""
-    resp = api_get_logs_route()
+    audit cancellation. ``?logs_since=<seq>`` is the logs cursor (see
+    /api/logs ``since``)."""
+    resp = api_get_logs_route(since=request.args.get('logs_since'))
     return resp.get_json()
 
 
@@ -261,8 +341,6 @@ def _pulse_section_printer_status():
     has no binding dependency. `state` is None when the printer is
     offline or unreachable so the widget can show an offline indicator.
     """
-    from concurrent.futures import ThreadPoolExecutor
-
     cfg = config_loader.load_config()
     printer_map = locations_db.get_active_printer_map()  # L271 P4 step 2: Printer-row toolheads[] (dual-read)
     _, fb_url = config_loader.get_api_urls()
@@ -313,18 +391,23 @@ def _pulse_section_printer_status():
         # so the widget ticks for dryer-box-less printers (L56). NOTE: cancel
         # DETECTION no longer rides this probe — it runs in the dashboard-
         # independent _cancel_monitor daemon (so an unattended print with FCC
-        # unfocused/closed is still caught). This probe is widget-display only.
+        # unfocused/closed is still caught). This probe is widget-display only,
+        # and is normally served from printer_state_hub — the monitor's last
+        # sweep or another kiosk's pulse — so more open kiosks ≠ more probes.
+        # A printer the monitor has backed off as offline (prusalink_poller)
+        # reads as offline without paying its connect timeout again.
         try:
-            state_info = prusalink_api.get_printer_state(fb_url, name)
+            if prusalink_poller.in_backoff(name):
+                state_info = None
+            else:
+                state_info = prusalink_api.get_printer_state(fb_url, name)
         except Exception:
             state_info = None
         return name, {'toolheads': toolheads, 'state': state_info}
 
     out = {}
-    max_workers = max(1, min(8, len(grouped)))
-    with ThreadPoolExecutor(max_workers=max_workers) as ex:
-        for name, payload in ex.map(fetch_for_printer, grouped.items()):
-            out[name] = payload
+    for name, payload in prusalink_poller.map_printers(fetch_for_printer, grouped.items()):
+        out[name] = payload
     return out
 
 
@@ -338,6 +421,8 @@ def api_dashboard_pulse():
                 names are silently ignored (forward-compat).
       manage_id required when 'manage' is in include - the LocationID
                 whose contents to fetch.
+      logs_since the logs section's cursor: the ``seq`` of the last
+                logs payload. Only newer entries are sent (see /api/logs).
     Body (POST): {"refresh_spool_ids": [123, 124, ...]} - if present
                 and non-empty, the response includes a "spools_refresh"
                 section keyed by spool id, equivalent to a POST to
@@ -346,8 +431,21 @@ def api_dashboard_pulse():
     Returns: {section_name: payload, ...}. Sections that error
     individually return {"error": "..."} in their slot; the response
     as a whole stays 200 so a partial failure doesn't blank the
-    dashboard.
+    dashboard. Every GET response carries an ETag; a GET whose
+    If-None-Match matches it gets 304 with no body. POSTs are never
+    conditional.
     """
+    with spoolman_cache.pinned():
+        out = _assemble_pulse()
+    return _conditional_json(out)
+
+
+def _assemble_pulse():
+    """Build the pulse payload for the current request. Runs inside
+    spoolman_cache.pinned(): the locations occupancy count, the manage
+    contents and the printer_status toolhead buckets all read the shared
+    spool index, so one pulse fetches (or reuses) ONE spool-list snapshot
+    however many sections it carries and however short the cache TTL."""
     raw_include = (request.args.get('include') or '').strip()
     requested = set(s.strip().lower() for s in raw_include.split(',') if s.strip())
     include = requested & _VALID_PULSE_SECTIONS
@@ -414,4 +512,105 @@ def api_dashboard_pulse():
         except Exception as e:
             out['spools_refresh'] = {'error': str(e)}
 
-    return jsonify(out)
+    return out
+
+
+def _conditional_json(payload):
+    """jsonify(payload) with a strong ETag over the body. A kiosk that sends
+    the ETag of its last pulse back in If-None-Match gets an empty 304 while
+    nothing it asked for changed — it skips the transfer AND the re-render.
+    GET / HEAD only: a 304 is not a valid answer to a POST (RFC 9110 §13.1.2
+    — a matching validator on any other method is a 412), so the POST form
+    (refresh_spool_ids) always gets the full body and no ETag. The app-wide
+    no-store Cache-Control (app_core) stays: the kiosk keeps the ETag itself,
+    the browser cache never holds a pulse."""
+    resp = jsonify(payload)
+    if request.method not in ('GET', 'HEAD'):
+        return resp
+    resp.set_etag(hashlib.sha1(resp.get_data()).hexdigest())
+    etag, _weak = resp.get_etag()
+    if request.if_none_match.contains(etag):
+        resp.status_code = 304
+        resp.set_data(b'')
+        resp.headers.pop('Content-Type', None)
+    return resp
+
+
+# ---------------------------------------------------------------------------
+# /api/events — Server-Sent Events push channel (event_stream)
+#
+# Replaces the dashboard's polling loops while a stream is open: the buffer /
+# queue 2s polls, the audit panel's 2s poll, the cancel-review badge's 20s poll
+# and most of the pulse (which drops to a slow safety-net cadence). Each topic
+# below is a cheap in-process snapshot; event_stream sends it only when it
+# differs from the last one sent.
+# ---------------------------------------------------------------------------
+
+@app.route('/api/events', methods=['GET'])
+def api_events():
+    """SSE stream of state changes (see event_stream). 503 when push is off
+    (push_max_clients = 0) or every stream slot is taken — the client keeps
+    polling and tries again later. A reconnecting browser's Last-Event-ID is
+    replayed from."""
+    if not event_stream.open_stream():
+        return jsonify({"error": "push channel unavailable; poll instead"}), 503
+    last_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    resp = Response(event_stream.stream(last_id), mimetype='text/event-stream')
+    # Keep a reverse proxy (nginx) from buffering the stream.
+    resp.headers['X-Accel-Buffering'] = 'no'
+    resp.call_on_close(event_stream.close_stream)
+    return resp
+
+
+# Newest log entries carried by each "logs" push event. A snapshot, like
+# every topic's — a client merges the ones past its cursor and, when the tail
+# doesn't reach back to it (it missed more than this), fetches /api/logs?since.
+PUSH_LOG_TAIL = 20
+
+
+def _push_logs():
+    """The /api/logs heartbeat minus the Spoolman health check (a network
+    call; the pulse still carries it), with only the newest entries."""
+    payload = _logs_fields(limit=PUSH_LOG_TAIL)
+    payload["reset"] = False
+    payload.update({
+        "undo_available": len(state.UNDO_STACK) > 0,
+        "audit_active": state.AUDIT_SESSION.get('active', False),
+    })
+    return payload
+
+
+def _push_audit():
+    sess = state.AUDIT_SESSION
+    return {
+        "active": bool(sess.get('active')),
+        "location_id": sess.get('location_id'),
+        "expected": list(sess.get('expected_items') or []),
+        "scanned": list(sess.get('scanned_items') or []),
+        "rogue": list(sess.get('rogue_items') or []),
+    }
+
+
+event_stream.register("buffer", lambda: state.GLOBAL_BUFFER)
+event_stream.register("queue", lambda: state.GLOBAL_QUEUE)
+event_stream.register("logs", _push_logs)
+event_stream.register("undo", lambda: {"undo_available": len(state.UNDO_STACK) > 0})
+event_stream.register("audit", _push_audit)
+event_stream.register("reviews", lambda: {"pending": cancel_review_store.list_pending()})
+event_stream.register("printer_state", printer_state_hub.states)
+# The audit idle watchdog used to ride the polled /api/logs; with the polls
+# gone it runs on the stream heartbeat too.
+event_stream.add_tick_hook(_check_audit_idle_timeout)
+# A log line (from a request or a background thread — the print monitor, a
+# deduct) goes out as it is written; a cancel review is always logged too.
+state.LOG_LISTENERS.append(lambda: event_stream.changed("logs", "reviews"))
+
+
+@app.after_request
+def _push_after_mutation(r):
+    """Sample every push topic after a state-changing request (scan, move,
+    undo, buffer / queue persist, review confirm …). GETs don't change
+    state — except the audit watchdog, which publishes its own change."""
+    if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+        event_stream.changed()
+    return r
@@ -1,8 +1,14 @@
 import requests # type: ignore
+import spoolman_http # type: ignore  # pooled keep-alive transport for every Spoolman call
+import spoolman_cache # type: ignore  # shared spool/filament list snapshots
 import state # type: ignore
 import config_loader # type: ignore
 import locations_db # type: ignore  # L271 Phase 2: single hierarchy resolver
+import contextlib
+import copy
 import json
+import threading
+import time
 
 def parse_inbound_data(data):
     """Recursively intercepts data incoming from Spoolman and deserializes JSON strings safely."""
@@ -81,33 +87,266 @@ class SpoolmanRejection(Exception):
         self.message = message or LAST_SPOOLMAN_ERROR or "Spoolman rejected the request"
         super().__init__(self.message)
 
+# Per-thread raw_spool_reads() scope: {str(sid): raw wire-form record}.
+_raw_reads = threading.local()
+
+
+@contextlib.contextmanager
+def raw_spool_reads():
+    """Keep the raw (wire-form) record of every spool get_spool fetches on
+    this thread inside the block; yields that {str(sid): record} dict.
+
+    update_spool reads the record it needs from the innermost open scope
+    instead of fetching it — a caller that just called get_spool(sid) and is
+    about to update it pays no second GET — and refreshes the scope with its
+    PATCH response, so a later update of the same spool in the block starts
+    from what Spoolman now holds. Only open a scope around code whose spool
+    writes all go through update_spool (a raw PATCH would leave it stale)."""
+    outer = getattr(_raw_reads, 'spools', None)
+    seen = {}
+    _raw_reads.spools = seen
+    try:
+        yield seen
+    finally:
+        _raw_reads.spools = outer
+
+
 def get_spool(sid):
     sm_url, _ = config_loader.get_api_urls()
     try:
-        return parse_inbound_data(requests.get(f"{sm_url}/api/v1/spool/{sid}", timeout=3).json())
+        raw = spoolman_http.get(f"{sm_url}/api/v1/spool/{sid}", timeout=3).json()
+        seen = getattr(_raw_reads, 'spools', None)
+        if seen is not None and isinstance(raw, dict) and raw.get('id') is not None:
+            seen[str(sid)] = copy.deepcopy(raw)
+        return parse_inbound_data(raw)
     except: return None
 
 
+def _fetch_collection(sm_url, kind):
+    """One full-list GET for the snapshot cache. Always asks for archived
+    records too so a single snapshot serves both the archived-inclusive and
+    the default (archived-omitted) views; _snapshot filters locally."""
+    r = spoolman_http.get(f"{sm_url}/api/v1/{kind}?allow_archived=true", timeout=10)
+    if not r.ok:
+        raise requests.HTTPError(f"Spoolman {kind} list: HTTP {r.status_code}", response=r)
+    return r.json()
+
+
+def _snapshot(kind, allow_archived=True):
+    """Private copy of the whole spool / filament list (RAW wire form — run
+    parse_inbound_data on it if you need decoded extras) from the shared
+    snapshot cache (see spoolman_cache). allow_archived=False reproduces
+    Spoolman's default list (archived records omitted). RAISES on fetch
+    failure; best-effort callers wrap it."""
+    sm_url, _ = config_loader.get_api_urls()
+    items = spoolman_cache.get_items(kind, sm_url, lambda: _fetch_collection(sm_url, kind))
+    if not allow_archived:
+        items = [x for x in items if not (isinstance(x, dict) and x.get('archived'))]
+    return items
+
+
+def invalidate_snapshots(kind=None):
+    """Drop the cached spool/filament lists after a write that bypassed the
+    write-through helpers below (raw PATCHes, extra-field schema rebuilds)."""
+    spoolman_cache.invalidate(kind)
+
+
+def _spool_physical_source(s):
+    # Strip the literal quotes that Spoolman adds to JSON String Fields — the
+    # same normalization _build_location_match applies.
+    return str((s.get('extra', {}) or {}).get('physical_source', '')).strip().replace('"', '').upper()
+
+
+def build_spool_index(spools):
+    """Secondary indexes over a spool list (parse_inbound_data output;
+    archived records included — readers filter). Each map goes key → list of
+    positions into index['spools'], ascending, so a lookup returns spools in
+    Spoolman's list order exactly like the linear scans it replaces:
+
+      by_location         location.upper() ('' = unassigned)
+      by_location_parent  derive_parent_id_from_prefix(location)
+      by_source           ghost physical_source, quote-stripped + upper-cased
+      by_source_parent    derive_parent_id_from_prefix(physical_source)
+      by_filament         filament.id
+
+    The four location maps are precisely the clauses of the
+    _build_location_match / get_spools_at_location_strict predicate, so the
+    union of a target's four buckets IS its candidate set — O(1) per target
+    instead of a scan of every spool. The index is shared (see
+    get_spool_index): never mutate it or the spools it holds.
+    """
+    spools = spools if isinstance(spools, list) else []
+    idx = {
+        'spools': spools,
+        'by_location': {},
+        'by_location_parent': {},
+        'by_source': {},
+        'by_source_parent': {},
+        'by_filament': {},
+    }
+
+    def add(name, key, pos):
+        if key is not None:
+            idx[name].setdefault(key, []).append(pos)
+
+    for pos, s in enumerate(spools):
+        if not isinstance(s, dict):
+            continue
+        sloc = (s.get('location') or '').strip()
+        add('by_location', sloc.upper(), pos)
+        add('by_location_parent', locations_db.derive_parent_id_from_prefix(sloc), pos)
+        p_source = _spool_physical_source(s)
+        add('by_source', p_source, pos)
+        add('by_source_parent', locations_db.derive_parent_id_from_prefix(p_source), pos)
+        add('by_filament', (s.get('filament') or {}).get('id'), pos)
+    return idx
+
+
+def _build_filament_index(filaments):
+    """{'by_external_id': legacy id → FIRST non-archived filament id} — the
+    filament find_filament_by_legacy_id / find_spools_by_legacy_id's linear
+    scans of the bare (archived-omitted) filament list used to stop at."""
+    by_ext = {}
+    for fil in parse_inbound_data(filaments if isinstance(filaments, list) else []):
+        if not isinstance(fil, dict) or fil.get('archived') or fil.get('id') is None:
+            continue
+        ext = str(fil.get('external_id', '')).strip().replace('"', '')
+        by_ext.setdefault(ext, fil['id'])
+    return {'by_external_id': by_ext}
+
+
+def get_spool_index():
+    """build_spool_index over the shared spool snapshot, built once per
+    snapshot (rebuilt after a refresh or write-through). RAISES on fetch
+    failure, like _snapshot."""
+    sm_url, _ = config_loader.get_api_urls()
+    return spoolman_cache.get_derived(
+        spoolman_cache.SPOOLS, sm_url, 'index',
+        lambda items: build_spool_index(parse_inbound_data(items)),
+        lambda: _fetch_collection(sm_url, spoolman_cache.SPOOLS))
+
+
+def _get_filament_index():
+    sm_url, _ = config_loader.get_api_urls()
+    return spoolman_cache.get_derived(
+        spoolman_cache.FILAMENTS, sm_url, 'index', _build_filament_index,
+        lambda: _fetch_collection(sm_url, spoolman_cache.FILAMENTS))
+
+
+def _index_lookup(idx, name, key, allow_archived=False):
+    spools = idx['spools']
+    out = [spools[pos] for pos in idx[name].get(key, ())]
+    if not allow_archived:
+        out = [sp for sp in out if not sp.get('archived')]
+    return out
+
+
+def _index_location_candidates(idx, target_loc_upper, check_unassigned=False):
+    """Non-archived spools that can match `target_loc_upper` (direct, first-
+    segment child, or ghost), in list order. _build_location_match still makes
+    the final call (direct beats ghost, builds the item)."""
+    if check_unassigned:
+        return _index_lookup(idx, 'by_location', '')
+    positions = set()
+    for name in ('by_location', 'by_location_parent', 'by_source', 'by_source_parent'):
+        positions.update(idx[name].get(target_loc_upper, ()))
+    spools = idx['spools']
+    return [spools[pos] for pos in sorted(positions) if not spools[pos].get('archived')]
+
+
 def get_all_spools(allow_archived=True):
     """Return every spool (optionally including archived) as parsed dicts.
     Backs the Prusament-scan matcher, which finds a spool by its stored
     extra.product_url. Best-effort: returns [] on any failure."""
-    sm_url, _ = config_loader.get_api_urls()
-    q = "?allow_archived=true" if allow_archived else ""
     try:
-        r = requests.get(f"{sm_url}/api/v1/spool{q}", timeout=5)
-        if not r.ok:
-            return []
-        return parse_inbound_data(r.json())
+        return parse_inbound_data(_snapshot(spoolman_cache.SPOOLS, allow_archived))
     except Exception as e:
         state.logger.error(f"get_all_spools failed: {e}")
         return []
 
+# get_spools_by_ids: at or below this many ids, and with no warm snapshot,
+# fetch each spool individually (concurrently, over the keep-alive pool) — a
+# handful of small GETs beats one full-list download. Above it, one list
+# fetch answers the whole set.
+LIVE_FANOUT_MAX = 4
+
+
+def _get_spools_concurrently(ids):
+    from concurrent.futures import ThreadPoolExecutor
+    if len(ids) == 1:
+        return {str(ids[0]): get_spool(ids[0])}
+    with ThreadPoolExecutor(max_workers=min(LIVE_FANOUT_MAX, len(ids))) as ex:
+        return {str(sid): sp for sid, sp in zip(ids, ex.map(get_spool, ids))}
+
+
+def get_spools_by_ids(spool_ids):
+    """Resolve many spool ids at once. Returns {str(id): parsed spool dict}
+    for every id that resolved; unknown / failed ids are simply absent.
+
+    Batched replacement for a `get_spool` loop (the dashboard live-refresh of
+    a 30-spool buffer was 30 sequential round-trips per heartbeat): sets
+    larger than LIVE_FANOUT_MAX (or any set, while a snapshot is warm) come
+    from ONE spool-list snapshot (archived included, as get_spool returns
+    archived spools too); ids the list doesn't have — e.g. created elsewhere
+    since the snapshot — fall back to individual GETs, as do small sets.
+    Records are the same shape get_spool returns."""
+    ids, seen = [], set()
+    for sid in (spool_ids or []):
+        key = str(sid)
+        if key not in seen:
+            seen.add(key)
+            ids.append(sid)
+    found = {}
+    if ids and (len(ids) > LIVE_FANOUT_MAX or spoolman_cache.is_fresh(
+            spoolman_cache.SPOOLS, config_loader.get_api_urls()[0])):
+        for s in get_all_spools(allow_archived=True):
+            key = str(s.get('id'))
+            if key in seen:
+                found[key] = s
+    missing = [sid for sid in ids if str(sid) not in found]
+    if missing:
+        found.update(_get_spools_concurrently(missing))
+    # get_spool hands back Spoolman's {"detail": ...} body for a 404 — not a spool.
+    return {k: v for k, v in found.items() if isinstance(v, dict) and v.get('id') is not None}
+
+
+def get_raw_spools_by_ids(spool_ids):
+    """{str(id): raw wire-form spool record} for many spools from ONE
+    spool-list read (archived included); ids the list doesn't have fall
+    back to individual GETs. The bulk-move counterpart of get_spools_by_ids:
+    parse a record (parse_inbound_data on a copy) for the get_spool shape and
+    hand the record itself to update_spool(prefetched=...) so the write
+    doesn't read the spool again.
+
+    Because those writes are planned from these records and PATCH without
+    re-reading, the list is never served from cache: the snapshot is dropped
+    and read afresh, so a location or extra changed outside FCC within
+    spoolman_cache_ttl isn't planned from (and written back) stale."""
+    wanted = {str(sid) for sid in (spool_ids or [])}
+    found = {}
+    if not wanted:
+        return found
+    try:
+        invalidate_snapshots(spoolman_cache.SPOOLS)
+        for s in _snapshot(spoolman_cache.SPOOLS):
+            if isinstance(s, dict) and str(s.get('id')) in wanted:
+                found[str(s['id'])] = s
+    except Exception as e:
+        state.logger.warning(f"get_raw_spools_by_ids: spool list unavailable ({e}); reading spools one by one")
+    missing = [sid for sid in spool_ids if str(sid) not in found]
+    if missing:
+        with raw_spool_reads() as seen:
+            for sid in missing:
+                get_spool(sid)
+        found.update(seen)
+    return found
+
+
 def get_all_locations():
     """Fetches all locations from Spoolman."""
     sm_url, _ = config_loader.get_api_urls()
     try: 
-        resp = requests.get(f"{sm_url}/api/v1/location", timeout=3)
+        resp = spoolman_http.get(f"{sm_url}/api/v1/location", timeout=3)
         if resp.ok:
             return resp.json()
         return []
@@ -117,7 +356,7 @@ def get_all_locations():
 def get_filament(fid):
     """Fetches a specific filament definition."""
     sm_url, _ = config_loader.get_api_urls()
-    try: return parse_inbound_data(requests.get(f"{sm_url}/api/v1/filament/{fid}", timeout=3).json())
+    try: return parse_inbound_data(spoolman_http.get(f"{sm_url}/api/v1/filament/{fid}", timeout=3).json())
     except: return None
 
 def sanitize_outbound_data(data):
@@ -286,25 +525,53 @@ def _auto_unarchive_on_refill(data, existing):
             data['location'] = prev_loc
 
 
-def update_spool(sid, data):
+def update_spool(sid, data, prefetched=None):
     """Returns the updated spool dict on success, or None on failure.
 
     The last Spoolman error message is stashed in module-global
     LAST_SPOOLMAN_ERROR so callers can surface the actual rejection
     reason to the UI. Use update_spool_or_raise for paths that must
     never silent-fail (slot assignment, label-confirm, force-move).
+
+    Reads the existing record ONCE: both the parsed view (weight cap,
+    auto-archive) and the raw extras the merge needs come from the same
+    response — previously get_spool and then _get_raw_extras, two GETs
+    before every PATCH. `prefetched` (the spool in raw wire form: a
+    snapshot record or an earlier update_spool return) skips the read
+    entirely, as does a record held by an open raw_spool_reads() scope.
     """
-    global LAST_SPOOLMAN_ERROR
     sm_url, _ = config_loader.get_api_urls()
+    scope = getattr(_raw_reads, 'spools', None)
+    if prefetched is None and scope is not None:
+        prefetched = scope.get(str(sid))
+    with raw_spool_reads() as seen:
+        if prefetched is not None:
+            seen[str(sid)] = prefetched
+        updated = _update_spool_once(sid, data, prefetched, sm_url)
+    if scope is not None:
+        if updated is not None:
+            scope[str(sid)] = copy.deepcopy(updated)
+        else:
+            scope.pop(str(sid), None)  # unknown state now; the next update reads it
+    return updated
+
+
+def _update_spool_once(sid, data, prefetched, sm_url):
+    """update_spool's body, run inside its own raw_spool_reads() scope so the
+    get_spool below and the _get_raw_extras merge share one GET."""
+    global LAST_SPOOLMAN_ERROR
     try:
         # [ALEX FIX] Intercept "UNASSIGNED" and coerce into empty string for Spoolman API
         if 'location' in data and isinstance(data['location'], str):
             if data['location'].strip().upper() == 'UNASSIGNED':
                 data['location'] = ''
 
-        # Fetch the existing spool once — used for the used_weight cap AND the
-        # auto-archive-on-empty check below. Cheaper than two round-trips.
-        existing = get_spool(sid) or {}
+        # Fetch the existing spool once — used for the used_weight cap, the
+        # auto-archive-on-empty check AND (raw, via the scope) the extras merge.
+        if prefetched is not None:
+            existing = parse_inbound_data(copy.deepcopy(prefetched))
+        else:
+            existing = get_spool(sid) or {}
 
         # [ALEX FIX] Ensure used_weight never crashes SQLAlchemy due to constraint by artificially capping to initial_weight
         if 'used_weight' in data:
@@ -357,16 +624,20 @@ def update_spool(sid, data):
             clean_data = data
         else:
             clean_data = sanitize_outbound_data(data)
-        r = requests.patch(f"{sm_url}/api/v1/spool/{sid}", json=clean_data)
+        r = spoolman_http.patch(f"{sm_url}/api/v1/spool/{sid}", json=clean_data)
         if r.ok:
             LAST_SPOOLMAN_ERROR = None
-            return r.json()
+            updated = r.json()
+            spoolman_cache.upsert(spoolman_cache.SPOOLS, updated)
+            return updated
         err_body = r.text
         state.logger.error(f"Failed to update spool {sid}: {r.status_code} - {err_body}")
-        LAST_SPOOLMAN_ERROR = f"HTTP {r.status_code}: {err_body[:400]}"
+        err = f"HTTP {r.status_code}: {err_body[:400]}"
     except Exception as e:
         state.logger.error(f"API Error updating spool {sid}: {e}")
-        LAST_SPOOLMAN_ERROR = str(e)[:400]
+        err = str(e)[:400]
+    LAST_SPOOLMAN_ERROR = err
+    _bulk_tls.error = err  # see update_filament
     return None
 
 
@@ -395,9 +666,11 @@ def create_spool(data):
                 data['used_weight'] = data['initial_weight']
         
         clean_data = sanitize_outbound_data(data)
-        r = requests.post(f"{sm_url}/api/v1/spool", json=clean_data, timeout=5)
+        r = spoolman_http.post(f"{sm_url}/api/v1/spool", json=clean_data, timeout=5)
         if r.ok:
-            return r.json()
+            created = r.json()
+            spoolman_cache.upsert(spoolman_cache.SPOOLS, created)
+            return created
         state.logger.error(f"Failed to create spool: {r.status_code} - {r.text}")
     except Exception as e:
         state.logger.error(f"API Error creating spool: {e}")
@@ -412,9 +685,14 @@ def _get_raw_extras(entity, eid):
     text-type validator accepts them. Calling get_filament() runs
     parse_inbound_data which strips the outer quotes; the round-trip
     then sends `225` (parses as int) and Spoolman 400s."""
+    if entity == 'spool':
+        # Already fetched in this raw_spool_reads() scope (update_spool).
+        rec = (getattr(_raw_reads, 'spools', None) or {}).get(str(eid))
+        if rec is not None:
+            return dict(rec.get('extra') or {})
     try:
         sm_url, _ = config_loader.get_api_urls()
-        r = requests.get(f"{sm_url}/api/v1/{entity}/{eid}", timeout=3)
+        r = spoolman_http.get(f"{sm_url}/api/v1/{entity}/{eid}", timeout=3)
         if r.ok:
             return (r.json() or {}).get('extra') or {}
     except Exception:
@@ -561,7 +839,9 @@ def update_filament(fid, data):
         # wire form. Skip the late sanitize on the merged dict — running
         # it twice on already-wrapped values would double-wrap and the
         # literal quote chars would leak (the original product_url bug).
-        existing_extras = _get_raw_extras('filament', fid)
+        existing_extras = _prefetched_raw_extras(fid)
+        if existing_extras is None:
+            existing_extras = _get_raw_extras('filament', fid)
         caller_sanitized = sanitize_outbound_data({'extra': data['extra']}).get('extra', {})
         data = dict(data)  # don't mutate caller's payload
         data['extra'] = _merge_extras_with_existing(existing_extras, caller_sanitized)
@@ -569,16 +849,25 @@ def update_filament(fid, data):
     else:
         sanitized = sanitize_outbound_data(data)
     try:
-        r = requests.patch(f"{sm_url}/api/v1/filament/{fid}", json=sanitized, timeout=2)
+        r = spoolman_http.patch(f"{sm_url}/api/v1/filament/{fid}", json=sanitized, timeout=2)
         if r.ok:
             LAST_SPOOLMAN_ERROR = None
-            return r.json()
+            updated = r.json()
+            spoolman_cache.upsert(spoolman_cache.FILAMENTS, updated)
+            spoolman_cache.replace_embedded_filament(updated)
+            return updated
         err_body = r.text
         state.logger.error(f"Failed to update filament {fid}: {r.status_code} - {err_body}")
-        LAST_SPOOLMAN_ERROR = f"HTTP {r.status_code}: {err_body[:400]}"
+        err = f"HTTP {r.status_code}: {err_body[:400]}"
     except Exception as e:
         state.logger.error(f"API Error updating filament {fid}: {e}")
-        LAST_SPOOLMAN_ERROR = str(e)[:400]
+        err = str(e)[:400]
+    # Both are set from this call's own message. The global is last-writer-
+    # wins across threads, so a copy read back from it could already be
+    # another bulk worker's error (or the None of its success);
+    # update_filaments / update_spools report the per-thread copy.
+    LAST_SPOOLMAN_ERROR = err
+    _bulk_tls.error = err
     return None
 
 
@@ -594,14 +883,265 @@ def update_filament_or_raise(fid, data):
     return result
 
 
+# ---------------------------------------------------------------------------
+# Bulk filament / spool writes
+#
+# A loop of update_filament calls costs two serial round-trips per filament:
+# the _get_raw_extras GET that protects sibling extras, then the PATCH. The
+# attributes manager's bulk_set over a 200-filament selection was 400 serial
+# calls, and the schema-rebuild restores (remove_choice, sweep_unused,
+# ensure_filament_attributes_cleaned) PATCHed every filament one at a time.
+#
+# update_filaments reads the existing records from ONE fresh filament-list
+# read (the same raw wire form _get_raw_extras returns) and hands each worker its
+# filament's extras, so update_filament merges without its GET; the PATCHes
+# run at most `spoolman_bulk_concurrency` at once over the keep-alive pool.
+# restore_filament_extras is the full-extras flavour for the restores. Both
+# report one result per item, in input order, and publish their progress to
+# /api/metrics while they run. update_spools is the spool-side runner for
+# writes already planned against pre-fetched records (the bulk smart move).
+#
+# Sets at or below LIVE_FANOUT_MAX run inline and in order, item by item —
+# pool start-up isn't worth it for a handful, and small selections keep
+# reading each filament live exactly as the per-id loop did.
+# ---------------------------------------------------------------------------
+
+# Per-thread: the raw extras update_filament should merge against instead of
+# fetching them ({fid: extras}), and the error this thread's last update hit.
+_bulk_tls = threading.local()
+
+# Guards _BULK_JOBS / _BULK_SEQ / _BULK_STATS.
+_BULK_LOCK = threading.Lock()
+_BULK_JOBS = {}  # job id -> {"label", "total", "done", "failed", "started" (monotonic)}
+_BULK_SEQ = 0
+_BULK_STATS = {
+    "jobs": 0,
+    "items": 0,
+    "failures": 0,
+    "snapshot_reads": 0,
+}
+
+
+def _bulk_concurrency():
+    """The configured PATCH bound for bulk writes (1..32)."""
+    return config_loader.get_clamped("spoolman_bulk_concurrency", 1, 32, int)
+
+
+def _prefetched_raw_extras(fid):
+    """The raw extras a bulk worker already holds for `fid`, else None."""
+    pre = getattr(_bulk_tls, 'extras', None)
+    if pre and fid in pre:
+        return pre[fid]
+    return None
+
+
+def _run_bulk(label, items, fn, progress=None):
+    """Run ``fn(item)`` over `items` — inline for small sets, else on a
+    bounded pool — and return the results in item order. Each result is a
+    dict whose "ok" says whether it counts as a failure. `progress(done,
+    total)` is called after every item (from the worker that finished it;
+    `done` only ever increases)."""
+    global _BULK_SEQ
+    total = len(items)
+    job = {"label": label, "total": total, "done": 0, "failed": 0, "started": time.monotonic()}
+    job_lock = threading.Lock()
+    with _BULK_LOCK:
+        _BULK_SEQ += 1
+        job_id = _BULK_SEQ
+        _BULK_JOBS[job_id] = job
+        _BULK_STATS["jobs"] += 1
+
+    def _one(item):
+        res = fn(item)
+        with job_lock:
+            job["done"] += 1
+            if not res.get("ok"):
+                job["failed"] += 1
+            if progress is not None:
+                try:
+                    progress(job["done"], total)
+                except Exception as e:
+                    state.logger.warning(f"{label}: progress callback failed: {e}")
+        return res
+
+    try:
+        workers = min(_bulk_concurrency(), total)
+        if total <= LIVE_FANOUT_MAX or workers <= 1:
+            return [_one(item) for item in items]
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="spoolman-bulk") as ex:
+            return list(ex.map(spoolman_http.counted_by_caller(_one), items))
+    finally:
+        with _BULK_LOCK:
+            _BULK_JOBS.pop(job_id, None)
+            _BULK_STATS["items"] += job["done"]
+            _BULK_STATS["failures"] += job["failed"]
+
+
+def update_filaments(filament_ids, build, progress=None, label="filament bulk update"):
+    """Apply a per-filament update to many filaments at once.
+
+    `build(filament)` receives each parsed filament (the get_filament shape)
+    and returns the update_filament payload for it, or None when it needs no
+    write. Partial `extra` payloads are merged against the record's existing
+    extras exactly as update_filament does — for large sets from ONE fresh
+    filament-list read taken when the call starts (never a cached list)
+    rather than a GET per filament. An extra edited outside FCC between
+    that read and a filament's PATCH is still overwritten, as it would be
+    between update_filament's own GET and PATCH.
+
+    Returns one result per input id, in input order:
+    ``{"id", "ok", "status": "updated" | "unchanged" | "error"}`` plus
+    ``"msg"`` on errors ("not an integer id", "filament not found", or the
+    Spoolman rejection) and ``"filament"`` (the updated record) on writes.
+    `id` is the int id, or the raw value when it isn't one."""
+    ids = []
+    for raw_id in (filament_ids or []):
+        try:
+            ids.append(int(raw_id))
+        except (ValueError, TypeError):
+            pass
+    raw_by_id = {}
+    if len(ids) > LIVE_FANOUT_MAX:
+        wanted = set(ids)
+        try:
+            # The extras read here are what every PATCH merges against, so
+            # they must be current: a cached list up to spoolman_cache_ttl
+            # old would write back (revert) an extra edited outside FCC in
+            # that window. Drop it and read the list once, fresh.
+            invalidate_snapshots(spoolman_cache.FILAMENTS)
+            for f in _snapshot(spoolman_cache.FILAMENTS):
+                if isinstance(f, dict) and f.get('id') in wanted:
+                    raw_by_id[f['id']] = f
+        except Exception as e:
+            # Fall back to reading each filament; the writes are unaffected.
+            state.logger.warning(f"{label}: filament list unavailable ({e}); reading filaments one by one")
+
+    def _one(raw_id):
+        try:
+            fid = int(raw_id)
+        except (ValueError, TypeError):
+            return {"id": raw_id, "ok": False, "status": "error", "msg": "not an integer id"}
+        raw = raw_by_id.get(fid)
+        if raw is not None:
+            fil = parse_inbound_data(copy.deepcopy(raw))
+            extras = dict(raw.get('extra') or {})
+            with _BULK_LOCK:
+                _BULK_STATS["snapshot_reads"] += 1
+        else:
+            fil, extras = get_filament(fid), None
+        # get_filament hands back Spoolman's {"detail": ...} body for a 404.
+        if not isinstance(fil, dict) or fil.get('id') is None:
+            return {"id": fid, "ok": False, "status": "error", "msg": "filament not found"}
+        data = build(fil)
+        if data is None:
+            return {"id": fid, "ok": True, "status": "unchanged"}
+        _bulk_tls.extras = {fid: extras} if extras is not None else None
+        _bulk_tls.error = None
+        try:
+            updated = update_filament(fid, data)
+        finally:
+            _bulk_tls.extras = None
+        if updated is None:
+            msg = getattr(_bulk_tls, 'error', None) or "unknown error"
+            return {"id": fid, "ok": False, "status": "error", "msg": msg}
+        return {"id": fid, "ok": True, "status": "updated", "filament": updated}
+
+    return _run_bulk(label, list(filament_ids or []), _one, progress)
+
+
+def restore_filament_extras(extras_by_fid, progress=None, label="filament extras restore"):
+    """PATCH each filament's FULL extras dict back — the restore half of a
+    filament_attributes schema rebuild (DELETE + re-POST of the field strips
+    the value from every filament). `extras_by_fid` maps fid -> the complete
+    raw extras dict; sending the whole dict is what keeps siblings under
+    Spoolman's replace-on-PATCH, so never pass a partial one here.
+
+    Returns ``[{"id", "ok", "msg" (failures only)}]`` in `extras_by_fid`
+    order; a failure is "HTTP <status>: <body>" or the exception text — any
+    exception, since the schema has already been rebuilt and one bad record
+    must not strand the rest unrestored. Drops the filament snapshots after
+    (these writes bypass the write-through helpers)."""
+    sm_url, _ = config_loader.get_api_urls()
+
+    def _one(item):
+        fid, extras = item
+        try:
+            pr = spoolman_http.patch(
+                f"{sm_url}/api/v1/filament/{fid}",
+                json={"extra": extras},
+                timeout=10,
+            )
+            if pr.ok:
+                return {"id": fid, "ok": True}
+            return {"id": fid, "ok": False, "msg": f"HTTP {pr.status_code}: {pr.text[:120]}"}
+        except Exception as e:
+            return {"id": fid, "ok": False, "msg": str(e)[:200]}
+
+    try:
+        return _run_bulk(label, list(extras_by_fid.items()), _one, progress)
+    finally:
+        invalidate_snapshots(spoolman_cache.FILAMENTS)
+
+
+def update_spools(writes, label="spool bulk update"):
+    """Run many update_spool calls at once. `writes` is a list of
+    ``(sid, data, prefetched)`` — `prefetched` the spool's raw record (see
+    get_raw_spools_by_ids) or None to let update_spool read it. Writes to
+    DIFFERENT spools only: two writes to one spool would race.
+
+    Returns ``[{"id", "ok", "spool" (updated record) | "msg" (error)}]`` in
+    `writes` order. A raw_spool_reads() scope open on the calling thread is
+    refreshed with the results, as a serial update_spool would have done."""
+    scope = getattr(_raw_reads, 'spools', None)
+
+    def _one(write):
+        sid, data, prefetched = write
+        _bulk_tls.error = None
+        if prefetched is None:
+            updated = update_spool(sid, data)
+        else:
+            updated = update_spool(sid, data, prefetched=prefetched)
+        if updated is None:
+            msg = getattr(_bulk_tls, 'error', None) or "unknown error"
+            return {"id": sid, "ok": False, "msg": msg}
+        return {"id": sid, "ok": True, "spool": updated}
+
+    results = _run_bulk(label, list(writes), _one)
+    if scope is not None:
+        for res in results:
+            if res["ok"]:
+                scope[str(res["id"])] = copy.deepcopy(res["spool"])
+            else:
+                scope.pop(str(res["id"]), None)
+    return results
+
+
+def get_bulk_stats():
+    """Bulk-write counters plus the jobs running right now (with progress)
+    for /api/metrics."""
+    now = time.monotonic()
+    with _BULK_LOCK:
+        out = dict(_BULK_STATS)
+        out["active"] = [
+            {"label": j["label"], "total": j["total"], "done": j["done"],
+             "failed": j["failed"], "elapsed_s": round(now - j["started"], 3)}
+            for j in _BULK_JOBS.values()
+        ]
+    out["concurrency"] = _bulk_concurrency()
+    return out
+
+
 def create_filament(data):
     """Creates a new filament via POST to Spoolman."""
     sm_url, _ = config_loader.get_api_urls()
     sanitized = sanitize_outbound_data(data)
     try:
-        r = requests.post(f"{sm_url}/api/v1/filament", json=sanitized, timeout=5)
+        r = spoolman_http.post(f"{sm_url}/api/v1/filament", json=sanitized, timeout=5)
         if r.ok:
-            return r.json()
+            created = r.json()
+            spoolman_cache.upsert(spoolman_cache.FILAMENTS, created)
+            return created
         state.logger.error(f"Failed to create filament: {r.status_code} - {r.text}")
     except Exception as e:
         state.logger.error(f"API Error creating filament: {e}")
@@ -615,9 +1155,10 @@ def delete_spool(sid):
     global LAST_SPOOLMAN_ERROR
     sm_url, _ = config_loader.get_api_urls()
     try:
-        r = requests.delete(f"{sm_url}/api/v1/spool/{sid}", timeout=10)
+        r = spoolman_http.delete(f"{sm_url}/api/v1/spool/{sid}", timeout=10)
         if r.ok:
             LAST_SPOOLMAN_ERROR = None
+            spoolman_cache.remove(spoolman_cache.SPOOLS, sid)
             return True
         state.logger.error(f"Failed to delete spool {sid}: {r.status_code} - {r.text}")
         LAST_SPOOLMAN_ERROR = f"HTTP {r.status_code}: {r.text[:400]}"
@@ -635,9 +1176,10 @@ def delete_filament(fid):
     global LAST_SPOOLMAN_ERROR
     sm_url, _ = config_loader.get_api_urls()
     try:
-        r = requests.delete(f"{sm_url}/api/v1/filament/{fid}", timeout=10)
+        r = spoolman_http.delete(f"{sm_url}/api/v1/filament/{fid}", timeout=10)
         if r.ok:
             LAST_SPOOLMAN_ERROR = None
+            spoolman_cache.remove(spoolman_cache.FILAMENTS, fid)
             return True
         state.logger.error(f"Failed to delete filament {fid}: {r.status_code} - {r.text}")
         LAST_SPOOLMAN_ERROR = f"HTTP {r.status_code}: {r.text[:400]}"
@@ -651,16 +1193,8 @@ def get_spools_for_filament(fid):
     """Returns all spool dicts whose filament.id matches `fid`. Used by the
     cascade-delete path so the UI can show the user how many child spools
     will be deleted alongside the parent filament."""
-    sm_url, _ = config_loader.get_api_urls()
     try:
-        r = requests.get(f"{sm_url}/api/v1/spool", timeout=5)
-        if not r.ok:
-            return []
-        out = []
-        for s in (r.json() or []):
-            if (s.get('filament') or {}).get('id') == fid:
-                out.append(s)
-        return out
+        return copy.deepcopy(_index_lookup(get_spool_index(), 'by_filament', fid))
     except Exception as e:
         state.logger.error(f"API Error listing spools for filament {fid}: {e}")
         return []
@@ -670,7 +1204,7 @@ def get_vendors():
     """Fetches the list of all vendors from Spoolman."""
     sm_url, _ = config_loader.get_api_urls()
     try:
-        r = requests.get(f"{sm_url}/api/v1/vendor", timeout=5)
+        r = spoolman_http.get(f"{sm_url}/api/v1/vendor", timeout=5)
         if r.ok:
             return r.json()
     except Exception as e:
@@ -679,15 +1213,12 @@ def get_vendors():
 
 def get_materials() -> list[str]:
     """Fetches a unique list of all materials across all filaments from Spoolman."""
-    sm_url, _ = config_loader.get_api_urls()
     materials = set()
     try:
-        r = requests.get(f"{sm_url}/api/v1/filament", timeout=5)
-        if r.ok:
-            for fil in r.json():
-                mat = fil.get("material")
-                if mat:
-                    materials.add(mat)
+        for fil in _snapshot(spoolman_cache.FILAMENTS, allow_archived=False):
+            mat = fil.get("material")
+            if mat:
+                materials.add(mat)
     except Exception as e:
         state.logger.error(f"API Error fetching materials: {e}")
     return sorted(list(materials))
@@ -702,7 +1233,7 @@ def create_vendor(data):
     sm_url, _ = config_loader.get_api_urls()
     sanitized = sanitize_outbound_data(data)
     try:
-        r = requests.post(f"{sm_url}/api/v1/vendor", json=sanitized, timeout=5)
+        r = spoolman_http.post(f"{sm_url}/api/v1/vendor", json=sanitized, timeout=5)
         if r.ok:
             LAST_SPOOLMAN_ERROR = None
             return r.json()
@@ -719,7 +1250,7 @@ def get_vendor(vid):
     """Returns the vendor dict for `vid`, or None on miss/error."""
     sm_url, _ = config_loader.get_api_urls()
     try:
-        r = requests.get(f"{sm_url}/api/v1/vendor/{vid}", timeout=5)
+        r = spoolman_http.get(f"{sm_url}/api/v1/vendor/{vid}", timeout=5)
         if r.ok:
             return r.json()
     except Exception as e:
@@ -751,9 +1282,12 @@ def update_vendor(vid, data):
     else:
         sanitized = sanitize_outbound_data(data)
     try:
-        r = requests.patch(f"{sm_url}/api/v1/vendor/{vid}", json=sanitized, timeout=2)
+        r = spoolman_http.patch(f"{sm_url}/api/v1/vendor/{vid}", json=sanitized, timeout=2)
         if r.ok:
             LAST_SPOOLMAN_ERROR = None
+            # Vendors are embedded in every filament (and, through it, every
+            # spool) record — drop both snapshots rather than patch each copy.
+            spoolman_cache.invalidate()
             return r.json()
         err_body = r.text
         state.logger.error(f"Failed to update vendor {vid}: {r.status_code} - {err_body}")
@@ -789,7 +1323,7 @@ def ensure_extra_field(entity_type, key, name, field_type="text", choices=None,
     """
     sm_url, _ = config_loader.get_api_urls()
     try:
-        r = requests.get(f"{sm_url}/api/v1/field/{entity_type}", timeout=5)
+        r = spoolman_http.get(f"{sm_url}/api/v1/field/{entity_type}", timeout=5)
         if r.ok:
             existing = r.json()
             existing_field = next((f for f in existing if f.get('key') == key), None)
@@ -809,7 +1343,7 @@ def ensure_extra_field(entity_type, key, name, field_type="text", choices=None,
                         update_payload['multi_choice'] = existing_field.get('multi_choice', False)
                         if 'choices' in existing_field:
                             update_payload['choices'] = existing_field['choices']
-                    upd = requests.post(f"{sm_url}/api/v1/field/{entity_type}/{key}", json=update_payload, timeout=5)
+                    upd = spoolman_http.post(f"{sm_url}/api/v1/field/{entity_type}/{key}", json=update_payload, timeout=5)
                     if upd.ok:
                         state.logger.info(
                             f"Spoolman extra field {entity_type}/{key} label updated: "
@@ -826,7 +1360,7 @@ def ensure_extra_field(entity_type, key, name, field_type="text", choices=None,
             payload["multi_choice"] = bool(multi)
             if choices:
                 payload["choices"] = sorted({c for c in choices if str(c).strip()})
-        post_r = requests.post(f"{sm_url}/api/v1/field/{entity_type}/{key}", json=payload, timeout=5)
+        post_r = spoolman_http.post(f"{sm_url}/api/v1/field/{entity_type}/{key}", json=payload, timeout=5)
         if post_r.status_code in (200, 201):
             state.logger.info(f"Spoolman extra field registered: {entity_type}/{key}")
             return True
@@ -957,7 +1491,7 @@ def ensure_filament_attributes_cleaned():
     """
     sm_url, _ = config_loader.get_api_urls()
     try:
-        r = requests.get(f"{sm_url}/api/v1/field/filament", timeout=10)
+        r = spoolman_http.get(f"{sm_url}/api/v1/field/filament", timeout=10)
         if not r.ok:
             return
         field = next(
@@ -978,7 +1512,7 @@ def ensure_filament_attributes_cleaned():
         # list while we KNOW the choice field exists, treat that as a
         # transient state (rather than evidence that nothing uses any of
         # the flagged choices) and skip — the next boot retries.
-        f_resp = requests.get(f"{sm_url}/api/v1/filament", timeout=20)
+        f_resp = spoolman_http.get(f"{sm_url}/api/v1/filament", timeout=20)
         if not f_resp.ok:
             return
         filaments = f_resp.json() or []
@@ -1053,7 +1587,7 @@ def ensure_filament_attributes_cleaned():
         )
 
         # DELETE the field, then POST it back with the cleaned choice list.
-        d_resp = requests.delete(
+        d_resp = spoolman_http.delete(
             f"{sm_url}/api/v1/field/filament/filament_attributes", timeout=15
         )
         if not d_resp.ok and d_resp.status_code != 404:
@@ -1062,8 +1596,10 @@ def ensure_filament_attributes_cleaned():
                 f"({d_resp.status_code}): {d_resp.text[:300]}"
             )
             return
+        # Deleting the field stripped it from every filament's extras.
+        invalidate_snapshots()
 
-        c_resp = requests.post(
+        c_resp = spoolman_http.post(
             f"{sm_url}/api/v1/field/filament/filament_attributes",
             json={
                 "name": "Filament Attributes",
@@ -1086,25 +1622,22 @@ def ensure_filament_attributes_cleaned():
         # filtered out of filament_attributes). Sending the whole dict
         # back preserves siblings — partial PATCH on `extra` makes
         # Spoolman replace the whole sub-document.
-        restored, failed = 0, 0
+        extras_out_by_fid = {}
         for fid, extras_in in extras_snapshot.items():
             extras_out = dict(extras_in)
             if 'filament_attributes' in extras_out:
                 attrs = _parse_filament_attrs_value(extras_out['filament_attributes'])
                 cleaned = [a for a in attrs if a not in effective_delete]
                 extras_out['filament_attributes'] = json.dumps(cleaned)
-            try:
-                pr = requests.patch(
-                    f"{sm_url}/api/v1/filament/{fid}",
-                    json={"extra": extras_out},
-                    timeout=10,
-                )
-                if pr.ok:
-                    restored += 1
-                else:
-                    failed += 1
-            except requests.RequestException:
-                failed += 1
+            extras_out_by_fid[fid] = extras_out
+        results = restore_filament_extras(
+            extras_out_by_fid, label="filament_attributes cleanup restore"
+        )
+        restored = sum(1 for res in results if res["ok"])
+        failed = len(results) - restored
+        # The schema rebuild + restore rewrote extras on many filaments behind
+        # the write-through helpers' back.
+        invalidate_snapshots()
 
         # Post-cleanup verification: re-fetch the field and confirm the
         # targets are ACTUALLY gone from the choices. If they survived the
@@ -1114,7 +1647,7 @@ def ensure_filament_attributes_cleaned():
         # diagnosis of why the cleanup keeps re-firing.
         survived = set()
         try:
-            v = requests.get(f"{sm_url}/api/v1/field/filament", timeout=10)
+            v = spoolman_http.get(f"{sm_url}/api/v1/field/filament", timeout=10)
             if v.ok:
                 vfield = next(
                     (f for f in (v.json() or []) if f.get("key") == "filament_attributes"),
@@ -1170,7 +1703,7 @@ def update_extra_field_choices(entity_type, key, new_choices):
     """Pulls existing field config, appends new choices, and PUTs back to Spoolman."""
     sm_url, _ = config_loader.get_api_urls()
     try:
-        r = requests.get(f"{sm_url}/api/v1/field/{entity_type}", timeout=5)
+        r = spoolman_http.get(f"{sm_url}/api/v1/field/{entity_type}", timeout=5)
         if r.ok:
             fields = r.json()
             target = next((f for f in fields if f['key'] == key), None)
@@ -1186,7 +1719,7 @@ def update_extra_field_choices(entity_type, key, new_choices):
                     "choices": updated_choices
                 }
                 
-                post_r = requests.post(f"{sm_url}/api/v1/field/{entity_type}/{key}", json=payload, timeout=5)
+                post_r = spoolman_http.post(f"{sm_url}/api/v1/field/{entity_type}/{key}", json=payload, timeout=5)
                 if post_r.ok:
                     return {"success": True, "msg": "Choices updated"}
                 else:
@@ -1362,9 +1895,9 @@ def get_spools_at_location_detailed(loc_name):
     target_loc_upper = str(loc_name).upper()
     found = []
     try:
-        # allow_archived=False mirrors the historical bare /api/v1/spool fetch
+        # Non-archived only, mirroring the historical bare /api/v1/spool fetch
         # this function used inline (Spoolman omits archived spools by default).
-        for s in get_all_spools(allow_archived=False):
+        for s in _index_location_candidates(get_spool_index(), target_loc_upper, check_unassigned):
             item = _build_location_match(s, target_loc_upper, check_unassigned)
             if item is not None:
                 found.append(item)
@@ -1426,10 +1959,12 @@ def bucket_spools_by_location(loc_ids, spools=None):
 
     Returns {loc_id_upper: [item_dict, ...]}. Pass a pre-fetched `spools`
     list (parse_inbound_data output, e.g. from get_all_spools) to reuse a
-    single HTTP round-trip; otherwise fetches the non-archived spool list
-    once. Lets callers needing contents for many locations (the Printer
+    single HTTP round-trip; otherwise uses the shared spool index (non-
+    archived). Lets callers needing contents for many locations (the Printer
     Status widget) resolve every toolhead's occupancy in ONE Spoolman call
-    instead of one fetch per toolhead.
+    instead of one fetch per toolhead. Each target is a dict lookup in the
+    index (build_spool_index), so the work scales with the number of
+    targets and their occupants — not spools × targets.
 
     A spool matching more than one target (located at one toolhead but
     ghosted to another via physical_source) appears in BOTH buckets — byte
@@ -1448,10 +1983,17 @@ def bucket_spools_by_location(loc_ids, spools=None):
     if not targets:
         return buckets
     if spools is None:
-        spools = get_all_spools(allow_archived=False)
-    for s in spools:
-        for t in targets:
-            item = _build_location_match(s, t, check_unassigned=(t == 'UNASSIGNED'))
+        try:
+            idx = get_spool_index()
+        except Exception as e:
+            state.logger.error(f"bucket_spools_by_location failed: {e}")
+            return buckets
+    else:
+        idx = build_spool_index(spools)
+    for t in targets:
+        check_unassigned = (t == 'UNASSIGNED')
+        for s in _index_location_candidates(idx, t, check_unassigned):
+            item = _build_location_match(s, t, check_unassigned=check_unassigned)
             if item is not None:
                 buckets[t].append(item)
     return buckets
@@ -1462,26 +2004,24 @@ def get_spools_at_location_strict(loc_name):
     instead of silently returning [] — for safety-critical callers (the L18
     printer_map removal guard) that must FAIL CLOSED when they cannot verify
     whether a toolhead still holds spools. Matches by direct location AND by
-    physical_source (ghost), mirroring get_spools_at_location_detailed."""
-    sm_url, _ = config_loader.get_api_urls()
-    resp = requests.get(f"{sm_url}/api/v1/spool", timeout=5)
-    resp.raise_for_status()  # raise on 4xx/5xx so the caller can fail closed
+    physical_source (ghost), mirroring get_spools_at_location_detailed.
+
+    Never answered from the cached snapshot: a spool placed there from
+    Spoolman's own UI within spoolman_cache_ttl would be missed and the
+    removal let through. The list is dropped and read afresh on every call."""
+    # get_spool_index raises on 4xx/5xx/transport errors so the caller can
+    # fail closed.
+    invalidate_snapshots(spoolman_cache.SPOOLS)
+    idx = get_spool_index()
     target = str(loc_name).strip().upper()
-    ids = []
-    for s in parse_inbound_data(resp.json()):
-        sloc = (s.get('location') or '').strip().upper()
-        extra = s.get('extra', {}) or {}
-        p_source = str(extra.get('physical_source', '')).strip().replace('"', '').upper()
-        # L271 Phase 3.5 (review fix): FLAT first-segment child match, matching
-        # _build_location_match — a location-string query, not a transitive
-        # parent_id walk. Keeps this fail-closed safety guard's scope exactly as
-        # pre-3.5 (e.g. a printer key reaches its toolheads; a room does NOT
-        # reach a nested printer's toolheads). See _build_location_match.
-        if (sloc == target or p_source == target
-                or locations_db.derive_parent_id_from_prefix(sloc) == target
-                or locations_db.derive_parent_id_from_prefix(p_source) == target):
-            ids.append(s['id'])
-    return ids
+    # L271 Phase 3.5 (review fix): FLAT first-segment child match, matching
+    # _build_location_match — a location-string query, not a transitive
+    # parent_id walk. Keeps this fail-closed safety guard's scope exactly as
+    # pre-3.5 (e.g. a printer key reaches its toolheads; a room does NOT
+    # reach a nested printer's toolheads). See _build_location_match. The
+    # candidate set is exactly "sloc == target or p_source == target or
+    # either's first segment == target" — the index's four location maps.
+    return [s['id'] for s in _index_location_candidates(idx, target)]
 
 def find_spools_by_legacy_id(legacy_id):
     """Return ALL spools attached to the filament with the given legacy
@@ -1493,32 +2033,20 @@ def find_spools_by_legacy_id(legacy_id):
     single-id callers, and by `resolve_scan` to detect the ambiguous
     case (same legacy id mapped to multiple spools — Item 3.6).
     """
-    sm_url, _ = config_loader.get_api_urls()
     legacy_id = str(legacy_id).strip()
     try:
-        fil_resp = requests.get(f"{sm_url}/api/v1/filament", timeout=5)
-        target_filament_id = None
-        if fil_resp.ok:
-            for fil in parse_inbound_data(fil_resp.json()):
-                ext = str(fil.get('external_id', '')).strip().replace('"', '')
-                if ext == legacy_id:
-                    target_filament_id = fil['id']
-                    break
+        target_filament_id = _get_filament_index()['by_external_id'].get(legacy_id)
         if not target_filament_id:
             return []
 
-        spool_resp = requests.get(f"{sm_url}/api/v1/spool", timeout=5)
-        if not spool_resp.ok:
-            return []
-
         non_empty = []
         empty = []
-        for spool in parse_inbound_data(spool_resp.json()):
-            if spool.get('filament', {}).get('id') == target_filament_id:
-                if (spool.get('remaining_weight') or 0) > 10:
-                    non_empty.append(spool)
-                else:
-                    empty.append(spool)
+        for spool in _index_lookup(get_spool_index(), 'by_filament', target_filament_id):
+            spool = copy.deepcopy(spool)
+            if (spool.get('remaining_weight') or 0) > 10:
+                non_empty.append(spool)
+            else:
+                empty.append(spool)
         non_empty.sort(key=lambda s: s.get('id', 0))
         empty.sort(key=lambda s: s.get('id', 0))
         return non_empty + empty
@@ -1544,15 +2072,11 @@ def find_spool_by_legacy_id(legacy_id, strict_mode=False):
 
 def find_filament_by_legacy_id(legacy_id):
     """Finds a filament definition directly by legacy ID."""
-    sm_url, _ = config_loader.get_api_urls()
     legacy_id = str(legacy_id).strip()
     try:
-        resp = requests.get(f"{sm_url}/api/v1/filament", timeout=5)
-        if resp.ok:
-            for fil in parse_inbound_data(resp.json()):
-                ext = str(fil.get('external_id', '')).strip().replace('"','')
-                if ext == legacy_id:
-                    return fil['id']
+        fid = _get_filament_index()['by_external_id'].get(legacy_id)
+        if fid is not None:
+            return fid
     except Exception as e: state.logger.error(f"Legacy Filament Lookup Error: {e}")
     return None
 
@@ -1603,7 +2127,6 @@ def search_inventory(query="", material="", vendor="", color_hex="", only_in_sto
     spools currently on a toolhead (location ∈ printer_map) OR with a ghost
     physical_source set, 'undeployed' = the inverse. Filaments ignore this.
     """
-    sm_url, _ = config_loader.get_api_urls()
     results = []
 
     # Load printer_map once so deployed_state filtering can check whether a
@@ -1622,25 +2145,20 @@ def search_inventory(query="", material="", vendor="", color_hex="", only_in_sto
             deployed_targets = set()
     
     try:
-        # If the user toggles 'In Stock' off (meaning they want to see everything), we must explicitly tell Spoolman API to return archived items
-        archived_param = "" if only_in_stock else "?allow_archived=true"
-        
+        # If the user toggles 'In Stock' off (meaning they want to see everything), archived items are included
+        allow_archived = not only_in_stock
+
         spools_for_count = []
+        kind = spoolman_cache.FILAMENTS if target_type == "filament" else spoolman_cache.SPOOLS
+        try:
+            all_items = parse_inbound_data(_snapshot(kind, allow_archived))
+        except Exception as e:
+            state.logger.error(f"Failed to fetch {target_type}s for search: {e}")
+            return []
         if target_type == "filament":
-            resp = requests.get(f"{sm_url}/api/v1/filament{archived_param}", timeout=10)
             try:
-                s_resp = requests.get(f"{sm_url}/api/v1/spool{archived_param}", timeout=10)
-                if s_resp.ok:
-                    spools_for_count = parse_inbound_data(s_resp.json())
+                spools_for_count = parse_inbound_data(_snapshot(spoolman_cache.SPOOLS, allow_archived))
             except: pass
-        else:
-            resp = requests.get(f"{sm_url}/api/v1/spool{archived_param}", timeout=10)
-            
-        if not resp.ok:
-            state.logger.error(f"Failed to fetch {target_type}s for search: {resp.status_code}")
-            return []
-            
-        all_items = parse_inbound_data(resp.json())
         
         # Build quick lookup for spool counts if we are answering a filament search
         spool_counts = {}
@@ -0,0 +1,374 @@
+"""Shared in-process snapshot of Spoolman's spool + filament collections.
+
+get_all_spools, get_spools_for_filament, find_spools_by_legacy_id,
+get_spools_at_location_strict, bucket_spools_by_location and search_inventory
+each used to download the ENTIRE /api/v1/spool (and often /api/v1/filament)
+list per call. A dashboard heartbeat plus a couple of scans was N full-list
+downloads + N JSON decodes of the same data within a second.
+
+This module holds ONE snapshot per collection (``SPOOLS`` / ``FILAMENTS``):
+
+- TTL: a snapshot is served until ``spoolman_cache_ttl`` seconds after it was
+  fetched (0 disables caching — every read fetches, the historical behaviour).
+- single-flight: concurrent readers of a stale collection queue on a per-
+  collection fetch lock; the first does the GET, the rest are served its
+  result. If that fetch FAILS the queued readers get the same exception
+  instead of each re-hammering an unreachable Spoolman with its own timeout.
+- write-through: spoolman_api's update/create/delete helpers patch the
+  snapshot with the record Spoolman returned (``upsert`` / ``remove`` /
+  ``replace_embedded_filament``), so the next read sees the write without a
+  refetch. Writes we can't mirror record-by-record (schema rebuilds, vendor
+  edits, raw PATCHes) call ``invalidate``.
+- derived structures: ``get_derived`` memoizes a lookup structure built from
+  the snapshot (spoolman_api's location / filament / legacy-id indexes) until
+  the next refresh or write-through.
+- request pinning: inside a ``pinned()`` block every read on that thread is
+  served from the snapshot the block first read, even if the TTL runs out
+  (or is 0) meanwhile — so a request made of several readers (the dashboard
+  pulse's locations / manage / printer_status sections) pays for at most one
+  fetch per collection and all of them see the same data. A write-through
+  or invalidate from anywhere ends the pin for that collection; the next
+  read takes the updated snapshot.
+
+Snapshots hold the RAW wire form (``r.json()`` — extras still JSON-encoded)
+including archived records; readers get a private deep copy (json round-trip
+of a cached blob, far cheaper than the HTTP fetch it replaces) so callers that
+mutate the result — parse_inbound_data does, in place — can't corrupt the
+shared copy. Archived filtering is done by the caller (see spoolman_api).
+
+Each snapshot is keyed by its ``source`` (the Spoolman base URL) so pointing
+the app at a different Spoolman never serves the old instance's data.
+
+Python 3.9 runtime (the container image) — keep syntax 3.9-safe.
+"""
+import contextlib
+import json
+import threading
+import time
+
+import config_loader  # type: ignore
+
+SPOOLS = "spool"
+FILAMENTS = "filament"
+KINDS = (SPOOLS, FILAMENTS)
+
+SETTINGS_KEYS = frozenset({"spoolman_cache_ttl"})
+
+# Guards _ENTRIES / _VERSION / _ATTEMPTS / _LAST_FAILURE / _STATS. Never held
+# across a network call — fetches run under the per-collection _FETCH_LOCKS.
+_LOCK = threading.Lock()
+_FETCH_LOCKS = {k: threading.Lock() for k in KINDS}
+
+# kind -> {"source", "items", "blob", "derived", "fetched_at", "expires"}.
+# `items` is the private mutable list write-through edits; `blob` is its
+# serialized form, rebuilt lazily on the first read after an edit; `derived`
+# memoizes get_derived() builds and is cleared by every edit.
+_ENTRIES = {}
+# Bumped by every write-through / invalidate. A fetch that started before a
+# write must not install its (now stale) result — it compares versions.
+_VERSION = {k: 0 for k in KINDS}
+# Count of COMPLETED fetches per collection. A reader notes it before queuing
+# on the fetch lock; a failure numbered above that note happened while it was
+# queued (possibly already in flight when it arrived), so it is shared.
+_ATTEMPTS = {k: 0 for k in KINDS}
+_LAST_FAILURE = {}  # kind -> (attempt_no, exception)
+
+# Per-thread pinned() state: `pins` is None outside a block, else
+# kind -> {"source", "blob", "version", "derived"}.
+_pinned = threading.local()
+
+_STATS = {
+    "hits": 0,
+    "fetches": 0,
+    "joined": 0,
+    "errors": 0,
+    "write_through": 0,
+    "invalidations": 0,
+    "derived_hits": 0,
+    "derived_builds": 0,
+    "pinned_hits": 0,
+}
+
+
+def _ttl():
+    return config_loader.get_clamped("spoolman_cache_ttl", 0.0, 300.0)
+
+
+def _fresh_blob(kind, source):
+    """Serialized snapshot if one is live for `source`, else None. Caller
+    holds _LOCK."""
+    entry = _live_entry(kind, source)
+    if entry is None:
+        return None
+    if entry["blob"] is None:
+        entry["blob"] = json.dumps(entry["items"])
+    return entry["blob"]
+
+
+def _live_entry(kind, source):
+    """The live snapshot entry for `source`, or None. Caller holds _LOCK."""
+    entry = _ENTRIES.get(kind)
+    if entry is None or entry["source"] != source or time.monotonic() >= entry["expires"]:
+        return None
+    return entry
+
+
+def is_fresh(kind, source):
+    """True when a read of `kind` from `source` would be served without a
+    fetch. Lets callers with a cheaper targeted alternative (a few single-
+    record GETs) use the snapshot only when it is already paid for."""
+    with _LOCK:
+        return _live_entry(kind, source) is not None
+
+
+@contextlib.contextmanager
+def pinned():
+    """Serve this thread's reads inside the block from one snapshot per
+    collection (see the module docstring). Nested blocks share the outer
+    block's pins."""
+    if getattr(_pinned, "pins", None) is not None:
+        yield
+        return
+    _pinned.pins = {}
+    try:
+        yield
+    finally:
+        _pinned.pins = None
+
+
+def _pin(kind, source):
+    """This thread's pinned entry for `kind`, if one is open and no write has
+    landed since it was taken. Caller holds _LOCK."""
+    pins = getattr(_pinned, "pins", None)
+    if not pins:
+        return None
+    pin = pins.get(kind)
+    if pin is None or pin["source"] != source or pin["version"] != _VERSION[kind]:
+        return None
+    return pin
+
+
+def _remember(kind, source, blob, version):
+    """Pin a just-read snapshot if this thread is inside pinned(), and return
+    the pin (None outside a block). Caller holds _LOCK."""
+    pins = getattr(_pinned, "pins", None)
+    if pins is None:
+        return None
+    pin = _pin(kind, source)
+    if pin is None or pin["version"] != version:
+        pin = pins[kind] = {"source": source, "blob": blob, "version": version, "derived": {}}
+    return pin
+
+
+def get_items(kind, source, fetch):
+    """Return a private copy of the `kind` collection (raw wire form, archived
+    records included). ``fetch()`` is called — at most once across concurrent
+    callers — when there is no live snapshot; it must return the decoded list
+    or raise. Exceptions propagate so fail-closed callers can fail closed."""
+    return json.loads(_read(kind, source, fetch)[0])
+
+
+def get_derived(kind, source, name, build, fetch):
+    """Return ``build(items)`` memoized on the live snapshot — for lookup
+    structures (indexes) that are worth building once per snapshot rather
+    than once per call. Rebuilt after any refresh or write-through. The value
+    is SHARED by every caller until then: treat it as read-only."""
+    with _LOCK:
+        pin = _pin(kind, source)
+        if pin is not None and name in pin["derived"]:
+            _STATS["derived_hits"] += 1
+            return pin["derived"][name]
+        entry = _live_entry(kind, source)
+        if entry is not None and name in entry["derived"]:
+            _STATS["derived_hits"] += 1
+            value = entry["derived"][name]
+            if pin is None:
+                pin = _remember(kind, source, _fresh_blob(kind, source), _VERSION[kind])
+            if pin is not None:
+                pin["derived"][name] = value
+            return value
+    blob, token = _read(kind, source, fetch)
+    value = build(json.loads(blob))
+    with _LOCK:
+        # Only memoize if no write landed since `blob` was taken.
+        if _VERSION[kind] == token:
+            entry = _live_entry(kind, source)
+            pin = _pin(kind, source)
+            if entry is not None:
+                entry["derived"][name] = value
+            if pin is not None:
+                pin["derived"][name] = value
+            if entry is not None or pin is not None:
+                _STATS["derived_builds"] += 1
+    return value
+
+
+def _read(kind, source, fetch):
+    """(serialized snapshot, version it reflects) — from this thread's pin,
+    the live entry or a single-flight fetch."""
+    with _LOCK:
+        pin = _pin(kind, source)
+        if pin is not None:
+            _STATS["pinned_hits"] += 1
+            return pin["blob"], pin["version"]
+    blob, version = _read_shared(kind, source, fetch)
+    with _LOCK:
+        _remember(kind, source, blob, version)
+    return blob, version
+
+
+def _read_shared(kind, source, fetch):
+    with _LOCK:
+        blob = _fresh_blob(kind, source)
+        if blob is not None:
+            _STATS["hits"] += 1
+            return blob, _VERSION[kind]
+        seen_attempt = _ATTEMPTS[kind]
+
+    with _FETCH_LOCKS[kind]:
+        with _LOCK:
+            blob = _fresh_blob(kind, source)
+            if blob is not None:
+                # Someone else refreshed while we queued — single-flight join.
+                _STATS["joined"] += 1
+                return blob, _VERSION[kind]
+            failure = _LAST_FAILURE.get(kind)
+            if failure is not None and failure[0] > seen_attempt:
+                # The fetch we queued behind just failed; share its error.
+                _STATS["joined"] += 1
+                raise failure[1]
+            attempt = _ATTEMPTS[kind] + 1
+            version = _VERSION[kind]
+
+        try:
+            items = fetch()
+            if not isinstance(items, list):
+                raise ValueError(f"Spoolman {kind} list was not a JSON array")
+            blob = json.dumps(items)
+        except Exception as e:
+            with _LOCK:
+                _ATTEMPTS[kind] = attempt
+                _LAST_FAILURE[kind] = (attempt, e)
+                _STATS["errors"] += 1
+            raise
+
+        ttl = _ttl()
+        with _LOCK:
+            _ATTEMPTS[kind] = attempt
+            _LAST_FAILURE.pop(kind, None)
+            _STATS["fetches"] += 1
+            if ttl > 0 and _VERSION[kind] == version:
+                now = time.monotonic()
+                _ENTRIES[kind] = {
+                    "source": source,
+                    "items": json.loads(blob),
+                    "blob": blob,
+                    "derived": {},
+                    "fetched_at": now,
+                    "expires": now + ttl,
+                }
+        return blob, version
+
+
+def _id_of(item):
+    return item.get("id") if isinstance(item, dict) else None
+
+
+def upsert(kind, item):
+    """Write-through: replace (or append) the record with `item`'s id in the
+    live snapshot. `item` is the RAW record Spoolman returned from the write.
+    Anything without an id can't be placed, so the collection is dropped."""
+    if _id_of(item) is None:
+        invalidate(kind)
+        return
+    try:
+        copy = json.loads(json.dumps(item))
+    except (TypeError, ValueError):
+        invalidate(kind)
+        return
+    with _LOCK:
+        _VERSION[kind] += 1
+        entry = _ENTRIES.get(kind)
+        if entry is None:
+            return
+        items = entry["items"]
+        for i, existing in enumerate(items):
+            if _id_of(existing) == copy["id"]:
+                items[i] = copy
+                break
+        else:
+            items.append(copy)
+        entry["blob"] = None
+        entry["derived"] = {}
+        _STATS["write_through"] += 1
+
+
+def remove(kind, item_id):
+    """Write-through for a successful DELETE."""
+    with _LOCK:
+        _VERSION[kind] += 1
+        entry = _ENTRIES.get(kind)
+        if entry is None:
+            return
+        # Route handlers pass ids straight from the URL ("12"), Spoolman's are ints.
+        entry["items"] = [x for x in entry["items"] if str(_id_of(x)) != str(item_id)]
+        entry["blob"] = None
+        entry["derived"] = {}
+        _STATS["write_through"] += 1
+
+
+def replace_embedded_filament(filament):
+    """Spoolman embeds the full filament object in every spool record, so a
+    filament edit must also refresh each spool's copy — otherwise a spool
+    list read right after a rename shows the old name."""
+    fid = _id_of(filament)
+    if fid is None:
+        invalidate(SPOOLS)
+        return
+    try:
+        blob = json.dumps(filament)
+    except (TypeError, ValueError):
+        invalidate(SPOOLS)
+        return
+    with _LOCK:
+        _VERSION[SPOOLS] += 1
+        entry = _ENTRIES.get(SPOOLS)
+        if entry is None:
+            return
+        touched = False
+        for s in entry["items"]:
+            fil = s.get("filament") if isinstance(s, dict) else None
+            if isinstance(fil, dict) and fil.get("id") == fid:
+                s["filament"] = json.loads(blob)
+                touched = True
+        if touched:
+            entry["blob"] = None
+            entry["derived"] = {}
+
+
+def invalidate(kind=None):
+    """Drop one collection's snapshot (or all of them). The next read
+    refetches; an in-flight fetch won't install its result."""
+    kinds = KINDS if kind is None else (kind,)
+    with _LOCK:
+        for k in kinds:
+            _VERSION[k] += 1
+            _ENTRIES.pop(k, None)
+            _LAST_FAILURE.pop(k, None)
+        _STATS["invalidations"] += 1
+
+
+def get_stats():
+    """Hit/fetch counters plus per-collection age and size for /api/metrics."""
+    now = time.monotonic()
+    with _LOCK:
+        out = dict(_STATS)
+        out["snapshots"] = {
+            k: {
+                "items": len(e["items"]),
+                "age_s": round(now - e["fetched_at"], 3),
+                "expires_in_s": round(max(0.0, e["expires"] - now), 3),
+            }
+            for k, e in _ENTRIES.items()
+        }
+    return out
@@ -0,0 +1,306 @@
+"""Pooled, keep-alive HTTP transport for every Spoolman call.
+
+Before this module each spoolman_api / logic / route helper called the bare
+``requests.get/patch/post`` functions, and every one of those builds a
+throw-away ``Session`` — so each call paid a fresh TCP handshake to Spoolman.
+A dashboard pulse plus a scan burst was dozens of handshakes per second.
+
+Everything that talks to Spoolman now goes through the module-level
+``get/post/patch/put/delete`` helpers here, which share ONE ``requests.Session``
+mounted with a pooled ``HTTPAdapter``:
+
+- keep-alive: sockets are returned to a per-host pool and reused;
+- per-host limit: at most ``spoolman_pool_size`` sockets per host (extra
+  concurrent callers wait for a free socket instead of opening more — for at
+  most ``spoolman_timeout``, then the call fails with a ConnectionError
+  rather than hanging on a starved pool);
+- retry policy: connect errors are retried for every method (the request never
+  left the box), read errors / 502-503-504 only for idempotent GET/HEAD so a
+  PATCH/POST is never replayed into a double write;
+- default timeout: ``spoolman_timeout`` applies whenever a caller omits its own
+  (explicit per-call timeouts still win — e.g. the 20s filament list).
+
+The session is built lazily from config on first use and rebuilt by
+``reset()`` (called after a Config-modal save so connection settings still
+"apply immediately"). ``get_stats()`` exposes request/error/retry counters
+plus the live urllib3 pool state for /api/metrics; ``count_round_trips()``
+counts the requests one block of code issues, for per-operation budgets.
+
+Thread-safety: urllib3's connection pools are thread-safe and the shared
+Session holds no per-request state we rely on (no cookies / auth), so Flask
+worker threads, the pulse ThreadPoolExecutor and the cancel-monitor daemon can
+all share it. Construction / teardown is serialized under ``_SESSION_LOCK``.
+
+Python 3.9 runtime (the container image) — keep syntax 3.9-safe.
+"""
+import contextlib
+import threading
+
+import requests  # type: ignore
+from requests.adapters import HTTPAdapter  # type: ignore
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool  # type: ignore
+from urllib3.exceptions import EmptyPoolError  # type: ignore
+from urllib3.util.retry import Retry  # type: ignore
+
+import config_loader  # type: ignore
+
+# Config keys that shape the session; a save touching any of them must
+# reset() so the change applies without a restart.
+SETTINGS_KEYS = frozenset({"spoolman_timeout", "spoolman_retries", "spoolman_pool_size"})
+
+# Spoolman is one host, but dev setups can point the app at a second instance
+# (reset_dev, the integration suite) — cache a few per-host pools, not one.
+_POOL_HOSTS = 4
+_RETRY_BACKOFF_S = 0.2
+_RETRY_STATUSES = (502, 503, 504)
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+
+_SESSION_LOCK = threading.Lock()
+# (session, adapter, settings) — swapped as ONE tuple so a reader racing a
+# reset() never pairs a live session with cleared settings.
+_current = None
+
+_STATS_LOCK = threading.Lock()
+_STATS = {
+    "requests": 0,
+    "errors": 0,
+    "retries": 0,
+    "sessions_built": 0,
+    "pool_exhausted": 0,
+    "by_method": {},
+}
+
+
+def _load_settings():
+    """Read the transport knobs from config, clamped to sane ranges so a
+    hand-edited config.json can't wedge every Spoolman call."""
+    return {
+        "timeout": config_loader.get_clamped("spoolman_timeout", 0.5, 120.0),
+        "retries": config_loader.get_clamped("spoolman_retries", 0, 10, int),
+        "pool_size": config_loader.get_clamped("spoolman_pool_size", 1, 128, int),
+    }
+
+
+class _BoundedWaitPool:
+    """Mixin for urllib3's connection pools: with ``pool_block`` on, a caller
+    that finds every socket checked out waits ``pool_wait_s`` for one, not
+    forever (requests never passes urllib3 a pool timeout)."""
+
+    pool_wait_s = None  # set per adapter: the session's timeout
+
+    def _get_conn(self, timeout=None):
+        return super()._get_conn(timeout=self.pool_wait_s if timeout is None else timeout)
+
+
+class _PoolAdapter(HTTPAdapter):
+    """HTTPAdapter whose per-host pools bound the wait for a free socket."""
+
+    def __init__(self, pool_wait_s, **kwargs):
+        self._pool_wait_s = pool_wait_s
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        attrs = {"pool_wait_s": self._pool_wait_s}
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type("_HTTPPool", (_BoundedWaitPool, HTTPConnectionPool), attrs),
+            "https": type("_HTTPSPool", (_BoundedWaitPool, HTTPSConnectionPool), attrs),
+        }
+
+
+def _build_session(settings):
+    retry = Retry(
+        total=settings["retries"],
+        connect=settings["retries"],
+        read=settings["retries"],
+        status=settings["retries"],
+        backoff_factor=_RETRY_BACKOFF_S,
+        status_forcelist=_RETRY_STATUSES,
+        allowed_methods=_IDEMPOTENT_METHODS,
+        # Hand the final 5xx back to the caller (every call site already
+        # branches on `r.ok`) instead of raising MaxRetryError.
+        raise_on_status=False,
+    )
+    adapter = _PoolAdapter(
+        settings["timeout"],
+        pool_connections=_POOL_HOSTS,
+        pool_maxsize=settings["pool_size"],
+        pool_block=True,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session, adapter
+
+
+def _get_session():
+    global _current
+    current = _current
+    if current is not None:
+        return current
+    with _SESSION_LOCK:
+        if _current is None:
+            settings = _load_settings()
+            session, adapter = _build_session(settings)
+            _current = (session, adapter, settings)
+            with _STATS_LOCK:
+                _STATS["sessions_built"] += 1
+        return _current
+
+
+def reset():
+    """Drop the shared session (closing its pooled sockets) so the next call
+    rebuilds it from the current config. Safe to call at any time — in-flight
+    requests on the old session finish on their already-checked-out sockets."""
+    global _current
+    with _SESSION_LOCK:
+        old, _current = _current, None
+    if old is not None:
+        try:
+            old[0].close()
+        except Exception:
+            pass
+
+
+# Per-thread stack of open count_round_trips() counters.
+_counters = threading.local()
+
+
+@contextlib.contextmanager
+def count_round_trips():
+    """Count the Spoolman requests this thread issues inside the block.
+
+    Yields ``{"total": n, "by_method": {"GET": n, ...}, "calls": [(method,
+    url), ...]}``, filled in as requests go out — so a test (or a debug
+    log) can pin an operation's request budget, e.g. "an update_spool is one
+    GET and one PATCH". Blocks nest; each counts everything inside it.
+    Requests made on other threads are not counted unless the work was
+    handed over through counted_by_caller() (the bulk write pool does)."""
+    counter = {"total": 0, "by_method": {}, "calls": []}
+    stack = getattr(_counters, "stack", None)
+    if stack is None:
+        stack = _counters.stack = []
+    stack.append(counter)
+    try:
+        yield counter
+    finally:
+        stack.remove(counter)
+
+
+def counted_by_caller(fn):
+    """Wrap `fn` so the requests it makes — on whatever thread runs it — are
+    counted by the count_round_trips() blocks open on the calling thread."""
+    stack = list(getattr(_counters, "stack", None) or ())
+    if not stack:
+        return fn
+
+    def _counted(*args, **kwargs):
+        prev = getattr(_counters, "stack", None)
+        _counters.stack = list(stack)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _counters.stack = prev
+
+    return _counted
+
+
+def request(method, url, **kwargs):
+    """Issue one Spoolman request over the shared pool. Same signature and
+    return/raise contract as ``requests.request``."""
+    session, _adapter, settings = _get_session()
+    if kwargs.get("timeout") is None:
+        kwargs["timeout"] = settings["timeout"]
+    method = method.upper()
+    with _STATS_LOCK:
+        _STATS["requests"] += 1
+        _STATS["by_method"][method] = _STATS["by_method"].get(method, 0) + 1
+    counters = getattr(_counters, "stack", None)
+    if counters:
+        with _STATS_LOCK:  # counted_by_caller() shares counters across threads
+            for counter in counters:
+                counter["total"] += 1
+                counter["by_method"][method] = counter["by_method"].get(method, 0) + 1
+                counter["calls"].append((method, url))
+    try:
+        resp = session.request(method, url, **kwargs)
+    except EmptyPoolError as e:
+        # Every pooled socket stayed busy for the whole wait. Surface it as
+        # the connection failure it is — callers already handle those.
+        with _STATS_LOCK:
+            _STATS["errors"] += 1
+            _STATS["pool_exhausted"] += 1
+        raise requests.exceptions.ConnectionError(
+            f"Spoolman connection pool exhausted ({settings['pool_size']} busy): {e}")
+    except Exception:
+        with _STATS_LOCK:
+            _STATS["errors"] += 1
+        raise
+    retries = getattr(getattr(resp, "raw", None), "retries", None)
+    history = getattr(retries, "history", None) or ()
+    if history or not resp.ok:
+        with _STATS_LOCK:
+            _STATS["retries"] += len(history)
+            if not resp.ok:
+                _STATS["errors"] += 1
+    return resp
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def patch(url, **kwargs):
+    return request("PATCH", url, **kwargs)
+
+
+def put(url, **kwargs):
+    return request("PUT", url, **kwargs)
+
+
+def delete(url, **kwargs):
+    return request("DELETE", url, **kwargs)
+
+
+def get_stats():
+    """Counters + live pool state for monitoring. ``connections_opened`` per
+    host is the number of TCP handshakes that pool has paid since the session
+    was built — with keep-alive working it stays near the concurrency level
+    while ``requests`` keeps climbing."""
+    with _STATS_LOCK:
+        out = {
+            "requests": _STATS["requests"],
+            "errors": _STATS["errors"],
+            "retries": _STATS["retries"],
+            "sessions_built": _STATS["sessions_built"],
+            "pool_exhausted": _STATS["pool_exhausted"],
+            "by_method": dict(_STATS["by_method"]),
+        }
+    current = _current
+    adapter, settings = (current[1], current[2]) if current else (None, None)
+    out["settings"] = dict(settings) if settings else None
+    pools = []
+    if adapter is not None:
+        pm = adapter.poolmanager
+        for key in list(pm.pools.keys()):
+            pool = pm.pools.get(key)
+            if pool is None:
+                continue
+            try:
+                idle = pool.pool.qsize() if pool.pool is not None else 0
+            except Exception:
+                idle = 0
+            pools.append({
+                "host": f"{pool.host}:{pool.port}",
+                "connections_opened": pool.num_connections,
+                "requests": pool.num_requests,
+                "idle": idle,
+                "maxsize": settings["pool_size"] if settings else None,
+            })
+    out["pools"] = pools
+    return out
@@ -1,11 +1,26 @@
+import collections
 import logging
 import sys
+import threading
 import time
 from logging.handlers import RotatingFileHandler
 
 # --- GLOBAL STATE ---
 UNDO_STACK = []
-RECENT_LOGS = []
+# The activity log: a ring of structured entries, NEWEST FIRST —
+# {"seq", "time", "msg", "type"} plus "colors" (["#RRGGBB", ...], the
+# swatch the dashboard draws) and "meta" when given. "seq" numbers every
+# entry this process wrote, so a client that remembers the newest seq it
+# has asks for only what came after it (logs_since) instead of re-fetching
+# the whole history on every heartbeat. Bounded by log_history_size (config)
+# from the first entry on (_log_ring).
+RECENT_LOGS = collections.deque()
+LOG_SEQ = 0
+# Guards RECENT_LOGS / LOG_SEQ.
+_LOG_LOCK = threading.Lock()
+# Callbacks fn() run after every add_log_entry (the /api/events push channel
+# sends the new log heartbeat from here). A failing listener is ignored.
+LOG_LISTENERS = []
 ACKNOWLEDGED_FILABRIDGE_ERRORS = set()
 
 # --- PERSISTENT STATE ---
@@ -49,53 +64,51 @@ f_handler = RotatingFileHandler('hub.log', maxBytes=1000000, backupCount=5)
 f_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
 logger.addHandler(f_handler)
 
+def log_history_size():
+    """How many entries RECENT_LOGS keeps (config log_history_size)."""
+    # Imported here: config_loader imports this module. Until it can be read
+    # (an entry logged while it is still importing) the ring keeps its bound.
+    try:
+        import config_loader  # type: ignore
+        return config_loader.get_clamped("log_history_size", 10, 5000, int)
+    except Exception:
+        return getattr(RECENT_LOGS, "maxlen", None) or 5000
+
+
+def _log_ring(size):
+    """RECENT_LOGS as a deque bounded at `size` — rebuilt (keeping the newest
+    entries) when the setting changed or a caller swapped in a plain list.
+    Caller holds _LOG_LOCK."""
+    global RECENT_LOGS
+    if not isinstance(RECENT_LOGS, collections.deque) or RECENT_LOGS.maxlen != size:
+        RECENT_LOGS = collections.deque(list(RECENT_LOGS)[:size], maxlen=size)
+    return RECENT_LOGS
+
+
+def _parse_colors(color_hex):
+    """'FF0000,00ff00' -> ['#FF0000', '#00ff00']; blanks between commas are
+    dropped, and a value with nothing usable falls back to grey."""
+    colors = [c.strip() for c in str(color_hex).split(',') if c.strip()]
+    return [c if c.startswith('#') else f'#{c}' for c in colors] or ["#888888"]
+
+
 def add_log_entry(msg, category="INFO", color_hex=None, meta=None):
-    """Adds a log entry to the in-memory list and the system log."""
-    timestamp = time.strftime("%H:%M:%S")
-    
-    # Visual Swatch for the UI log
+    """Adds a log entry to the in-memory ring and the system log. The
+    swatch for `color_hex` is drawn by the dashboard from the entry's
+    "colors" list; nothing here renders HTML."""
+    global LOG_SEQ
+    entry = {"time": time.strftime("%H:%M:%S"), "msg": msg, "type": category}
     if color_hex:
-        colors = [c.strip() for c in color_hex.split(',') if c.strip()]
-        if not colors:
-            colors = ["888888"]
-            
-        if len(colors) > 1:
-            # Generate a conic-gradient for multi-color
-            slice_size = 100.0 / len(colors)
-            gradient_parts = []
-            for i, c in enumerate(colors):
-                start = i * slice_size
-                end = (i + 1) * slice_size
-                hex_val = c if c.startswith('#') else f'#{c}'
-                
-                # Format start to 0% instead of 0.00% to match Pytest asserting "0%"
-                start_str = "0%" if i == 0 else f"{start:.2f}%"
-                end_str = f"{end:.2f}%"
-                
-                # Strip trailing .00 for exact Pytest matches if needed (e.g. 50.0% instead of 50.00%)
-                if start_str.endswith(".00%"): start_str = start_str.replace(".00%", ".0%")
-                if end_str.endswith(".00%"): end_str = end_str.replace(".00%", ".0%")
-                
-                gradient_parts.append(f"{hex_val} {start_str} {end_str}")
-            
-            bg_style = f"background: conic-gradient({', '.join(gradient_parts)});"
-        else:
-            # Single color fallback
-            single_hex = colors[0] if colors[0].startswith('#') else f'#{colors[0]}'
-            bg_style = f"background-color:{single_hex};"
-            
-        swatch = f'<span style="display:inline-block;width:24px;height:24px;border-radius:50%;{bg_style}margin-right:10px;border:2px solid #fff;vertical-align:middle;"></span>'
-        ui_msg = swatch + f'<span style="vertical-align:middle;">{msg}</span>'
-    else:
-        ui_msg = msg
-
-    entry = {"time": timestamp, "msg": ui_msg, "type": category}
+        entry["colors"] = _parse_colors(color_hex)
     if meta:
         entry["meta"] = meta
-        
-    RECENT_LOGS.insert(0, entry)
-    if len(RECENT_LOGS) > 50: RECENT_LOGS.pop()
-    
+
+    size = log_history_size()
+    with _LOG_LOCK:
+        LOG_SEQ += 1
+        entry["seq"] = LOG_SEQ
+        _log_ring(size).appendleft(entry)
+
     # Standard Python Logging
     if category == "ERROR":
         logger.error(msg)
@@ -104,6 +117,40 @@ def add_log_entry(msg, category="INFO", color_hex=None, meta=None):
     else:
         logger.info(msg)
 
+    for fn in list(LOG_LISTENERS):
+        try:
+            fn()
+        except Exception:
+            pass
+
+
+def logs_since(since=None, limit=None):
+    """(entries, seq, reset) for a client whose newest entry is `since`.
+
+    entries are newest first. reset is False when they are exactly the ones
+    after `since` (possibly none) — the client prepends them; True when the
+    client must replace its list: no cursor, a cursor this process never
+    issued (the hub restarted) or one the ring has already dropped entries
+    past. `limit` caps the entries (newest kept). seq is the newest seq
+    written — the client's next cursor."""
+    with _LOG_LOCK:
+        entries = list(RECENT_LOGS)
+        seq = LOG_SEQ
+    try:
+        since = int(since) if since is not None and str(since).strip() != "" else None
+    except (TypeError, ValueError):
+        since = None
+    reset = since is None or since > seq
+    if not reset:
+        oldest = entries[-1].get("seq", 0) if entries else seq + 1
+        reset = since + 1 < oldest
+    if not reset:
+        entries = [e for e in entries if e.get("seq", 0) > since]
+    if limit is not None:
+        entries = entries[:max(0, int(limit))]
+    return entries, seq, reset
+
+
 def reset_audit():
     """Clears the current audit state."""
     global AUDIT_SESSION
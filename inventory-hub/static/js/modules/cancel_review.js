@@ -463,11 +463,21 @@
     window.cancelReviewDecorate = decoratePrinterStatus;
 
     // Keep the indicators live: on load, on a slow poll, and after every sync
-    // pulse (a confirm/deduct fires one). Cheap — one tiny GET.
+    // pulse (a confirm/deduct fires one). Cheap — one tiny GET. While the push
+    // channel is live the server sends the pending list itself (`reviews`),
+    // so the poll and the per-pulse GET stand down.
     function startBadge() {
         refreshBadge();
-        setInterval(refreshBadge, 20000);
-        document.addEventListener('inventory:sync-pulse', refreshBadge);
+        setInterval(() => { if (!window.fccPushLive()) refreshBadge(); }, 20000);
+        document.addEventListener('inventory:sync-pulse', () => {
+            if (!window.fccPushLive()) refreshBadge();
+        });
+        document.addEventListener('inventory:push', (e) => {
+            if (e.detail.topic === 'reviews' && Array.isArray(e.detail.data.pending)) {
+                applyBadges(e.detail.data.pending);
+            }
+        });
+        document.addEventListener('inventory:push-resync', refreshBadge);
     }
     if (document.readyState === 'loading') {
         document.addEventListener('DOMContentLoaded', startBadge);
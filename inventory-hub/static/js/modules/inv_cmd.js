@@ -397,15 +397,20 @@ window.updateAuditVisuals = () => {
         });
         const closeBtn = _handle.element.querySelector('#fcc-audit-panel-close');
         if (closeBtn) closeBtn.onclick = () => window.closeAuditPanel();
-        // Initial render + start the 2s poll.
+        // Initial render + start the 2s poll (a no-op tick while the push
+        // channel is live — the `audit` event re-renders on each scan).
         _poll();
-        _pollTimer = setInterval(_poll, 2000);
+        _pollTimer = setInterval(() => { if (!window.fccPushLive()) _poll(); }, 2000);
     };
 
     window.closeAuditPanel = () => {
         if (_pollTimer) { clearInterval(_pollTimer); _pollTimer = null; }
         if (_handle) { try { _handle.cleanup(); } catch (_) { /* noop */ } _handle = null; }
     };
+
+    document.addEventListener('inventory:push', (e) => {
+        if (e.detail.topic === 'audit' && _handle) _poll();
+    });
 })();
 
 // --- Prusament matched-scan overlay (Stage 2c) -----------------------------
@@ -1051,6 +1056,44 @@ const persistBuffer = () => {
     }).catch(e => console.warn("Buffer Save Failed", e));
 };
 
+// Apply a server buffer payload (a /api/state/buffer poll or a pushed
+// `buffer` event) unless a local change is younger than the grace window.
+const _applyServerBuffer = (data) => {
+    if (Array.isArray(data)) {
+        const currentStr = JSON.stringify(state.heldSpools);
+        const serverStr = JSON.stringify(data);
+
+        if (currentStr !== serverStr) {
+            // Grace window: a user-driven mutation in the last 3s wins over the server payload.
+            // Without this, manual entries (and barcode scans) added during an in-flight sync
+            // get wiped before persistBuffer lands.
+            const localAge = Date.now() - (window.lastLocalBufferChange || 0);
+            if (localAge < 3000) {
+                console.log(`⏸️ Skipping server overwrite — local change ${localAge}ms ago`);
+                window.pendingPersist = true;
+            } else {
+                console.log("🔄 Syncing Buffer from Server...");
+                // 21.6: drop any spool this client just assigned out of
+                // the buffer — a stale server payload (lost persist or a
+                // second client's clobber) must not resurrect it.
+                const cleaned = _filterRecentlyAssignedOut(data);
+                const wasStale = cleaned.length !== data.length;
+                window.suppressBufferDirty = true;
+                state.heldSpools = cleaned;
+                if (window.renderBuffer) window.renderBuffer();
+                window.suppressBufferDirty = false;
+                // If we filtered resurrected spools, the server is behind
+                // us — re-assert the corrected buffer so it converges
+                // (recovers a dropped persist) instead of fighting us on
+                // every heartbeat.
+                if (wasStale) persistBuffer();
+                // [ALEX FIX] Trigger a proactive backfill sync since old DB state didn't track remaining_weight
+                setTimeout(liveRefreshBuffer, 500);
+            }
+        }
+    }
+};
+
 const loadBuffer = () => {
     // L28 polling guard: bail if a previous tick is still in flight.
     // isBufferSyncing was already used to block persistBuffer uploads
@@ -1063,39 +1106,7 @@ const loadBuffer = () => {
     fetch('/api/state/buffer')
         .then(r => r.json())
         .then(data => {
-            if (Array.isArray(data)) {
-                const currentStr = JSON.stringify(state.heldSpools);
-                const serverStr = JSON.stringify(data);
-
-                if (currentStr !== serverStr) {
-                    // Grace window: a user-driven mutation in the last 3s wins over the server payload.
-                    // Without this, manual entries (and barcode scans) added during an in-flight sync
-                    // get wiped before persistBuffer lands.
-                    const localAge = Date.now() - (window.lastLocalBufferChange || 0);
-                    if (localAge < 3000) {
-                        console.log(`⏸️ Skipping server overwrite — local change ${localAge}ms ago`);
-                        window.pendingPersist = true;
-                    } else {
-                        console.log("🔄 Syncing Buffer from Server...");
-                        // 21.6: drop any spool this client just assigned out of
-                        // the buffer — a stale server payload (lost persist or a
-                        // second client's clobber) must not resurrect it.
-                        const cleaned = _filterRecentlyAssignedOut(data);
-                        const wasStale = cleaned.length !== data.length;
-                        window.suppressBufferDirty = true;
-                        state.heldSpools = cleaned;
-                        if (window.renderBuffer) window.renderBuffer();
-                        window.suppressBufferDirty = false;
-                        // If we filtered resurrected spools, the server is behind
-                        // us — re-assert the corrected buffer so it converges
-                        // (recovers a dropped persist) instead of fighting us on
-                        // every heartbeat.
-                        if (wasStale) persistBuffer();
-                        // [ALEX FIX] Trigger a proactive backfill sync since old DB state didn't track remaining_weight
-                        setTimeout(liveRefreshBuffer, 500);
-                    }
-                }
-            }
+            _applyServerBuffer(data);
             window.isBufferSyncing = false; // Unblock
             if (window.pendingPersist) {
                 window.pendingPersist = false;
@@ -1197,8 +1208,19 @@ document.addEventListener('inventory:sync-pulse', (e) => {
 // fetchLocations directly without signalling the buffer).
 document.addEventListener('inventory:locations-changed', () => liveRefreshBuffer());
 
-// Heartbeat (Checks every 2 seconds)
-setInterval(loadBuffer, 2000);
+// Heartbeat (Checks every 2 seconds) — only while the push channel is down.
+// With /api/events live, the server sends the buffer as it changes and a
+// `resync` (reconnect after a gap) reloads it once.
+setInterval(() => { if (!window.fccPushLive()) loadBuffer(); }, 2000);
+document.addEventListener('inventory:push', (e) => {
+    if (e.detail.topic !== 'buffer' || window.isBufferSyncing) return;
+    _applyServerBuffer(e.detail.data);
+    if (window.pendingPersist) {
+        window.pendingPersist = false;
+        persistBuffer();
+    }
+});
+document.addEventListener('inventory:push-resync', loadBuffer);
 
 // Initial Load
 document.addEventListener('DOMContentLoaded', loadBuffer);
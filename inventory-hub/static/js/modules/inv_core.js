@@ -10,6 +10,11 @@ let state = {
     bufferTimeout: null,
     processing: false,
     logsPaused: false,
+    // Activity log as last rendered (newest first) and the server cursor
+    // (`seq` of the newest entry) the next /api/logs?since= asks after.
+    logEntries: [],
+    logSeq: null,
+    logHistory: 200,
     allLocations: [],
 
     // Command Center / Buffer
@@ -215,9 +220,9 @@ const pauseLogs = (isPaused) => {
     }
 };
 
-// Click-to-toggle from the log-status indicator. RECENT_LOGS is bounded
-// at 50 server-side, so resume always backfills with whatever ticked while
-// the user was reading.
+// Click-to-toggle from the log-status indicator. The next logs fetch asks
+// for everything after the last entry shown, so resume backfills whatever
+// ticked while the user was reading (the whole history if more than that).
 window.toggleLogsStickyPause = () => {
     pauseLogs(!state.logsPaused);
 };
@@ -925,7 +930,7 @@ window.openLogPillOverlay = () => {
         // hits ~1.4:1 against the dark overlay bg and reads as gray-on-gray.
         // Use explicit rgba(255,255,255,0.7) for low-emphasis text instead.
         const rows = logs.map(l =>
-            `<div class="log-${l.type}" style="padding:2px 4px; border-bottom:1px solid #222;">[${l.time}] ${l.msg}</div>`
+            `<div class="log-${l.type}" style="padding:2px 4px; border-bottom:1px solid #222;">[${l.time}] ${_logSwatchHtml(l.colors)}${l.msg}</div>`
         ).join('') || '<div class="small p-3" style="color: rgba(255,255,255,0.7);">Activity Log is empty.</div>';
         const html = `
             <div style="background:#1e1e1e; color:#fff; border:2px solid #0ff;
@@ -957,6 +962,50 @@ window.openLogPillOverlay = () => {
     });
 };
 
+// Log entries carry their spool colors as a list ("colors"); the swatch is
+// drawn here rather than shipped as markup with every entry. Several colors
+// split a conic gradient into equal wedges.
+const _LOG_COLOR_RE = /^#[0-9a-fA-F]{3,8}$/;
+const _logSwatchHtml = (colors) => {
+    if (!Array.isArray(colors) || colors.length === 0) return '';
+    const hexes = colors.map(c => (_LOG_COLOR_RE.test(c) ? c : '#888888'));
+    let bg;
+    if (hexes.length > 1) {
+        const slice = 100 / hexes.length;
+        const parts = hexes.map((c, i) => `${c} ${+(i * slice).toFixed(2)}% ${+((i + 1) * slice).toFixed(2)}%`);
+        bg = `background: conic-gradient(${parts.join(', ')});`;
+    } else {
+        bg = `background-color:${hexes[0]};`;
+    }
+    return `<span style="display:inline-block;width:24px;height:24px;border-radius:50%;${bg}margin-right:10px;border:2px solid #fff;vertical-align:middle;"></span>`;
+};
+
+// Fold a logs payload into state.logEntries. `reset` payloads replace the
+// list; the rest carry only entries past our cursor (the pulse / polled
+// /api/logs send exactly those; a push event carries the newest few, so
+// anything at or below the cursor is dropped). A push tail that doesn't
+// reach back to the cursor means entries were missed — fetch them with
+// ?since instead of leaving a hole. Returns whether the list changed.
+const _mergeLogs = (d) => {
+    if (d.history) state.logHistory = d.history;
+    const incoming = d.logs || [];
+    if (d.reset || d.seq === undefined) {
+        state.logEntries = incoming.slice(0, state.logHistory);
+        state.logSeq = d.seq === undefined ? null : d.seq;
+        return true;
+    }
+    if (state.logSeq === null) return false;  // the full load is on its way
+    const fresh = incoming.filter(l => l.seq > state.logSeq);
+    if (fresh.length === 0) return false;
+    if (fresh[fresh.length - 1].seq > state.logSeq + 1 && fresh.length === incoming.length) {
+        updateLogState(true);
+        return false;
+    }
+    state.logEntries = fresh.concat(state.logEntries).slice(0, state.logHistory);
+    state.logSeq = Math.max(state.logSeq, d.seq);
+    return true;
+};
+
 // L28 root cause: this poll fired on a 5s heartbeat without an in-flight
 // guard and without a .catch(), so a slow backend (e.g. mid-PATCH) would
 // pile fetches up until Chrome hit net::ERR_NO_BUFFER_SPACE — at which
@@ -976,8 +1025,8 @@ const _renderLogsPayload = (d, force = false) => {
     // -----------------------
 
     const logsEl = document.getElementById('live-logs');
-    if (logsEl && d.logs) {
-        logsEl.innerHTML = d.logs.map(l => {
+    if (d.logs && (_mergeLogs(d) || force) && logsEl) {
+        logsEl.innerHTML = state.logEntries.map(l => {
             let extraHtml = '';
             let extraClass = '';
             if (l.meta && l.meta.type === 'cancel_deduct_pending') {
@@ -987,10 +1036,10 @@ const _renderLogsPayload = (d, force = false) => {
                 extraClass = ' cancel-review-log';
                 extraHtml = `<button class="btn btn-sm btn-outline-warning ms-2 py-0 px-1" onclick="window.openCancelReview()">🛑 Review</button>`;
             }
-            return `<div class="log-${l.type}${extraClass}">[${l.time}] ${l.msg}${extraHtml}</div>`;
+            return `<div class="log-${l.type}${extraClass}">[${l.time}] ${_logSwatchHtml(l.colors)}${l.msg}${extraHtml}</div>`;
         }).join('');
     }
-    _updateLogPill(d.logs || []);
+    _updateLogPill(state.logEntries);
 
     const sSpool = document.getElementById('st-spoolman');
     if (d.status) {
@@ -1010,7 +1059,8 @@ const updateLogState = (force = false) => {
     if (state.logsPaused && !force) return;
     if (_updateLogStateInflight) return;
     _updateLogStateInflight = true;
-    fetch('/api/logs').then(r => r.json()).then(d => _renderLogsPayload(d, force))
+    const since = state.logSeq === null ? '' : `?since=${state.logSeq}`;
+    fetch(`/api/logs${since}`).then(r => r.json()).then(d => _renderLogsPayload(d, force))
         .catch(e => console.warn("updateLogState failed:", e))
         .finally(() => { _updateLogStateInflight = false; });
 };
@@ -1047,6 +1097,11 @@ const PULSE_INTERVAL_ACTIVE = 5000;
 const PULSE_INTERVAL_IDLE = 15000;
 const PULSE_INTERVAL_HIDDEN = 30000;
 const PULSE_IDLE_THRESHOLD_MS = 60000;
+// While the /api/events push channel is live (see PUSH CHANNEL below) the
+// pulse is only a safety net — Spoolman edits made outside FCC and the
+// Spoolman health dot — since every FCC-side change arrives as an event.
+const PULSE_INTERVAL_PUSH = 60000;
+let _pushLive = false;
 
 // L25 / FilaBridge Phase 0 — fast-poll on a print-finish/cancel edge.
 //
@@ -1094,6 +1149,7 @@ const _pulseInterval = () => {
     // overrides the idle + hidden buckets, so the deduct's weight update
     // isn't stuck behind the 15s/30s gap (L25).
     if (Date.now() < _fastPollUntil) return PULSE_INTERVAL_ACTIVE;
+    if (_pushLive) return PULSE_INTERVAL_PUSH;
     if (document.hidden) return PULSE_INTERVAL_HIDDEN;
     if (Date.now() - _lastUserActivity > PULSE_IDLE_THRESHOLD_MS) return PULSE_INTERVAL_IDLE;
     return PULSE_INTERVAL_ACTIVE;
@@ -1146,6 +1202,13 @@ const _computePulseInclude = () => {
 
 let _pulseInflight = false;
 let _pulseNextTimer = null;
+// ETag of the last pulse we rendered, and the request (url) it answered.
+// The next GET tick asking the same thing sends it as If-None-Match; a 304
+// means nothing changed, so there is nothing to download or repaint. The
+// POST form (held spools to refresh) is never conditional — the server
+// sends it no ETag, as a 304 is only valid for GET / HEAD.
+let _pulseEtag = null;
+let _pulseEtagKey = null;
 // _scheduleNextPulse owns every setTimeout we use to drive ticks so the
 // visibilitychange handler can cancel-and-reschedule when the tab comes
 // back to focus (otherwise the user would wait up to 30s — the hidden-
@@ -1179,6 +1242,7 @@ const _dashboardPulseTick = () => {
         : sections;
     let url = `/api/dashboard_pulse?include=${encodeURIComponent(include.join(','))}`;
     if (manageId) url += `&manage_id=${encodeURIComponent(manageId)}`;
+    if (include.includes('logs') && state.logSeq !== null) url += `&logs_since=${state.logSeq}`;
 
     // POST body carries refresh_spool_ids when the buffer has held spools,
     // replacing the old liveRefreshBuffer fetch.
@@ -1190,10 +1254,25 @@ const _dashboardPulseTick = () => {
             body: JSON.stringify({ refresh_spool_ids: heldIds }),
         }
         : { method: 'GET' };
+    const etagKey = url;
+    if (fetchOpts.method === 'GET' && _pulseEtag && _pulseEtagKey === etagKey) {
+        fetchOpts.headers = Object.assign({}, fetchOpts.headers, { 'If-None-Match': _pulseEtag });
+    }
+    let etag = null;
 
     fetch(url, fetchOpts)
-        .then(r => r.json())
+        .then(r => {
+            if (r.status === 304) return null;
+            etag = r.ok ? r.headers.get('ETag') : null;
+            return r.json();
+        })
         .then(payload => {
+            if (payload === null) {
+                // Unchanged since the last render — still tell the
+                // independent pollers a tick happened.
+                document.dispatchEvent(new CustomEvent('inventory:sync-pulse', { detail: { source: 'dashboard_pulse' } }));
+                return;
+            }
             if (!payload || typeof payload !== 'object') return;
 
             // logs / status renderer — handles status dots + audit visuals + log entries
@@ -1230,6 +1309,9 @@ const _dashboardPulseTick = () => {
             // These do NOT include liveRefreshBuffer — that's now driven
             // directly by the spools_refresh payload above.
             document.dispatchEvent(new CustomEvent('inventory:sync-pulse', { detail: { source: 'dashboard_pulse' } }));
+            // Only a fully rendered pulse may be skipped next time.
+            _pulseEtag = etag;
+            _pulseEtagKey = etagKey;
         })
         .catch(e => console.warn("dashboard_pulse failed:", e))
         .finally(() => {
@@ -1272,10 +1354,84 @@ window._notePrinterStatesForFastPoll = _notePrinterStatesForFastPoll;
 window._fastPollActive = () => Date.now() < _fastPollUntil;
 window._resetFastPollForTest = () => { _fastPollUntil = 0; _lastPrinterState = {}; };
 
+// --- PUSH CHANNEL (/api/events, Server-Sent Events) ---
+//
+// The server pushes buffer, queue, logs, undo, audit, cancel-review and
+// printer-state changes as they happen (event_stream.py), so a live stream
+// lets the 2s buffer / queue / audit polls and the 20s review-badge poll
+// stand down and stretches the pulse to PULSE_INTERVAL_PUSH. Modules listen
+// for `inventory:push` ({topic, data} — data is the topic's full snapshot)
+// and `inventory:push-resync` (reload everything once: first connect, or a
+// reconnect the server couldn't replay). Anything that goes wrong — no
+// EventSource, the server refusing the stream (503: push off or full), a
+// dropped connection — just flips fccPushLive() false and every poll resumes
+// on its next tick. EventSource reconnects a dropped stream by itself
+// (resuming from Last-Event-ID); a refused one is retried after
+// PUSH_RETRY_MS.
+const PUSH_RETRY_MS = 60000;
+const _PUSH_TOPICS = ['buffer', 'queue', 'logs', 'undo', 'audit', 'reviews', 'printer_state'];
+let _pushSource = null;
+let _pushRetryTimer = null;
+
+window.fccPushLive = () => _pushLive;
+
+const _setPushLive = (live) => {
+    if (_pushLive === live) return;
+    _pushLive = live;
+    console.log(live ? "📡 Push channel live — polling paused" : "📡 Push channel down — polling");
+    // Back on the normal cadence straight away when the stream drops.
+    if (!live && !_pulseInflight) _scheduleNextPulse(_pulseInterval());
+};
+
+// A log line (a move, a deduct) or a printer state change usually means the
+// locations / printer-status / buffer-weight sections changed too: pull the
+// pulse forward (coalescing a burst of events into one pulse).
+const _pulseSoon = () => {
+    if (!_pulseInflight) _scheduleNextPulse(300);
+};
+
+const _onPushEvent = (topic, ev) => {
+    let data;
+    try { data = JSON.parse(ev.data); } catch (_) { return; }
+    if (topic === 'logs' && !state.logsPaused) _renderLogsPayload(data);
+    if (topic === 'logs' || topic === 'printer_state') _pulseSoon();
+    document.dispatchEvent(new CustomEvent('inventory:push', { detail: { topic, data } }));
+};
+
+const _onPushResync = () => {
+    _pulseSoon();
+    document.dispatchEvent(new CustomEvent('inventory:push-resync'));
+};
+
+window.startPushChannel = () => {
+    if (_pushSource || typeof window.EventSource !== 'function') return;
+    const es = new EventSource('/api/events');
+    _pushSource = es;
+    es.addEventListener('open', () => _setPushLive(true));
+    es.addEventListener('hello', _onPushResync);
+    es.addEventListener('resync', _onPushResync);
+    _PUSH_TOPICS.forEach(topic => es.addEventListener(topic, ev => _onPushEvent(topic, ev)));
+    es.addEventListener('error', () => {
+        _setPushLive(false);
+        if (es.readyState === EventSource.CLOSED) {
+            // Refused (or failed for good): poll, and ask again later.
+            _pushSource = null;
+            if (_pushRetryTimer === null) {
+                _pushRetryTimer = setTimeout(() => {
+                    _pushRetryTimer = null;
+                    window.startPushChannel();
+                }, PUSH_RETRY_MS);
+            }
+        }
+    });
+};
+
 // --- GLOBAL MODAL / WINDOW MANAGER ---
 document.addEventListener('DOMContentLoaded', () => {
     // Start Heartbeat
     window.startSmartSync();
+    // ...and the push channel that lets it (and the other polls) idle.
+    window.startPushChannel();
     // L184 — fire the log poll once immediately so the corner pill can
     // populate without waiting ~5s for the first heartbeat tick.
     updateLogState(true);
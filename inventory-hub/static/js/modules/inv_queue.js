@@ -237,6 +237,34 @@ const persistQueue = () => {
 };
 
 let queueInitialLoad = true;
+// Apply a server queue payload (a /api/state/queue poll or a pushed `queue`
+// event).
+const _applyServerQueue = (data) => {
+    if (Array.isArray(data)) {
+        const currentStr = JSON.stringify(labelQueue);
+        const serverStr = JSON.stringify(data);
+
+        if (currentStr !== serverStr) {
+            // [ALEX BUGFIX]: If the server restarted, it sets GLOBAL_QUEUE to `[]`.
+            // If this client holds a localStorage queue on initial load, re-seed the server!
+            if (queueInitialLoad && serverStr === '[]' && labelQueue.length > 0) {
+                persistQueue();
+            } else {
+                labelQueue.length = 0;
+                data.forEach(item => labelQueue.push(item));
+
+                const btn = document.getElementById('btn-queue-count');
+                if (btn) btn.innerText = `🛒 Queue (${labelQueue.length})`;
+
+                if (modals.queueModal && document.getElementById('queueModal').classList.contains('show')) {
+                    window.openQueueModal();
+                }
+            }
+        }
+        queueInitialLoad = false;
+    }
+};
+
 let _loadQueueInflight = false;
 const loadQueue = () => {
     // In-flight guard (L28): loadQueue polls /api/state/queue every 2s — the
@@ -253,34 +281,18 @@ const loadQueue = () => {
             // local mutation — they reflect the server's old state and
             // would clobber the user's just-applied change.
             if (issuedAt < lastPersistAt) return;
-            if (Array.isArray(data)) {
-                const currentStr = JSON.stringify(labelQueue);
-                const serverStr = JSON.stringify(data);
-
-                if (currentStr !== serverStr) {
-                    // [ALEX BUGFIX]: If the server restarted, it sets GLOBAL_QUEUE to `[]`.
-                    // If this client holds a localStorage queue on initial load, re-seed the server!
-                    if (queueInitialLoad && serverStr === '[]' && labelQueue.length > 0) {
-                        persistQueue();
-                    } else {
-                        labelQueue.length = 0;
-                        data.forEach(item => labelQueue.push(item));
-
-                        const btn = document.getElementById('btn-queue-count');
-                        if (btn) btn.innerText = `🛒 Queue (${labelQueue.length})`;
-
-                        if (modals.queueModal && document.getElementById('queueModal').classList.contains('show')) {
-                            window.openQueueModal();
-                        }
-                    }
-                }
-                queueInitialLoad = false;
-            }
+            _applyServerQueue(data);
         })
         .catch(e => console.warn("Queue Load Failed", e))
         .finally(() => { _loadQueueInflight = false; });
 };
 
 document.addEventListener('inventory:queue-updated', persistQueue);
-setInterval(loadQueue, 2000);
+// Poll only while the push channel is down; with /api/events live the server
+// sends the queue as it changes.
+setInterval(() => { if (!window.fccPushLive()) loadQueue(); }, 2000);
+document.addEventListener('inventory:push', (e) => {
+    if (e.detail.topic === 'queue' && !_loadQueueInflight) _applyServerQueue(e.detail.data);
+});
+document.addEventListener('inventory:push-resync', loadQueue);
 document.addEventListener('DOMContentLoaded', loadQueue);
\ No newline at end of file
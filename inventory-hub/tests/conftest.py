@@ -44,6 +44,15 @@ for _utf8_stream in (sys.stdout, sys.stderr):
         pass
 
 
+# hub_store keeps the deduct ledger, cancel reviews / fetches and the print
+# latch in data/hub_store.sqlite3. Point it at a throwaway database before any
+# test imports app (whose startup re-surfaces pending reviews from the store) —
+# and at a fresh one per test, below — so no test ever opens the real one.
+import tempfile  # noqa: E402
+import hub_store  # noqa: E402
+hub_store._DB_PATH = os.path.join(tempfile.mkdtemp(prefix="fcc-hub-store-"), "hub_store.sqlite3")
+
+
 DEFAULT_BASE_URL = os.environ.get("INVENTORY_HUB_URL", "http://localhost:8000")
 DEFAULT_DEV_SPOOLMAN = os.environ.get("DEV_SPOOLMAN_URL", "http://192.168.1.29:7913")
 BASELINE_VIEWPORT = {"width": 1600, "height": 1300}
@@ -94,6 +103,15 @@ def pytest_addoption(parser):
              "(DESTRUCTIVE; agent-invoked with explicit OK — Derek never runs "
              "this). Equivalent env: RESET_DEV_PRUNE=1.",
     )
+    # Performance benchmarks (@pytest.mark.benchmark) time real work and print
+    # a latency table — seconds of wall clock each, so OFF by default. Run with
+    # `pytest -m benchmark --run-benchmark -s`. Equivalent env: RUN_BENCHMARK=1.
+    parser.addoption(
+        "--run-benchmark",
+        action="store_true",
+        default=False,
+        help="Run @pytest.mark.benchmark performance benchmarks.",
+    )
 
 
 def pytest_collection_modifyitems(config, items):
@@ -102,18 +120,87 @@ def pytest_collection_modifyitems(config, items):
     Two opt-in switches: the --run-integration CLI flag OR RUN_INTEGRATION=1
     in the environment. If neither is set, every integration item gets a
     skip marker added so the rest of the suite still runs.
+
+    @pytest.mark.benchmark items are gated the same way (--run-benchmark or
+    RUN_BENCHMARK=1).
     """
-    opted_in = config.getoption("--run-integration") or os.environ.get(
-        "RUN_INTEGRATION", ""
-    ).lower() in ("1", "true", "yes")
-    if opted_in:
-        return
-    skip_marker = pytest.mark.skip(
-        reason="integration test skipped (opt-in: --run-integration or RUN_INTEGRATION=1)"
+    gates = (
+        ("integration", "--run-integration", "RUN_INTEGRATION"),
+        ("benchmark", "--run-benchmark", "RUN_BENCHMARK"),
     )
-    for item in items:
-        if "integration" in item.keywords:
-            item.add_marker(skip_marker)
+    for marker, flag, env in gates:
+        opted_in = config.getoption(flag) or os.environ.get(
+            env, ""
+        ).lower() in ("1", "true", "yes")
+        if opted_in:
+            continue
+        skip_marker = pytest.mark.skip(
+            reason=f"{marker} test skipped (opt-in: {flag} or {env}=1)"
+        )
+        for item in items:
+            if marker in item.keywords:
+                item.add_marker(skip_marker)
+
+
+# ---------------------------------------------------------------------------
+# In-process cache isolation
+# ---------------------------------------------------------------------------
+# spoolman_cache holds spool/filament list snapshots for a few seconds. Unit
+# tests swap the Spoolman transport mock per test, so a snapshot fetched under
+# one test's mock must never be served to the next.
+
+@pytest.fixture(autouse=True)
+def _fresh_spoolman_snapshots():
+    import spoolman_cache
+    spoolman_cache.invalidate()
+    yield
+    spoolman_cache.invalidate()
+
+
+# hub_store: a fresh database per test (the session default is set at the top),
+# and print_tracker_store's dirty-check / snapshot-version state with it.
+
+@pytest.fixture(autouse=True)
+def _isolated_hub_store(tmp_path, monkeypatch):
+    import print_tracker_store
+    monkeypatch.setattr(hub_store, "_DB_PATH", str(tmp_path / "hub_store.sqlite3"))
+    for name in ("_PERSISTED", "_STAGED", "_LAST_VERSION"):
+        monkeypatch.setattr(print_tracker_store, name, None)
+    yield
+    hub_store.close()
+
+
+# print_file_cache keeps downloaded print files under data/. Deduct tests fake
+# the PrusaLink download per test, so each gets its own empty cache dir — never
+# the real one, and never a file cached under a previous test's fake.
+
+# printer_state_hub shares the last PrusaLink probe of each printer for a few
+# seconds, prusalink_poller backs off printers that probed offline and the
+# monitor loop arms a per-printer probe schedule. Tests fake the probe per
+# test, so none of it may carry over into the next test.
+
+@pytest.fixture(autouse=True)
+def _fresh_printer_states():
+    import printer_state_hub
+    import prusalink_poller
+    printer_state_hub.invalidate()
+    prusalink_poller.reset()
+    yield
+    printer_state_hub.invalidate()
+    prusalink_poller.reset()
+    # A test that ran _cancel_monitor_loop armed its per-printer schedule;
+    # direct _cancel_monitor_tick calls elsewhere expect a full sweep.
+    print_monitor = sys.modules.get("print_monitor")
+    if print_monitor is not None:
+        print_monitor._PROBE_SCHEDULE = None
+        del print_monitor._PROBE_HEAP[:]
+
+
+@pytest.fixture(autouse=True)
+def _isolated_print_file_cache(tmp_path, monkeypatch):
+    import print_file_cache
+    monkeypatch.setattr(print_file_cache, "_CACHE_DIR", str(tmp_path / "print_file_cache"))
+    yield
 
 
 # ---------------------------------------------------------------------------
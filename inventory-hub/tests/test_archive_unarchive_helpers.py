@@ -199,7 +199,7 @@ class TestUpdateSpoolInheritWeightArchive:
 
         with patch.object(sm, "get_spool", return_value=existing), \
              patch.object(sm, "_get_raw_extras", return_value={}), \
-             patch("spoolman_api.requests.patch", side_effect=fake_patch):
+             patch("spoolman_api.spoolman_http.patch", side_effect=fake_patch):
             res = sm.update_spool(42, {"used_weight": 1000})
 
         assert res is not None
@@ -224,7 +224,7 @@ class TestUpdateSpoolInheritWeightArchive:
 
         with patch.object(sm, "get_spool", return_value=existing), \
              patch.object(sm, "_get_raw_extras", return_value={"fcc_pre_archive_location": '"PM-XL-Buffer-1"'}), \
-             patch("spoolman_api.requests.patch", side_effect=fake_patch):
+             patch("spoolman_api.spoolman_http.patch", side_effect=fake_patch):
             res = sm.update_spool(42, {"used_weight": 200})
 
         assert res is not None
@@ -483,7 +483,7 @@ class TestUpdateSpoolArchiveLifecycle:
 
         with patch.object(sm, "get_spool", return_value=existing), \
              patch.object(sm, "_get_raw_extras", return_value={}), \
-             patch("spoolman_api.requests.patch", side_effect=fake_patch):
+             patch("spoolman_api.spoolman_http.patch", side_effect=fake_patch):
             res = sm.update_spool(99, {"used_weight": 1000})
 
         assert res is not None
@@ -515,7 +515,7 @@ class TestUpdateSpoolArchiveLifecycle:
 
         with patch.object(sm, "get_spool", return_value=existing), \
              patch.object(sm, "_get_raw_extras", return_value={"fcc_pre_archive_location": '"PM-XL-Buffer-1"'}), \
-             patch("spoolman_api.requests.patch", side_effect=fake_patch):
+             patch("spoolman_api.spoolman_http.patch", side_effect=fake_patch):
             res = sm.update_spool(99, {"used_weight": 200})
 
         assert res is not None
@@ -540,7 +540,7 @@ class TestUpdateSpoolArchiveLifecycle:
 
         with patch.object(sm, "get_spool", return_value=existing), \
              patch.object(sm, "_get_raw_extras", return_value={}), \
-             patch("spoolman_api.requests.patch", side_effect=fake_patch):
+             patch("spoolman_api.spoolman_http.patch", side_effect=fake_patch):
             res = sm.update_spool(99, {"used_weight": 200})
 
         assert res is not None
@@ -571,7 +571,7 @@ class TestUpdateSpoolArchiveLifecycle:
 
         with patch.object(sm, "get_spool", return_value=existing), \
              patch.object(sm, "_get_raw_extras", return_value={"fcc_pre_archive_location": '"PM-XL-Buffer-1"'}), \
-             patch("spoolman_api.requests.patch", side_effect=fake_patch):
+             patch("spoolman_api.spoolman_http.patch", side_effect=fake_patch):
             res = sm.update_spool(99, {"used_weight": 1000})
 
         assert res is not None
@@ -14,7 +14,7 @@ from unittest.mock import patch, MagicMock
 import pytest
 
 import atomic_store
-import cancel_fetch_store
+import print_file_cache
 
 
 def test_replace_with_retry_success(tmp_path):
@@ -66,11 +66,12 @@ def test_non_permissionerror_propagates_immediately():
     slept.assert_not_called()
 
 
-def test_cancel_fetch_store_save_routes_through_retry(tmp_path, monkeypatch):
-    """Integration: cancel_fetch_store._save survives a one-shot PermissionError
-    on os.replace (the real bind-mount collision) and still lands the record."""
-    store = tmp_path / "pending_cancel_fetches.json"
-    monkeypatch.setattr(cancel_fetch_store, "_STORE_PATH", str(store))
+def test_print_file_cache_write_routes_through_retry(tmp_path, monkeypatch):
+    """Integration: a print_file_cache write survives a one-shot PermissionError
+    on os.replace (the real bind-mount collision) and still lands the file.
+    (The cancel / ledger / latch stores this used to pin moved to hub_store's
+    SQLite database and no longer swap files.)"""
+    monkeypatch.setattr(print_file_cache, "_CACHE_DIR", str(tmp_path / "cache"))
 
     real_replace = os.replace
     state = {"failed": False}
@@ -83,12 +84,8 @@ def test_cancel_fetch_store_save_routes_through_retry(tmp_path, monkeypatch):
 
     with patch.object(atomic_store.os, "replace", side_effect=fail_once), \
          patch.object(atomic_store.time, "sleep"):
-        cancel_fetch_store.add_pending({
-            "printer_name": "XL", "job_id": "G-9", "filename": "f.gcode",
-            "progress": 0.5, "first_seen": 0, "attempts": 1,
-        })
+        print_file_cache._save_index({"keys": {"k": "abc"}, "blobs": {}})
 
     assert state["failed"] is True                       # the retry actually fired
-    assert cancel_fetch_store.has_pending("XL", "G-9")   # and the write landed
-    saved = json.loads(store.read_text(encoding="utf-8"))
-    assert "XL::G-9" in saved
+    saved = json.loads((tmp_path / "cache" / "index.json").read_text(encoding="utf-8"))
+    assert saved["keys"] == {"k": "abc"}                 # and the write landed
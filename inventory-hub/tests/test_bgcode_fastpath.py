@@ -0,0 +1,327 @@
+"""Table-driven heatshrink + MeatPack decoding (bgcode_decode).
+
+heatshrink_decode reads each token with one 32-bit word instead of bit by
+bit and copies back-references as slices; meatpack_decode decodes packed
+bytes through a 256-entry pair table. Both must be byte-for-byte the decoders
+they replaced — the originals are kept verbatim below as the reference and
+diffed over a corpus: the real sample.bgcode G-code blocks, streams from a
+small greedy encoder (realistic overlapping runs and window-edge distances),
+and random bytes (any bitstream is a valid heatshrink input, including
+backrefs before the start of output and truncated tails).
+
+The benchmark (opt-in: --run-benchmark -s) reports MB/s for both decoders.
+"""
+from __future__ import annotations
+
+import os
+import random
+import struct
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import bgcode_decode  # noqa: E402
+
+_FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "sample.bgcode")
+
+
+# --------------------------------------------------------------------------
+# reference decoders (the bit-at-a-time / nibble-at-a-time originals)
+# --------------------------------------------------------------------------
+
+def _ref_heatshrink(data, window, lookahead):
+    out = bytearray()
+    nbits = len(data) * 8
+    pos = 0
+
+    def get(n):
+        nonlocal pos
+        if pos + n > nbits:
+            return None
+        v = 0
+        p = pos
+        for _ in range(n):
+            v = (v << 1) | ((data[p >> 3] >> (7 - (p & 7))) & 1)
+            p += 1
+        pos = p
+        return v
+
+    while True:
+        if len(out) > bgcode_decode._MAX_BLOCK_OUTPUT:
+            break
+        tag = get(1)
+        if tag is None:
+            break
+        if tag == 1:
+            b = get(8)
+            if b is None:
+                break
+            out.append(b)
+        else:
+            idx = get(window)
+            if idx is None:
+                break
+            cnt = get(lookahead)
+            if cnt is None:
+                break
+            start = len(out) - (idx + 1)
+            for i in range(cnt + 1):
+                src = start + i
+                out.append(out[src] if src >= 0 else 0)
+    return bytes(out)
+
+
+def _ref_meatpack(data, packing=False, no_spaces=False):
+    out = bytearray()
+    i = 0
+    n = len(data)
+
+    def lut(nib):
+        if nib == 11 and no_spaces:
+            return ord("E")
+        return bgcode_decode._MP_LUT[nib]
+
+    while i < n:
+        c = data[i]
+        if c == 0xFF:
+            if i + 1 < n and data[i + 1] == 0xFF:
+                i += 2
+                if i < n:
+                    cmd = data[i]
+                    i += 1
+                    if cmd == 0xFB:
+                        packing = True
+                    elif cmd == 0xFA:
+                        packing = False
+                    elif cmd == 0xF9:
+                        packing = False
+                        no_spaces = False
+                    elif cmd == 0xF7:
+                        no_spaces = True
+                    elif cmd == 0xF6:
+                        no_spaces = False
+                continue
+            i += 1
+            if i < n:
+                out.append(data[i]); i += 1
+            if i < n:
+                out.append(data[i]); i += 1
+            continue
+        i += 1
+        if not packing:
+            out.append(c)
+            continue
+        low = c & 0x0F
+        high = (c >> 4) & 0x0F
+        if low == 0x0F:
+            if i < n:
+                out.append(data[i]); i += 1
+        else:
+            out.append(lut(low))
+        if high == 0x0F:
+            if i < n:
+                out.append(data[i]); i += 1
+        else:
+            out.append(lut(high))
+    return bytes(out), packing, no_spaces
+
+
+# --------------------------------------------------------------------------
+# corpus
+# --------------------------------------------------------------------------
+
+def _heatshrink_encode(data, window, lookahead):
+    """Greedy heatshrink encoder (test-only): longest match among the last few
+    positions sharing a 2-byte prefix, overlapping matches allowed."""
+    max_dist = 1 << window
+    max_len = 1 << lookahead
+    bits = []
+    last = {}
+    i = 0
+    while i < len(data):
+        best_len, best_dist = 0, 0
+        for j in reversed(last.get(data[i:i + 2], [])[-8:]):
+            dist = i - j
+            if dist > max_dist:
+                break
+            k = 0
+            while k < max_len and i + k < len(data) and data[j + k] == data[i + k]:
+                k += 1
+            if k > best_len:
+                best_len, best_dist = k, dist
+        if best_len >= 2:
+            bits.append(f"0{best_dist - 1:0{window}b}{best_len - 1:0{lookahead}b}")
+            step = best_len
+        else:
+            bits.append(f"1{data[i]:08b}")
+            step = 1
+        for p in range(i, i + step):
+            last.setdefault(data[p:p + 2], []).append(p)
+        i += step
+    s = "".join(bits)
+    s += "0" * (-len(s) % 8)
+    return int(s, 2).to_bytes(len(s) // 8, "big") if s else b""
+
+
+def _meatpack_encode(text, no_spaces):
+    """MeatPack encoder (test-only) covering packed pairs, one- and two-sided
+    literal escapes and the enable / no-spaces commands."""
+    lut = bytearray(bgcode_decode._MP_LUT)
+    if no_spaces:
+        lut[11] = ord("E")
+        text = text.replace(b" ", b"")
+    nib = {ch: i for i, ch in enumerate(lut[:15])}
+    out = bytearray(b"\xff\xff\xfb")
+    if no_spaces:
+        out += b"\xff\xff\xf7"
+    if len(text) % 2:
+        text += b"\n"
+    for a, b in zip(text[0::2], text[1::2]):
+        lo, hi = nib.get(a, 0xF), nib.get(b, 0xF)
+        out.append(lo | (hi << 4))
+        if lo == 0xF:
+            out.append(a)
+        if hi == 0xF:
+            out.append(b)
+    return bytes(out)
+
+
+def _gcode_text(rnd, n):
+    lines = []
+    for _ in range(n):
+        lines.append(rnd.choice([
+            f"G1 X{rnd.uniform(0, 360):.3f} Y{rnd.uniform(0, 360):.3f} E{rnd.uniform(0, 2):.5f}",
+            f"G1 X{rnd.uniform(0, 360):.3f} Y{rnd.uniform(0, 360):.3f}",
+            "G1 E-.8 F2100", ";WIPE_START", "M73 P12 R40", "T1", "G92 E0",
+            "; " + "=" * rnd.randint(1, 60),
+        ]))
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _fixture_gcode_blocks():
+    """Raw (still compressed) G-code block payloads of sample.bgcode."""
+    if not os.path.exists(_FIXTURE):
+        return []
+    with open(_FIXTURE, "rb") as fh:
+        raw = fh.read()
+    checksum_type, = struct.unpack_from("<H", raw, 8)
+    off, blocks = 10, []
+    while off + 8 <= len(raw):
+        btype, comp, usize = struct.unpack_from("<HHI", raw, off)
+        off += 8
+        csize = usize
+        if comp:
+            csize, = struct.unpack_from("<I", raw, off)
+            off += 4
+        off += 6 if btype == 5 else 2
+        if btype == 1:
+            blocks.append((comp, raw[off:off + csize]))
+        off += csize + (4 if checksum_type else 0)
+    return blocks
+
+
+# --------------------------------------------------------------------------
+# differential tests
+# --------------------------------------------------------------------------
+
+@pytest.mark.skipif(not os.path.exists(_FIXTURE), reason="sample.bgcode fixture not present")
+def test_real_blocks_decode_identically():
+    blocks = _fixture_gcode_blocks()
+    assert blocks
+    stream = b""
+    for comp, payload in blocks:
+        window = 11 if comp == 2 else 12
+        got = bgcode_decode.heatshrink_decode(payload, window, 4)
+        assert got == _ref_heatshrink(payload, window, 4)
+        stream += got
+    assert bgcode_decode.meatpack_decode(stream) == _ref_meatpack(stream)
+
+
+@pytest.mark.parametrize("window", [8, 11, 12])
+def test_encoded_gcode_heatshrink_matches_reference(window):
+    rnd = random.Random(window)
+    for n in (0, 1, 40, 600):
+        text = _gcode_text(rnd, n) + b"\x00" * rnd.randint(0, 40) + b"abab" * rnd.randint(0, 30)
+        packed = _heatshrink_encode(text, window, 4)
+        got = bgcode_decode.heatshrink_decode(packed, window, 4)
+        assert got == _ref_heatshrink(packed, window, 4)
+        assert got[:len(text)] == text
+
+
+def test_random_bitstreams_heatshrink_matches_reference():
+    rnd = random.Random(11)
+    for _ in range(400):
+        data = bytes(rnd.randrange(256) for _ in range(rnd.randrange(0, 120)))
+        for window, lookahead in ((11, 4), (12, 4), (8, 4), (4, 3)):
+            assert bgcode_decode.heatshrink_decode(data, window, lookahead) == \
+                _ref_heatshrink(data, window, lookahead)
+
+
+def test_heatshrink_bomb_guard_stops_at_the_same_byte(monkeypatch):
+    monkeypatch.setattr(bgcode_decode, "_MAX_BLOCK_OUTPUT", 100)
+    data = b"\x00\x0f" * 64   # (11,4): 16-bit backrefs of 16 zero bytes each
+    assert bgcode_decode.heatshrink_decode(data, 11, 4) == _ref_heatshrink(data, 11, 4)
+    assert len(bgcode_decode.heatshrink_decode(data, 11, 4)) == 112
+
+
+@pytest.mark.parametrize("no_spaces", [False, True])
+def test_encoded_gcode_meatpack_matches_reference(no_spaces):
+    rnd = random.Random(int(no_spaces))
+    text = _gcode_text(rnd, 500)
+    packed = _meatpack_encode(text, no_spaces)
+    got = bgcode_decode.meatpack_decode(packed)
+    assert got == _ref_meatpack(packed)
+    assert got[0].rstrip(b"\n") == (text.replace(b" ", b"") if no_spaces else text).rstrip(b"\n")
+
+
+def test_random_streams_meatpack_matches_reference():
+    rnd = random.Random(5)
+    special = [0xFF, 0xFB, 0xFA, 0xF9, 0xF7, 0xF6, 0x1F, 0xF1, 0xBF, 0xFB]
+    for _ in range(3000):
+        data = bytes(rnd.choice(special) if rnd.random() < 0.3 else rnd.randrange(256)
+                     for _ in range(rnd.randrange(0, 40)))
+        for packing in (False, True):
+            for no_spaces in (False, True):
+                assert bgcode_decode.meatpack_decode(data, packing, no_spaces) == \
+                    _ref_meatpack(data, packing, no_spaces)
+
+
+# --------------------------------------------------------------------------
+# Benchmark
+# --------------------------------------------------------------------------
+
+@pytest.mark.benchmark
+def test_benchmark_decoder_throughput():
+    blocks = [(11 if comp == 2 else 12, payload) for comp, payload in _fixture_gcode_blocks()]
+    if not blocks:
+        rnd = random.Random(0)
+        blocks = [(12, _heatshrink_encode(_meatpack_encode(_gcode_text(rnd, 4000), True), 12, 4))]
+    reps = max(1, (4 << 20) // sum(len(p) for _w, p in blocks))   # ~4 MB compressed
+    work = blocks * reps
+    comp_mb = sum(len(p) for _w, p in work) / (1 << 20)
+
+    def timed(fn):
+        t0 = time.perf_counter()
+        out = fn()
+        return time.perf_counter() - t0, out
+
+    ref_hs_s, ref_hs = timed(lambda: [_ref_heatshrink(p, w, 4) for w, p in work])
+    hs_s, hs = timed(lambda: [bgcode_decode.heatshrink_decode(p, w, 4) for w, p in work])
+    assert hs == ref_hs
+    stream = b"".join(hs)
+    mp_mb = len(stream) / (1 << 20)
+    ref_mp_s, ref_mp = timed(lambda: _ref_meatpack(stream))
+    mp_s, mp = timed(lambda: bgcode_decode.meatpack_decode(stream))
+    assert mp == ref_mp
+
+    print(f"\nbgcode decode: {comp_mb:.1f} MB heatshrink in, {mp_mb:.1f} MB MeatPack in, "
+          f"{len(mp[0]) / (1 << 20):.1f} MB G-code out")
+    print(f"{'stage':>12} {'ref MB/s':>10} {'new MB/s':>10} {'speedup':>8}")
+    for name, mb, ref_s, new_s in (("heatshrink", comp_mb, ref_hs_s, hs_s),
+                                   ("meatpack", mp_mb, ref_mp_s, mp_s)):
+        print(f"{name:>12} {mb / ref_s:>10.2f} {mb / new_s:>10.2f} {ref_s / new_s:>7.1f}x")
+    assert hs_s * 3 < ref_hs_s
+    assert mp_s * 2 < ref_mp_s
@@ -0,0 +1,158 @@
+"""Streaming .bgcode decode (bgcode_decode.iter_blocks / decode_bgcode_until).
+
+iter_blocks decompresses a block only when the caller advances to it;
+decode_bgcode_until rides on that to stop once the M73 markers pin the byte a
+cancelled print reached. These tests pin that the early-stopped text is
+exactly the full decode cut at that byte (so the prefix-parse gives the same
+grams), that blocks past it are never decompressed, and that every case the
+markers can't settle falls back to the full decode unchanged.
+"""
+from __future__ import annotations
+
+import os
+import struct
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import bgcode_decode  # noqa: E402
+import prusalink_api  # noqa: E402
+
+_FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "sample.bgcode")
+_META = b"filament used [mm] = 100\nfilament used [g] = 3\n"
+
+
+def _block(btype, payload, enc=0):
+    return struct.pack("<HHI", btype, 0, len(payload)) + struct.pack("<H", enc) + payload
+
+
+def _bgcode(*blocks):
+    return b"GCDE" + struct.pack("<I", 1) + struct.pack("<H", 0) + b"".join(blocks)
+
+
+def _marked_blocks(n_blocks=10, per_block=10):
+    """A time-marked print: one `M73 P<pct>` line every 10 moves."""
+    blocks, pct = [], 0
+    for b in range(n_blocks):
+        lines = ["M83"] if b == 0 else []
+        for i in range(per_block):
+            if i % 10 == 0:
+                lines.append(f"M73 P{pct} R{100 - pct}")
+                pct += 100 // n_blocks
+            lines.append(f"G1 X{b}.{i} E1")
+        blocks.append(("\n".join(lines) + "\n").encode())
+    return blocks
+
+
+@pytest.fixture
+def decompress_log(monkeypatch):
+    calls = []
+    real = bgcode_decode._decompress
+
+    def counting(comp, data, usize):
+        calls.append(len(data))
+        return real(comp, data, usize)
+
+    monkeypatch.setattr(bgcode_decode, "_decompress", counting)
+    return calls
+
+
+def _expected_cut(raw, p):
+    """The full decode, cut where progress_to_decoded_fraction's M73 inversion
+    lands — what the early stop must reproduce byte for byte."""
+    full = bgcode_decode.decode_bgcode(raw)
+    body = full["gcode"].encode()
+    footer = bgcode_decode._footer_lines(full["filament_g"], full["filament_mm"]).encode()
+    body = body[:len(body) - len(footer)]
+    reached = bgcode_decode._m73_byte_for_percent(full["m73"], p * 100)
+    return (body[:body.rfind(b"\n", 0, reached) + 1] + footer).decode()
+
+
+def test_blocks_are_decoded_only_when_reached(decompress_log):
+    raw = _bgcode(_block(4, _META), *[_block(1, b) for b in _marked_blocks()])
+    it = bgcode_decode.iter_blocks(raw)
+    assert decompress_log == []
+    btype, _s, _e, ini = next(it)
+    assert btype == 4 and "filament used [g]" in ini
+    assert next(it)[0] == 1
+    assert len(decompress_log) == 2
+    assert len(list(it)) == 9 and len(decompress_log) == 11
+
+
+@pytest.mark.parametrize("p", [0.01, 0.05, 0.15, 0.33, 0.5, 0.75])
+def test_early_stop_matches_full_decode_cut(decompress_log, p):
+    raw = _bgcode(_block(4, _META), *[_block(1, b) for b in _marked_blocks()])
+    dec = bgcode_decode.decode_bgcode_until(raw, p)
+    # The reached block and the one whose marker bracketed it — never the tail.
+    decoded_gcode_blocks = len(decompress_log) - 1
+    assert decoded_gcode_blocks <= int(p * 10) + 2 < 10
+    assert dec["complete"] is False and dec["fraction"] == 1.0
+    assert dec["gcode"] == _expected_cut(raw, p)
+
+
+def test_progress_past_the_last_marker_decodes_everything():
+    raw = _bgcode(_block(4, _META), *[_block(1, b) for b in _marked_blocks()])
+    full = bgcode_decode.decode_bgcode(raw)
+    for p in (0.95, 1.0):
+        dec = bgcode_decode.decode_bgcode_until(raw, p)
+        assert dec["complete"] is True and dec["gcode"] == full["gcode"]
+        assert dec["fraction"] == bgcode_decode.progress_to_decoded_fraction(full, p)
+
+
+def test_zero_progress_keeps_the_footer_and_parses_to_nothing():
+    raw = _bgcode(_block(4, _META), *[_block(1, b) for b in _marked_blocks()])
+    dec = bgcode_decode.decode_bgcode_until(raw, 0.0)
+    assert dec["complete"] is False
+    assert dec["gcode"].lstrip().startswith("; filament used [mm] = 100")
+    assert prusalink_api.parse_partial_filament_usage(dec["gcode"], dec["fraction"]) == {}
+
+
+@pytest.mark.parametrize("layout", ["no_markers", "footer_after_gcode"])
+def test_falls_back_to_full_decode_when_markers_cannot_settle_it(decompress_log, layout):
+    if layout == "no_markers":
+        body = [b"G1 X1 E1\n" * 20 for _ in range(5)]
+        raw = _bgcode(_block(4, _META), *[_block(1, b) for b in body])
+    else:
+        raw = _bgcode(*[_block(1, b) for b in _marked_blocks()], _block(4, _META))
+    full = bgcode_decode.decode_bgcode(raw)
+    dec = bgcode_decode.decode_bgcode_until(raw, 0.3)
+    assert dec["complete"] is True and dec["gcode"] == full["gcode"]
+    assert dec["fraction"] == bgcode_decode.progress_to_decoded_fraction(full, 0.3)
+
+
+def test_marker_straddling_a_block_boundary_is_seen_once():
+    b1, b2 = b"G1 E1\nM73 P4", b"0 R60\nG1 E2\nM73 P90 R1\nG1 E3\n"
+    raw = _bgcode(_block(4, _META), _block(1, b"M73 P0 R99\nG1 E1\n"), _block(1, b1), _block(1, b2))
+    assert bgcode_decode.decode_bgcode(raw)["m73"] == [(0, 0), (40, 23), (90, 41)]
+    assert bgcode_decode.decode_bgcode_until(raw, 0.5)["gcode"] == _expected_cut(raw, 0.5)
+
+
+@pytest.mark.skipif(not os.path.exists(_FIXTURE), reason="sample.bgcode fixture not present")
+def test_real_file_early_cancel(decompress_log):
+    raw = open(_FIXTURE, "rb").read()
+    full = bgcode_decode.decode_bgcode(raw)
+    total = len(decompress_log)
+    for p in (0.05, 0.25, 0.51, 0.76):
+        del decompress_log[:]
+        dec = bgcode_decode.decode_bgcode_until(raw, p)
+        if p < 0.5:
+            assert len(decompress_log) < total
+        assert dec["gcode"] == _expected_cut(raw, p)
+        grams = prusalink_api.parse_partial_filament_usage(dec["gcode"], dec["fraction"])
+        old = prusalink_api.parse_partial_filament_usage(
+            full["gcode"], bgcode_decode.progress_to_decoded_fraction(full, p))
+        assert grams.keys() == old.keys()
+        for tool in old:
+            assert grams[tool] == pytest.approx(old[tool], abs=0.01)
+
+
+def test_fetch_cancel_gcode_uses_the_early_stop(monkeypatch):
+    raw = _bgcode(_block(4, _META), *[_block(1, b) for b in _marked_blocks()])
+    monkeypatch.setattr(prusalink_api, "_download_file_bytes", lambda *a: raw)
+    got = prusalink_api.fetch_cancel_gcode("1.2.3.4", "k", "x.bgcode", 0.25)
+    assert got == {"gcode": _expected_cut(raw, 0.25), "fraction": 1.0}
+    # 25% of a 10-block print reached the first ~3 blocks' moves: 30mm * 0.03 g/mm.
+    usage = prusalink_api.parse_partial_filament_usage(got["gcode"], got["fraction"])
+    assert usage == {0: pytest.approx(0.75, abs=0.1)}
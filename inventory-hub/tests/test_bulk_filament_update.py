@@ -0,0 +1,180 @@
+"""Bulk filament writes — spoolman_api.update_filaments / restore_filament_extras
+(behind /api/filament_attributes/bulk_set, remove_choice, sweep_unused and the
+boot-time ensure_filament_attributes_cleaned).
+
+Round-trips are counted at the `spoolman_http` seam: a large selection reads
+ONE filament list instead of a GET per filament (plus update_filament's extras
+GET), the PATCHes stay under `spoolman_bulk_concurrency`, and the per-item
+results come back in input order whatever order the writes finished in.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import spoolman_api  # noqa: E402
+import spoolman_cache  # noqa: E402
+
+
+def _filament(fid, attrs=None):
+    extra = {"product_url": '"https://example.com/%d"' % fid, "nozzle_temp_max": '"225"'}
+    if attrs is not None:
+        extra["filament_attributes"] = json.dumps(attrs)
+    return {"id": fid, "name": f"Fil {fid}", "extra": extra}
+
+
+@pytest.fixture
+def fake_spoolman(monkeypatch):
+    monkeypatch.setattr(spoolman_api.config_loader, "get_api_urls",
+                        lambda: ("http://sm", "http://fb"))
+    monkeypatch.setattr(spoolman_api.config_loader, "load_config",
+                        lambda: {"spoolman_bulk_concurrency": 3})
+    monkeypatch.setattr(spoolman_api.state.logger, "error", lambda *a, **k: None)
+    db = {i: _filament(i, ["Silk"] if i % 2 else []) for i in range(1, 13)}
+    calls = {"get": [], "patch": [], "in_flight": 0, "max_in_flight": 0}
+    lock = threading.Lock()
+    rejects = {}
+
+    def fake_get(url, **kwargs):
+        calls["get"].append(url)
+        r = MagicMock()
+        path = url.split("/api/v1/", 1)[1]
+        if path.startswith("filament?"):
+            r.ok = True
+            r.json.return_value = [json.loads(json.dumps(v)) for v in db.values()]
+        else:
+            fid = int(path.split("/")[1])
+            r.ok = fid in db
+            r.json.return_value = json.loads(json.dumps(db[fid])) if fid in db else {"detail": "nf"}
+        return r
+
+    def fake_patch(url, json=None, **kwargs):
+        fid = int(url.rsplit("/", 1)[-1])
+        with lock:
+            calls["patch"].append((fid, json))
+            calls["in_flight"] += 1
+            calls["max_in_flight"] = max(calls["max_in_flight"], calls["in_flight"])
+        time.sleep(0.02 if fid % 3 else 0.05)  # finish out of order
+        with lock:
+            calls["in_flight"] -= 1
+        r = MagicMock()
+        if fid in rejects:
+            r.ok, r.status_code, r.text = False, 422, rejects[fid]
+            return r
+        r.ok = True
+        r.json.return_value = dict(db[fid], extra=json["extra"])
+        return r
+
+    monkeypatch.setattr(spoolman_api.spoolman_http, "get", fake_get)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "patch", fake_patch)
+    return db, calls, rejects
+
+
+def _add_matte(fil):
+    attrs = spoolman_api._parse_filament_attrs_value(
+        (fil.get("extra") or {}).get("filament_attributes"))
+    if "Matte" in attrs:
+        return None
+    return {"extra": {"filament_attributes": json.dumps(attrs + ["Matte"])}}
+
+
+def test_large_selection_reads_one_list_and_bounds_the_patches(fake_spoolman):
+    db, calls, rejects = fake_spoolman
+    db[4]["extra"]["filament_attributes"] = json.dumps(["Matte"])
+    rejects[7] = "bad value"
+    ids = [1, "x", 2, 3, 4, 99, 5, 6, 7, 8, 9, 10]
+    results = spoolman_api.update_filaments(ids, _add_matte)
+
+    # One list fetch answers every read — no per-filament GET, no extras GET.
+    # Only the id the list doesn't have is looked up on its own.
+    assert calls["get"] == ["http://sm/api/v1/filament?allow_archived=true",
+                            "http://sm/api/v1/filament/99"]
+    assert 1 < calls["max_in_flight"] <= 3
+    assert [r["id"] for r in results] == [1, "x", 2, 3, 4, 99, 5, 6, 7, 8, 9, 10]
+    by_id = {r["id"]: r for r in results}
+    assert by_id["x"]["msg"] == "not an integer id"
+    assert by_id[99]["msg"] == "filament not found"
+    assert by_id[4]["status"] == "unchanged"
+    assert by_id[7] == {"id": 7, "ok": False, "status": "error", "msg": "HTTP 422: bad value"}
+    assert sorted(f for f, _ in calls["patch"]) == [1, 2, 3, 5, 6, 7, 8, 9, 10]
+    # Siblings ride along in their raw wire form; the attribute is appended.
+    body = dict(calls["patch"])[3]["extra"]
+    assert body["product_url"] == '"https://example.com/3"' and body["nozzle_temp_max"] == '"225"'
+    assert json.loads(body["filament_attributes"]) == ["Silk", "Matte"]
+    assert by_id[3]["status"] == "updated" and by_id[3]["filament"]["id"] == 3
+
+
+def test_small_selection_reads_each_filament_in_order(fake_spoolman):
+    _db, calls, _rejects = fake_spoolman
+    results = spoolman_api.update_filaments([2, 1], _add_matte)
+    # At or below LIVE_FANOUT_MAX: the per-id loop, sequential.
+    assert [f for f, _ in calls["patch"]] == [2, 1]
+    assert [r["status"] for r in results] == ["updated", "updated"]
+    assert "http://sm/api/v1/filament?allow_archived=true" not in calls["get"]
+
+
+def test_large_selection_merges_against_a_fresh_list_not_the_cached_one(fake_spoolman):
+    db, calls, _rejects = fake_spoolman
+    spoolman_api._snapshot(spoolman_cache.FILAMENTS)  # warm, within the TTL
+    db[3]["extra"]["product_url"] = '"https://elsewhere.example/3"'  # edited outside FCC
+    spoolman_api.update_filaments(list(range(1, 11)), _add_matte)
+    # The bulk job re-read the list once, so the outside edit survives.
+    assert calls["get"].count("http://sm/api/v1/filament?allow_archived=true") == 2
+    assert dict(calls["patch"])[3]["extra"]["product_url"] == '"https://elsewhere.example/3"'
+
+
+def test_small_selection_ignores_a_warm_snapshot(fake_spoolman):
+    db, calls, _rejects = fake_spoolman
+    spoolman_api._snapshot(spoolman_cache.FILAMENTS)
+    db[2]["extra"]["product_url"] = '"https://elsewhere.example/2"'
+    spoolman_api.update_filaments([2], _add_matte)
+    assert calls["get"][1:] == ["http://sm/api/v1/filament/2", "http://sm/api/v1/filament/2"]
+    assert dict(calls["patch"])[2]["extra"]["product_url"] == '"https://elsewhere.example/2"'
+
+
+def test_progress_and_active_job_in_stats(fake_spoolman):
+    seen = []
+    ids = list(range(1, 11))
+
+    def progress(done, total):
+        seen.append((done, total, spoolman_api.get_bulk_stats()["active"]))
+
+    before = spoolman_api.get_bulk_stats()
+    spoolman_api.update_filaments(ids, _add_matte, progress=progress, label="test job")
+    assert [d for d, _t, _a in seen] == list(range(1, 11))
+    assert all(t == 10 for _d, t, _a in seen)
+    assert seen[0][2][0]["label"] == "test job" and seen[0][2][0]["total"] == 10
+    after = spoolman_api.get_bulk_stats()
+    assert after["active"] == [] and after["concurrency"] == 3
+    assert after["items"] - before["items"] == 10
+    assert after["snapshot_reads"] - before["snapshot_reads"] == 10
+
+
+def test_restore_reports_each_failure_and_drops_the_snapshot(fake_spoolman, monkeypatch):
+    _db, calls, rejects = fake_spoolman
+    rejects[2] = "bad value"
+    real_patch = spoolman_api.spoolman_http.patch
+
+    def patch(url, **kw):
+        if url.endswith("/5"):
+            raise RuntimeError("boom")
+        return real_patch(url, **kw)
+
+    monkeypatch.setattr(spoolman_api.spoolman_http, "patch", patch)
+    spoolman_api._snapshot(spoolman_cache.FILAMENTS)
+    assert spoolman_cache.is_fresh(spoolman_cache.FILAMENTS, "http://sm")
+    extras = {fid: {"filament_attributes": "[]", "k": fid} for fid in range(1, 9)}
+    results = spoolman_api.restore_filament_extras(extras)
+    assert [r["id"] for r in results] == list(range(1, 9))
+    assert [r for r in results if not r["ok"]] == [
+        {"id": 2, "ok": False, "msg": "HTTP 422: bad value"},
+        {"id": 5, "ok": False, "msg": "boom"},
+    ]
+    assert dict(calls["patch"])[3] == {"extra": {"filament_attributes": "[]", "k": 3}}
+    assert not spoolman_cache.is_fresh(spoolman_cache.FILAMENTS, "http://sm")
@@ -0,0 +1,176 @@
+"""Bulk smart move — logic._perform_bulk_move_writes behind perform_smart_move.
+
+A slotless move of more than BULK_MOVE_THRESHOLD spools reads every spool from
+one fresh spool-list read, plans all writes up front and PATCHes them on the
+bounded pool. These tests run the same move down both paths against a fake
+Spoolman (faked at the pooled session, so spoolman_http.count_round_trips sees
+every request) and pin that the end state, undo record and log lines are the
+serial path's, for far fewer round-trips.
+"""
+import copy
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import logic  # noqa: E402
+import spoolman_cache  # noqa: E402
+import spoolman_http  # noqa: E402
+import state  # noqa: E402
+
+_LOCS = [
+    {"LocationID": "LR-SHELF-2", "Type": "Shelf"},
+    {"LocationID": "LR-MDB-9", "Type": "Dryer Box", "Max Spools": "1"},
+    {"LocationID": "XL-2", "Type": "Tool Head"},
+]
+
+
+class _Resp:
+    def __init__(self, payload, status=200):
+        self._payload = payload
+        self.status_code = status
+        self.ok = status < 400
+        self.text = payload if isinstance(payload, str) else json.dumps(payload)
+        self.raw = None
+
+    def json(self):
+        return copy.deepcopy(self._payload)
+
+
+def _spools():
+    db = {}
+    for sid in range(101, 109):
+        extra = {"container_slot": '"%d"' % (sid % 3), "nozzle_temp_max": '"225"'}
+        if sid % 2:
+            extra.update(physical_source='"LR-MDB-1"', physical_source_slot='"2"')
+        db[sid] = {"id": sid, "location": "XL-2" if sid == 101 else "LR-CART-1",
+                   "archived": False, "remaining_weight": 500.0,
+                   "initial_weight": 1000.0, "used_weight": 500.0,
+                   "filament": {"id": 7, "name": "Galaxy Black", "material": "PLA",
+                                "color_hex": "111111", "vendor": {"name": "Acme"}},
+                   "extra": extra}
+    return db
+
+
+@pytest.fixture
+def spoolman(monkeypatch):
+    """Fake Spoolman at the session; returns (db, patched ids, reject, logs)
+    where `reject` maps sid -> error body for PATCHes that should fail."""
+    db = _spools()
+    patches, reject = [], {}
+
+    class _Session:
+        def request(self, method, url, json=None, **kw):
+            path = url.split("/api/v1/", 1)[1]
+            if method == "GET" and path.startswith("spool?"):
+                return _Resp(list(db.values()))
+            sid = int(path.split("/")[1])
+            if method == "PATCH":
+                patches.append(sid)
+                if sid in reject:
+                    return _Resp(reject[sid], status=422)
+                db[sid].update(json)
+            return _Resp(db[sid])
+
+    spoolman_cache.invalidate()
+    monkeypatch.setattr(spoolman_http, "_get_session",
+                        lambda: (_Session(), None, {"timeout": 5.0}))
+    monkeypatch.setattr(logic.config_loader, "get_api_urls",
+                        lambda: ("http://sm", "http://fb"))
+    monkeypatch.setattr(logic.config_loader, "load_config", lambda: {})
+    monkeypatch.setattr(logic.locations_db, "get_active_printer_map", lambda: {})
+    monkeypatch.setattr(logic.locations_db, "load_locations_list",
+                        lambda: copy.deepcopy(_LOCS))
+    monkeypatch.setattr(state, "UNDO_STACK", [])
+    logs = []
+    monkeypatch.setattr(state, "add_log_entry", lambda msg, *a, **k: logs.append((msg,) + a))
+    return db, patches, reject, logs
+
+
+def _move(monkeypatch, target, ids, bulk):
+    monkeypatch.setattr(logic, "BULK_MOVE_THRESHOLD", 4 if bulk else 10_000)
+    with spoolman_http.count_round_trips() as trips:
+        result = logic.perform_smart_move(target, ids, origin="test")
+    return result, trips
+
+
+@pytest.mark.parametrize("target", ["LR-SHELF-2", "LR-MDB-9", "XL-2"])
+def test_bulk_and_serial_paths_land_the_same_state(spoolman, monkeypatch, target):
+    db, _patches, _reject, logs = spoolman
+    ids = list(range(101, 109))
+    start = copy.deepcopy(db)
+
+    serial_result, serial_trips = _move(monkeypatch, target, ids, bulk=False)
+    serial_db, serial_undo, serial_logs = copy.deepcopy(db), state.UNDO_STACK[-1], list(logs)
+
+    db.clear()
+    db.update(copy.deepcopy(start))
+    logs.clear()
+    spoolman_cache.invalidate()
+    bulk_result, bulk_trips = _move(monkeypatch, target, ids, bulk=True)
+
+    assert bulk_result == serial_result == {"status": "success"}
+    assert db == serial_db
+    assert state.UNDO_STACK[-1] == serial_undo
+    assert logs == serial_logs
+    # Serial: a GET + a PATCH per spool (plus the toolhead's resident read).
+    # Bulk: one fresh list GET to plan from (plus the list read that answered
+    # the toolhead's resident lookup), then the PATCHes — made on the pool,
+    # counted through counted_by_caller.
+    assert serial_trips["by_method"] == {"GET": 9 if target == "XL-2" else 8, "PATCH": 8}
+    assert bulk_trips["by_method"] == {"GET": 2 if target == "XL-2" else 1, "PATCH": 8}
+
+
+def test_bulk_move_plans_from_a_fresh_list_not_the_cached_one(spoolman, monkeypatch):
+    db, _patches, _reject, _logs = spoolman
+    logic.spoolman_api.get_spools_by_ids(list(db))  # warm, within the TTL
+    # Changed outside FCC after the snapshot was taken.
+    db[105]["extra"]["nozzle_temp_max"] = '"240"'
+    db[106]["location"] = "LR-SHELF-9"
+    _move(monkeypatch, "LR-SHELF-2", list(range(101, 109)), bulk=True)
+    assert db[105]["extra"]["nozzle_temp_max"] == '"240"'
+    assert state.UNDO_STACK[-1]["moves"][106] == "LR-SHELF-9"
+
+
+def test_bulk_move_reports_each_failed_write(spoolman, monkeypatch):
+    db, patches, reject, logs = spoolman
+    reject[104] = "location is locked"
+    ids = list(range(101, 109)) + [103]  # a spool listed twice moves once
+    _move(monkeypatch, "LR-SHELF-2", ids, bulk=True)
+    assert sorted(patches) == list(range(101, 109))
+    assert db[104]["location"] == "LR-CART-1"
+    assert all(db[sid]["location"] == "LR-SHELF-2" for sid in db if sid != 104)
+    failures = [m for (m, *_rest) in logs if m.startswith("❌")]
+    assert failures == ["❌ Failed to move Spool #104 -> LR-SHELF-2: HTTP 422: location is locked"]
+    # Logs follow input order, whatever order the PATCHes finished in.
+    moved = [m for (m, *_rest) in logs if m.startswith("🚚")]
+    assert len(moved) == 7
+    assert set(state.UNDO_STACK[-1]["moves"]) == set(range(101, 109))
+
+
+def test_bulk_move_onto_a_toolhead_ejects_the_resident_first(spoolman, monkeypatch):
+    db, patches, _reject, logs = spoolman
+    db[108]["location"] = "XL-2"
+    ids = list(range(101, 108))
+    start = copy.deepcopy(db)
+
+    _move(monkeypatch, "XL-2", ids, bulk=False)
+    serial_db, serial_undo, serial_logs = copy.deepcopy(db), state.UNDO_STACK[-1], list(logs)
+
+    db.clear()
+    db.update(copy.deepcopy(start))
+    logs.clear()
+    patches.clear()
+    spoolman_cache.invalidate()
+    _move(monkeypatch, "XL-2", ids, bulk=True)
+
+    # The resident's eject (perform_smart_eject, one spool) lands before the
+    # batch, exactly as on the serial path.
+    assert patches[0] == 108 and sorted(patches[1:]) == ids
+    assert db == serial_db and db[108]["location"] != "XL-2"
+    assert state.UNDO_STACK[-1] == serial_undo
+    assert serial_undo["ejections"] == {108: db[108]["location"]}
+    assert logs == serial_logs
@@ -0,0 +1,139 @@
+"""config_loader read cache: load_config() / get_api_urls() served from a
+frozen in-memory config revalidated on the file's (path, mtime_ns, size,
+inode), re-seeded by save_config, with the .config_mtime tracker only
+touched when the file actually changed.
+
+Pure unit tests — get_config_path / BASE_DIR point at a temp dir.
+"""
+import copy
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import config_loader  # noqa: E402
+
+SEED = {
+    "server_ip": "192.168.1.29",
+    "spoolman_port": 7913,
+    "printer_map": {"xl-1": {"printer_name": "XL", "position": 0}},
+    "dryer_slots": ["PM-DB-1"],
+}
+
+
+@pytest.fixture
+def cfg_file(tmp_path, monkeypatch):
+    p = tmp_path / "config.json"
+    p.write_text(json.dumps(SEED, indent=4), encoding="utf-8")
+    monkeypatch.setattr(config_loader, "get_config_path", lambda: (str(p), "TEST"))
+    monkeypatch.setattr(config_loader, "BASE_DIR", str(tmp_path))
+    config_loader.invalidate_config_cache()
+    yield p
+    config_loader.invalidate_config_cache()
+
+
+def _delta(before, key):
+    return config_loader.get_config_cache_stats()[key] - before[key]
+
+
+def test_warm_reads_do_not_touch_the_files(cfg_file, monkeypatch):
+    config_loader.get_api_urls()
+    before = config_loader.get_config_cache_stats()
+    # Past the racy window, a warm read must not open anything.
+    config_loader._CONFIG_CACHE["entry"]["racy"] = False
+    opened = []
+    real_open = open
+    monkeypatch.setattr("builtins.open", lambda *a, **k: opened.append(a[0]) or real_open(*a, **k))
+    for _ in range(50):
+        assert config_loader.get_api_urls()[0] == "http://192.168.1.29:7913"
+    assert opened == []
+    assert _delta(before, "hits") == 50 and _delta(before, "loads") == 0
+
+
+def test_config_is_frozen_but_copies_are_not(cfg_file):
+    cfg = config_loader.load_config()
+    assert cfg["printer_map"] == {"XL-1": {"printer_name": "XL", "position": 0}}
+    assert cfg["dryer_slots"] == ["PM-DB-1"]
+    with pytest.raises(TypeError):
+        cfg["server_ip"] = "x"
+    with pytest.raises(TypeError):
+        cfg["printer_map"]["XL-1"]["position"] = 3
+    with pytest.raises(TypeError):
+        cfg["dryer_slots"].append("PM-DB-2")
+    mine = copy.deepcopy(cfg)
+    mine["printer_map"]["XL-1"]["position"] = 3
+    mine["dryer_slots"].append("PM-DB-2")
+    shallow = dict(cfg)
+    shallow["server_ip"] = "x"
+    assert config_loader.load_config()["server_ip"] == "192.168.1.29"
+    assert json.loads(json.dumps(cfg))["spoolman_port"] == 7913
+
+
+def test_out_of_band_edit_is_picked_up(cfg_file):
+    assert config_loader.load_config()["spoolman_port"] == 7913
+    tmp = cfg_file.with_suffix(".new")
+    tmp.write_text(json.dumps(dict(SEED, spoolman_port=8000)), encoding="utf-8")
+    os.replace(tmp, cfg_file)
+    assert config_loader.get_api_urls()[0] == "http://192.168.1.29:8000"
+
+
+def test_same_size_in_place_rewrite_inside_timestamp_tick(cfg_file):
+    config_loader.load_config()
+    st = os.stat(cfg_file)
+    cfg_file.write_text(json.dumps(dict(SEED, spoolman_port=7914), indent=4), encoding="utf-8")
+    os.utime(cfg_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert os.stat(cfg_file).st_size == st.st_size
+    assert config_loader.load_config()["spoolman_port"] == 7914
+
+
+def test_save_reseeds_cache(cfg_file):
+    config_loader.load_config()
+    before = config_loader.get_config_cache_stats()
+    assert config_loader.save_config({"sync_delay": 1.5})["ok"] is True
+    assert config_loader.load_config()["sync_delay"] == 1.5
+    assert _delta(before, "installs") == 1
+    assert _delta(before, "loads") == 0
+
+
+def test_tracker_written_once_per_version(cfg_file, tmp_path, monkeypatch):
+    writes = []
+    real_note = config_loader._note_config_version
+    monkeypatch.setattr(config_loader, "_note_config_version",
+                        lambda *a: writes.append(a) or real_note(*a))
+    for _ in range(5):
+        config_loader.load_config()
+    assert len(writes) == 1
+    assert (tmp_path / ".config_mtime").read_text() == str(os.stat(cfg_file).st_mtime)
+
+
+def test_degraded_load_is_not_cached(cfg_file):
+    config_loader.load_config()
+    cfg_file.write_text("{ not json", encoding="utf-8")
+    assert config_loader.load_config()["server_ip"] == "127.0.0.1"  # no backup: defaults
+    good = dict(SEED, server_ip="10.0.0.5")
+    with open(config_loader.get_config_backup_path(), "w", encoding="utf-8") as f:
+        json.dump(good, f)
+    # Primary unchanged (still corrupt) — the new backup is still honoured.
+    assert config_loader.load_config()["server_ip"] == "10.0.0.5"
+    cfg_file.write_text(json.dumps(SEED), encoding="utf-8")
+    assert config_loader.load_config()["server_ip"] == "192.168.1.29"
+
+
+def test_missing_file_serves_defaults_until_created(cfg_file):
+    os.remove(cfg_file)
+    assert config_loader.load_config()["spoolman_port"] == 7912
+    cfg_file.write_text(json.dumps(SEED), encoding="utf-8")
+    assert config_loader.load_config()["spoolman_port"] == 7913
+
+
+@pytest.mark.parametrize("raw, want", [
+    (None, 3.0), ("bogus", 3.0), (float("nan"), 3.0),  # the default
+    (-1, 0.0), (9999, 300.0), ("12.5", 12.5),           # clamped / parsed
+])
+def test_get_clamped_reads_the_default_from_one_place(cfg_file, raw, want):
+    seed = dict(SEED) if raw is None else dict(SEED, spoolman_cache_ttl=raw)
+    cfg_file.write_text(json.dumps(seed), encoding="utf-8")
+    assert config_loader.get_clamped("spoolman_cache_ttl", 0.0, 300.0) == want
+    assert config_loader.get_default("spoolman_cache_ttl") == 3.0
@@ -626,8 +626,9 @@ def _ref_env(monkeypatch, slot_targets=None, spools_by_loc=None,
     first-class Type:"Printer" row carrying toolheads[]=[{XL-1, 0}] — the same
     single XL-* toolhead the pre-cutover config SEED exposed — so removing /
     renaming XL-1 is what the guard tests exercise. The Dryer Box row (added when
-    slot_targets is given) carries the bindings the guard's slot scan reads; a
-    single load_locations_list stub serves both the active-map read and the scan.
+    slot_targets is given) carries the bindings the guard's slot scan reads; the
+    same rows back both load_locations_list and the read-only get_locations_view
+    (the active-map read), so one stub serves the map and the scan.
     The save_locations_list no-op isolates the PUT's authoritative row write from
     the real data/locations.json (the dev-data wipe documented in
     reference_fcc_e2e_sweep_pollution — the "rename/bindings test", 53→2)."""
@@ -642,8 +643,10 @@ def _ref_env(monkeypatch, slot_targets=None, spools_by_loc=None,
         def _boom():
             raise RuntimeError("locations.json corrupt")
         monkeypatch.setattr(locations_db, "load_locations_list", _boom)
+        monkeypatch.setattr(locations_db, "get_locations_view", _boom)
     else:
         monkeypatch.setattr(locations_db, "load_locations_list", lambda: rows)
+        monkeypatch.setattr(locations_db, "get_locations_view", lambda: rows)
     # Isolate the PUT /api/printer_map post-save sync (it re-runs the Phase-3
     # printer-rows + Phase-4 toolheads[] migrations and persists them). Without
     # this no-op, save_locations_list would overwrite the REAL data/locations.json
@@ -0,0 +1,120 @@
+"""One spool snapshot per /api/dashboard_pulse, and ETag / 304 on the pulse.
+
+The locations occupancy count, the manage contents and the printer_status
+toolhead buckets each used to read the spool list on their own — three full
+downloads per pulse whenever the snapshot TTL had run out (every one of them
+with spoolman_cache_ttl = 0). The pulse now assembles inside
+spoolman_cache.pinned(), so it is one fetch per request whatever the TTL.
+
+Host-runnable: the Spoolman transport is faked at spoolman_http.get and the
+printer probe at prusalink_api.get_printer_state.
+"""
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import app as app_module  # noqa: E402
+import spoolman_cache  # noqa: E402
+import spoolman_http  # noqa: E402
+
+_ROWS = [
+    {"LocationID": "LR", "Name": "Living Room", "Type": "Room"},
+    {"LocationID": "LR-MDB-1", "Name": "Box 1", "Type": "Dryer Box", "Max Spools": "2"},
+    {"LocationID": "XL-1", "Name": "XL Head 1", "Type": "Tool Head", "Max Spools": "1"},
+]
+
+
+def _spool(sid, loc, source=""):
+    extra = {"physical_source": '"%s"' % source} if source else {}
+    return {"id": sid, "location": loc, "archived": False, "remaining_weight": 500.0,
+            "filament": {"id": 1, "name": "Black", "material": "PLA", "color_hex": "000000"},
+            "extra": extra}
+
+
+@pytest.fixture
+def pulse_env(monkeypatch):
+    spools = [_spool(1, "LR-MDB-1"), _spool(2, "XL-1", source="LR-MDB-1"), _spool(3, "")]
+    gets = []
+
+    def fake_get(url, **kwargs):
+        gets.append(url)
+        r = MagicMock(ok=True, status_code=200)
+        r.json.return_value = [dict(s) for s in spools] if "/api/v1/spool" in url else []
+        return r
+
+    cfg = dict(app_module.config_loader.load_config(), spoolman_cache_ttl=0)
+    monkeypatch.setattr(app_module.config_loader, "load_config", lambda: cfg)
+    monkeypatch.setattr(app_module.config_loader, "get_api_urls",
+                        lambda: ("http://sm", "http://fb"))
+    monkeypatch.setattr(spoolman_http, "get", fake_get)
+    monkeypatch.setattr(app_module.locations_db, "load_locations_list", lambda: [dict(r) for r in _ROWS])
+    monkeypatch.setattr(app_module.locations_db, "get_active_printer_map",
+                        lambda: {"XL-1": {"printer_name": "XL", "position": 0}})
+    monkeypatch.setattr(app_module.locations_db, "get_bindings_for_machine",
+                        lambda name, pm=None: {"toolheads": {}})
+    monkeypatch.setattr(app_module.prusalink_api, "get_printer_state", lambda fb, name: None)
+    return spools, gets
+
+
+def _spool_list_gets(gets):
+    return [u for u in gets if "/api/v1/spool" in u]
+
+
+def test_pulse_reads_the_spool_list_once(pulse_env):
+    _spools, gets = pulse_env
+    client = app_module.app.test_client()
+    res = client.get("/api/dashboard_pulse?include=locations,manage,printer_status&manage_id=LR-MDB-1")
+    assert res.status_code == 200
+    body = res.get_json()
+    assert [c["id"] for c in body["manage"]["contents"]] == [1, 2]
+    assert body["printer_status"]["XL"]["toolheads"][0]["item"]["id"] == 2
+    assert _spool_list_gets(gets) == ["http://sm/api/v1/spool?allow_archived=true"]
+
+    # TTL 0: the pin is per request — the next pulse fetches again, once.
+    client.get("/api/dashboard_pulse?include=locations,manage,printer_status&manage_id=LR-MDB-1")
+    assert len(_spool_list_gets(gets)) == 2
+
+
+def test_unchanged_pulse_answers_304(pulse_env):
+    spools, _gets = pulse_env
+    client = app_module.app.test_client()
+    url = "/api/dashboard_pulse?include=manage&manage_id=LR-MDB-1"
+    first = client.get(url)
+    etag = first.headers["ETag"]
+
+    again = client.get(url, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.data == b""
+    # A 304 is only valid for GET / HEAD: the POST form always gets the body.
+    post = client.post(url, json={}, headers={"If-None-Match": etag})
+    assert post.status_code == 200
+    assert "ETag" not in post.headers
+    assert post.get_json()["manage"]["contents"]
+
+    spools[0]["location"] = "LR-MDB-2"
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert [c["id"] for c in changed.get_json()["manage"]["contents"]] == [2]
+
+
+def test_pin_ends_at_a_write(monkeypatch):
+    monkeypatch.setattr(spoolman_cache, "_ttl", lambda: 0.0)
+    fetched = []
+
+    def fetch():
+        fetched.append(1)
+        return [{"id": 1, "location": "A"}]
+
+    with spoolman_cache.pinned():
+        spoolman_cache.get_items(spoolman_cache.SPOOLS, "http://sm", fetch)
+        spoolman_cache.get_derived(spoolman_cache.SPOOLS, "http://sm", "n", len, fetch)
+        assert len(fetched) == 1
+        spoolman_cache.upsert(spoolman_cache.SPOOLS, {"id": 1, "location": "B"})
+        spoolman_cache.get_items(spoolman_cache.SPOOLS, "http://sm", fetch)
+        assert len(fetched) == 2
+    spoolman_cache.get_items(spoolman_cache.SPOOLS, "http://sm", fetch)
+    assert len(fetched) == 3
@@ -26,13 +26,13 @@ def _resp(ok: bool, status: int = 200, text: str = "ok") -> MagicMock:
 class TestDeleteSpool:
     def test_success_returns_true_clears_error(self):
         sm.LAST_SPOOLMAN_ERROR = "stale"
-        with patch("spoolman_api.requests.delete", return_value=_resp(True)):
+        with patch("spoolman_api.spoolman_http.delete", return_value=_resp(True)):
             result = sm.delete_spool(42)
         assert result is True
         assert sm.LAST_SPOOLMAN_ERROR is None
 
     def test_http_failure_returns_false_populates_error(self):
-        with patch("spoolman_api.requests.delete",
+        with patch("spoolman_api.spoolman_http.delete",
                    return_value=_resp(False, status=409, text="spool has dependencies")):
             result = sm.delete_spool(42)
         assert result is False
@@ -40,7 +40,7 @@ class TestDeleteSpool:
         assert "dependencies" in sm.LAST_SPOOLMAN_ERROR
 
     def test_transport_exception_returns_false_with_message(self):
-        with patch("spoolman_api.requests.delete",
+        with patch("spoolman_api.spoolman_http.delete",
                    side_effect=Exception("connection refused")):
             result = sm.delete_spool(42)
         assert result is False
@@ -50,20 +50,20 @@ class TestDeleteSpool:
 class TestDeleteFilament:
     def test_success_returns_true_clears_error(self):
         sm.LAST_SPOOLMAN_ERROR = "stale"
-        with patch("spoolman_api.requests.delete", return_value=_resp(True)):
+        with patch("spoolman_api.spoolman_http.delete", return_value=_resp(True)):
             result = sm.delete_filament(7)
         assert result is True
         assert sm.LAST_SPOOLMAN_ERROR is None
 
     def test_http_failure_populates_error_body(self):
-        with patch("spoolman_api.requests.delete",
+        with patch("spoolman_api.spoolman_http.delete",
                    return_value=_resp(False, status=409, text="filament has child spools")):
             result = sm.delete_filament(7)
         assert result is False
         assert "child spools" in sm.LAST_SPOOLMAN_ERROR
 
     def test_transport_exception(self):
-        with patch("spoolman_api.requests.delete",
+        with patch("spoolman_api.spoolman_http.delete",
                    side_effect=Exception("timeout")):
             result = sm.delete_filament(7)
         assert result is False
@@ -80,7 +80,7 @@ class TestGetSpoolsForFilament:
         resp = MagicMock()
         resp.ok = True
         resp.json = MagicMock(return_value=api_spools)
-        with patch("spoolman_api.requests.get", return_value=resp):
+        with patch("spoolman_api.spoolman_http.get", return_value=resp):
             result = sm.get_spools_for_filament(7)
         assert [s["id"] for s in result] == [1, 3]
 
@@ -90,7 +90,7 @@ class TestGetSpoolsForFilament:
         resp.json = MagicMock(return_value=[
             {"id": 1, "filament": {"id": 99}},
         ])
-        with patch("spoolman_api.requests.get", return_value=resp):
+        with patch("spoolman_api.spoolman_http.get", return_value=resp):
             result = sm.get_spools_for_filament(7)
         assert result == []
 
@@ -101,19 +101,19 @@ class TestGetSpoolsForFilament:
             {"id": 1},  # malformed entry, no filament block at all
             {"id": 2, "filament": {"id": 7}},
         ])
-        with patch("spoolman_api.requests.get", return_value=resp):
+        with patch("spoolman_api.spoolman_http.get", return_value=resp):
             result = sm.get_spools_for_filament(7)
         assert [s["id"] for s in result] == [2]
 
     def test_returns_empty_on_http_failure(self):
         resp = MagicMock()
         resp.ok = False
-        with patch("spoolman_api.requests.get", return_value=resp):
+        with patch("spoolman_api.spoolman_http.get", return_value=resp):
             result = sm.get_spools_for_filament(7)
         assert result == []
 
     def test_returns_empty_on_transport_exception(self):
-        with patch("spoolman_api.requests.get",
+        with patch("spoolman_api.spoolman_http.get",
                    side_effect=Exception("network down")):
             result = sm.get_spools_for_filament(7)
         assert result == []
@@ -47,7 +47,7 @@ def _setup_smartmove_mocks(spool_data, printer_map, loc_list, captured):
         patch.object(logic.spoolman_api, "format_spool_display",
                      return_value={"text": "Test Spool", "color": "ff0000"}),
         patch.object(logic.spoolman_api, "update_spool", side_effect=_fake_update),
-        patch.object(logic.requests, "post", return_value=MagicMock(ok=True)),
+        patch.object(logic.spoolman_http, "post", return_value=MagicMock(ok=True)),
     ]
     return mocks
 
@@ -85,7 +85,7 @@ def test_perform_smart_move_auto_deploys_when_slot_is_bound():
         patch.object(logic.spoolman_api, "format_spool_display",
                      return_value={"text": "Test", "color": "ff0000"}),
         patch.object(logic.spoolman_api, "update_spool", side_effect=fake_update),
-        patch.object(logic.requests, "post", return_value=MagicMock(ok=True)),
+        patch.object(logic.spoolman_http, "post", return_value=MagicMock(ok=True)),
     ]
     for m in ctx: m.start()
     try:
@@ -130,7 +130,7 @@ def test_perform_smart_move_skips_auto_deploy_when_slot_unbound():
         patch.object(logic.spoolman_api, "format_spool_display",
                      return_value={"text": "Test", "color": "ff0000"}),
         patch.object(logic.spoolman_api, "update_spool", side_effect=fake_update),
-        patch.object(logic.requests, "post", return_value=MagicMock(ok=True)),
+        patch.object(logic.spoolman_http, "post", return_value=MagicMock(ok=True)),
     ]
     for m in ctx: m.start()
     try:
@@ -0,0 +1,102 @@
+"""/api/events — the Server-Sent Events push channel (event_stream).
+
+Host-runnable: the stream generator is driven directly (it only blocks when
+nothing is pending), and the routes through the Flask test client.
+"""
+import collections
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import app as app_module  # noqa: E402
+import event_stream  # noqa: E402
+import state  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_channel(monkeypatch):
+    monkeypatch.setattr(event_stream, "_SEQ", 0)
+    monkeypatch.setattr(event_stream, "_RING", collections.deque(maxlen=event_stream.RING_SIZE))
+    monkeypatch.setattr(event_stream, "_LAST", {})
+    monkeypatch.setattr(event_stream, "_CLIENTS", 0)
+    monkeypatch.setattr(state, "GLOBAL_BUFFER", [])
+    monkeypatch.setattr(state, "GLOBAL_QUEUE", [])
+
+
+def _parse(frame):
+    out = {}
+    for line in frame.strip().split("\n"):
+        key, _, value = line.partition(": ")
+        out[key] = value
+    return out
+
+
+def test_stream_sends_hello_then_each_change_once():
+    gen = event_stream.stream()
+    assert next(gen).startswith("retry: ")
+    assert _parse(next(gen))["event"] == "hello"
+
+    event_stream.publish("queue", [{"id": 1}])
+    assert event_stream.publish("queue", [{"id": 1}]) is None   # unchanged: dropped
+    frame = _parse(next(gen))
+    assert frame["event"] == "queue" and json.loads(frame["data"]) == [{"id": 1}]
+    assert frame["id"] == "1"
+    gen.close()
+
+
+def test_idle_stream_heartbeat_samples_sources(monkeypatch):
+    ticks = []
+    monkeypatch.setattr(event_stream, "_TICK_HOOKS", [lambda: ticks.append(1)])
+    event_stream.changed()  # every topic's current snapshot already sent
+    gen = event_stream.stream(heartbeat_s=0.01)
+    next(gen), next(gen)
+    assert next(gen) == ": keepalive\n\n"
+    assert ticks == [1]
+    # A change nobody announced goes out on the heartbeat after it.
+    state.GLOBAL_BUFFER = [{"id": 7}]
+    frame = _parse(next(gen))
+    assert frame["event"] == "buffer" and json.loads(frame["data"]) == [{"id": 7}]
+    gen.close()
+
+
+def test_reconnect_replays_missed_events_or_asks_for_resync(monkeypatch):
+    for i in range(3):
+        event_stream.publish("queue", [i])
+    gen = event_stream.stream(last_event_id="1")
+    next(gen)
+    assert [_parse(next(gen))["id"] for _ in range(2)] == ["2", "3"]
+    gen.close()
+
+    monkeypatch.setattr(event_stream, "_RING", collections.deque(list(event_stream._RING)[-1:], maxlen=1))
+    gen = event_stream.stream(last_event_id="1")
+    next(gen)
+    assert _parse(next(gen))["event"] == "resync"
+    gen.close()
+
+
+def test_state_changes_are_pushed_by_requests_and_log_lines():
+    client = app_module.app.test_client()
+    client.post("/api/state/buffer", json={"buffer": [{"id": 42}]})
+    state.add_log_entry("🚚 Moved Spool #42")
+    topics = {topic: json.loads(data) for _seq, topic, data in event_stream._RING}
+    assert topics["buffer"] == [{"id": 42}]
+    assert topics["logs"]["logs"][0]["msg"] == "🚚 Moved Spool #42"
+
+
+def test_events_route_streams_and_refuses_when_full(monkeypatch):
+    monkeypatch.setattr(event_stream, "max_clients", lambda: 1)
+    client = app_module.app.test_client()
+    res = client.get("/api/events")
+    assert res.status_code == 200
+    assert res.mimetype == "text/event-stream"
+    body = iter(res.response)
+    assert next(body).startswith(b"retry: ")
+    assert b"event: hello" in next(body)
+
+    refused = client.get("/api/events")
+    assert refused.status_code == 503
+    res.close()
+    assert event_stream.get_stats()["clients"] == 0
@@ -10,9 +10,9 @@ from external_parsers import SpoolmanParser, PrusamentParser, AmazonParser, sear
 from unittest.mock import patch, Mock
 
 def test_spoolman_parser_mocked():
-    # Mock the config loader and requests.get for Spoolman
+    # Mock the config loader and the pooled Spoolman transport's GET
     with patch('config_loader.get_api_urls', return_value=("http://mocked-spoolman:7942", "")), \
-         patch('requests.get') as mock_get:
+         patch('spoolman_http.get') as mock_get:
         
         # Create a mock response
         mock_response = Mock()
@@ -104,10 +104,10 @@ def test_no_targets_in_field_is_idempotent_noop(monkeypatch):
     calls, fake_get, fake_delete, fake_post, fake_patch = _stub_calls(
         clean_choices, []
     )
-    monkeypatch.setattr(spoolman_api.requests, "get", fake_get)
-    monkeypatch.setattr(spoolman_api.requests, "delete", fake_delete)
-    monkeypatch.setattr(spoolman_api.requests, "post", fake_post)
-    monkeypatch.setattr(spoolman_api.requests, "patch", fake_patch)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "get", fake_get)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "delete", fake_delete)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "post", fake_post)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "patch", fake_patch)
     monkeypatch.setattr(
         spoolman_api.config_loader, "get_api_urls",
         lambda: ("http://spoolman", "http://filabridge"),
@@ -131,10 +131,10 @@ def test_first_boot_deletes_confirmed_safe_choices(monkeypatch):
         _filament(2, "Clean PLA", ["Basic"]),
     ]
     calls, fake_get, fake_delete, fake_post, fake_patch = _stub_calls(dirty, filaments)
-    monkeypatch.setattr(spoolman_api.requests, "get", fake_get)
-    monkeypatch.setattr(spoolman_api.requests, "delete", fake_delete)
-    monkeypatch.setattr(spoolman_api.requests, "post", fake_post)
-    monkeypatch.setattr(spoolman_api.requests, "patch", fake_patch)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "get", fake_get)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "delete", fake_delete)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "post", fake_post)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "patch", fake_patch)
     monkeypatch.setattr(
         spoolman_api.config_loader, "get_api_urls",
         lambda: ("http://spoolman", "http://filabridge"),
@@ -183,10 +183,10 @@ def test_flag_choice_in_use_is_kept(monkeypatch):
         _filament(10, "Prototype Filler", ["For Infill"]),  # uses the flagged one
     ]
     calls, fake_get, fake_delete, fake_post, fake_patch = _stub_calls(dirty, filaments)
-    monkeypatch.setattr(spoolman_api.requests, "get", fake_get)
-    monkeypatch.setattr(spoolman_api.requests, "delete", fake_delete)
-    monkeypatch.setattr(spoolman_api.requests, "post", fake_post)
-    monkeypatch.setattr(spoolman_api.requests, "patch", fake_patch)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "get", fake_get)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "delete", fake_delete)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "post", fake_post)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "patch", fake_patch)
     monkeypatch.setattr(
         spoolman_api.config_loader, "get_api_urls",
         lambda: ("http://spoolman", "http://filabridge"),
@@ -220,10 +220,10 @@ def test_flag_choice_with_zero_usage_is_promoted_to_delete(monkeypatch):
         _filament(20, "Basic PLA", ["Basic"]),  # uses neither flagged choice
     ]
     calls, fake_get, fake_delete, fake_post, fake_patch = _stub_calls(dirty, filaments)
-    monkeypatch.setattr(spoolman_api.requests, "get", fake_get)
-    monkeypatch.setattr(spoolman_api.requests, "delete", fake_delete)
-    monkeypatch.setattr(spoolman_api.requests, "post", fake_post)
-    monkeypatch.setattr(spoolman_api.requests, "patch", fake_patch)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "get", fake_get)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "delete", fake_delete)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "post", fake_post)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "patch", fake_patch)
     monkeypatch.setattr(
         spoolman_api.config_loader, "get_api_urls",
         lambda: ("http://spoolman", "http://filabridge"),
@@ -246,10 +246,10 @@ def test_zero_filaments_returned_skips_cleanup(monkeypatch):
     dirty = ["+", "Wood", "For Infill"]  # at least one target present
     filaments = []  # but no filaments returned
     calls, fake_get, fake_delete, fake_post, fake_patch = _stub_calls(dirty, filaments)
-    monkeypatch.setattr(spoolman_api.requests, "get", fake_get)
-    monkeypatch.setattr(spoolman_api.requests, "delete", fake_delete)
-    monkeypatch.setattr(spoolman_api.requests, "post", fake_post)
-    monkeypatch.setattr(spoolman_api.requests, "patch", fake_patch)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "get", fake_get)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "delete", fake_delete)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "post", fake_post)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "patch", fake_patch)
     monkeypatch.setattr(
         spoolman_api.config_loader, "get_api_urls",
         lambda: ("http://spoolman", "http://filabridge"),
@@ -267,7 +267,7 @@ def test_network_error_does_not_propagate(monkeypatch):
     can't crash app startup."""
     def boom(*_a, **_kw):
         raise spoolman_api.requests.RequestException("simulated unreachable")
-    monkeypatch.setattr(spoolman_api.requests, "get", boom)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "get", boom)
     monkeypatch.setattr(
         spoolman_api.config_loader, "get_api_urls",
         lambda: ("http://spoolman", "http://filabridge"),
@@ -288,10 +288,10 @@ def test_post_failure_logs_and_returns(monkeypatch):
         calls.append(("POST", url, _kw.get("json")))
         return _mock_resp(ok=False, status=500)
 
-    monkeypatch.setattr(spoolman_api.requests, "get", fake_get)
-    monkeypatch.setattr(spoolman_api.requests, "delete", fake_delete)
-    monkeypatch.setattr(spoolman_api.requests, "post", fake_post)
-    monkeypatch.setattr(spoolman_api.requests, "patch", fake_patch)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "get", fake_get)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "delete", fake_delete)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "post", fake_post)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "patch", fake_patch)
     monkeypatch.setattr(
         spoolman_api.config_loader, "get_api_urls",
         lambda: ("http://spoolman", "http://filabridge"),
@@ -353,10 +353,10 @@ def _stub_calls_stateful(field_choices, filaments, *, recreate_sticks=True,
 
 
 def _wire(monkeypatch, fake_get, fake_delete, fake_post, fake_patch):
-    monkeypatch.setattr(spoolman_api.requests, "get", fake_get)
-    monkeypatch.setattr(spoolman_api.requests, "delete", fake_delete)
-    monkeypatch.setattr(spoolman_api.requests, "post", fake_post)
-    monkeypatch.setattr(spoolman_api.requests, "patch", fake_patch)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "get", fake_get)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "delete", fake_delete)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "post", fake_post)
+    monkeypatch.setattr(spoolman_api.spoolman_http, "patch", fake_patch)
     monkeypatch.setattr(
         spoolman_api.config_loader, "get_api_urls",
         lambda: ("http://spoolman", "http://filabridge"),
@@ -70,7 +70,7 @@ class TestMergeFilament:
         children = [{'id': 101}, {'id': 102}, {'id': 103}]
 
         with patch('spoolman_api.get_filament', side_effect=[src, dst]), \
-             patch('app.requests.get', return_value=_ok_json(children)), \
+             patch('spoolman_http.get', return_value=_ok_json(children)), \
              patch('spoolman_api.update_spool_or_raise', return_value={'id': 'ok'}) as mock_upd, \
              patch('spoolman_api.delete_filament', return_value=True) as mock_del:
             r = client.post('/api/filament/7/merge_into/9')
@@ -99,7 +99,7 @@ class TestMergeFilament:
             return {'id': sid}
 
         with patch('spoolman_api.get_filament', side_effect=[src, dst]), \
-             patch('app.requests.get', return_value=_ok_json(children)), \
+             patch('spoolman_http.get', return_value=_ok_json(children)), \
              patch('spoolman_api.update_spool_or_raise', side_effect=upd_side_effect), \
              patch('spoolman_api.delete_filament') as mock_del:
             r = client.post('/api/filament/7/merge_into/9')
@@ -121,7 +121,7 @@ class TestMergeFilament:
 
         spoolman_api.LAST_SPOOLMAN_ERROR = "HTTP 500: db locked"
         with patch('spoolman_api.get_filament', side_effect=[src, dst]), \
-             patch('app.requests.get', return_value=_ok_json(children)), \
+             patch('spoolman_http.get', return_value=_ok_json(children)), \
              patch('spoolman_api.update_spool_or_raise', return_value={'id': 101}), \
              patch('spoolman_api.delete_filament', return_value=False):
             r = client.post('/api/filament/7/merge_into/9')
@@ -138,7 +138,7 @@ class TestMergeFilament:
         src = {'id': 7, 'name': 'src'}
         dst = {'id': 9, 'name': 'dst'}
         with patch('spoolman_api.get_filament', side_effect=[src, dst]), \
-             patch('app.requests.get', return_value=_ok_json([])), \
+             patch('spoolman_http.get', return_value=_ok_json([])), \
              patch('spoolman_api.update_spool_or_raise') as mock_upd, \
              patch('spoolman_api.delete_filament', return_value=True) as mock_del:
             r = client.post('/api/filament/7/merge_into/9')
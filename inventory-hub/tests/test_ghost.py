@@ -31,7 +31,7 @@ def test_get_spools_at_location_detailed_ghost():
         }
     ]
 
-    with patch('requests.get') as mock_get:
+    with patch('spoolman_http.get') as mock_get:
         mock_response = MagicMock()
         mock_response.ok = True
         mock_response.json.return_value = mock_data
@@ -0,0 +1,194 @@
+"""hub_store — the SQLite (WAL) database behind print_deduct_ledger,
+cancel_review_store, cancel_fetch_store and print_tracker_store.
+
+Pure unit tests: conftest points hub_store at a fresh tmp database per test.
+The stores' own behaviour (dedupe, claim-by-pop, latch recovery) stays pinned
+by the cancel / completion deduct suites; these cover what moved: the one-time
+JSON import, no more history cap, ledger retention, the cross-thread pop and
+the reads' fallback when the database fails.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pytest
+
+import cancel_fetch_store
+import cancel_review_store
+import hub_store
+import print_deduct_ledger
+import print_tracker_store
+
+
+@pytest.fixture
+def legacy_paths(tmp_path, monkeypatch):
+    paths = {
+        "ledger": tmp_path / "print_deduct_ledger.json",
+        "review": tmp_path / "pending_cancel_deducts.json",
+        "fetch": tmp_path / "pending_cancel_fetches.json",
+        "latch": tmp_path / "print_tracker_latch.json",
+    }
+    monkeypatch.setattr(print_deduct_ledger, "_LEDGER_PATH", str(paths["ledger"]))
+    monkeypatch.setattr(cancel_review_store, "_STORE_PATH", str(paths["review"]))
+    monkeypatch.setattr(cancel_fetch_store, "_STORE_PATH", str(paths["fetch"]))
+    monkeypatch.setattr(print_tracker_store, "_STORE_PATH", str(paths["latch"]))
+    return paths
+
+
+def test_database_runs_in_wal_mode(monkeypatch):
+    monkeypatch.delenv("FCC_HUB_STORE_JOURNAL", raising=False)
+    assert hub_store.query("PRAGMA journal_mode")[0][0] == "wal"
+    assert hub_store.get_stats()["journal_mode"] == "wal"
+
+
+def test_refused_or_disabled_wal_falls_back_to_the_rollback_journal(monkeypatch):
+    class _NoWal(sqlite3.Connection):
+        """A filesystem that can't do WAL: SQLite answers with the old mode."""
+        def execute(self, sql, *args):
+            if sql == "PRAGMA journal_mode=WAL":
+                return super().execute("SELECT 'delete'")
+            return super().execute(sql, *args)
+
+    real_connect = sqlite3.connect
+    monkeypatch.setattr(hub_store.sqlite3, "connect",
+                        lambda *a, **kw: real_connect(*a, factory=_NoWal, **kw))
+    hub_store.close()
+    assert hub_store.query("PRAGMA journal_mode")[0][0] == "delete"
+    assert hub_store.query("PRAGMA synchronous")[0][0] == 2   # FULL
+    assert hub_store.get_stats()["journal_mode"] == "delete"
+
+    monkeypatch.setattr(hub_store.sqlite3, "connect", real_connect)
+    monkeypatch.setenv("FCC_HUB_STORE_JOURNAL", "delete")
+    hub_store.close()
+    cancel_fetch_store.add_pending({"printer_name": "XL", "job_id": "F-1"})
+    assert hub_store.get_stats()["journal_mode"] == "delete"
+    assert cancel_fetch_store.has_pending("XL", "F-1")
+
+
+def test_legacy_json_is_imported_once_in_order(legacy_paths):
+    legacy_paths["ledger"].write_text(json.dumps({
+        "XL::J-2": {"job_id": "J-2", "grams": 4.0},
+        "Core One::J-1": {"job_id": "J-1", "grams": 1.5},
+    }))
+    legacy_paths["review"].write_text(json.dumps({
+        "XL::C-1": {"printer_name": "XL", "job_id": "C-1", "total_grams": 9},
+    }))
+    legacy_paths["fetch"].write_text(json.dumps({
+        "XL::F-2": {"printer_name": "XL", "job_id": "F-2", "attempts": 3},
+        "XL::F-1": {"printer_name": "XL", "job_id": "F-1", "attempts": 1},
+    }))
+    legacy_paths["latch"].write_text(json.dumps({"XL": {"state": "PRINTING", "job_id": "J-9"}}))
+
+    assert print_deduct_ledger.was_deducted("Core One", "J-1")
+    assert list(print_deduct_ledger._load()) == ["XL::J-2", "Core One::J-1"]
+    assert cancel_review_store.get_pending("XL", "C-1")["total_grams"] == 9
+    assert [r["job_id"] for r in cancel_fetch_store.list_pending()] == ["F-2", "F-1"]
+    assert print_tracker_store.load() == {"XL": {"state": "PRINTING", "job_id": "J-9"}}
+
+    for path in legacy_paths.values():
+        assert not path.exists()
+        assert path.with_name(path.name + ".imported").exists()
+    imported = dict(hub_store.query("SELECT source, records FROM legacy_imports"))
+    assert imported == {"print_deduct_ledger": 2, "cancel_review_store": 1,
+                        "cancel_fetch_store": 2, "print_tracker_store": 1}
+
+    # A file that reappears (a restored backup) is not imported over the database.
+    legacy_paths["review"].write_text(json.dumps({
+        "XL::C-1": {"printer_name": "XL", "job_id": "C-1", "total_grams": 1},
+    }))
+    hub_store._IMPORT_CHECKED.clear()
+    assert cancel_review_store.get_pending("XL", "C-1")["total_grams"] == 9
+
+
+def test_legacy_records_keep_their_own_timestamps(legacy_paths):
+    legacy_paths["ledger"].write_text(json.dumps({"XL::J-1": {"job_id": "J-1", "grams": 1.0}}))
+    written = time.time() - 40 * 86400
+    os.utime(legacy_paths["ledger"], (written, written))
+    legacy_paths["review"].write_text(json.dumps({"XL::C-1": {
+        "printer_name": "XL", "job_id": "C-1", "created": "2026-01-02 03:04:05"}}))
+    legacy_paths["fetch"].write_text(json.dumps({"XL::F-1": {
+        "printer_name": "XL", "job_id": "F-1", "first_seen": 1700000000.5}}))
+
+    assert print_deduct_ledger.list_deducts()[0]["recorded_at"] == pytest.approx(written)
+    cancel_review_store.list_pending()
+    cancel_fetch_store.list_pending()
+    created = dict(hub_store.query("SELECT job_id, created_at FROM cancel_reviews"))
+    assert created["C-1"] == time.mktime((2026, 1, 2, 3, 4, 5, 0, 0, -1))
+    assert hub_store.records("cancel_fetches")[0][2] == 1700000000.5
+
+
+def test_a_failing_database_reads_as_nothing_recorded(legacy_paths, tmp_path, monkeypatch):
+    hub_store.close()
+    monkeypatch.setattr(hub_store, "_DB_PATH", str(tmp_path))   # a directory: can't open
+    errors = hub_store._ERROR_COUNT
+    assert print_deduct_ledger.was_deducted("XL", "J-1") is False
+    assert print_deduct_ledger.list_deducts() == []
+    for store in (cancel_review_store, cancel_fetch_store):
+        assert store.has_pending("XL", "C-1") is False
+        assert store.get_pending("XL", "C-1") is None
+        assert store.list_pending() == []
+        assert store.pop_pending("XL", "C-1") is None
+    assert print_tracker_store.load() == {}
+    assert hub_store._ERROR_COUNT - errors == 11
+
+
+def test_unreadable_legacy_file_is_left_alone(legacy_paths):
+    legacy_paths["fetch"].write_text("{ not json")
+    assert cancel_fetch_store.list_pending() == []
+    assert legacy_paths["fetch"].exists()
+    cancel_fetch_store.add_pending({"printer_name": "XL", "job_id": "F-1"})
+    assert cancel_fetch_store.has_pending("XL", "F-1")
+
+
+def test_history_is_not_capped_and_queries_by_printer_and_time(legacy_paths):
+    for i in range(250):
+        print_deduct_ledger.record_deduct("XL" if i % 2 else "MK4", f"J-{i}", grams=float(i))
+    assert print_deduct_ledger.was_deducted("MK4", "J-0")   # the old cap dropped this
+    assert len(print_deduct_ledger._load()) == 250
+    xl = print_deduct_ledger.list_deducts("XL")
+    assert len(xl) == 125 and xl[0]["job_id"] == "J-1" and xl[0]["printer_name"] == "XL"
+    assert [e["job_id"] for e in print_deduct_ledger.list_deducts("MK4", limit=2)] == ["J-246", "J-248"]
+    assert print_deduct_ledger.list_deducts(since=time.time() + 60) == []
+
+
+def test_re_record_keeps_place_and_updates_meta(legacy_paths):
+    print_deduct_ledger.record_deduct("XL", "A", grams=1.0)
+    print_deduct_ledger.record_deduct("XL", "B", grams=2.0)
+    print_deduct_ledger.record_deduct("XL", "A", grams=1.0, confirmed=True)
+    assert list(print_deduct_ledger._load()) == ["XL::A", "XL::B"]
+    assert print_deduct_ledger._load()["XL::A"]["confirmed"] is True
+
+
+def test_ledger_retention_prunes_old_rows(legacy_paths, monkeypatch):
+    monkeypatch.setattr(print_deduct_ledger, "_retention_days", lambda: 30)
+    monkeypatch.setattr(print_deduct_ledger, "_LAST_PRUNE", 0.0)
+    print_deduct_ledger.record_deduct("XL", "OLD", grams=1.0)
+    with hub_store.transaction() as conn:
+        conn.execute("UPDATE deduct_ledger SET created_at = ? WHERE job_id = 'OLD'",
+                     (time.time() - 31 * 86400,))
+    monkeypatch.setattr(print_deduct_ledger, "_LAST_PRUNE", 0.0)
+    print_deduct_ledger.record_deduct("XL", "NEW", grams=1.0)
+    assert not print_deduct_ledger.was_deducted("XL", "OLD")
+    assert print_deduct_ledger.was_deducted("XL", "NEW")
+
+
+def test_pop_is_a_single_claim_across_threads(legacy_paths):
+    cancel_review_store.add_pending({"printer_name": "XL", "job_id": "C-9", "total_grams": 5})
+    got = []
+    barrier = threading.Barrier(8)
+
+    def claim():
+        barrier.wait()
+        got.append(cancel_review_store.pop_pending("XL", "C-9"))
+
+    threads = [threading.Thread(target=claim) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert [g for g in got if g is not None] == [{"printer_name": "XL", "job_id": "C-9", "total_grams": 5}]
+    assert not cancel_review_store.has_pending("XL", "C-9")
@@ -192,13 +192,15 @@ def test_strict_location_match_matches_legacy_predicate(monkeypatch, target):
     payload = [dict(s, extra=dict(s["extra"])) for s in _STRICT_SPOOLS]
 
     class _Resp:
+        ok = True
+
         def raise_for_status(self):
             pass
 
         def json(self):
             return payload
 
-    monkeypatch.setattr(spoolman_api, "requests",
+    monkeypatch.setattr(spoolman_api, "spoolman_http",
                         types.SimpleNamespace(get=lambda url, timeout=5: _Resp()))
     monkeypatch.setattr(config_loader, "get_api_urls", lambda: ("http://sm", "http://fb"))
 
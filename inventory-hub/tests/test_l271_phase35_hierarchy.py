@@ -216,5 +216,5 @@ import logic  # noqa: E402
     ("", ""),
 ])
 def test_get_room_from_location_nested(monkeypatch, loc, expected):
-    monkeypatch.setattr(L, "load_locations_list", lambda: list(NESTED_TREE))
+    monkeypatch.setattr(L, "get_locations_view", lambda: list(NESTED_TREE))
     assert logic.get_room_from_location(loc) == expected
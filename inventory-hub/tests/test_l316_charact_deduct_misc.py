@@ -58,7 +58,7 @@ def _fake_requests_get(monkeypatch, payload, ok=True):
         calls.append((args, kwargs))
         return resp
 
-    monkeypatch.setattr(app_module.requests, 'get', fake_get)
+    monkeypatch.setattr("spoolman_http.get", fake_get)
     return calls
 
 
@@ -203,7 +203,7 @@ def test_multi_spool_exception_swallowed_to_empty_list(monkeypatch):
     def raising_get(*args, **kwargs):
         raise RuntimeError('connection exploded')
 
-    monkeypatch.setattr(app_module.requests, 'get', raising_get)
+    monkeypatch.setattr("spoolman_http.get", raising_get)
 
     res = _client().get('/api/get_multi_spool_filaments')
     assert res.status_code == 200
@@ -337,7 +337,7 @@ def test_backfill_no_inheritable_weight_400(monkeypatch, vendor):
         lambda fid: {'id': 7, 'spool_weight': 0, 'vendor': vendor},
     )
     fetch = MagicMock()
-    monkeypatch.setattr(app_module.requests, 'get', fetch)
+    monkeypatch.setattr("spoolman_http.get", fetch)
 
     res = _client().post('/api/backfill_spool_weights/7')
     assert res.status_code == 400
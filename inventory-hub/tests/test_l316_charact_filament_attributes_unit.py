@@ -16,9 +16,9 @@ test_filament_attributes_bulk_api.py and needs BOTH the live dev container
 and live Spoolman — an offline refactor sweep skips them and goes
 false-green. These tests are the offline tripwire.
 
-Mocking layer: the handlers do `import requests as _req` FUNCTION-LOCALLY,
-which resolves to the singleton `requests` module — so patching
-requests.get/delete/post/patch covers every wire call. bulk_set is the
+Mocking layer: the handlers do `import spoolman_http as _req` FUNCTION-LOCALLY,
+which resolves to the singleton pooled-transport module — so patching
+spoolman_http.get/delete/post/patch covers every wire call. bulk_set is the
 exception: it goes through spoolman_api.get_filament/update_filament, so
 those are patched at the spoolman_api layer instead.
 """
@@ -31,7 +31,7 @@ import pytest
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import app as app_module  # noqa: E402
-import requests as requests_module  # noqa: E402
+import spoolman_http  # noqa: E402
 
 SM_URL = "http://spoolman.test"
 
@@ -107,10 +107,10 @@ def _install_wire(monkeypatch, *, fields=None, filaments=None,
         fid = int(url.rstrip("/").rsplit("/", 1)[-1])
         return patch_resps.get(fid, _Resp())
 
-    monkeypatch.setattr(requests_module, "get", fake_get)
-    monkeypatch.setattr(requests_module, "delete", fake_delete)
-    monkeypatch.setattr(requests_module, "post", fake_post)
-    monkeypatch.setattr(requests_module, "patch", fake_patch)
+    monkeypatch.setattr(spoolman_http, "get", fake_get)
+    monkeypatch.setattr(spoolman_http, "delete", fake_delete)
+    monkeypatch.setattr(spoolman_http, "post", fake_post)
+    monkeypatch.setattr(spoolman_http, "patch", fake_patch)
     monkeypatch.setattr(app_module.config_loader, "get_api_urls",
                         lambda: (SM_URL, SM_URL))
     return calls
@@ -241,8 +241,9 @@ def test_bulk_set_rejects_noop_payload(client):
 
 def test_bulk_set_per_id_error_surface_and_warning_log(client, monkeypatch):
     """The per-id error taxonomy: non-integer id -> 'not an integer id',
-    get_filament None -> 'filament not found', update_filament None ->
-    LAST_SPOOLMAN_ERROR propagated verbatim into errors[]. Partial success
+    get_filament None -> 'filament not found', update_filament None -> that
+    call's own error (the per-thread copy update_filament records) propagated
+    verbatim into errors[]. Partial success
     still counts `updated`, and errors escalate the summary log to
     WARNING/ffaa00.
     # 29.A3: partial success (>=1 id processed) keeps top-level success:true;
@@ -258,11 +259,12 @@ def test_bulk_set_per_id_error_surface_and_warning_log(client, monkeypatch):
 
     def fake_update(fid, data):
         update_calls.append((fid, data))
-        return None if fid == 5 else {"id": fid}
+        if fid == 5:
+            app_module.spoolman_api._bulk_tls.error = "HTTP 422: nope"
+            return None
+        return {"id": fid}
 
     monkeypatch.setattr(app_module.spoolman_api, "update_filament", fake_update)
-    monkeypatch.setattr(app_module.spoolman_api, "LAST_SPOOLMAN_ERROR",
-                        "HTTP 422: nope")
     logs = _capture_logs(monkeypatch)
 
     r = client.post("/api/filament_attributes/bulk_set",
@@ -306,13 +308,15 @@ def test_bulk_set_all_errored_reports_success_false(client, monkeypatch):
 
 
 def test_bulk_set_null_last_error_falls_back_to_unknown(client, monkeypatch):
-    """update_filament None while LAST_SPOOLMAN_ERROR is unset -> the per-id
-    msg falls back to 'unknown error' (the `or` guard)."""
+    """update_filament None without recording an error of its own -> the
+    per-id msg is 'unknown error', never the process-wide
+    LAST_SPOOLMAN_ERROR (another worker's or request's failure)."""
     monkeypatch.setattr(app_module.spoolman_api, "get_filament",
                         lambda fid: {"id": fid, "extra": {}})
     monkeypatch.setattr(app_module.spoolman_api, "update_filament",
                         lambda fid, data: None)
-    monkeypatch.setattr(app_module.spoolman_api, "LAST_SPOOLMAN_ERROR", None)
+    monkeypatch.setattr(app_module.spoolman_api, "LAST_SPOOLMAN_ERROR",
+                        "HTTP 500: someone else's failure")
     _capture_logs(monkeypatch)
 
     body = client.post("/api/filament_attributes/bulk_set",
@@ -577,7 +581,7 @@ def test_remove_choice_restore_non_requestexception_collected(client, monkeypatc
             raise ValueError("non-request boom")  # NOT a requests.RequestException
         return _Resp()
 
-    monkeypatch.setattr(requests_module, "patch", boom_patch)
+    monkeypatch.setattr(spoolman_http, "patch", boom_patch)
     logs = _capture_logs(monkeypatch)
 
     body = client.post("/api/filament_attributes/remove_choice",
@@ -789,7 +793,7 @@ def test_sweep_restore_non_requestexception_collected(client, monkeypatch):
             raise ValueError("sweep boom")  # NOT a requests.RequestException
         return _Resp()
 
-    monkeypatch.setattr(requests_module, "patch", boom_patch)
+    monkeypatch.setattr(spoolman_http, "patch", boom_patch)
     _capture_logs(monkeypatch)
 
     body = client.post("/api/filament_attributes/sweep_unused",
@@ -301,7 +301,7 @@ def test_batch_location_dedup_fallback_and_slot_fanout_exact_rows(client, tmp_pa
         get_calls.append((url, k))
         return _FakeResp(ok=True, payload={"name": "Remote Loc"})
 
-    monkeypatch.setattr(app_module.requests, "get", _fake_get)
+    monkeypatch.setattr("spoolman_http.get", _fake_get)
 
     spy = _WriterSpy()
     monkeypatch.setattr(labels_csv, "_write_label_csv", spy)
@@ -362,7 +362,7 @@ def test_batch_location_spoolman_fallback_failure_uses_raw_id(client, tmp_path,
         def _fake_get(url, *a, **k):
             return _FakeResp(ok=False)
 
-    monkeypatch.setattr(app_module.requests, "get", _fake_get)
+    monkeypatch.setattr("spoolman_http.get", _fake_get)
 
     spy = _WriterSpy()
     monkeypatch.setattr(labels_csv, "_write_label_csv", spy)
@@ -529,7 +529,7 @@ def test_filaments_raw_proxy_preserves_double_encoded_extras(monkeypatch):
 
     monkeypatch.setattr(app_module.config_loader, "get_api_urls",
                         lambda: ("http://sm.test:9999", "http://fb.test/api"))
-    monkeypatch.setattr(app_module.requests, "get", fake_get)
+    monkeypatch.setattr("spoolman_http.get", fake_get)
 
     r = _client().get("/api/filaments")
     assert r.status_code == 200
@@ -550,13 +550,12 @@ def test_filaments_fetch_failure_returns_success_false_empty_list(monkeypatch):
     def _raise(url, timeout=None, **kw):
         raise RuntimeError("connection refused")
 
-    monkeypatch.setattr(app_module.requests, "get", _raise)
+    monkeypatch.setattr("spoolman_http.get", _raise)
     r = _client().get("/api/filaments")
     assert r.status_code == 200
     assert r.get_json() == {"success": False, "filaments": []}
 
-    monkeypatch.setattr(app_module.requests, "get",
-                        lambda url, timeout=None, **kw: _FakeResp(False))
+    monkeypatch.setattr("spoolman_http.get", lambda url, timeout=None, **kw: _FakeResp(False))
     r2 = _client().get("/api/filaments")
     assert r2.status_code == 200
     assert r2.get_json() == {"success": False, "filaments": []}
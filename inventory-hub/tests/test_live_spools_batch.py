@@ -0,0 +1,202 @@
+"""Batched live-spool refresh — spoolman_api.get_spools_by_ids behind
+logic.get_live_spools_data (the /api/dashboard_pulse `refresh_spool_ids` and
+/api/spools/refresh path).
+
+The unit tests count Spoolman round-trips at the `spoolman_http.get` seam.
+The benchmark (opt-in: --run-benchmark -s) runs the old per-id get_spool loop
+and the batched resolver against a local HTTP server with a simulated
+per-request latency. It prints latency against id-set size.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import logic  # noqa: E402
+import spoolman_api  # noqa: E402
+import spoolman_cache  # noqa: E402
+import spoolman_http  # noqa: E402
+
+
+def _spool(sid, **kw):
+    rec = {
+        "id": sid, "location": "LR-MDB-1", "remaining_weight": 500.0,
+        "initial_weight": 1000.0, "archived": False,
+        "filament": {"id": 7, "name": f"Fil {sid}", "material": "PLA",
+                     "color_hex": "112233", "vendor": {"name": "Acme"}},
+        "extra": {},
+    }
+    rec.update(kw)
+    return rec
+
+
+@pytest.fixture
+def fake_spoolman(monkeypatch):
+    monkeypatch.setattr(spoolman_api.config_loader, "get_api_urls",
+                        lambda: ("http://sm", "http://fb"))
+    db = {i: _spool(i) for i in range(1, 41)}
+    db[40] = _spool(40, archived=True, location="")
+    urls = []
+
+    def fake_get(url, **kwargs):
+        urls.append(url)
+        r = MagicMock()
+        path = url.split("/api/v1/", 1)[1]
+        if path.startswith("spool?"):
+            r.ok = True
+            r.json.return_value = [dict(v) for v in db.values()]
+        else:
+            sid = int(path.split("/")[1])
+            r.ok = sid in db
+            r.json.return_value = dict(db[sid]) if sid in db else {"detail": "not found"}
+        return r
+
+    monkeypatch.setattr(spoolman_api.spoolman_http, "get", fake_get)
+    return db, urls
+
+
+def test_large_set_is_one_list_fetch(fake_spoolman):
+    _db, urls = fake_spoolman
+    ids = list(range(1, 31))
+    out = logic.get_live_spools_data(ids)
+    assert sorted(out, key=int) == [str(i) for i in ids]
+    assert len(urls) == 1 and urls[0].endswith("/api/v1/spool?allow_archived=true")
+
+
+def test_small_set_fans_out_per_id(fake_spoolman):
+    _db, urls = fake_spoolman
+    out = logic.get_live_spools_data([3, "5"])
+    assert set(out) == {"3", "5"}
+    assert sorted(urls) == ["http://sm/api/v1/spool/3", "http://sm/api/v1/spool/5"]
+
+
+def test_batched_output_matches_per_id_loop(fake_spoolman):
+    db, _urls = fake_spoolman
+    db[2] = _spool(2, location="CORE1-M0",
+                   extra={"physical_source": "\"LR-MDB-1\"", "physical_source_slot": "\"3\""})
+    ids = [1, 2, 40, 6, 7, 8, 9]
+    batched = logic.get_live_spools_data(ids)
+    spoolman_cache.invalidate()
+    per_id = {}
+    for sid in ids:
+        per_id.update(logic.get_live_spools_data([sid]))
+    assert batched == per_id
+    assert batched["2"]["is_ghost"] is True and batched["2"]["slot"] == "3"
+    assert batched["40"]["archived"] is True
+
+
+def test_small_set_uses_warm_snapshot(fake_spoolman):
+    _db, urls = fake_spoolman
+    spoolman_api.get_all_spools()
+    urls.clear()
+    assert set(logic.get_live_spools_data([3, 5])) == {"3", "5"}
+    assert urls == []
+
+
+def test_ids_missing_from_list_fall_back_to_single_get(fake_spoolman, monkeypatch):
+    db, urls = fake_spoolman
+    spoolman_api.get_all_spools()  # warm a snapshot that predates spool 99
+    db[99] = _spool(99)
+    urls.clear()
+    out = logic.get_live_spools_data([1, 2, 3, 4, 5, 99, 12345])
+    assert set(out) == {"1", "2", "3", "4", "5", "99"}
+    # Snapshot was warm: only the two unknown ids cost a request each.
+    assert sorted(urls) == ["http://sm/api/v1/spool/12345", "http://sm/api/v1/spool/99"]
+
+
+def test_duplicate_ids_resolve_once(fake_spoolman):
+    _db, urls = fake_spoolman
+    out = logic.get_live_spools_data([4, "4", 4])
+    assert list(out) == ["4"]
+    assert len(urls) == 1
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+_LATENCY_S = 0.004  # per-request server time; a LAN Spoolman is ~2-10ms
+_BENCH_SPOOLS = 400
+
+
+class _BenchHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send headers + body as one segment with Nagle off, as uvicorn does —
+    # otherwise delayed-ACK adds ~40ms to every response and swamps the timing.
+    wbufsize = 1 << 16
+    disable_nagle_algorithm = True
+    spools = {}
+    list_body = b"[]"
+
+    def do_GET(self):
+        time.sleep(_LATENCY_S)
+        path = self.path.split("/api/v1/", 1)[1]
+        if path.startswith("spool?") or path == "spool":
+            body = _BenchHandler.list_body
+        else:
+            body = json.dumps(_BenchHandler.spools[int(path.split("/")[1])]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.mark.benchmark
+def test_benchmark_live_refresh_latency_vs_set_size(monkeypatch):
+    _BenchHandler.spools = {i: _spool(i) for i in range(1, _BENCH_SPOOLS + 1)}
+    _BenchHandler.list_body = json.dumps(list(_BenchHandler.spools.values())).encode()
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _BenchHandler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{srv.server_address[1]}"
+    monkeypatch.setattr(spoolman_api.config_loader, "get_api_urls", lambda: (base, ""))
+    monkeypatch.setattr(spoolman_cache.config_loader, "load_config",
+                        lambda: {"spoolman_cache_ttl": 3})
+    spoolman_http.reset()
+
+    def per_id_loop(ids):  # the pre-batching implementation's fetch pattern
+        return {str(s): spoolman_api.get_spool(s) for s in ids}
+
+    def timed(fn, ids, cold):
+        best = float("inf")
+        for _ in range(3):
+            if cold:
+                spoolman_cache.invalidate()
+            t0 = time.perf_counter()
+            fn(ids)
+            best = min(best, time.perf_counter() - t0)
+        return best * 1000
+
+    rows = []
+    try:
+        for n in (1, 2, 4, 8, 16, 32, 64, 128):
+            ids = list(range(1, n + 1))
+            loop_ms = timed(per_id_loop, ids, cold=True)
+            cold_ms = timed(spoolman_api.get_spools_by_ids, ids, cold=True)
+            spoolman_api.get_all_spools()
+            warm_ms = timed(spoolman_api.get_spools_by_ids, ids, cold=False)
+            rows.append((n, loop_ms, cold_ms, warm_ms))
+    finally:
+        srv.shutdown()
+        srv.server_close()
+        spoolman_http.reset()
+
+    print(f"\nlive refresh, {_BENCH_SPOOLS} spools in Spoolman, "
+          f"{_LATENCY_S * 1000:.0f}ms simulated server latency (best of 3)")
+    print(f"{'ids':>5} {'per-id loop ms':>15} {'batched cold ms':>16} {'batched warm ms':>16}")
+    for n, loop_ms, cold_ms, warm_ms in rows:
+        print(f"{n:>5} {loop_ms:>15.1f} {cold_ms:>16.1f} {warm_ms:>16.1f}")
+
+    # At buffer scale the batch must beat the serial loop by a wide margin.
+    by_n = {n: (loop_ms, cold_ms) for n, loop_ms, cold_ms, _w in rows}
+    assert by_n[32][1] < by_n[32][0] / 3
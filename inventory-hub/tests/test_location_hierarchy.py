@@ -0,0 +1,175 @@
+"""Precomputed location hierarchy (locations_db.LocationHierarchy).
+
+The closure-table index must give exactly the hop-by-hop walk's answers —
+including for dangling parent_ids, hand-edited cycles, pseudo-prefix
+ancestors and ids with no row — so the unit tests diff it against the walk
+over randomized trees. The benchmark (opt-in: --run-benchmark -s) times both
+over a synthetic 10k-location shop.
+"""
+import os
+import random
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import locations_db  # noqa: E402
+
+
+def _random_rows(rnd, n):
+    """A messy tree: prefix-derived ids, explicit parents (some dangling, some
+    forming cycles), pseudo-prefix boxes and explicit None roots."""
+    ids = []
+    rows = []
+    for i in range(n):
+        if ids and rnd.random() < 0.7:
+            base = rnd.choice(ids)
+            lid = f"{base}-{rnd.choice('ABCDEFGH')}{rnd.randint(1, 9)}"
+        else:
+            lid = rnd.choice(["LR", "CR", "DR", "PM", "PJ", "TST", "XL", f"RM{i}"])
+        if lid in ids:
+            continue
+        row = {"LocationID": lid.lower() if rnd.random() < 0.1 else lid}
+        roll = rnd.random()
+        if roll < 0.15 and ids:
+            row["parent_id"] = rnd.choice(ids)          # may create a cycle
+        elif roll < 0.2:
+            row["parent_id"] = f"GONE-{rnd.randint(1, 3)}"  # dangling
+        elif roll < 0.25:
+            row["parent_id"] = None
+        ids.append(lid)
+        rows.append(row)
+    return rows, ids
+
+
+def _queries(rnd, ids, k):
+    extra = ["", "NOPE", "LR-UNKNOWN-9", "PM-DB-77", "GONE-1-X", "xl-2"]
+    pool = ids + [f"{rnd.choice(ids)}-Z{rnd.randint(1, 5)}" for _ in range(20)] + extra
+    return [rnd.choice(pool) for _ in range(k)]
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_index_matches_hop_by_hop_walk(seed):
+    rnd = random.Random(seed)
+    rows, ids = _random_rows(rnd, 150)
+    pmap = locations_db.build_parent_map(rows)
+    idx = locations_db.LocationHierarchy(pmap)
+    qs = _queries(rnd, ids, 300)
+    for q in qs:
+        for pseudo in (False, True):
+            assert idx.ancestors(q, include_pseudo=pseudo) == tuple(
+                locations_db.ancestors_of(q, pmap, include_pseudo=pseudo)), q
+        assert idx.room(q) == locations_db.resolve_room(q, parent_map=pmap), q
+    for child, anc in zip(qs, reversed(qs)):
+        assert idx.is_descendant(child, anc) == locations_db.is_descendant(
+            child, anc, parent_map=pmap), (child, anc)
+    for lid in pmap:
+        expected = tuple(x for x in pmap if locations_db.is_descendant(x, lid, parent_map=pmap))
+        assert idx.descendants(lid) == expected, lid
+
+
+def test_cycle_stops_where_the_walk_stops():
+    rows = [{"LocationID": "A", "parent_id": "B"},
+            {"LocationID": "B", "parent_id": "C"},
+            {"LocationID": "C", "parent_id": "A"}]
+    idx = locations_db.build_hierarchy_index(rows)
+    assert idx.ancestors("A") == ("B", "C")
+    assert idx.ancestors("A-X") == ("A", "B", "C")
+    assert idx.room("B") == "A"
+    assert not idx.is_descendant("A", "A")
+
+
+def test_store_index_serves_module_helpers(monkeypatch):
+    rows = [{"LocationID": "CR", "Type": "Room"},
+            {"LocationID": "CR-CT-1", "parent_id": "CR"},
+            {"LocationID": "CR-CT-1-R1", "parent_id": "CR-CT-1"},
+            {"LocationID": "PM-DB-1", "parent_id": "PM"}]
+    monkeypatch.setattr(locations_db, "get_locations_view", lambda: rows)
+    assert locations_db.resolve_room("CR-CT-1-R1") == "CR"
+    assert locations_db.is_descendant("cr-ct-1-r1", "CR")
+    assert list(locations_db.ancestors_of("CR-CT-1-R1")) == ["CR-CT-1", "CR"]
+    # No row: prefix derivation jumps to the first segment, as the walk does.
+    assert list(locations_db.ancestors_of("CR-CT-1-R1-S2")) == ["CR"]
+    assert list(locations_db.ancestors_of("PM-DB-1")) == []
+    assert list(locations_db.ancestors_of("PM-DB-1", include_pseudo=True)) == ["PM"]
+    assert locations_db.build_hierarchy_index().descendants("CR") == ("CR-CT-1", "CR-CT-1-R1")
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def _shop(n_target=10000):
+    """Rooms -> wall shelves -> rows -> sections -> bins, ~10k rows."""
+    rows = []
+    r = 0
+    while len(rows) < n_target:
+        room = f"RM{r}"
+        rows.append({"LocationID": room, "Type": "Room", "parent_id": None})
+        for w in range(4):
+            wall = f"{room}-W{w}"
+            rows.append({"LocationID": wall, "parent_id": room})
+            for rr in range(5):
+                row_id = f"{wall}-R{rr}"
+                rows.append({"LocationID": row_id, "parent_id": wall})
+                for s in range(6):
+                    sec = f"{row_id}-S{s}"
+                    rows.append({"LocationID": sec, "parent_id": row_id})
+                    for b in range(3):
+                        rows.append({"LocationID": f"{sec}-B{b}", "parent_id": sec})
+        r += 1
+    return rows[:n_target]
+
+
+@pytest.mark.benchmark
+def test_benchmark_hierarchy_10k():
+    rows = _shop()
+    rnd = random.Random(1)
+    ids = [r["LocationID"] for r in rows]
+    qs = [rnd.choice(ids) for _ in range(20000)]
+    pairs = list(zip(qs, [rnd.choice(ids[:200]) for _ in qs]))
+
+    t0 = time.perf_counter()
+    pmap = locations_db.build_parent_map(rows)
+    pmap_ms = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter()
+    idx = locations_db.LocationHierarchy(pmap)
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    def timed(fn):
+        t0 = time.perf_counter()
+        fn()
+        return (time.perf_counter() - t0) * 1e6 / len(qs)
+
+    results = [
+        ("is_descendant",
+         timed(lambda: [locations_db.is_descendant(c, a, parent_map=pmap) for c, a in pairs]),
+         timed(lambda: [idx.is_descendant(c, a) for c, a in pairs])),
+        ("ancestors_of",
+         timed(lambda: [list(locations_db.ancestors_of(q, pmap)) for q in qs]),
+         timed(lambda: [idx.ancestors(q) for q in qs])),
+        ("resolve_room",
+         timed(lambda: [locations_db.resolve_room(q, parent_map=pmap) for q in qs]),
+         timed(lambda: [idx.room(q) for q in qs])),
+        # The no-map call shape: a parent map rebuilt from the rows per call.
+        ("room, rows/call",
+         timed(lambda: [locations_db.resolve_room(q, loc_list=rows) for q in qs[:20]]) * len(qs) / 20,
+         timed(lambda: [idx.room(q) for q in qs])),
+        ("subtree (room)",
+         timed(lambda: [[x for x in pmap if locations_db.is_descendant(x, a, parent_map=pmap)]
+                        for _c, a in pairs[:20]]) * len(qs) / 20,
+         timed(lambda: [idx.descendants(a) for _c, a in pairs])),
+    ]
+    print(f"\nhierarchy, {len(rows)} locations: parent map {pmap_ms:.1f}ms, "
+          f"index build {build_ms:.1f}ms")
+    print(f"{'query':>16} {'walk us/op':>12} {'index us/op':>12} {'speedup':>8}")
+    for name, walk_us, idx_us in results:
+        print(f"{name:>16} {walk_us:>12.2f} {idx_us:>12.2f} {walk_us / idx_us:>7.1f}x")
+    # Single hops on a shallow tree are within noise of the walk; the wins
+    # that matter are the rebuilt-map call shape and subtree enumeration.
+    by_name = {name: (walk_us, idx_us) for name, walk_us, idx_us in results}
+    for name in ("room, rows/call", "subtree (room)"):
+        walk_us, idx_us = by_name[name]
+        assert idx_us * 100 < walk_us, name
@@ -0,0 +1,139 @@
+"""Memory-resident locations store (locations_db._store_entry & friends).
+
+load_locations_list / get_locations_view / the derived parent, printer and
+room maps are served from one in-memory snapshot of locations.json. It is
+revalidated on the file's (path, mtime_ns, size, inode) signature, re-seeded
+by save_locations_list, and its derived maps are dropped together on change.
+"""
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import locations_db  # noqa: E402
+
+ROWS = [
+    {"LocationID": "LR", "Type": "Room", "Name": "Living Room"},
+    {"LocationID": "LR-MDB-1", "Type": "Dryer Box", "parent_id": "LR",
+     "extra": {"slot_targets": {"1": "XL-1"}}},
+    {"LocationID": "XL", "Type": "Printer", "Name": "XL", "parent_id": "LR",
+     "toolheads": [{"location_id": "XL-1", "position": 0}]},
+    {"LocationID": "XL-1", "Type": "Tool Head", "parent_id": "XL"},
+]
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    target = tmp_path / "locations.json"
+    target.write_text(json.dumps(ROWS, indent=4), encoding="utf-8")
+    monkeypatch.setattr(locations_db, "JSON_FILE", str(target))
+    monkeypatch.setattr(locations_db, "_DATA_DIR", str(tmp_path))
+    locations_db.invalidate_locations_cache()
+    yield target
+    locations_db.invalidate_locations_cache()
+
+
+def _delta(before, key):
+    return locations_db.get_store_stats()[key] - before[key]
+
+
+def _rewrite(target, rows):
+    """Out-of-band edit, the way an editor or `git checkout` replaces it."""
+    tmp = target.with_suffix(".new")
+    tmp.write_text(json.dumps(rows, indent=4), encoding="utf-8")
+    os.replace(tmp, target)
+
+
+def test_repeated_reads_parse_once_and_return_private_copies(store):
+    before = locations_db.get_store_stats()
+    first = locations_db.load_locations_list()
+    first[0]["Name"] = "MUTATED"
+    first.append({"LocationID": "JUNK"})
+    for _ in range(5):
+        again = locations_db.load_locations_list()
+    assert again == ROWS
+    assert locations_db.get_locations_view() == ROWS
+    assert _delta(before, "loads") == 1
+
+
+def test_out_of_band_rewrite_is_picked_up(store):
+    assert len(locations_db.load_locations_list()) == 4
+    _rewrite(store, ROWS[:2])
+    assert [r["LocationID"] for r in locations_db.load_locations_list()] == ["LR", "LR-MDB-1"]
+
+
+def test_same_size_in_place_rewrite_inside_timestamp_tick(store):
+    locations_db.load_locations_list()
+    st = os.stat(store)
+    swapped = [dict(ROWS[0], Name="Living Rooq")] + ROWS[1:]
+    store.write_text(json.dumps(swapped, indent=4), encoding="utf-8")
+    # Force the worst case: identical mtime, size and inode.
+    os.utime(store, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert os.stat(store).st_size == st.st_size
+    assert locations_db.load_locations_list()[0]["Name"] == "Living Rooq"
+
+
+def test_save_reseeds_store_without_reparse(store):
+    locations_db.load_locations_list()
+    before = locations_db.get_store_stats()
+    new_rows = ROWS + [{"LocationID": "LR-MDB-2", "Type": "Dryer Box"}]
+    assert locations_db.save_locations_list(new_rows) is True
+    assert locations_db.load_locations_list() == new_rows
+    assert _delta(before, "writes") == 1
+    assert _delta(before, "loads") == 0
+
+
+def test_derived_maps_built_once_and_dropped_together_on_write(store):
+    before = locations_db.get_store_stats()
+    for _ in range(3):
+        pm = locations_db.get_active_printer_map()
+        parents = locations_db.build_parent_map()
+        assert locations_db.resolve_room("XL-1") == "LR"
+        assert locations_db.is_descendant("XL-1", "LR")
+    assert pm == {"XL-1": {"printer_name": "XL", "position": 0}}
+    assert parents["XL-1"] == "XL"
+    assert _delta(before, "derived_builds") == 3  # printer_map, parent_map, hierarchy
+
+    # Callers own what they get back.
+    pm["XL-1"]["position"] = 9
+    parents["XL-1"] = "NOPE"
+    assert locations_db.get_active_printer_map()["XL-1"]["position"] == 0
+    assert locations_db.build_parent_map()["XL-1"] == "XL"
+
+    moved = [dict(r) for r in ROWS]
+    moved[2]["toolheads"] = [{"location_id": "XL-1", "position": 0},
+                             {"location_id": "XL-2", "position": 1}]
+    moved.append({"LocationID": "XL-2", "Type": "Tool Head", "parent_id": "XL"})
+    locations_db.save_locations_list(moved)
+    assert set(locations_db.get_active_printer_map()) == {"XL-1", "XL-2"}
+    assert locations_db.get_room_map()["XL-2"] == "LR"
+
+
+def test_explicit_loc_list_bypasses_the_store(store):
+    other = [{"LocationID": "CR", "Type": "Room"},
+             {"LocationID": "CORE1", "Type": "Printer", "Name": "Core One", "parent_id": "CR",
+              "toolheads": [{"location_id": "CORE1", "position": 0}]}]
+    assert locations_db.get_active_printer_map(other) == {
+        "CORE1": {"printer_name": "Core One", "position": 0}}
+    assert locations_db.resolve_room("CORE1", loc_list=other) == "CR"
+    assert locations_db.resolve_room("CORE1") == "CORE1"  # not in the on-disk tree
+
+
+def test_corrupt_file_is_never_cached(store):
+    locations_db.load_locations_list()
+    store.write_text('[{"LocationID": "LR",', encoding="utf-8")
+    with pytest.raises(locations_db.LocationsCorruptError):
+        locations_db.load_locations_list()
+    with pytest.raises(locations_db.LocationsCorruptError):
+        locations_db.get_active_printer_map()
+    _rewrite(store, ROWS)
+    assert locations_db.load_locations_list() == ROWS
+
+
+def test_missing_file_reads_empty(store):
+    os.remove(store)
+    assert locations_db.load_locations_list() == []
+    assert locations_db.get_active_printer_map() == {}
@@ -0,0 +1,69 @@
+"""Activity-log cursor — state.logs_since and /api/logs?since=.
+
+The log is a seq-numbered ring (state.RECENT_LOGS, newest first). A client
+sends back the ``seq`` of its last payload and receives only newer entries;
+it gets the whole history with reset=true when it has none, when the hub
+restarted under it, or when the ring already dropped what it missed.
+"""
+import collections
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import app as app_module  # noqa: E402
+import routes_state_pulse  # noqa: E402
+import state  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_log(monkeypatch):
+    monkeypatch.setattr(state, "RECENT_LOGS", collections.deque(maxlen=state.log_history_size()))
+    monkeypatch.setattr(state, "LOG_SEQ", 0)
+    monkeypatch.setattr(state, "log_history_size", lambda: 5)
+    monkeypatch.setattr(routes_state_pulse, "_check_audit_idle_timeout", lambda: None)
+
+
+def _msgs(entries):
+    return [e["msg"] for e in entries]
+
+
+def test_since_returns_only_newer_entries_newest_first():
+    for i in range(3):
+        state.add_log_entry(f"m{i}")
+    entries, seq, reset = state.logs_since()
+    assert (_msgs(entries), seq, reset) == (["m2", "m1", "m0"], 3, True)
+
+    state.add_log_entry("m3")
+    assert state.logs_since(3) == ([state.RECENT_LOGS[0]], 4, False)
+    assert state.logs_since(4) == ([], 4, False)
+
+
+def test_ring_is_bounded_and_a_stale_cursor_resets():
+    for i in range(8):
+        state.add_log_entry(f"m{i}")
+    assert len(state.RECENT_LOGS) == 5
+    entries, _seq, reset = state.logs_since(3)   # oldest kept is seq 4: no gap
+    assert (_msgs(entries), reset) == (["m7", "m6", "m5", "m4", "m3"], False)
+    entries, _seq, reset = state.logs_since(2)   # seq 3 was dropped
+    assert reset and len(entries) == 5
+    assert state.logs_since(99)[2] is True       # cursor from before a restart
+
+
+def test_logs_route_honours_since_and_pulse_logs_since(monkeypatch):
+    monkeypatch.setattr(routes_state_pulse.spoolman_http, "get",
+                        lambda *a, **kw: type("R", (), {"ok": True})())
+    client = app_module.app.test_client()
+    state.add_log_entry("Loaded spool", color_hex="FF0000,00FF00")
+    full = client.get("/api/logs").get_json()
+    assert full["reset"] is True and full["seq"] == 1 and full["history"] == 5
+    assert full["logs"][0]["colors"] == ["#FF0000", "#00FF00"]
+
+    state.add_log_entry("Ejected spool")
+    delta = client.get("/api/logs?since=1").get_json()
+    assert (delta["reset"], _msgs(delta["logs"]), delta["seq"]) == (False, ["Ejected spool"], 2)
+    assert delta["status"] == {"spoolman": True}
+
+    pulse = client.get("/api/dashboard_pulse?include=logs&logs_since=2").get_json()
+    assert pulse["logs"]["logs"] == [] and pulse["logs"]["reset"] is False
@@ -63,7 +63,7 @@ def mock_locations():
 
 @pytest.fixture
 def mock_requests():
-    with patch('logic.requests') as mock_req:
+    with patch('logic.spoolman_http') as mock_req:
         yield mock_req
 
 
@@ -203,7 +203,7 @@ def test_undo_legacy_record_without_labels_renders(mock_state):
         'target': 'CR', 'moves': {77: 'LR'}, 'ejections': {},
         'summary': 'Moved 1 -> CR', 'origin': ''
     }]
-    with patch('logic.requests'), patch('logic.config_loader') as cfg:
+    with patch('logic.spoolman_http'), patch('logic.config_loader') as cfg:
         cfg.get_api_urls.return_value = ("http://spoolman", "http://fb")
         res = logic.perform_undo()
 
@@ -220,7 +220,7 @@ def test_undo_empty_moves_record_no_double_moved(mock_state):
         'target': 'CR', 'moves': {}, 'ejections': {},
         'summary': 'Moved 1 -> CR', 'origin': ''
     }]
-    with patch('logic.requests'), patch('logic.config_loader') as cfg:
+    with patch('logic.spoolman_http'), patch('logic.config_loader') as cfg:
         cfg.get_api_urls.return_value = ("http://spoolman", "http://fb")
         res = logic.perform_undo()
 
@@ -237,8 +237,12 @@ def test_get_live_spools_data(mock_spoolman):
     # get_spool.return_value = {'id': 123, ...}
     # format_spool_display.return_value = {'text': 'Test Spool', 'color': '#ff0000'}
 
-    # Passing 123 triggers the mock, passing 404 tests graceful handling
-    mock_spoolman.get_spool.side_effect = lambda sid: {'id': sid} if sid == 123 else None
+    # Passing 123 triggers the mock, passing 404 tests graceful handling.
+    # get_live_spools_data resolves the whole set via the batched resolver,
+    # which (like get_spool) omits ids that don't resolve.
+    mock_spoolman.get_spools_by_ids.side_effect = lambda ids: {
+        str(sid): {'id': sid} for sid in ids if sid == 123
+    }
 
     res = logic.get_live_spools_data([123, 404])
 
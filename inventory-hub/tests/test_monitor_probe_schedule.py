@@ -0,0 +1,141 @@
+"""Per-printer probe schedule of the cancel monitor (print_monitor).
+
+Under the running loop each printer is probed on its own cadence — FAST while
+it prints or sits on a terminal screen, IDLE when idle, backed off while
+offline — instead of the whole fleet following its busiest printer. A reader
+that sees a printer's state change, or a connection edit, wakes that printer's
+probe at once. The conftest fixture disarms the schedule after each test.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import config_loader  # noqa: E402
+import print_monitor  # noqa: E402
+import printer_state_hub  # noqa: E402
+import prusalink_api  # noqa: E402
+import prusalink_poller  # noqa: E402
+
+FAST = print_monitor._CANCEL_MONITOR_FAST_S
+# The fixture stubs the retry pass out; tests that exercise it put it back.
+_RETRY_PASS = print_monitor._process_pending_cancel_fetches
+IDLE = print_monitor._CANCEL_MONITOR_IDLE_S
+
+
+@pytest.fixture
+def fleet(monkeypatch):
+    """Three printers (XL printing, MINI idle, OFF offline), a hand-driven
+    clock and an armed schedule. Returns (states, probed, clock)."""
+    states = {"XL": {"state": "PRINTING"}, "MINI": {"state": "IDLE"}, "OFF": None}
+    probed = []
+    now = [5000.0]
+    monkeypatch.setattr(print_monitor.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(config_loader, "get_api_urls", lambda: ("http://sm", "http://fb"))
+    monkeypatch.setattr(print_monitor.locations_db, "get_active_printer_map",
+                        lambda: {f"{n}-1": {"printer_name": n} for n in states})
+
+    def probe(fb, name, max_age=None):
+        probed.append(name)
+        return states[name]
+
+    monkeypatch.setattr(prusalink_api, "_probe_printer_state", probe)
+    monkeypatch.setattr(print_monitor, "_track_print_edge", lambda *a: None)
+    monkeypatch.setattr(print_monitor, "_process_pending_cancel_fetches", lambda *a: None)
+    monkeypatch.setattr(print_monitor.print_tracker_store, "save", lambda snap, **kw: None)
+    monkeypatch.setattr(print_monitor, "_PROBE_SCHEDULE", {})
+    return states, probed, now
+
+
+def test_each_printer_follows_its_own_cadence(fleet):
+    _states, probed, now = fleet
+    assert print_monitor._cancel_monitor_tick() is True
+    assert sorted(probed) == ["MINI", "OFF", "XL"]
+    # Next due: XL (printing) and OFF (first miss) at FAST, MINI at IDLE.
+    assert print_monitor._monitor_sleep_s(True) == FAST
+    del probed[:]
+    now[0] += FAST
+    print_monitor._cancel_monitor_tick()
+    assert sorted(probed) == ["OFF", "XL"]
+    # OFF has now missed twice → prusalink_poller's backoff (10 s, then 20 s)
+    # sets its pace; XL stays on FAST, MINI comes due at IDLE.
+    del probed[:]
+    for _ in range(2):
+        now[0] += FAST
+        print_monitor._cancel_monitor_tick()
+    assert probed.count("XL") == 2 and probed.count("OFF") == 1 and "MINI" in probed
+    assert print_monitor._PROBE_SCHEDULE["OFF"]["due"] == now[0] - FAST + 20
+
+
+def test_an_idle_fleet_sleeps_the_idle_interval(fleet):
+    states, probed, now = fleet
+    states["XL"] = {"state": "IDLE"}
+    states["OFF"] = {"state": "READY"}
+    assert print_monitor._cancel_monitor_tick() is False
+    assert print_monitor._monitor_sleep_s(False) == IDLE
+    now[0] += IDLE - 0.5
+    assert print_monitor._monitor_sleep_s(False) == print_monitor._MONITOR_MIN_SLEEP_S
+    del probed[:]
+    now[0] += 0.5
+    print_monitor._cancel_monitor_tick()
+    assert sorted(probed) == ["MINI", "OFF", "XL"]
+
+
+def test_unprobed_printers_pending_fetch_is_not_retried(fleet, monkeypatch):
+    states, probed, now = fleet
+    states["OFF"] = {"state": "IDLE"}
+    # MINI (idle) has a queued cancel fetch that keeps failing; XL prints, so
+    # it is due every FAST while MINI is only due every IDLE.
+    rec = {"printer_name": "MINI", "job_id": 7, "filename": "a.bgcode",
+           "progress": 0.5, "first_seen": print_monitor.time.time()}
+    monkeypatch.setattr(print_monitor, "_process_pending_cancel_fetches", _RETRY_PASS)
+    monkeypatch.setattr(print_monitor.cancel_fetch_store, "list_pending", lambda: [dict(rec)])
+    monkeypatch.setattr(print_monitor.cancel_fetch_store, "pop_pending",
+                        lambda *a: pytest.fail("the entry must stay queued"))
+    monkeypatch.setattr(print_monitor.print_deduct_ledger, "was_deducted", lambda *a: False)
+    monkeypatch.setattr(print_monitor.cancel_review_store, "has_pending", lambda *a: False)
+    attempts = []
+    monkeypatch.setattr(print_monitor.print_deduct, "_create_pending_cancel_review",
+                        lambda printer, *a, **k: attempts.append(printer)
+                        or {"status": "awaiting_fetch"})
+    print_monitor._cancel_monitor_tick()
+    assert attempts == ["MINI"]
+    del probed[:]
+    # A tick every second until MINI is next due: its last-visit IDLE must not
+    # gate a download attempt on any of them.
+    for _ in range(int(IDLE) - 1):
+        now[0] += 1
+        print_monitor._cancel_monitor_tick()
+    assert "MINI" not in probed and probed.count("XL") == 2
+    assert attempts == ["MINI"]
+    # Probed again → retried again.
+    now[0] += 1
+    print_monitor._cancel_monitor_tick()
+    assert attempts == ["MINI", "MINI"]
+
+
+def test_reader_state_change_wakes_the_printer(fleet, monkeypatch):
+    states, probed, now = fleet
+    monkeypatch.setattr(prusalink_poller, "submit", lambda fn, *a: fn(*a))
+    monkeypatch.setattr(config_loader, "load_config", lambda: {"printer_state_max_age": 5})
+    printer_state_hub.add_listener(print_monitor._on_reader_state_change)
+    print_monitor._cancel_monitor_tick()
+    del probed[:]
+    # MINI starts printing; a dashboard read after the hub entry aged out sees it.
+    states["MINI"] = {"state": "PRINTING"}
+    printer_state_hub._ENTRIES[("http://fb", "MINI")]["at"] -= 6
+    assert prusalink_api.get_printer_state("http://fb", "MINI") == {"state": "PRINTING"}
+    # The reader's probe, then the monitor's woken one — rescheduled at FAST.
+    assert probed == ["MINI", "MINI"]
+    assert print_monitor._PROBE_SCHEDULE["MINI"]["due"] == now[0] + FAST
+
+
+def test_wake_is_a_noop_when_the_monitor_is_not_running(monkeypatch):
+    monkeypatch.setattr(prusalink_poller, "submit",
+                        lambda *a: pytest.fail("nothing should be probed"))
+    assert print_monitor._PROBE_SCHEDULE is None
+    assert print_monitor.wake_printer("XL") is False
@@ -34,10 +34,11 @@ ALLOWED_FILES = {
 }
 SCAN_GLOBS = ["*.py", "static/js/**/*.js", "templates/**/*.html"]
 
-# Match `requests.patch(...)` or `_req.patch(...)` invocations whose
+# Match `requests.patch(...)`, `_req.patch(...)` or the pooled
+# `spoolman_http.patch(...)` transport invocations whose
 # json payload literal contains `extra`. We anchor on the patch call
 # and look forward through the next ~6 lines for the `extra` token.
-PATCH_CALL = re.compile(r"\b(?:requests|_req)\.patch\s*\(", re.MULTILINE)
+PATCH_CALL = re.compile(r"\b(?:requests|_req|spoolman_http)\.patch\s*\(", re.MULTILINE)
 
 
 def _violations_in_file(path: Path) -> list[tuple[int, str]]:
@@ -0,0 +1,329 @@
+"""Byte-level cancel prefix-parse (prusalink_api.parse_partial_filament_usage).
+
+The parser now scans UTF-8 bytes with compiled patterns instead of walking
+decoded lines. These tests diff it against the original per-line walk (kept
+verbatim below as the reference) over randomized multi-tool G-code — mixed
+M82/M83, G92 resets, no-space moves, comments, CRLF, odd case — at many cut
+points and for every accepted input type (str, bytes, memoryview, mmap).
+parse_cumulative_filament_usage (the swap-split's many cuts in one walk) is
+diffed against one single-cut parse per boundary.
+
+The benchmarks (opt-in: --run-benchmark -s) time both over a synthetic
+~50 MB XL five-tool file, the size that used to stall the cancel-deduct thread.
+"""
+import mmap
+import os
+import random
+import re
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import prusalink_api  # noqa: E402
+
+
+def _reference_parse(gcode_content, reached_fraction):
+    """The pre-bytes implementation, line for line."""
+    if not gcode_content:
+        return {}
+    g_match = re.search(r';?\s*filament used \[g\]\s*=\s*([0-9.,\s]+)', gcode_content)
+    mm_match = re.search(r';?\s*filament used \[mm\]\s*=\s*([0-9.,\s]+)', gcode_content)
+    if not g_match or not mm_match:
+        return {}
+    grams = prusalink_api._parse_weights_from_match(g_match)
+    mms = prusalink_api._parse_weights_from_match(mm_match)
+    g_per_mm = {t: grams[t] / mm for t, mm in mms.items() if mm > 0 and t in grams}
+    if not g_per_mm:
+        return {}
+    reached_fraction = max(0.0, min(1.0, float(reached_fraction)))
+    reached_byte = int(reached_fraction * len(gcode_content.encode('utf-8')))
+    if reached_byte <= 0:
+        return {}
+    default_tool = next(iter(g_per_mm)) if len(g_per_mm) == 1 else 0
+    active_tool = default_tool
+    relative_e = False
+    e_high = {}
+    extruded_mm = {}
+    saw_tool = False
+    consumed = 0
+    for line in gcode_content.splitlines(keepends=True):
+        consumed += len(line.encode('utf-8'))
+        if consumed > reached_byte:
+            break
+        code = line.split(';', 1)[0].strip()
+        if not code:
+            continue
+        upper = code.upper()
+        tmatch = re.match(r'^T(\d+)(?![0-9])', upper)
+        if tmatch:
+            active_tool = int(tmatch.group(1))
+            saw_tool = True
+            continue
+        if upper.startswith('M82'):
+            relative_e = False
+            continue
+        if upper.startswith('M83'):
+            relative_e = True
+            continue
+        if upper.startswith('G92'):
+            em = re.search(r'E(-?\d*\.?\d+)', upper)
+            e_high[active_tool] = float(em.group(1)) if em else 0.0
+            continue
+        if re.match(r'^G[01](?![0-9])', upper):
+            em = re.search(r'E(-?\d*\.?\d+)', upper)
+            if not em:
+                continue
+            e = float(em.group(1))
+            if relative_e:
+                extruded_mm[active_tool] = extruded_mm.get(active_tool, 0.0) + e
+            else:
+                hi = e_high.get(active_tool, 0.0)
+                if e > hi:
+                    extruded_mm[active_tool] = extruded_mm.get(active_tool, 0.0) + (e - hi)
+                    e_high[active_tool] = e
+    if not saw_tool and len(g_per_mm) == 1 and extruded_mm:
+        extruded_mm = {next(iter(g_per_mm)): sum(extruded_mm.values())}
+    return {t: round(mm * g_per_mm[t], 4)
+            for t, mm in extruded_mm.items() if mm > 0 and t in g_per_mm}
+
+
+def _random_gcode(rnd, n_lines, tools):
+    """Messy but well-formed G-code: every construct the parser branches on."""
+    eol = "\r\n" if rnd.random() < 0.3 else "\n"
+    lines = ["; generated by PrusaSlicer 2.8.1", "M83" if rnd.random() < 0.5 else "M82"]
+    e = {t: 0.0 for t in range(tools)}
+    for _ in range(n_lines):
+        roll = rnd.random()
+        if roll < 0.03 and tools > 1:
+            lines.append(rnd.choice(["T", "t", "  T"]) + str(rnd.randrange(tools))
+                         + rnd.choice(["", " ; tool change", " S1"]))
+        elif roll < 0.05:
+            lines.append(rnd.choice(["M83", "M82", "m83", " M82 ; abs"]))
+        elif roll < 0.07:
+            lines.append(rnd.choice(["G92 E0", "g92 e0", "G92", "G92 E1.5", "G92 X0 ; no E"]))
+        elif roll < 0.10:
+            lines.append(rnd.choice([";LAYER_CHANGE", ";Z:0.4", "", "   ", "M73 P12 R40",
+                                     "G10 ; retract", "G11", "G28 E5", "G4 S0"]))
+        else:
+            t = rnd.randrange(tools)
+            e[t] += rnd.uniform(-0.8, 2.0)
+            val = rnd.choice([f"{e[t]:.5f}", f"{rnd.uniform(-0.8, 1.2):.4f}", ".0412"])
+            lines.append(rnd.choice([
+                f"G1 X{rnd.uniform(0, 360):.3f} Y{rnd.uniform(0, 360):.3f} E{val}",
+                f"G1X{rnd.uniform(0, 360):.2f}E{val}",
+                f"g1 x1 e{val} ; lower case",
+                f"G0 F9000 E{val}",
+                "G1 X1 Y2 ; E99 in a comment",
+                "G1 F1200",
+            ]))
+    mm = ", ".join(f"{rnd.uniform(1, 5000):.2f}" for _ in range(tools))
+    g = ", ".join(f"{rnd.uniform(0.5, 20):.2f}" for _ in range(tools))
+    lines += [f"; filament used [mm] = {mm}", f"; filament used [g] = {g}",
+              "; total filament used [g] = 1"]
+    return eol.join(lines) + eol
+
+
+def _same(fast, ref):
+    # The M83 fold sums a chunk at once and the M82 fold takes one max per run
+    # of moves — same math, but not the same float rounding order.
+    assert fast.keys() == ref.keys()
+    for t in ref:
+        assert fast[t] == pytest.approx(ref[t], abs=2e-4), (t, fast, ref)
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_matches_line_walk_at_every_cut(seed):
+    rnd = random.Random(seed)
+    gcode = _random_gcode(rnd, 400, rnd.choice([1, 2, 5]))
+    for frac in [0.0, 1e-4, 1.0, 1.5, -1] + [rnd.random() for _ in range(40)]:
+        _same(prusalink_api.parse_partial_filament_usage(gcode, frac),
+              _reference_parse(gcode, frac))
+
+
+def test_cut_landing_exactly_on_a_line_end():
+    gcode = "M83\nT0\nG1 E5\nG1 E7\n; filament used [mm] = 12\n; filament used [g] = 1.2\n"
+    data = gcode.encode()
+    for cut in range(1, len(data) + 1):
+        frac = (cut + 0.5) / len(data)
+        _same(prusalink_api.parse_partial_filament_usage(gcode, frac),
+              _reference_parse(gcode, frac))
+
+
+@pytest.mark.parametrize("first", ["G1 E5", "  g1x2e5", "M83", "T1", "G92 E2", "G1 E5 ; c"])
+def test_first_line_is_scanned_like_any_other(first):
+    body = first + "\nG1 E7\nT0\nG1 E3\n; filament used [mm] = 20, 20\n; filament used [g] = 2, 4\n"
+    for frac in (0.05, 0.3, 1.0):
+        _same(prusalink_api.parse_partial_filament_usage(body, frac), _reference_parse(body, frac))
+        _same(prusalink_api.parse_partial_filament_usage(first, frac), _reference_parse(first, frac))
+
+
+def test_bytes_like_inputs_match_str(tmp_path):
+    rnd = random.Random(99)
+    gcode = _random_gcode(rnd, 2000, 5) + "; naïve ünïcode comment\n"
+    data = gcode.encode("utf-8")
+    path = tmp_path / "print.gcode"
+    path.write_bytes(data)
+    fracs = [0.25, 0.5, 0.999, 1.0]
+    expected = [prusalink_api.parse_partial_filament_usage(gcode, f) for f in fracs]
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for src in (data, bytearray(data), memoryview(data), mm):
+            assert [prusalink_api.parse_partial_filament_usage(src, f) for f in fracs] == expected
+
+
+def test_long_single_tool_run_is_folded_in_chunks(monkeypatch):
+    monkeypatch.setattr(prusalink_api, "_GCODE_SCAN_CHUNK", 64)
+    rnd = random.Random(5)
+    for seed_tools in (1, 2):
+        gcode = _random_gcode(rnd, 600, seed_tools)
+        for frac in (0.3, 0.77, 1.0):
+            _same(prusalink_api.parse_partial_filament_usage(gcode, frac),
+                  _reference_parse(gcode, frac))
+
+
+# ---------------------------------------------------------------------------
+# Cumulative (multi-cut) walk
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("seed", range(8))
+def test_cumulative_walk_matches_one_parse_per_cut(seed):
+    rnd = random.Random(100 + seed)
+    gcode = _random_gcode(rnd, 500, rnd.choice([1, 2, 5]))
+    fracs = [0.0, -1, 1e-4, 1.0, 1.5] + [rnd.random() for _ in range(30)]
+    rnd.shuffle(fracs)
+    got = prusalink_api.parse_cumulative_filament_usage(gcode, fracs)
+    assert len(got) == len(fracs)
+    for frac, usage in zip(fracs, got):
+        _same(usage, _reference_parse(gcode, frac))
+
+
+def test_cumulative_walk_on_line_ends_and_repeats():
+    gcode = "T1\nM83\nG1 E5\nT0\nG1 E7\n; filament used [mm] = 12, 12\n; filament used [g] = 1.2, 2.4"
+    data = gcode.encode()
+    fracs = [(cut + 0.5) / len(data) for cut in range(len(data) + 1)] * 2
+    got = prusalink_api.parse_cumulative_filament_usage(data, fracs)
+    assert got == [prusalink_api.parse_partial_filament_usage(gcode, f) for f in fracs]
+
+
+def test_cumulative_walk_scans_the_file_once(monkeypatch):
+    rnd = random.Random(7)
+    gcode = _random_gcode(rnd, 3000, 2)
+    data = gcode.encode()
+    scanned = []
+    real = prusalink_api._fold_moves
+    monkeypatch.setattr(prusalink_api, "_fold_moves",
+                        lambda buf, start, stop, *a: scanned.append(stop - start) or real(buf, start, stop, *a))
+    prusalink_api.parse_cumulative_filament_usage(data, [0.9, 0.1, 0.5, 0.3, 0.7])
+    assert sum(scanned) <= int(0.9 * len(data))
+    del scanned[:]
+    prusalink_api.parse_partial_filament_usage(data, 0.9)
+    single = sum(scanned)
+    del scanned[:]
+    for f in (0.9, 0.1, 0.5, 0.3, 0.7):
+        prusalink_api.parse_partial_filament_usage(data, f)
+    assert sum(scanned) > 2 * single
+
+
+def test_cumulative_walk_without_footer_or_cuts():
+    assert prusalink_api.parse_cumulative_filament_usage("G1 E5\n", [0.5, 1.0]) == [{}, {}]
+    assert prusalink_api.parse_cumulative_filament_usage("", [0.5]) == [{}]
+    assert prusalink_api.parse_cumulative_filament_usage("G1 E5\n; filament used [mm] = 5\n"
+                                                         "; filament used [g] = 1\n", []) == []
+
+
+def test_compute_segment_usage_uses_one_walk(monkeypatch):
+    rnd = random.Random(21)
+    gcode = _random_gcode(rnd, 800, 2)
+    monkeypatch.setattr(prusalink_api, "_download_file_bytes", lambda *a: gcode.encode())
+    walks = []
+    real = prusalink_api.parse_cumulative_filament_usage
+    monkeypatch.setattr(prusalink_api, "parse_cumulative_filament_usage",
+                        lambda g, f: walks.append(list(f)) or real(g, f))
+    bounds = [0.2, 0.45, 0.8]
+    seg = prusalink_api.compute_segment_usage("1.2.3.4", "k", "x.gcode", bounds)
+    assert walks == [bounds]
+    assert seg["footer"] == prusalink_api.parse_footer_usage(gcode)
+    for b, cum in zip(bounds, seg["cums"]):
+        _same(cum, _reference_parse(gcode, b))
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def _xl_gcode(target_mb=50, tools=5):
+    """A PrusaSlicer-shaped XL multi-tool body: M83, tool changes every layer
+    segment, wipe/retract pairs, no-space moves and G92 resets."""
+    rnd = random.Random(3)
+    chunk = []
+    for layer in range(40):
+        chunk.append(f";LAYER_CHANGE\n;Z:{0.2 * (layer + 1):.1f}\nG92 E0\n")
+        for t in range(tools):
+            chunk.append(f"T{t}\nG1 E-.8 F2100\nG1 Z{0.2 * layer + 0.6:.1f}\nG1 E.8\n")
+            for _ in range(100):
+                chunk.append(f"G1 X{rnd.uniform(20, 340):.3f} Y{rnd.uniform(20, 340):.3f} "
+                             f"E{rnd.uniform(0.01, 0.9):.5f}\n")
+                chunk.append(f"G1X{rnd.uniform(20, 340):.2f}Y{rnd.uniform(20, 340):.2f}"
+                             f"E.0{rnd.randint(100, 999)} ; perimeter\n")
+    block = "M83\n" + "".join(chunk)
+    reps = max(1, (target_mb << 20) // len(block))
+    footer = ("; filament used [mm] = " + ", ".join(["9000.00"] * tools) + "\n"
+              "; filament used [g] = " + ", ".join(["27.00"] * tools) + "\n")
+    return block * reps + footer
+
+
+@pytest.mark.benchmark
+def test_benchmark_prefix_parse_50mb(tmp_path):
+    gcode = _xl_gcode()
+    data = gcode.encode("utf-8")
+    path = tmp_path / "xl.gcode"
+    path.write_bytes(data)
+    mb = len(data) / (1 << 20)
+
+    def timed(fn):
+        t0 = time.perf_counter()
+        out = fn()
+        return time.perf_counter() - t0, out
+
+    rows = []
+    ref_s, ref = timed(lambda: _reference_parse(gcode, 0.9))
+    rows.append(("line walk (str)", ref_s))
+    str_s, got = timed(lambda: prusalink_api.parse_partial_filament_usage(gcode, 0.9))
+    _same(got, ref)
+    rows.append(("bytes scan (str)", str_s))
+    bytes_s, got = timed(lambda: prusalink_api.parse_partial_filament_usage(data, 0.9))
+    _same(got, ref)
+    rows.append(("bytes scan (bytes)", bytes_s))
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        mmap_s, got = timed(lambda: prusalink_api.parse_partial_filament_usage(mm, 0.9))
+    _same(got, ref)
+    rows.append(("bytes scan (mmap)", mmap_s))
+
+    print(f"\ncancel prefix-parse, {mb:.1f} MB XL G-code, cut at 90%")
+    print(f"{'parser':>20} {'seconds':>9} {'MB/s':>8} {'speedup':>8}")
+    for name, secs in rows:
+        print(f"{name:>20} {secs:>9.3f} {mb / secs:>8.1f} {ref_s / secs:>7.1f}x")
+    assert bytes_s * 5 < ref_s
+
+
+@pytest.mark.benchmark
+def test_benchmark_swap_split_boundaries_50mb():
+    data = _xl_gcode().encode("utf-8")
+    mb = len(data) / (1 << 20)
+    bounds = [0.1, 0.25, 0.4, 0.55, 0.7, 0.85, 0.95]
+
+    t0 = time.perf_counter()
+    per_cut = [prusalink_api.parse_partial_filament_usage(data, b) for b in bounds]
+    per_cut_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    walk = prusalink_api.parse_cumulative_filament_usage(data, bounds)
+    walk_s = time.perf_counter() - t0
+    for got, ref in zip(walk, per_cut):
+        _same(got, ref)
+
+    print(f"\nswap-split usage, {mb:.1f} MB XL G-code, {len(bounds)} boundaries")
+    print(f"{'per-boundary parse':>20} {per_cut_s:>8.3f}s")
+    print(f"{'single walk':>20} {walk_s:>8.3f}s {per_cut_s / walk_s:>7.1f}x")
+    assert walk_s * 3 < per_cut_s
@@ -235,7 +235,7 @@ def test_get_locations_redacts_printer_creds(client):
     with patch.object(app.locations_db, "load_locations_list", return_value=copy.deepcopy(_rows())), \
          patch.object(app.spoolman_api, "get_all_locations", return_value=[]), \
          patch.object(app.config_loader, "get_api_urls", return_value=("http://spool", "http://fb/api")), \
-         patch.object(app.requests, "get", return_value=spool_resp):
+         patch("spoolman_http.get", return_value=spool_resp):
         res = client.get("/api/locations")
     assert res.status_code == 200
     rows = res.get_json()
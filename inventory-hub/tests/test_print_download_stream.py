@@ -0,0 +1,162 @@
+"""Streaming print-file download (prusalink_api._download_file_bytes).
+
+The file is streamed chunk by chunk into an unlinked temp file and handed back
+as a read-only mmap, so a 100 MB XL print never sits on the heap whole. These
+tests pin the bytes, the chunking / progress reporting, the failure paths, the
+heap peak (tracemalloc) and that the bgcode decoder and the prefix-parse give
+the same answers on the mapped buffer as on plain bytes.
+"""
+import mmap
+import os
+import sys
+import tracemalloc
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import bgcode_decode  # noqa: E402
+import prusalink_api  # noqa: E402
+
+_FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "sample.bgcode")
+
+
+class _StreamResponse:
+    """Just enough of a streamed requests.Response: chunks are produced lazily,
+    so the test itself never holds the whole body."""
+
+    def __init__(self, size, status=200, fill=b"G1 X1 E0.5\n", fail_after=None, length=True):
+        self.status_code = status
+        self.ok = status < 400
+        self.headers = {"Content-Length": str(size)} if length else {}
+        self.size = size
+        self.fill = fill
+        self.fail_after = fail_after
+        self.chunk_sizes = []
+
+    def iter_content(self, chunk_size):
+        unit = self.fill * (chunk_size // len(self.fill) + 2)
+        sent = 0
+        while sent < self.size:
+            if self.fail_after is not None and sent >= self.fail_after:
+                raise requests.exceptions.ChunkedEncodingError("connection reset")
+            n = min(chunk_size, self.size - sent)
+            start = sent % len(self.fill)
+            self.chunk_sizes.append(n)
+            sent += n
+            yield unit[start:start + n]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Point requests.get at a canned streamed response; records the call."""
+    calls = []
+
+    def install(resp):
+        def fake_get(url, **kw):
+            calls.append((url, kw))
+            return resp
+        monkeypatch.setattr(prusalink_api.requests, "get", fake_get)
+        return resp
+    install.calls = calls
+    return install
+
+
+def test_streams_into_a_mapped_temp_file(serve, monkeypatch):
+    monkeypatch.setattr(prusalink_api, "_DOWNLOAD_CHUNK", 4096)
+    resp = serve(_StreamResponse(10_000, fill=b"0123456789"))
+    seen = []
+    before = prusalink_api.get_download_stats()
+    buf = prusalink_api._download_file_bytes("10.0.0.2", "key", "/usb/a.gcode",
+                                             progress=lambda d, t: seen.append((d, t)))
+    assert isinstance(buf, mmap.mmap)
+    assert buf[:] == (b"0123456789" * 1000)
+    url, kw = serve.calls[0]
+    assert url == "http://10.0.0.2/usb/a.gcode" and kw["stream"] is True
+    assert kw["headers"] == {"X-Api-Key": "key"}
+    assert resp.chunk_sizes == [4096, 4096, 1808]
+    assert seen == [(4096, 10_000), (8192, 10_000), (10_000, 10_000)]
+    after = prusalink_api.get_download_stats()
+    assert after["downloads"] - before["downloads"] == 1
+    assert after["bytes"] - before["bytes"] == 10_000
+    assert after["active"] == []
+    # The temp file is already unlinked — nothing is left in the directory.
+    assert [n for n in os.listdir(prusalink_api.print_file_cache._CACHE_DIR)
+            if n.startswith("download-")] == []
+
+
+def test_active_download_is_visible_while_it_runs(serve, monkeypatch):
+    monkeypatch.setattr(prusalink_api, "_DOWNLOAD_CHUNK", 1000)
+    serve(_StreamResponse(3000, length=False))
+    snaps = []
+    prusalink_api._download_file_bytes(
+        "ip", None, "b.gcode",
+        progress=lambda d, t: snaps.append(prusalink_api.get_download_stats()["active"]))
+    assert [a[0]["bytes"] for a in snaps] == [1000, 2000, 3000]
+    assert snaps[0][0]["total"] is None and snaps[0][0]["url"] == "http://ip/b.gcode"
+    assert prusalink_api.get_download_stats()["active"] == []
+
+
+@pytest.mark.parametrize("resp", [
+    _StreamResponse(100, status=404),
+    _StreamResponse(50_000, fail_after=8192),
+])
+def test_failures_return_none_and_clean_up(serve, resp, monkeypatch):
+    monkeypatch.setattr(prusalink_api, "_DOWNLOAD_CHUNK", 4096)
+    serve(resp)
+    before = prusalink_api.get_download_stats()
+    assert prusalink_api._download_file_bytes("ip", "k", "c.gcode") is None
+    after = prusalink_api.get_download_stats()
+    assert after["failures"] - before["failures"] == 1 and after["active"] == []
+
+
+def test_empty_file_is_empty_bytes(serve):
+    serve(_StreamResponse(0))
+    assert prusalink_api._download_file_bytes("ip", "k", "e.gcode") == b""
+
+
+def test_heap_peak_is_a_few_chunks_not_the_file(serve, monkeypatch):
+    monkeypatch.setattr(prusalink_api, "_DOWNLOAD_CHUNK", 64 * 1024)
+    size = 24 << 20
+    serve(_StreamResponse(size))
+    tracemalloc.start()
+    try:
+        buf = prusalink_api._download_file_bytes("ip", "k", "big.gcode")
+        _cur, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(buf) == size
+    assert peak < 4 * 64 * 1024, peak
+
+
+def test_text_file_parses_in_place_from_the_mapping(serve):
+    body = (b"M83\nT0\n" + b"G1 X1 E0.5\n" * 2000
+            + b"; filament used [mm] = 1000\n; filament used [g] = 3\n")
+    serve(_StreamResponse(len(body), fill=body))
+    buf = prusalink_api._download_file_bytes("ip", "k", "t.gcode")
+    text = body.decode()
+    assert prusalink_api.parse_footer_usage(buf) == prusalink_api.parse_footer_usage(text) == {0: 3.0}
+    assert prusalink_api.parse_cumulative_filament_usage(buf, [0.3, 1.0]) == \
+        prusalink_api.parse_cumulative_filament_usage(text, [0.3, 1.0])
+    seg = prusalink_api.compute_segment_usage("ip", "k", "t.gcode", [0.5])
+    assert seg["footer"] == {0: 3.0}
+    assert seg["cums"] == [prusalink_api.parse_partial_filament_usage(text, 0.5)]
+
+
+@pytest.mark.skipif(not os.path.exists(_FIXTURE), reason="sample.bgcode fixture not present")
+def test_bgcode_decodes_from_the_mapping(serve):
+    raw = open(_FIXTURE, "rb").read()
+    serve(_StreamResponse(len(raw), fill=raw))
+    buf = prusalink_api._download_file_bytes("ip", "k", "s.bgcode")
+    assert isinstance(buf, mmap.mmap) and bgcode_decode.is_bgcode(buf)
+    assert bgcode_decode.decode_bgcode(buf) == bgcode_decode.decode_bgcode(raw)
+    got = prusalink_api.fetch_cancel_gcode("ip", "k", "s.bgcode", 0.4)
+    want = bgcode_decode.decode_bgcode_until(raw, 0.4)
+    assert got == {"gcode": want["gcode"], "fraction": want["fraction"]}
@@ -0,0 +1,195 @@
+"""On-disk print-file cache (print_file_cache) and the prusalink_api fetch paths
+that use it.
+
+A print job's file must be downloaded and decoded at most once: the cancel
+fetch, its deferred retries and the completion's follow-up swap split all hit
+the cache. Blobs are content-addressed (a reprint shares the bytes), evicted
+least-recently-used past the size budget, and a fetch with no job id behaves
+exactly as before. The autouse conftest fixture points the cache at tmp_path.
+"""
+import os
+import struct
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import bgcode_decode  # noqa: E402
+import print_deduct  # noqa: E402
+import print_file_cache  # noqa: E402
+import prusalink_api  # noqa: E402
+
+_META = b"filament used [mm] = 100\nfilament used [g] = 3\n"
+
+
+def _block(btype, payload):
+    return struct.pack("<HHI", btype, 0, len(payload)) + struct.pack("<H", 0) + payload
+
+
+def _bgcode(n_blocks=10):
+    """A time-marked single-tool print: `M73 P<pct>` then ten 1 mm moves per block."""
+    blocks = [_block(4, _META)]
+    for b in range(n_blocks):
+        lines = (["M83"] if b == 0 else []) + [f"M73 P{b * 10} R{100 - b * 10}"]
+        lines += [f"G1 X{b}.{i} E1" for i in range(10)]
+        blocks.append(_block(1, ("\n".join(lines) + "\n").encode()))
+    return b"GCDE" + struct.pack("<I", 1) + struct.pack("<H", 0) + b"".join(blocks)
+
+
+@pytest.fixture
+def printer(monkeypatch):
+    """A fake PrusaLink serving one file; records downloads and full decodes."""
+    files = {"big.bgcode": _bgcode()}
+    calls = {"downloads": [], "decodes": 0}
+
+    def download(ip, key, filename):
+        calls["downloads"].append(filename)
+        return files.get(filename)
+
+    real_walk = bgcode_decode._walk_gcode
+
+    def walk(raw, stop=None):
+        calls["decodes"] += 1
+        return real_walk(raw, stop)
+
+    monkeypatch.setattr(prusalink_api, "_download_file_bytes", download)
+    monkeypatch.setattr(bgcode_decode, "_walk_gcode", walk)
+    monkeypatch.setattr(print_file_cache, "_max_bytes", lambda: 1 << 30)
+    yield files, calls
+    prusalink_api.clear_file_job()
+
+
+def test_store_lookup_and_content_addressing():
+    raw = b"G1 E1\n" * 100
+    assert print_file_cache.lookup("1.2.3.4", "a.gcode", 7) is None
+    sha = print_file_cache.store("1.2.3.4", "/a.gcode", 7, raw)
+    assert print_file_cache.lookup("1.2.3.4", "a.gcode", 7) == sha
+    assert print_file_cache.read_raw(sha)[:] == raw
+    # A reprint (new job id) of the same bytes lands on the same blob.
+    assert print_file_cache.store("1.2.3.4", "a.gcode", 8, raw) == sha
+    stats = print_file_cache.get_stats()
+    assert stats["files"] == 1 and stats["bytes"] == len(raw)
+    # Other jobs / printers miss; no job id never touches the cache.
+    assert print_file_cache.lookup("1.2.3.5", "a.gcode", 7) is None
+    assert print_file_cache.store("1.2.3.4", "a.gcode", None, raw) is None
+    assert print_file_cache.lookup("1.2.3.4", "a.gcode", None) is None
+
+
+def test_lru_eviction_keeps_the_budget(monkeypatch):
+    monkeypatch.setattr(print_file_cache, "_max_bytes", lambda: 2500)
+    shas = [print_file_cache.store("ip", f"f{i}.gcode", i, bytes([65 + i]) * 1000)
+            for i in range(3)]
+    # Three 1000-byte files over a 2500-byte budget: the oldest one went.
+    assert print_file_cache.lookup("ip", "f0.gcode", 0) is None
+    assert not os.path.exists(os.path.join(print_file_cache._CACHE_DIR, shas[0] + ".raw"))
+    # Touch f1, then add f3: f2 is now the least recently used.
+    assert print_file_cache.lookup("ip", "f1.gcode", 1) == shas[1]
+    print_file_cache.store("ip", "f3.gcode", 3, b"D" * 1000)
+    assert print_file_cache.lookup("ip", "f2.gcode", 2) is None
+    assert print_file_cache.lookup("ip", "f1.gcode", 1) == shas[1]
+    assert print_file_cache.get_stats()["bytes"] <= 2500
+    # Bigger than the whole budget → not cached at all.
+    assert print_file_cache.store("ip", "huge.gcode", 9, b"x" * 3000) is None
+
+
+def test_hits_do_not_rewrite_the_index(monkeypatch):
+    sha = print_file_cache.store("ip", "a.gcode", 1, b"A" * 100)
+    saves = []
+    monkeypatch.setattr(print_file_cache, "_save_index", saves.append)
+    for _ in range(5):
+        assert print_file_cache.lookup("ip", "a.gcode", 1) == sha
+    assert saves == []
+    # A read-only stretch still reaches the disk, once per flush interval.
+    monkeypatch.setattr(print_file_cache, "_LAST_USE_FLUSH", 0.0)
+    monkeypatch.setattr(print_file_cache, "_USE_FLUSH_S", 0.0)
+    print_file_cache.lookup("ip", "a.gcode", 1)
+    assert len(saves) == 1 and saves[0]["blobs"][sha]["used"] > 0
+
+
+def test_zero_budget_disables_and_corrupt_index_is_empty(monkeypatch):
+    monkeypatch.setattr(print_file_cache, "_max_bytes", lambda: 0)
+    assert print_file_cache.store("ip", "a.gcode", 1, b"G1 E1\n") is None
+    monkeypatch.setattr(print_file_cache, "_max_bytes", lambda: 1 << 20)
+    os.makedirs(print_file_cache._CACHE_DIR, exist_ok=True)
+    with open(os.path.join(print_file_cache._CACHE_DIR, "index.json"), "w") as f:
+        f.write("{ not json")
+    assert print_file_cache.lookup("ip", "a.gcode", 1) is None
+    assert print_file_cache.store("ip", "a.gcode", 1, b"G1 E1\n")
+
+
+def test_job_fetches_download_and_decode_once(printer):
+    files, calls = printer
+    full = bgcode_decode.decode_bgcode(files["big.bgcode"])
+    calls["decodes"] = 0
+    prusalink_api.begin_file_job("42")
+    # Completion: the footer deduct (progress 1.0 decodes everything) ...
+    first = prusalink_api.fetch_cancel_gcode("ip", "k", "big.bgcode", 1.0)
+    assert first["gcode"] == full["gcode"]
+    # ... then the retry and the swap split reuse the file and its decode.
+    again = prusalink_api.fetch_cancel_gcode("ip", "k", "big.bgcode", 0.45)
+    seg = prusalink_api.compute_segment_usage("ip", "k", "big.bgcode", [0.25, 0.5])
+    assert calls["downloads"] == ["big.bgcode"] and calls["decodes"] == 1
+    assert again == {"gcode": full["gcode"],
+                     "fraction": bgcode_decode.progress_to_decoded_fraction(full, 0.45)}
+    assert seg["footer"] == {0: 3.0}
+    assert seg["cums"] == prusalink_api.parse_cumulative_filament_usage(
+        full["gcode"], [bgcode_decode.progress_to_decoded_fraction(full, p) for p in (0.25, 0.5)])
+    # The footer is now in the entry's metadata (JSON string keys → tool ints).
+    prusalink_api.compute_segment_usage("ip", "k", "big.bgcode", [0.9])
+    sha = print_file_cache.lookup("ip", "big.bgcode", "42")
+    assert print_file_cache.get_meta(sha)["footer"] == {"0": 3.0}
+    assert calls["decodes"] == 1
+
+
+def test_early_cancel_decode_is_not_cached_as_the_full_file(printer):
+    files, calls = printer
+    prusalink_api.begin_file_job("43")
+    early = prusalink_api.fetch_cancel_gcode("ip", "k", "big.bgcode", 0.15)
+    assert early["fraction"] == 1.0
+    sha = print_file_cache.lookup("ip", "big.bgcode", "43")
+    assert print_file_cache.load_decoded(sha) is None
+    # The split still needs the whole file: decoded once from the cached bytes.
+    prusalink_api.compute_segment_usage("ip", "k", "big.bgcode", [0.5])
+    prusalink_api.compute_segment_usage("ip", "k", "big.bgcode", [0.5])
+    assert calls["downloads"] == ["big.bgcode"] and calls["decodes"] == 2
+
+
+def test_without_a_job_every_fetch_downloads(printer):
+    _files, calls = printer
+    for _ in range(2):
+        assert prusalink_api.download_gcode_content("ip", "k", "big.bgcode")
+    assert calls["downloads"] == ["big.bgcode"] * 2
+    assert print_file_cache.get_stats()["files"] == 0
+    assert prusalink_api.fetch_cancel_gcode("ip", "k", "missing.bgcode", 0.5) is None
+
+
+def test_compute_cancel_usage_scopes_the_job(printer, monkeypatch):
+    _files, calls = printer
+    monkeypatch.setattr(print_deduct, "_log_cancel_uncomputable", lambda *a: None)
+    for _ in range(3):
+        usage, terminal = print_deduct._compute_cancel_usage(
+            "Core One", "big.bgcode", "77", 0.5, "ip", "k")
+        assert terminal is None and usage
+    assert calls["downloads"] == ["big.bgcode"]
+    assert getattr(prusalink_api._file_job, "job_id", None) is None
+
+
+def test_cached_mappings_are_closed_after_each_fetch(printer, monkeypatch):
+    files, _calls = printer
+    files["plain.gcode"] = b"M83\nG1 X1 E5\n" + _META
+    maps = []
+    real_read = print_file_cache.read_raw
+
+    def read_raw(sha):
+        maps.append(real_read(sha))
+        return maps[-1]
+
+    monkeypatch.setattr(print_file_cache, "read_raw", read_raw)
+    for name in ("plain.gcode", "big.bgcode"):
+        prusalink_api.begin_file_job(name)
+        assert prusalink_api.fetch_cancel_gcode("ip", "k", name, 1.0)
+        assert prusalink_api.compute_segment_usage("ip", "k", name, [0.5])
+        assert prusalink_api.download_gcode_content("ip", "k", name)
+    # Each file's first fetch downloads; the other two map the cached copy.
+    assert len(maps) == 4 and all(m.closed for m in maps)
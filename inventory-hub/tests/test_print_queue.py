@@ -17,7 +17,7 @@ def client():
 
 def test_get_pending_queue(client):
     """Test fetching the print queue backlog and filtering"""
-    with patch('requests.get') as mock_get, patch('config_loader.get_api_urls', return_value=('http://mock', 'http://mock')):
+    with patch('spoolman_http.get') as mock_get, patch('config_loader.get_api_urls', return_value=('http://mock', 'http://mock')):
         mock_resp = MagicMock()
         mock_resp.ok = True
         mock_resp.json.return_value = [{"id": 1, "registered": "2023-01-01"}]
@@ -381,7 +381,7 @@ def _patch_legacy_lookup_responses(mock_get, *, fil_legacy_id, fil_id, spools):
 def test_find_spools_by_legacy_id_returns_all_candidates():
     """The new helper returns every matching spool (sorted: non-empty first)."""
     import logic  # noqa: E402 — import lazily so the patch above takes effect
-    with patch('requests.get') as mock_get, \
+    with patch('spoolman_http.get') as mock_get, \
          patch('config_loader.get_api_urls', return_value=('http://mock', 'http://mock')):
         _patch_legacy_lookup_responses(
             mock_get, fil_legacy_id='39', fil_id=37,
@@ -402,7 +402,7 @@ def test_find_spool_by_legacy_id_back_compat_picks_first():
     """The old `find_spool_by_legacy_id` is a thin wrapper that now picks the
     first candidate (non-empty preference is preserved by the underlying
     sort). Existing callers must keep working."""
-    with patch('requests.get') as mock_get, \
+    with patch('spoolman_http.get') as mock_get, \
          patch('config_loader.get_api_urls', return_value=('http://mock', 'http://mock')):
         _patch_legacy_lookup_responses(
             mock_get, fil_legacy_id='39', fil_id=37,
@@ -413,7 +413,7 @@ def test_find_spool_by_legacy_id_back_compat_picks_first():
 
 def test_find_spools_by_legacy_id_no_match():
     """No filament with the legacy id → empty list."""
-    with patch('requests.get') as mock_get, \
+    with patch('spoolman_http.get') as mock_get, \
          patch('config_loader.get_api_urls', return_value=('http://mock', 'http://mock')):
         fil_resp = MagicMock()
         fil_resp.ok = True
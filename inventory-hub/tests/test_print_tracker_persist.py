@@ -0,0 +1,108 @@
+"""print_tracker_store.save — dirty-checked, coalesced latch persistence.
+
+The monitor hands over the whole latch every tick (and after a woken probe),
+but it rarely changes between edges. save() commits only the printers whose
+entry differs, skips an unchanged snapshot outright, and folds saves that
+arrive while another thread is writing into that writer's commit — without
+ever leaving the newest snapshot unwritten.
+"""
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import hub_store  # noqa: E402
+import print_tracker_store  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _no_legacy_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(print_tracker_store, "_STORE_PATH", str(tmp_path / "latch.json"))
+
+
+def _stats():
+    return print_tracker_store.get_stats()
+
+
+def _updated_at():
+    return dict(hub_store.query("SELECT printer, updated_at FROM print_latch"))
+
+
+def test_unchanged_snapshot_is_not_rewritten():
+    snap = {"XL": {"state": "PRINTING", "job_id": "J1", "progress": 0.1},
+            "MK4": {"state": "IDLE"}}
+    before = _stats()
+    print_tracker_store.save(snap)
+    stamps = _updated_at()
+    print_tracker_store.save({k: dict(v) for k, v in snap.items()})
+    after = _stats()
+    assert after["writes"] - before["writes"] == 1
+    assert after["writes_avoided"] - before["writes_avoided"] == 1
+    assert _updated_at() == stamps
+
+
+def test_only_changed_rows_are_written_and_removed_rows_deleted():
+    print_tracker_store.save({"XL": {"state": "PRINTING", "progress": 0.1},
+                              "MK4": {"state": "IDLE"}, "CORE1": {"state": "IDLE"}})
+    before = _stats()
+    print_tracker_store.save({"XL": {"state": "PRINTING", "progress": 0.2},
+                              "MK4": {"state": "IDLE"}})
+    after = _stats()
+    assert after["rows_written"] - before["rows_written"] == 1
+    assert after["rows_deleted"] - before["rows_deleted"] == 1
+    assert print_tracker_store.load() == {"XL": {"state": "PRINTING", "progress": 0.2},
+                                          "MK4": {"state": "IDLE"}}
+
+
+def test_dirty_check_starts_from_the_table_after_a_restart():
+    print_tracker_store.save({"XL": {"state": "PRINTING", "job_id": "J1"}})
+    # A restart: the process forgets what it wrote, the database doesn't.
+    print_tracker_store._PERSISTED = None
+    before = _stats()
+    print_tracker_store.save({"XL": {"state": "PRINTING", "job_id": "J1"}})
+    assert _stats()["writes_avoided"] - before["writes_avoided"] == 1
+
+
+def test_failed_write_is_retried_on_the_next_save(monkeypatch):
+    real = hub_store.transaction
+    monkeypatch.setattr(hub_store, "transaction", lambda: (_ for _ in ()).throw(OSError("disk")))
+    print_tracker_store.save({"XL": {"state": "PRINTING"}})
+    assert _stats()["failures"] >= 1
+    monkeypatch.setattr(hub_store, "transaction", real)
+    print_tracker_store.save({"XL": {"state": "PRINTING"}})
+    assert print_tracker_store.load() == {"XL": {"state": "PRINTING"}}
+
+
+def test_concurrent_saves_coalesce_and_the_newest_version_lands(monkeypatch):
+    """A burst arriving mid-write stages behind the writer, which commits the
+    newest snapshot before returning; an older version that loses the race
+    to save() is dropped rather than overwriting a newer one."""
+    real_commit = print_tracker_store._commit
+    entered, release = threading.Event(), threading.Event()
+
+    def slow_commit(rows):
+        if not entered.is_set():
+            entered.set()
+            release.wait(5)
+        real_commit(rows)
+
+    monkeypatch.setattr(print_tracker_store, "_commit", slow_commit)
+    before = _stats()
+    writer = threading.Thread(target=print_tracker_store.save,
+                              args=({"XL": {"progress": 0.1}},), kwargs={"version": 1})
+    writer.start()
+    assert entered.wait(5)
+    for v in (2, 3, 4):
+        print_tracker_store.save({"XL": {"progress": v / 10}}, version=v)
+    print_tracker_store.save({"XL": {"progress": 0.15}}, version=2)   # late arrival
+    release.set()
+    writer.join(5)
+
+    after = _stats()
+    assert print_tracker_store.load() == {"XL": {"progress": 0.4}}
+    assert after["writes"] - before["writes"] == 2          # version 1, then 4
+    assert after["coalesced"] - before["coalesced"] == 2    # 2 and 3 folded into 4
+    assert after["stale_dropped"] - before["stale_dropped"] == 1
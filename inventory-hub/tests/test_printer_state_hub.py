@@ -0,0 +1,137 @@
+"""Shared printer-state hub (printer_state_hub via prusalink_api.get_printer_state).
+
+The cancel monitor's sweep probes every printer live and publishes the result;
+dashboard pulses, /api/printer_state and the move guard read it back while it
+is fresh, and only a stale printer is probed — once, however many readers ask
+at the same moment. The autouse conftest fixture empties the hub per test.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import config_loader  # noqa: E402
+import printer_state_hub  # noqa: E402
+import prusalink_api  # noqa: E402
+
+
+@pytest.fixture
+def probes(monkeypatch):
+    """Fake PrusaLink probe: records each printer probed, answers PRINTING."""
+    calls = []
+
+    def probe(fb, name):
+        calls.append(name)
+        return {"state": "PRINTING", "is_active": True}
+
+    monkeypatch.setattr(prusalink_api, "_probe_printer_state", probe)
+    monkeypatch.setattr(config_loader, "load_config", lambda: {"printer_state_max_age": 5})
+    return calls
+
+
+def test_readers_share_one_probe_per_freshness_window(probes):
+    for _ in range(5):
+        assert prusalink_api.get_printer_state("http://fb", "CORE1") == \
+            {"state": "PRINTING", "is_active": True}
+    prusalink_api.get_printer_state("http://fb", "XL")
+    assert probes == ["CORE1", "XL"]
+    stats = printer_state_hub.get_stats()
+    assert stats["printers"]["CORE1"]["state"] == "PRINTING"
+    assert stats["max_age_s"] == 5.0
+
+
+def test_monitor_sweep_always_probes_and_feeds_readers(probes):
+    # The monitor reads with max_age=0: live every time ...
+    prusalink_api.get_printer_state("http://fb", "CORE1", max_age=0)
+    prusalink_api.get_printer_state("http://fb", "CORE1", max_age=0)
+    assert probes == ["CORE1", "CORE1"]
+    # ... and a dashboard right after it is served that probe.
+    prusalink_api.get_printer_state("http://fb", "CORE1")
+    assert probes == ["CORE1", "CORE1"]
+
+
+def test_stale_entry_is_reprobed(probes):
+    prusalink_api.get_printer_state("http://fb", "CORE1")
+    key = ("http://fb", "CORE1")
+    printer_state_hub._ENTRIES[key]["at"] -= 6
+    prusalink_api.get_printer_state("http://fb", "CORE1")
+    assert probes == ["CORE1", "CORE1"]
+
+
+def test_offline_is_shared_and_copies_are_private(monkeypatch, probes):
+    calls = []
+    monkeypatch.setattr(prusalink_api, "_probe_printer_state",
+                        lambda fb, name: calls.append(name))
+    assert prusalink_api.get_printer_state("http://fb", "OFF") is None
+    assert prusalink_api.get_printer_state("http://fb", "OFF") is None
+    assert calls == ["OFF"]
+    printer_state_hub.publish(("http://fb", "CORE1"), {"state": "IDLE", "is_active": False})
+    got = prusalink_api.get_printer_state("http://fb", "CORE1")
+    got["state"] = "MUTATED"
+    assert prusalink_api.get_printer_state("http://fb", "CORE1")["state"] == "IDLE"
+
+
+def test_zero_max_age_config_disables_reuse(monkeypatch, probes):
+    monkeypatch.setattr(config_loader, "load_config", lambda: {"printer_state_max_age": 0})
+    prusalink_api.get_printer_state("http://fb", "CORE1")
+    prusalink_api.get_printer_state("http://fb", "CORE1")
+    assert probes == ["CORE1", "CORE1"]
+
+
+def test_probe_failure_publishes_nothing(monkeypatch, probes):
+    def boom(fb, name):
+        raise RuntimeError("boom")
+    monkeypatch.setattr(prusalink_api, "_probe_printer_state", boom)
+    with pytest.raises(RuntimeError):
+        prusalink_api.get_printer_state("http://fb", "CORE1")
+    assert printer_state_hub.get_stats()["printers"] == {}
+
+
+def test_concurrent_stale_readers_single_flight(monkeypatch):
+    monkeypatch.setattr(config_loader, "load_config", lambda: {"printer_state_max_age": 5})
+    calls = []
+    gate = threading.Event()
+
+    def slow_probe(fb, name):
+        calls.append(name)
+        gate.wait(2)
+        return {"state": "IDLE", "is_active": False}
+
+    monkeypatch.setattr(prusalink_api, "_probe_printer_state", slow_probe)
+    before = printer_state_hub.get_stats()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(
+        prusalink_api.get_printer_state("http://fb", "CORE1"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    gate.set()
+    for t in threads:
+        t.join(5)
+    assert calls == ["CORE1"]
+    assert results == [{"state": "IDLE", "is_active": False}] * 8
+    after = printer_state_hub.get_stats()
+    assert after["probes"] - before["probes"] == 1
+    assert (after["joined"] - before["joined"]) + (after["hits"] - before["hits"]) == 7
+
+
+def test_cancel_monitor_tick_publishes_for_the_pulse(monkeypatch, probes):
+    import print_monitor
+    import locations_db
+    monkeypatch.setattr(locations_db, "get_active_printer_map",
+                        lambda: {"CORE1-M0": {"printer_name": "CORE1", "position": 0}})
+    monkeypatch.setattr(config_loader, "get_api_urls", lambda: ("http://sm", "http://fb"))
+    monkeypatch.setattr(print_monitor, "_track_print_edge", lambda *a: None)
+    monkeypatch.setattr(print_monitor, "_process_pending_cancel_fetches", lambda *a: None)
+    monkeypatch.setattr(print_monitor.print_tracker_store, "save", lambda snap, **kw: None)
+    print_monitor._cancel_monitor_tick()
+    assert probes == ["CORE1"]
+    # A dashboard pulse / move guard right after the sweep costs no probe.
+    assert prusalink_api.get_printer_state("http://fb", "CORE1")["is_active"] is True
+    assert probes == ["CORE1"]
@@ -82,7 +82,8 @@ def test_bucket_equivalent_to_per_location_calls():
     ]
     loc_ids = ['CORE1-M0', 'XL-1', 'XL-2', 'XL-4']
     with patch.object(spoolman_api, 'format_spool_display', side_effect=_fake_display), \
-         patch.object(spoolman_api, 'get_all_spools', return_value=spools):
+         patch.object(spoolman_api, 'get_spool_index',
+                      return_value=spoolman_api.build_spool_index(spools)):
         bucket = spoolman_api.bucket_spools_by_location(loc_ids)
         for lid in loc_ids:
             per = spoolman_api.get_spools_at_location_detailed(lid)
@@ -106,7 +107,7 @@ def test_bucket_dedupes_and_uppercases_targets():
 # _pulse_section_printer_status — the ungate
 # --------------------------------------------------------------------------
 
-def _patch_pulse(printer_map, bindings_toolheads, spools, get_all=None):
+def _patch_pulse(printer_map, bindings_toolheads, spools, get_index=None):
     return [
         patch.object(app.config_loader, 'load_config', return_value={'printer_map': printer_map}),
         # L271 Phase 4 (step 2): the pulse aggregator reads printer_map via
@@ -116,7 +117,9 @@ def _patch_pulse(printer_map, bindings_toolheads, spools, get_all=None):
         patch.object(app.prusalink_api, 'get_printer_state', return_value=None),
         patch.object(app.locations_db, 'get_bindings_for_machine',
                      return_value={'printer_name': 'x', 'toolheads': bindings_toolheads, 'printer_pool': []}),
-        patch.object(app.spoolman_api, 'get_all_spools', get_all or (lambda *a, **k: spools)),
+        # Occupancy reads the shared spool index (one spool-list snapshot).
+        patch.object(app.spoolman_api, 'get_spool_index',
+                     get_index or (lambda: spoolman_api.build_spool_index(spools))),
         patch.object(app.spoolman_api, 'format_spool_display', side_effect=_fake_display),
     ]
 
@@ -188,8 +191,8 @@ def test_single_spoolman_fetch_regardless_of_toolhead_count():
     printer_map = {f'CORE1-M{i}': {'printer_name': 'Core One', 'position': i} for i in range(6)}
     printer_map.update({f'XL-{i}': {'printer_name': 'XL', 'position': i} for i in range(1, 6)})
     spools = [{'id': 1, 'location': 'CORE1-M0', 'extra': {}, 'remaining_weight': 100, 'archived': False}]
-    get_all = MagicMock(return_value=spools)
-    ps = _run_pulse(_patch_pulse(printer_map, bindings_toolheads={}, spools=spools, get_all=get_all))
-    assert get_all.call_count == 1, f"expected ONE spool-list fetch, got {get_all.call_count}"
+    get_index = MagicMock(return_value=spoolman_api.build_spool_index(spools))
+    ps = _run_pulse(_patch_pulse(printer_map, bindings_toolheads={}, spools=spools, get_index=get_index))
+    assert get_index.call_count == 1, f"expected ONE spool-list fetch, got {get_index.call_count}"
     total_ths = sum(len(p['toolheads']) for p in ps.values())
     assert total_ths == 11  # 6 Core One + 5 XL all rendered
@@ -0,0 +1,113 @@
+"""Fleet probe engine (prusalink_poller) behind the cancel monitor's sweep.
+
+One shared pool bounded well above the old 8 workers, per-printer offline
+backoff (one blip is retried next sweep; after that 10 s, 20 s ... capped),
+and sweep-latency counters for /api/metrics. The autouse conftest fixture
+clears the backoff state per test.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import config_loader  # noqa: E402
+import print_monitor  # noqa: E402
+import prusalink_api  # noqa: E402
+import prusalink_poller  # noqa: E402
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A hand-driven time.monotonic for the backoff windows."""
+    now = [1000.0]
+    monkeypatch.setattr(prusalink_poller.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_offline_printer_backs_off_exponentially(clock):
+    calls = []
+
+    def probe(name):
+        calls.append(name)
+        return None if name == "OFF" else {"state": "IDLE"}
+
+    names = ["OFF", "XL"]
+    prusalink_poller.sweep(names, probe)   # 1st miss: a blip, retried next sweep
+    prusalink_poller.sweep(names, probe)   # 2nd miss: backed off 10 s
+    assert calls == ["OFF", "XL", "OFF", "XL"]
+    del calls[:]
+    out = prusalink_poller.sweep(names, probe)
+    assert calls == ["XL"] and out == {"OFF": None, "XL": {"state": "IDLE"}}
+    clock[0] += 10
+    prusalink_poller.sweep(names, probe)   # due again → 3rd miss: 20 s
+    assert calls == ["XL", "OFF", "XL"]
+    assert prusalink_poller.get_stats()["offline"]["OFF"] == {"failures": 3, "retry_in_s": 20.0}
+    for _ in range(10):
+        clock[0] += 1000
+        prusalink_poller.sweep(["OFF"], probe)
+    assert prusalink_poller.get_stats()["offline"]["OFF"]["retry_in_s"] == 120.0
+
+
+def test_any_answer_clears_the_backoff(clock):
+    answers = {"OFF": None}
+    for _ in range(2):
+        prusalink_poller.sweep(["OFF"], answers.get)
+    assert prusalink_poller.in_backoff("OFF")
+    clock[0] += 10
+    answers["OFF"] = {"state": "PRINTING"}
+    prusalink_poller.sweep(["OFF"], answers.get)
+    assert not prusalink_poller.in_backoff("OFF")
+    assert prusalink_poller.get_stats()["offline"] == {}
+
+
+def test_sweep_runs_a_large_fleet_in_one_wave(monkeypatch):
+    monkeypatch.setattr(config_loader, "load_config", lambda: {"prusalink_poll_concurrency": 48})
+    lock = threading.Lock()
+    live = [0, 0]   # in flight, peak
+
+    def probe(name):
+        with lock:
+            live[0] += 1
+            live[1] = max(live[1], live[0])
+        time.sleep(0.05)
+        with lock:
+            live[0] -= 1
+        return {"state": "IDLE"}
+
+    names = [f"P{i}" for i in range(40)]
+    before = prusalink_poller.get_stats()
+    out = prusalink_poller.sweep(names, probe)
+    assert set(out) == set(names)
+    assert live[1] > 8, live[1]
+    after = prusalink_poller.get_stats()
+    assert after["sweeps"] - before["sweeps"] == 1
+    assert after["probes"] - before["probes"] == 40
+    assert 0.04 <= after["last_sweep_s"] < 1.0
+    assert after["concurrency"] == 48
+
+
+def test_cancel_monitor_tick_skips_a_backed_off_printer(monkeypatch):
+    probed, edges = [], []
+    monkeypatch.setattr(config_loader, "get_api_urls", lambda: ("http://sm", "http://fb"))
+    monkeypatch.setattr(print_monitor.locations_db, "get_active_printer_map",
+                        lambda: {"OFF-1": {"printer_name": "OFF"}, "XL-1": {"printer_name": "XL"}})
+    monkeypatch.setattr(prusalink_api, "get_printer_state",
+                        lambda fb, name, max_age=None: (probed.append(name)
+                                                        or (None if name == "OFF" else {"state": "PRINTING"})))
+    monkeypatch.setattr(print_monitor, "_track_print_edge",
+                        lambda name, st, fb: edges.append((name, st)))
+    monkeypatch.setattr(print_monitor, "_process_pending_cancel_fetches", lambda *a: None)
+    monkeypatch.setattr(print_monitor.print_tracker_store, "save", lambda snap, **kw: None)
+    for _ in range(3):
+        assert print_monitor._cancel_monitor_tick() is True
+    # OFF is probed twice (miss + blip retry), then skipped; XL every tick.
+    assert probed.count("OFF") == 2 and probed.count("XL") == 3
+    # A skipped printer never reaches the edge detector — the same no-op it
+    # makes of an offline (None) probe — and the live one keeps its ticks.
+    assert edges.count(("OFF", None)) == 2 and edges.count(("XL", {"state": "PRINTING"})) == 3
@@ -56,9 +56,10 @@ def test_no_cache_calls_through_each_time(monkeypatch):
     calls = []
     monkeypatch.setattr(prusalink_api, "_probe_printer_state",
                         lambda fb, name: (calls.append(name) or None))
-    # no begin_probe_cache() → unrelated callers are unaffected by fix A
-    prusalink_api.get_printer_state("http://fb", "CORE1")
-    prusalink_api.get_printer_state("http://fb", "CORE1")
+    # no begin_probe_cache() → unrelated callers are unaffected by fix A. With
+    # printer_state_hub reuse off (max_age=0) every read is a live probe.
+    prusalink_api.get_printer_state("http://fb", "CORE1", max_age=0)
+    prusalink_api.get_printer_state("http://fb", "CORE1", max_age=0)
     assert calls == ["CORE1", "CORE1"]
 
 
@@ -51,8 +51,8 @@ def test_restore_field_order_skips_fields_already_in_position():
 
     with patch("app.config_loader.get_api_urls",
                return_value=("http://spoolman", "http://fb")), \
-         patch("app.requests.get", side_effect=fake_get), \
-         patch("app.requests.post") as mock_post:
+         patch("spoolman_http.get", side_effect=fake_get), \
+         patch("spoolman_http.post") as mock_post:
         client = _make_app()
         res = client.post('/api/spoolman/restore_field_order')
 
@@ -92,8 +92,8 @@ def test_restore_field_order_writes_canonical_index_when_drift_present():
 
     with patch("app.config_loader.get_api_urls",
                return_value=("http://spoolman", "http://fb")), \
-         patch("app.requests.get", side_effect=fake_get), \
-         patch("app.requests.post", side_effect=fake_post):
+         patch("spoolman_http.get", side_effect=fake_get), \
+         patch("spoolman_http.post", side_effect=fake_post):
         client = _make_app()
         res = client.post('/api/spoolman/restore_field_order')
 
@@ -131,8 +131,8 @@ def test_restore_field_order_skips_unknown_keys():
 
     with patch("app.config_loader.get_api_urls",
                return_value=("http://spoolman", "http://fb")), \
-         patch("app.requests.get", side_effect=fake_get), \
-         patch("app.requests.post") as mock_post:
+         patch("spoolman_http.get", side_effect=fake_get), \
+         patch("spoolman_http.post") as mock_post:
         client = _make_app()
         res = client.post('/api/spoolman/restore_field_order')
 
@@ -168,8 +168,8 @@ def test_restore_field_order_surfaces_spoolman_errors():
 
     with patch("app.config_loader.get_api_urls",
                return_value=("http://spoolman", "http://fb")), \
-         patch("app.requests.get", side_effect=fake_get), \
-         patch("app.requests.post", side_effect=fake_post):
+         patch("spoolman_http.get", side_effect=fake_get), \
+         patch("spoolman_http.post", side_effect=fake_post):
         client = _make_app()
         res = client.post('/api/spoolman/restore_field_order')
 
@@ -207,8 +207,8 @@ def test_restore_field_order_dry_run_does_not_post(monkeypatch):
 
     with patch("app.config_loader.get_api_urls",
                return_value=("http://spoolman", "http://fb")), \
-         patch("app.requests.get", side_effect=fake_get), \
-         patch("app.requests.post") as mock_post:
+         patch("spoolman_http.get", side_effect=fake_get), \
+         patch("spoolman_http.post") as mock_post:
         client = _make_app()
         res = client.post('/api/spoolman/restore_field_order?dry_run=true')
 
@@ -255,8 +255,8 @@ def test_restore_field_order_apply_after_dry_run_writes_same_set(monkeypatch):
 
     with patch("app.config_loader.get_api_urls",
                return_value=("http://spoolman", "http://fb")), \
-         patch("app.requests.get", side_effect=fake_get), \
-         patch("app.requests.post", side_effect=fake_post):
+         patch("spoolman_http.get", side_effect=fake_get), \
+         patch("spoolman_http.post", side_effect=fake_post):
         client = _make_app()
         # Default (no dry_run param) writes for real.
         res = client.post('/api/spoolman/restore_field_order')
@@ -285,8 +285,8 @@ def test_restore_field_order_dry_run_with_no_drift_reports_zero():
 
     with patch("app.config_loader.get_api_urls",
                return_value=("http://spoolman", "http://fb")), \
-         patch("app.requests.get", side_effect=fake_get), \
-         patch("app.requests.post") as mock_post:
+         patch("spoolman_http.get", side_effect=fake_get), \
+         patch("spoolman_http.post") as mock_post:
         client = _make_app()
         res = client.post('/api/spoolman/restore_field_order?dry_run=1')
 
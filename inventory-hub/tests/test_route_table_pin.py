@@ -37,6 +37,7 @@ EXPECTED_ROUTES = [
     ("/api/dryer_box/<loc_id>/slot_order", "PUT", "api_dryer_box_slot_order_put"),
     ("/api/dryer_boxes/slots", "GET", "api_all_dryer_box_slots"),
     ("/api/edit_spool_wizard", "POST", "api_edit_spool_wizard"),
+    ("/api/events", "GET", "api_events"),
     ("/api/external/fields", "GET", "api_external_fields"),
     ("/api/external/fields/add_choice", "POST", "api_external_fields_add_choice"),
     ("/api/external/search", "GET", "api_external_search"),
@@ -63,6 +64,7 @@ EXPECTED_ROUTES = [
     ("/api/machine/<path:printer_name>/toolhead_slots", "GET", "api_machine_toolhead_slots"),
     ("/api/manage_contents", "POST", "api_manage_contents"),
     ("/api/materials", "GET", "api_materials"),
+    ("/api/metrics", "GET", "api_metrics"),
     ("/api/print_batch_csv", "POST", "api_print_batch_csv"),
     ("/api/print_label", "POST", "api_print_label"),
     ("/api/print_location_label", "POST", "api_print_location_label"),
@@ -66,7 +66,7 @@ def client():
     with flask_app.test_client() as client:
         yield client
 
-@patch('spoolman_api.requests.get')
+@patch('spoolman_api.spoolman_http.get')
 def test_search_spools_basic_query(mock_get):
     """Test tokenized fuzzy matching by text fields."""
     mock_response = MagicMock()
@@ -87,7 +87,7 @@ def test_search_spools_basic_query(mock_get):
     results = spoolman_api.search_inventory(query="PLA")
     assert len(results) == 2
 
-@patch('spoolman_api.requests.get')
+@patch('spoolman_api.spoolman_http.get')
 def test_search_spools_color_hex(mock_get):
     """Test Euclidean distance sorting for colors, including multi-color gradient support."""
     mock_response = MagicMock()
@@ -106,7 +106,7 @@ def test_search_spools_color_hex(mock_get):
     assert len(results) == 3
     assert results[0]['id'] == 1
 
-@patch('spoolman_api.requests.get')
+@patch('spoolman_api.spoolman_http.get')
 def test_search_spools_stock_filters(mock_get):
     """Test only_in_stock and empty parameters for spools."""
     mock_response = MagicMock()
@@ -122,7 +122,7 @@ def test_search_spools_stock_filters(mock_get):
     assert len(results) == 1
     assert results[0]['id'] == 2
 
-@patch('spoolman_api.requests.get')
+@patch('spoolman_api.spoolman_http.get')
 def test_search_filament_target_type(mock_get):
     """Test searching raw filaments instead of spools."""
     mock_response = MagicMock()
@@ -165,7 +165,7 @@ def test_api_endpoint(client):
         )
 
 
-@patch('spoolman_api.requests.get')
+@patch('spoolman_api.spoolman_http.get')
 def test_search_filaments_sort_by_spool_count(mock_get):
     """L21 — filament results can be sorted by spool count (most or
     fewest available). The endpoint already populates `spools_count`
@@ -207,7 +207,7 @@ def test_search_filaments_sort_by_spool_count(mock_get):
     assert [r['id'] for r in asc] == [1, 3, 2]
 
 
-@patch('spoolman_api.requests.get')
+@patch('spoolman_api.spoolman_http.get')
 def test_search_unknown_sort_falls_through(mock_get):
     """Garbage sort tokens are ignored — results fall back to default
     ordering (id desc) so the endpoint never errors on bad input."""
@@ -62,6 +62,7 @@ def isolated_locations():
         store["rows"] = copy.deepcopy(rows)
 
     with patch.object(locations_db, "load_locations_list", side_effect=_load), \
+         patch.object(locations_db, "get_locations_view", side_effect=_load), \
          patch.object(locations_db, "save_locations_list", side_effect=_save):
         yield store
 
@@ -11,7 +11,7 @@ What survives — and what these tests now guard:
   - A move writes the spool's Spoolman `location` to the destination.
   - A bound-slot move still does the two-step auto-deploy (dryer placement →
     toolhead deploy) and reports `auto_deployed_to`.
-  - A move makes ZERO FilaBridge writes (no `requests.post`) — the regression
+  - A move makes ZERO FilaBridge writes (no `spoolman_http.post`) — the regression
     guard that `_fb_write` and its ~12 call sites stay removed.
   - The move result no longer carries `filabridge_ok`/`filabridge_detail`/
     `filabridge_outcomes`.
@@ -30,8 +30,8 @@ def _move_ctx(printer_map, loc_list, get_spool, update_spool,
               spools_at_location=None):
     """Build the standard mock context for a perform_smart_move call.
 
-    `requests.post` is mocked so we can assert it is NEVER called (FilaBridge is
-    gone); `requests.get` returns a 404 so the active-print preflight fails open
+    `spoolman_http.post` is mocked so we can assert it is NEVER called (FilaBridge is
+    gone); `spoolman_http.get` returns a 404 so the active-print preflight fails open
     (no printer reachable → no active-print block)."""
     return [
         patch.object(logic.config_loader, "load_config",
@@ -49,8 +49,8 @@ def _move_ctx(printer_map, loc_list, get_spool, update_spool,
         patch.object(logic.spoolman_api, "format_spool_display",
                      return_value={"text": "#240", "color": "ff0000"}),
         patch.object(logic.spoolman_api, "update_spool", **update_spool),
-        patch.object(logic.requests, "post", return_value=MagicMock(ok=True)),
-        patch.object(logic.requests, "get", return_value=MagicMock(ok=False, status_code=404)),
+        patch.object(logic.spoolman_http, "post", return_value=MagicMock(ok=True)),
+        patch.object(logic.spoolman_http, "get", return_value=MagicMock(ok=False, status_code=404)),
     ]
 
 
@@ -76,7 +76,7 @@ def test_move_to_toolhead_writes_spoolman_location():
         m.start()
     try:
         result = logic.perform_smart_move("XL-3", [240], target_slot=None, origin="test")
-        post = logic.requests.post
+        post = logic.spoolman_http.post
     finally:
         for m in reversed(ctx):
             m.stop()
@@ -128,7 +128,7 @@ def test_bound_slot_move_two_step_autodeploy():
         m.start()
     try:
         result = logic.perform_smart_move("LR-MDB-1", [240], target_slot="3", origin="test")
-        post = logic.requests.post
+        post = logic.spoolman_http.post
     finally:
         for m in reversed(ctx):
             m.stop()
@@ -164,7 +164,7 @@ def test_move_to_same_toolhead_rescan_succeeds():
         m.start()
     try:
         result = logic.perform_smart_move("XL-3", [240], target_slot=None, origin="test")
-        post = logic.requests.post
+        post = logic.spoolman_http.post
     finally:
         for m in reversed(ctx):
             m.stop()
@@ -199,7 +199,7 @@ def test_dryer_move_writes_spoolman_and_clears_ghost_trail():
         m.start()
     try:
         result = logic.perform_smart_move("PM-DB-1", [240], target_slot=None, origin="test")
-        post = logic.requests.post
+        post = logic.spoolman_http.post
     finally:
         for m in reversed(ctx):
             m.stop()
@@ -236,14 +236,14 @@ def test_eject_writes_spoolman_no_filabridge_post():
         patch.object(logic.spoolman_api, "format_spool_display",
                      return_value={"text": "#240", "color": "ff0000"}),
         patch.object(logic.spoolman_api, "update_spool", side_effect=fake_update),
-        patch.object(logic.requests, "post", return_value=MagicMock(ok=True)),
-        patch.object(logic.requests, "get", return_value=MagicMock(ok=False, status_code=404)),
+        patch.object(logic.spoolman_http, "post", return_value=MagicMock(ok=True)),
+        patch.object(logic.spoolman_http, "get", return_value=MagicMock(ok=False, status_code=404)),
     ]
     for m in ctx:
         m.start()
     try:
         logic.perform_smart_eject(240, confirmed_unassign=True)
-        post = logic.requests.post
+        post = logic.spoolman_http.post
     finally:
         for m in reversed(ctx):
             m.stop()
@@ -0,0 +1,156 @@
+"""Secondary spool indexes (spoolman_api.build_spool_index / get_spool_index).
+
+The location / legacy-id / filament lookups now hit dict buckets instead of
+scanning every spool. These tests pin that the indexed answers match the
+linear predicates they replaced: a randomized spool population is checked
+against a brute-force `_build_location_match` scan. They also pin that the
+index is built once per snapshot and rebuilt after a write-through.
+"""
+import os
+import random
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import spoolman_api  # noqa: E402
+import spoolman_cache  # noqa: E402
+
+
+def _fake_display(s):
+    return {'text': f"#{s['id']}", 'color': 'ff0000', 'slot': '',
+            'color_direction': 'longitudinal', 'details': {}}
+
+
+_LOCS = ['', 'LR', 'LR-MDB-1', 'lr-mdb-2', 'CORE1', 'CORE1-M0', 'CORE1-M1',
+         'XL-1', 'XL-2', 'CR', 'CR-CT-1', 'CR-CT-1-R1', 'UNASSIGNED', ' XL-3 ']
+
+
+def _population(n=300, seed=7):
+    rnd = random.Random(seed)
+    spools = []
+    for sid in range(1, n + 1):
+        extra = {}
+        if rnd.random() < 0.3:
+            extra['physical_source'] = rnd.choice(_LOCS[1:])
+            extra['physical_source_slot'] = str(rnd.randint(1, 4))
+        spools.append({
+            'id': sid, 'location': rnd.choice(_LOCS), 'extra': extra,
+            'archived': rnd.random() < 0.15, 'remaining_weight': rnd.choice([0, 5, 400]),
+            'filament': {'id': rnd.randint(1, 12)},
+        })
+    return spools
+
+
+def _brute_detailed(spools, loc):
+    target = str(loc).upper()
+    unassigned = target == 'UNASSIGNED'
+    out = []
+    for s in spools:
+        if s.get('archived'):
+            continue
+        item = spoolman_api._build_location_match(s, target, unassigned)
+        if item is not None:
+            out.append(item)
+    return out
+
+
+@pytest.fixture
+def indexed(monkeypatch):
+    spools = _population()
+    monkeypatch.setattr(spoolman_api, 'format_spool_display', _fake_display)
+    monkeypatch.setattr(spoolman_api, 'get_spool_index',
+                        lambda: spoolman_api.build_spool_index(spools))
+    return spools
+
+
+@pytest.mark.parametrize('loc', sorted(set(_LOCS) | {'XL', 'lr', 'NOPE', 'XL-3'}))
+def test_detailed_lookup_matches_linear_scan(indexed, loc):
+    assert spoolman_api.get_spools_at_location_detailed(loc) == _brute_detailed(indexed, loc)
+
+
+def test_bucket_matches_linear_scan_for_every_target(indexed):
+    targets = [l for l in _LOCS if l.strip()] + ['XL', 'NOPE']
+    buckets = spoolman_api.bucket_spools_by_location(targets)
+    for t in targets:
+        key = t.strip().upper()
+        assert buckets[key] == _brute_detailed(indexed, key), t
+
+
+def test_strict_lookup_matches_linear_predicate(indexed):
+    for loc in ['LR', 'CORE1', 'CORE1-M0', 'XL-1', 'CR-CT-1', 'UNASSIGNED', 'XL-3']:
+        target = loc.upper()
+        expected = []
+        for s in indexed:
+            if s['archived']:
+                continue
+            sloc = (s.get('location') or '').strip().upper()
+            p_source = spoolman_api._spool_physical_source(s)
+            parent = spoolman_api.locations_db.derive_parent_id_from_prefix
+            if target in (sloc, p_source, parent(sloc), parent(p_source)):
+                expected.append(s['id'])
+        assert spoolman_api.get_spools_at_location_strict(loc) == expected, loc
+
+
+def test_filament_lookup_returns_copies(indexed):
+    got = spoolman_api.get_spools_for_filament(3)
+    assert [s['id'] for s in got] == [s['id'] for s in indexed
+                                      if s['filament']['id'] == 3 and not s['archived']]
+    got[0]['location'] = 'MUTATED'
+    assert spoolman_api.get_spools_for_filament(3)[0]['location'] != 'MUTATED'
+
+
+def _serve(spools, filaments):
+    def fake_get(url, **kwargs):
+        r = MagicMock()
+        r.ok = True
+        r.json.return_value = [dict(x) for x in (filaments if '/filament' in url else spools)]
+        return r
+    return fake_get
+
+
+def test_legacy_lookup_uses_first_live_filament(monkeypatch):
+    monkeypatch.setattr(spoolman_api.config_loader, 'get_api_urls', lambda: ('http://sm', ''))
+    filaments = [
+        {'id': 5, 'external_id': '"42"', 'archived': True},   # archived: skipped
+        {'id': 6, 'external_id': '"42"'},                      # first live match wins
+        {'id': 7, 'external_id': '"42"'},
+    ]
+    spools = [
+        {'id': 1, 'filament': {'id': 7}, 'remaining_weight': 900},
+        {'id': 2, 'filament': {'id': 6}, 'remaining_weight': 3},
+        {'id': 3, 'filament': {'id': 6}, 'remaining_weight': 500},
+        {'id': 4, 'filament': {'id': 6}, 'remaining_weight': 500, 'archived': True},
+    ]
+    monkeypatch.setattr(spoolman_api.spoolman_http, 'get', _serve(spools, filaments))
+    assert spoolman_api.find_filament_by_legacy_id('42') == 6
+    assert [s['id'] for s in spoolman_api.find_spools_by_legacy_id(' 42 ')] == [3, 2]
+    assert spoolman_api.find_spools_by_legacy_id('nope') == []
+
+
+def test_index_built_once_per_snapshot_and_rebuilt_after_write(monkeypatch):
+    monkeypatch.setattr(spoolman_api.config_loader, 'get_api_urls', lambda: ('http://sm', ''))
+    monkeypatch.setattr(spoolman_cache.config_loader, 'load_config',
+                        lambda: {'spoolman_cache_ttl': 30})
+    monkeypatch.setattr(spoolman_api, 'format_spool_display', _fake_display)
+    spools = [{'id': 1, 'location': 'XL-1', 'extra': {}},
+              {'id': 2, 'location': 'XL-2', 'extra': {}}]
+    monkeypatch.setattr(spoolman_api.spoolman_http, 'get', _serve(spools, []))
+    before = spoolman_cache.get_stats()['derived_builds']
+
+    first = spoolman_api.get_spool_index()
+    assert spoolman_api.get_spool_index() is first
+    for _ in range(5):
+        spoolman_api.bucket_spools_by_location(['XL-1', 'XL-2'])
+    assert spoolman_cache.get_stats()['derived_builds'] - before == 1
+
+    moved = {'id': 2, 'location': 'XL-1', 'extra': {}}
+    with patch.object(spoolman_api, 'get_spool', return_value=spools[1]), \
+         patch.object(spoolman_api.spoolman_http, 'patch',
+                      return_value=MagicMock(ok=True, json=MagicMock(return_value=moved))):
+        spoolman_api.update_spool(2, {'location': 'XL-1'})
+    assert spoolman_api.get_spool_index() is not first
+    assert spoolman_api.get_spools_at_location('XL-1') == [1, 2]
+    assert spoolman_api.get_spools_at_location('XL-2') == []
@@ -45,7 +45,7 @@ class TestUpdateSpoolErrorSymmetry:
     def test_http_400_populates_error_with_status_and_body(self):
         with patch.object(spoolman_api, "get_spool", return_value={"id": 1}), \
              patch.object(spoolman_api, "_get_raw_extras", return_value={}), \
-             patch.object(spoolman_api.requests, "patch",
+             patch.object(spoolman_api.spoolman_http, "patch",
                           return_value=_mock_response(ok=False, status_code=400, text="Unknown extra field")):
             result = spoolman_api.update_spool(1, {"extra": {"x": "y"}})
         assert result is None
@@ -56,7 +56,7 @@ class TestUpdateSpoolErrorSymmetry:
     def test_transport_exception_populates_error_with_message(self):
         import requests as _r
         with patch.object(spoolman_api, "get_spool", return_value={"id": 1}), \
-             patch.object(spoolman_api.requests, "patch",
+             patch.object(spoolman_api.spoolman_http, "patch",
                           side_effect=_r.RequestException("boom — connection refused")):
             result = spoolman_api.update_spool(1, {"used_weight": 5})
         assert result is None
@@ -66,7 +66,7 @@ class TestUpdateSpoolErrorSymmetry:
     def test_success_clears_error_to_none(self):
         spoolman_api.LAST_SPOOLMAN_ERROR = "stale prior failure"
         with patch.object(spoolman_api, "get_spool", return_value={"id": 1}), \
-             patch.object(spoolman_api.requests, "patch",
+             patch.object(spoolman_api.spoolman_http, "patch",
                           return_value=_mock_response(ok=True, json_body={"id": 1})):
             result = spoolman_api.update_spool(1, {"used_weight": 5})
         assert result == {"id": 1}
@@ -81,7 +81,7 @@ class TestUpdateFilamentErrorSymmetry:
         spoolman_api.LAST_SPOOLMAN_ERROR = None
 
     def test_http_400_populates_error(self):
-        with patch.object(spoolman_api.requests, "patch",
+        with patch.object(spoolman_api.spoolman_http, "patch",
                           return_value=_mock_response(ok=False, status_code=422, text="Some Spoolman complaint")):
             result = spoolman_api.update_filament(99, {"name": "Test"})
         assert result is None
@@ -91,7 +91,7 @@ class TestUpdateFilamentErrorSymmetry:
 
     def test_success_clears_error_to_none(self):
         spoolman_api.LAST_SPOOLMAN_ERROR = "stale prior failure"
-        with patch.object(spoolman_api.requests, "patch",
+        with patch.object(spoolman_api.spoolman_http, "patch",
                           return_value=_mock_response(ok=True, json_body={"id": 99})):
             result = spoolman_api.update_filament(99, {"name": "Test"})
         assert result == {"id": 99}
@@ -0,0 +1,250 @@
+"""Unit tests for spoolman_cache — the shared spool/filament list snapshot —
+and its wiring into spoolman_api's readers and write-through writers.
+
+Spoolman is mocked at the `spoolman_http.get/patch/post/delete` seam; the
+fetch counter on the fake is what proves N readers cost one list download.
+"""
+import os
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import spoolman_api  # noqa: E402
+import spoolman_cache  # noqa: E402
+
+
+def _resp(payload, ok=True, status=200):
+    r = MagicMock()
+    r.ok = ok
+    r.status_code = status
+    r.json.return_value = payload
+    return r
+
+
+def _spools():
+    return [
+        {"id": 1, "location": "LR-MDB-1", "remaining_weight": 500,
+         "filament": {"id": 10, "name": "Galaxy Black", "external_id": "\"77\""},
+         "extra": {}},
+        {"id": 2, "location": "", "remaining_weight": 0, "archived": True,
+         "filament": {"id": 10, "name": "Galaxy Black", "external_id": "\"77\""},
+         "extra": {}},
+        {"id": 3, "location": "CORE1-M0", "remaining_weight": 800,
+         "filament": {"id": 11, "name": "Sky Blue"},
+         "extra": {"physical_source": "\"LR-MDB-1\""}},
+    ]
+
+
+def _filaments():
+    return [{"id": 10, "name": "Galaxy Black", "external_id": "\"77\"", "material": "PLA"},
+            {"id": 11, "name": "Sky Blue", "material": "PETG"}]
+
+
+@pytest.fixture
+def spoolman(monkeypatch):
+    """Fake Spoolman list endpoints; `calls` counts GETs per collection."""
+    monkeypatch.setattr(spoolman_api.config_loader, "get_api_urls",
+                        lambda: ("http://sm", "http://fb"))
+    monkeypatch.setattr(spoolman_cache.config_loader, "load_config",
+                        lambda: {"spoolman_cache_ttl": 30})
+    calls = {"spool": 0, "filament": 0}
+    data = {"spool": _spools(), "filament": _filaments()}
+
+    def fake_get(url, **kwargs):
+        kind = "filament" if "/api/v1/filament" in url else "spool"
+        calls[kind] += 1
+        assert "allow_archived=true" in url
+        return _resp(data[kind])
+
+    monkeypatch.setattr(spoolman_api.spoolman_http, "get", fake_get)
+    return calls, data
+
+
+def test_readers_share_one_fetch_per_collection(spoolman):
+    calls, _ = spoolman
+    before = spoolman_cache.get_stats()
+    spoolman_api.get_all_spools()
+    spoolman_api.get_spools_for_filament(10)
+    spoolman_api.get_spools_at_location("LR-MDB-1")
+    spoolman_api.bucket_spools_by_location(["LR-MDB-1", "CORE1-M0"])
+    spoolman_api.find_spools_by_legacy_id("77")
+    spoolman_api.find_filament_by_legacy_id("77")
+    spoolman_api.search_inventory(query="black")
+    assert calls == {"spool": 1, "filament": 1}
+    stats = spoolman_cache.get_stats()
+    assert stats["fetches"] - before["fetches"] == 2
+    served = lambda st: st["hits"] + st["derived_hits"]  # noqa: E731
+    assert served(stats) - served(before) >= 6
+
+
+def test_archived_view_matches_spoolman_default(spoolman):
+    assert sorted(s["id"] for s in spoolman_api.get_all_spools()) == [1, 2, 3]
+    assert sorted(s["id"] for s in spoolman_api.get_all_spools(allow_archived=False)) == [1, 3]
+    # get_spools_for_filament mirrors the bare (archived-omitted) list it used to GET.
+    assert [s["id"] for s in spoolman_api.get_spools_for_filament(10)] == [1]
+
+
+def test_callers_get_private_copies(spoolman):
+    first = spoolman_api.get_all_spools()
+    first[0]["location"] = "MUTATED"
+    first[0]["extra"]["x"] = 1
+    again = spoolman_api.get_all_spools()
+    assert again[0]["location"] == "LR-MDB-1"
+    assert "x" not in again[0]["extra"]
+
+
+def test_ttl_expiry_refetches(spoolman, monkeypatch):
+    calls, _ = spoolman
+    spoolman_api.get_all_spools()
+    t0 = time.monotonic()
+    monkeypatch.setattr(spoolman_cache.time, "monotonic", lambda: t0 + 31)
+    spoolman_api.get_all_spools()
+    assert calls["spool"] == 2
+
+
+def test_zero_ttl_disables_caching(spoolman, monkeypatch):
+    calls, _ = spoolman
+    monkeypatch.setattr(spoolman_cache.config_loader, "load_config",
+                        lambda: {"spoolman_cache_ttl": 0})
+    spoolman_api.get_all_spools()
+    spoolman_api.get_all_spools()
+    assert calls["spool"] == 2
+
+
+def test_source_change_is_a_miss(spoolman, monkeypatch):
+    calls, _ = spoolman
+    spoolman_api.get_all_spools()
+    monkeypatch.setattr(spoolman_api.config_loader, "get_api_urls",
+                        lambda: ("http://other-sm", "http://fb"))
+    spoolman_api.get_all_spools()
+    assert calls["spool"] == 2
+
+
+def test_concurrent_readers_single_flight():
+    gate = threading.Event()
+    fetches = []
+
+    def slow_fetch():
+        fetches.append(1)
+        gate.wait(2)
+        return [{"id": 1}]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(
+        spoolman_cache.get_items(spoolman_cache.SPOOLS, "src", slow_fetch)))
+        for _ in range(8)]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    gate.set()
+    for t in threads:
+        t.join(3)
+    assert len(fetches) == 1
+    assert results == [[{"id": 1}]] * 8
+
+
+def test_failed_fetch_is_shared_with_queued_readers_then_retried():
+    gate = threading.Event()
+    fetches = []
+
+    def failing_fetch():
+        fetches.append(1)
+        gate.wait(2)
+        raise ConnectionError("spoolman down")
+
+    errors = []
+
+    def reader():
+        try:
+            spoolman_cache.get_items(spoolman_cache.SPOOLS, "src", failing_fetch)
+        except ConnectionError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=reader) for _ in range(5)]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    gate.set()
+    for t in threads:
+        t.join(3)
+    assert len(fetches) == 1
+    assert len(errors) == 5
+    # A NEW reader (not queued behind the failure) tries again.
+    assert spoolman_cache.get_items(spoolman_cache.SPOOLS, "src", lambda: [{"id": 9}]) == [{"id": 9}]
+
+
+def test_strict_reader_still_fails_closed(spoolman, monkeypatch):
+    monkeypatch.setattr(spoolman_api.spoolman_http, "get",
+                        lambda url, **kw: _resp(None, ok=False, status=503))
+    with pytest.raises(Exception):
+        spoolman_api.get_spools_at_location_strict("LR-MDB-1")
+    assert spoolman_api.get_all_spools() == []
+
+
+def test_strict_reader_never_answers_from_the_snapshot(spoolman):
+    calls, data = spoolman
+    assert spoolman_api.get_spools_at_location("XL-1") == []
+    # Placed on the toolhead from Spoolman's own UI, within the TTL.
+    data["spool"] = _spools() + [{"id": 4, "location": "XL-1", "filament": {"id": 11},
+                                  "extra": {}}]
+    assert spoolman_api.get_spools_at_location("XL-1") == []  # cached reader
+    assert spoolman_api.get_spools_at_location_strict("XL-1") == [4]
+    assert calls["spool"] == 2
+
+
+def test_update_spool_writes_through(spoolman):
+    calls, _ = spoolman
+    spoolman_api.get_all_spools()
+    moved = dict(_spools()[0], location="CORE1-M0")
+    with patch.object(spoolman_api, "get_spool", return_value=_spools()[0]), \
+         patch.object(spoolman_api.spoolman_http, "patch", return_value=_resp(moved)):
+        assert spoolman_api.update_spool(1, {"location": "CORE1-M0"})
+    assert spoolman_api.get_spools_at_location("CORE1-M0") == [1, 3]
+    assert calls["spool"] == 1
+
+
+def test_create_and_delete_spool_write_through(spoolman):
+    calls, _ = spoolman
+    spoolman_api.get_all_spools()
+    new = {"id": 4, "location": "DR", "filament": {"id": 11}, "extra": {}}
+    with patch.object(spoolman_api.spoolman_http, "post", return_value=_resp(new)):
+        spoolman_api.create_spool({"filament_id": 11, "location": "DR"})
+    with patch.object(spoolman_api.spoolman_http, "delete", return_value=_resp(None)):
+        assert spoolman_api.delete_spool(1) is True
+    assert sorted(s["id"] for s in spoolman_api.get_all_spools()) == [2, 3, 4]
+    assert calls["spool"] == 1
+
+
+def test_update_filament_refreshes_embedded_copies(spoolman):
+    calls, _ = spoolman
+    spoolman_api.get_all_spools()
+    spoolman_api.find_filament_by_legacy_id("77")
+    renamed = dict(_filaments()[0], name="Galaxy Black v2")
+    with patch.object(spoolman_api.spoolman_http, "patch", return_value=_resp(renamed)):
+        assert spoolman_api.update_filament(10, {"name": "Galaxy Black v2"})
+    names = {s["id"]: s["filament"]["name"] for s in spoolman_api.get_all_spools()}
+    assert names == {1: "Galaxy Black v2", 2: "Galaxy Black v2", 3: "Sky Blue"}
+    assert calls == {"spool": 1, "filament": 1}
+
+
+def test_write_during_fetch_is_not_overwritten_by_stale_result():
+    gate = threading.Event()
+
+    def slow_fetch():
+        gate.wait(2)
+        return [{"id": 1, "location": "OLD"}]
+
+    t = threading.Thread(target=lambda: spoolman_cache.get_items(
+        spoolman_cache.SPOOLS, "src", slow_fetch))
+    t.start()
+    time.sleep(0.05)
+    spoolman_cache.upsert(spoolman_cache.SPOOLS, {"id": 1, "location": "NEW"})
+    gate.set()
+    t.join(3)
+    # The in-flight result predates the write, so it must not be installed.
+    assert spoolman_cache.get_stats()["snapshots"] == {}
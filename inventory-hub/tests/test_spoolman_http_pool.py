@@ -0,0 +1,139 @@
+"""Unit tests for spoolman_http — the pooled keep-alive Spoolman transport.
+
+Runs against a throw-away local HTTP/1.1 server (no Spoolman needed) so the
+keep-alive behaviour is real socket reuse, not a mock assertion.
+"""
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import spoolman_http  # noqa: E402
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    statuses = []  # queued status codes; empty -> 200
+
+    def _reply(self):
+        status = _Handler.statuses.pop(0) if _Handler.statuses else 200
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/slow":
+            time.sleep(1.5)
+        self._reply()
+
+    def do_PATCH(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        self._reply()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(spoolman_http.config_loader, "load_config",
+                        lambda: {"spoolman_timeout": 3, "spoolman_retries": 2,
+                                 "spoolman_pool_size": 4})
+    monkeypatch.setattr(spoolman_http, "_RETRY_BACKOFF_S", 0)
+    spoolman_http.reset()
+    _Handler.statuses = []
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    t = threading.Thread(target=srv.serve_forever, daemon=True)
+    t.start()
+    try:
+        yield f"http://127.0.0.1:{srv.server_address[1]}"
+    finally:
+        srv.shutdown()
+        srv.server_close()
+        spoolman_http.reset()
+
+
+def _pool(base):
+    host = base.split("//", 1)[1]
+    return next(p for p in spoolman_http.get_stats()["pools"] if p["host"] == host)
+
+
+def test_sequential_calls_reuse_one_socket(server):
+    for _ in range(10):
+        assert spoolman_http.get(f"{server}/api/v1/spool").ok
+    pool = _pool(server)
+    assert pool["requests"] == 10
+    assert pool["connections_opened"] == 1
+
+
+def test_default_timeout_applied_when_caller_omits_it(server, monkeypatch):
+    seen = {}
+    session, _adapter, _settings = spoolman_http._get_session()
+    real = session.request
+
+    def spy(method, url, **kwargs):
+        seen["timeout"] = kwargs.get("timeout")
+        return real(method, url, **kwargs)
+
+    monkeypatch.setattr(session, "request", spy)
+    spoolman_http.get(f"{server}/x")
+    assert seen["timeout"] == 3.0
+    spoolman_http.get(f"{server}/x", timeout=20)
+    assert seen["timeout"] == 20
+
+
+def test_get_retries_on_503_but_patch_does_not(server):
+    before = spoolman_http.get_stats()["retries"]
+    _Handler.statuses = [503, 200]
+    assert spoolman_http.get(f"{server}/x").ok
+    assert spoolman_http.get_stats()["retries"] == before + 1
+
+    # A PATCH must never be replayed — the 503 comes straight back.
+    _Handler.statuses = [503, 200]
+    r = spoolman_http.patch(f"{server}/x", json={"a": 1})
+    assert r.status_code == 503
+    _Handler.statuses = []
+
+
+def test_reset_rebuilds_session_from_config(server, monkeypatch):
+    spoolman_http.get(f"{server}/x")
+    built = spoolman_http.get_stats()["sessions_built"]
+    monkeypatch.setattr(spoolman_http.config_loader, "load_config",
+                        lambda: {"spoolman_timeout": "bogus", "spoolman_pool_size": 999})
+    spoolman_http.reset()
+    spoolman_http.get(f"{server}/x")
+    stats = spoolman_http.get_stats()
+    assert stats["sessions_built"] == built + 1
+    # Unparseable values fall back to the default, out-of-range ones clamp.
+    assert stats["settings"] == {
+        "timeout": 5.0,
+        "retries": 2,
+        "pool_size": 128,
+    }
+
+
+def test_starved_pool_fails_after_the_timeout_instead_of_hanging(server, monkeypatch):
+    monkeypatch.setattr(spoolman_http.config_loader, "load_config",
+                        lambda: {"spoolman_timeout": 0.5, "spoolman_pool_size": 1})
+    spoolman_http.reset()
+    holder = threading.Thread(target=spoolman_http.get, args=(f"{server}/slow",),
+                              kwargs={"timeout": 5})
+    holder.start()
+    time.sleep(0.2)  # the only pooled socket is now checked out
+    before = spoolman_http.get_stats()["pool_exhausted"]
+    started = time.monotonic()
+    with pytest.raises(spoolman_http.requests.exceptions.ConnectionError):
+        spoolman_http.get(server)
+    assert time.monotonic() - started < 1.4
+    holder.join(5)
+    assert spoolman_http.get_stats()["pool_exhausted"] - before == 1
+    assert spoolman_http.get(server).ok  # the socket is back in the pool
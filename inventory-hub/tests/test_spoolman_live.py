@@ -22,7 +22,7 @@ def test_create_filament_live_logic():
         }
     }
 
-    with patch('requests.post') as mock_post:
+    with patch('spoolman_http.post') as mock_post:
         mock_response = MagicMock()
         mock_response.ok = True
         mock_response.json.return_value = {"id": 999}
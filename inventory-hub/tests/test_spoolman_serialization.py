@@ -218,14 +218,14 @@ def test_filament_search_result_passes_full_multicolor_string():
             return _FakeResp(fake_filaments)
         return _FakeResp([])
 
-    # Patch the module-level requests.get for this test
+    # Patch the module-level spoolman_http.get for this test
     import spoolman_api as sm
-    original = sm.requests.get
-    sm.requests.get = fake_get
+    original = sm.spoolman_http.get
+    sm.spoolman_http.get = fake_get
     try:
         results = sm.search_inventory(target_type="filament")
     finally:
-        sm.requests.get = original
+        sm.spoolman_http.get = original
 
     assert results, "Expected at least one filament result"
     fil_card = results[0]
@@ -322,12 +322,12 @@ def test_filament_search_result_direction_defaults_to_longitudinal():
         return _FakeResp([])
 
     import spoolman_api as sm
-    original = sm.requests.get
-    sm.requests.get = fake_get
+    original = sm.spoolman_http.get
+    sm.spoolman_http.get = fake_get
     try:
         results = sm.search_inventory(target_type="filament")
     finally:
-        sm.requests.get = original
+        sm.spoolman_http.get = original
 
     assert results[0]["color_direction"] == "longitudinal"
 
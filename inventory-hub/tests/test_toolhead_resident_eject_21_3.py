@@ -65,7 +65,7 @@ def _run_move(target_type, *, printer_map=None, resident_id=99, new_id=42):
         patch.object(logic.spoolman_api, "update_spool", side_effect=fake_update),
         # Capture every resident eject the move triggers.
         patch.object(logic, "perform_smart_eject", side_effect=fake_eject),
-        patch.object(logic.requests, "post", return_value=MagicMock(ok=True)),
+        patch.object(logic.spoolman_http, "post", return_value=MagicMock(ok=True)),
     ]
     for m in ctx:
         m.start()
@@ -107,7 +107,7 @@ def test_smart_move_to_unknown_clears_ghost_trail():
         patch.object(logic.spoolman_api, "format_spool_display",
                      return_value={"text": "Test Spool", "color": "ff0000"}),
         patch.object(logic.spoolman_api, "update_spool", side_effect=_fake_update),
-        patch.object(logic.requests, "post", return_value=MagicMock(ok=True)),
+        patch.object(logic.spoolman_http, "post", return_value=MagicMock(ok=True)),
     ]
     for m in mocks: m.start()
     try:
@@ -0,0 +1,105 @@
+"""Request budget of spoolman_api.update_spool, counted with
+spoolman_http.count_round_trips().
+
+update_spool used to read the spool twice before every PATCH — get_spool for
+the weight / archive checks, then _get_raw_extras for the extras merge. It now
+reads once (or not at all given a pre-fetched record, or inside a
+raw_spool_reads() scope such as a smart move). The transport is faked at the
+session, so every request still goes through spoolman_http.request and is
+counted there.
+"""
+import copy
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import spoolman_api  # noqa: E402
+import spoolman_http  # noqa: E402
+
+
+class _Resp:
+    def __init__(self, payload, status=200):
+        self._payload = payload
+        self.status_code = status
+        self.ok = status < 400
+        self.text = json.dumps(payload)
+        self.raw = None
+
+    def json(self):
+        return copy.deepcopy(self._payload)
+
+
+@pytest.fixture
+def spoolman(monkeypatch):
+    """One spool behind a fake session; PATCHes replace `extra` wholesale the
+    way Spoolman does."""
+    db = {7: {"id": 7, "location": "LR-MDB-1", "initial_weight": 1000.0, "used_weight": 100.0,
+              "archived": False, "filament": {"id": 3, "weight": 1000.0},
+              "extra": {"nozzle_temp_max": '"225"', "container_slot": '"1"'}}}
+    patches = []
+
+    class _Session:
+        def request(self, method, url, json=None, **kw):
+            sid = int(url.rsplit("/", 1)[-1])
+            if method == "PATCH":
+                patches.append(json)
+                db[sid].update(json)
+            return _Resp(db[sid])
+
+    monkeypatch.setattr(spoolman_http, "_get_session",
+                        lambda: (_Session(), None, {"timeout": 5.0}))
+    monkeypatch.setattr(spoolman_api.config_loader, "get_api_urls",
+                        lambda: ("http://sm", "http://fb"))
+    return db, patches
+
+
+def test_update_with_extras_reads_the_spool_once(spoolman):
+    db, patches = spoolman
+    with spoolman_http.count_round_trips() as trips:
+        out = spoolman_api.update_spool(7, {"location": "XL-1", "extra": {"container_slot": ""}})
+    assert trips["by_method"] == {"GET": 1, "PATCH": 1}
+    assert out["location"] == "XL-1"
+    # The sibling is merged from the same GET, still in its wire form.
+    assert patches[0]["extra"] == {"nozzle_temp_max": '"225"', "container_slot": '""'}
+
+
+def test_prefetched_record_skips_the_read(spoolman):
+    db, patches = spoolman
+    raw = copy.deepcopy(db[7])
+    with spoolman_http.count_round_trips() as trips:
+        spoolman_api.update_spool(7, {"used_weight": 2000.0, "extra": {"k": "v"}}, prefetched=raw)
+    assert trips["calls"] == [("PATCH", "http://sm/api/v1/spool/7")]
+    # The weight cap still ran against the pre-fetched record.
+    assert patches[0]["used_weight"] == 1000.0
+    assert patches[0]["extra"]["nozzle_temp_max"] == '"225"'
+
+
+def test_scope_hands_reads_to_updates_and_keeps_them_current(spoolman):
+    db, patches = spoolman
+    with spoolman_http.count_round_trips() as outer:
+        with spoolman_api.raw_spool_reads() as seen:
+            spool = spoolman_api.get_spool(7)
+            assert spool["extra"]["nozzle_temp_max"] == "225"  # parsed view
+            with spoolman_http.count_round_trips() as inner:
+                spoolman_api.update_spool(7, {"extra": {"container_slot": "2"}})
+                spoolman_api.update_spool(7, {"extra": {"physical_source": "PM-DB-1"}})
+            assert seen["7"]["extra"]["physical_source"] == '"PM-DB-1"'
+    assert inner["by_method"] == {"PATCH": 2}
+    assert outer["by_method"] == {"GET": 1, "PATCH": 2}
+    # The second PATCH merged over the first one's result, not the stale read.
+    assert patches[1]["extra"]["container_slot"] == '"2"'
+
+
+def test_failed_update_drops_the_scoped_record(spoolman, monkeypatch):
+    monkeypatch.setattr(spoolman_api.state.logger, "error", lambda *a, **k: None)
+    with spoolman_api.raw_spool_reads() as seen:
+        spoolman_api.get_spool(7)
+        monkeypatch.setattr(spoolman_http, "patch",
+                            lambda url, **kw: _Resp({"detail": "nope"}, status=422))
+        assert spoolman_api.update_spool(7, {"location": "X"}) is None
+        assert "7" not in seen
+    assert spoolman_api.LAST_SPOOLMAN_ERROR.startswith("HTTP 422")
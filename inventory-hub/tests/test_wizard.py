@@ -253,7 +253,7 @@ def test_update_filament_merges_extras_with_existing(monkeypatch):
         return FakeResp()
 
     monkeypatch.setattr(spoolman_api, '_get_raw_extras', fake_get_raw_extras)
-    monkeypatch.setattr(spoolman_api.requests, 'patch', fake_patch)
+    monkeypatch.setattr(spoolman_api.spoolman_http, 'patch', fake_patch)
 
     spoolman_api.update_filament(157, {'extra': {'nozzle_temp_max': '"225"'}})
 
@@ -308,7 +308,7 @@ def test_update_spool_merges_extras_with_existing(monkeypatch):
 
     monkeypatch.setattr(spoolman_api, 'get_spool', fake_get_spool)
     monkeypatch.setattr(spoolman_api, '_get_raw_extras', fake_get_raw_extras)
-    monkeypatch.setattr(spoolman_api.requests, 'patch', fake_patch)
+    monkeypatch.setattr(spoolman_api.spoolman_http, 'patch', fake_patch)
 
     spoolman_api.update_spool(200, {'extra': {'prusament_manufacturing_date': '"2026-04-26"'}})
 
@@ -375,7 +375,7 @@ def test_update_filament_without_extras_does_not_fetch_existing(monkeypatch):
         return FakeResp()
 
     monkeypatch.setattr(spoolman_api, '_get_raw_extras', fake_get_raw_extras)
-    monkeypatch.setattr(spoolman_api.requests, 'patch', fake_patch)
+    monkeypatch.setattr(spoolman_api.spoolman_http, 'patch', fake_patch)
 
     spoolman_api.update_filament(1, {'name': 'New name', 'color_hex': 'AABBCC'})
     assert fetched['count'] == 0, "no extras in payload → no fetch needed"
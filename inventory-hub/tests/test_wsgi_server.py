@@ -0,0 +1,154 @@
+"""wsgi_server — the pooled production server app.py runs by default.
+
+Host-runnable: each test binds a PooledWSGIServer on a free localhost port,
+serves from a thread and talks to it with http.client.
+"""
+import http.client
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import app as app_module  # noqa: E402
+import event_stream  # noqa: E402
+import wsgi_server  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_channel(monkeypatch):
+    monkeypatch.setattr(event_stream, "_CLOSING", False)
+    monkeypatch.setattr(event_stream, "_CLIENT_CAP", None)
+    monkeypatch.setattr(event_stream, "_CLIENTS", 0)
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(app, **kw):
+        server = wsgi_server.make_server(app, "127.0.0.1", 0, **kw)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server, server.server_address[1]
+
+    yield start
+    for server in servers:
+        server.drain(1.0)
+
+
+def _slow_app(release):
+    def app(environ, start_response):
+        if environ["PATH_INFO"] == "/slow":
+            release.wait(5)
+        body = environ["PATH_INFO"].encode()
+        start_response("200 OK", [("Content-Type", "text/plain"),
+                                  ("Content-Length", str(len(body)))])
+        return [body]
+    return app
+
+
+def test_keep_alive_serves_several_requests_on_one_connection(serve):
+    server, port = serve(_slow_app(threading.Event()), workers=2)
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    for method, path in (("GET", "/a"), ("POST", "/b"), ("GET", "/c")):
+        # The app never reads the POST body; it must not spill into /c.
+        conn.request(method, path, body=b"x" * 5000 if method == "POST" else None)
+        res = conn.getresponse()
+        assert res.read() == path.encode() and res.getheader("Connection") != "close"
+    conn.close()
+    stats = server.stats()
+    assert stats["connections"] == 1
+    assert stats["requests"] == 3 and stats["keepalive_reused"] == 2
+
+
+def test_full_queue_is_refused_with_503(serve):
+    release = threading.Event()
+    server, port = serve(_slow_app(release), workers=1, queue_max=0)
+    busy = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    busy.request("GET", "/slow")
+    try:
+        refused = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        refused.request("GET", "/fast")
+        res = refused.getresponse()
+        assert res.status == 503 and res.getheader("Retry-After") == "1"
+    finally:
+        release.set()
+    assert busy.getresponse().read() == b"/slow"
+    assert server.stats()["rejected"] == 1
+
+
+def test_drain_finishes_in_flight_work_and_ends_push_streams(serve):
+    release = threading.Event()
+    server, port = serve(app_module.app, workers=4)
+    # A push stream holds a worker indefinitely until the drain ends it.
+    stream = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    stream.request("GET", "/api/events")
+    sse = stream.getresponse()
+    assert sse.status == 200 and sse.readline().startswith(b"retry: ")
+
+    slow_server, slow_port = serve(_slow_app(release), workers=2)
+    slow = http.client.HTTPConnection("127.0.0.1", slow_port, timeout=5)
+    slow.request("GET", "/slow")
+    deadline = time.monotonic() + 5
+    while not slow_server.stats()["busy"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    result = {}
+    drainer = threading.Thread(target=lambda: result.update(left=slow_server.drain(5.0)))
+    drainer.start()
+    deadline = time.monotonic() + 5
+    while slow_server.socket.fileno() != -1 and time.monotonic() < deadline:
+        time.sleep(0.01)  # listener closed: no new connections from here on
+    assert drainer.is_alive()  # still waiting for /slow
+    release.set()
+    assert slow.getresponse().read() == b"/slow"
+    drainer.join(5)
+    assert result == {"left": 0}
+    with pytest.raises(OSError):
+        http.client.HTTPConnection("127.0.0.1", slow_port, timeout=2).request("GET", "/late")
+
+    # The first drain ended every stream (event_stream.shutdown): the
+    # app server drains cleanly at once.
+    assert server.drain(5.0) == 0
+    sse.read()
+    assert event_stream.get_stats()["clients"] == 0
+
+
+def test_idle_keep_alive_connections_yield_their_workers(serve):
+    server, port = serve(_slow_app(threading.Event()), workers=4, keepalive_s=5.0)
+    idle = []
+    for i in range(4):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        conn.request("GET", f"/idle{i}")
+        assert conn.getresponse().read() == f"/idle{i}".encode()
+        idle.append(conn)
+    deadline = time.monotonic() + 5
+    while server.stats()["idle_keepalive"] < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # Every worker sits on an idle socket; a fifth client must not wait out
+    # the keep-alive timeout for one of them.
+    started = time.monotonic()
+    fifth = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    fifth.request("GET", "/fifth")
+    assert fifth.getresponse().read() == b"/fifth"
+    assert time.monotonic() - started < 1.0
+    assert server.stats()["keepalive_evicted"] == 1
+
+    # The longest-idle socket was the one closed; its client reconnects
+    # (http.client, unlike a browser, surfaces the close before retrying)
+    # onto the worker the fifth client leaves.
+    fifth.close()
+    deadline = time.monotonic() + 5
+    while server.stats()["busy"] > 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    with pytest.raises((http.client.HTTPException, OSError)):
+        idle[0].request("GET", "/again0")
+        idle[0].getresponse().read()
+    for i, conn in enumerate(idle):
+        conn.request("GET", f"/again{i}")
+        assert conn.getresponse().read() == f"/again{i}".encode()
+        conn.close()
+    assert server.stats()["keepalive_evicted"] == 1
@@ -0,0 +1,409 @@
+"""Production HTTP serving for app.py: a pooled WSGI server with keep-alive,
+a bounded wait queue and a graceful drain.
+
+Why this exists: app.py used to hand every request to Flask's development
+server (``app.run``), which spawns a fresh thread per connection with no
+upper bound and no idle limit. Several kiosks (each now holding an
+/api/events stream) plus phone scanners meant thread churn on every burst and
+latency spikes when a burst outran the box.
+
+This module serves the same WSGI app on werkzeug's ``BaseWSGIServer`` — the
+dev server's HTTP/1.1 parsing, which is already in the image — with the
+concurrency model replaced:
+
+- a fixed pool of ``serve_workers`` threads (config). The accept loop hands
+  each connection to the pool through a queue; at most ``serve_queue``
+  connections may wait for a worker. Past that the connection gets an
+  immediate ``503`` + ``Retry-After`` instead of waiting behind a backlog it
+  will time out in (the dashboard's pollers just retry on their next tick).
+- keep-alive (HTTP/1.1): a connection is served by one worker until the
+  client closes it or sits idle for ``serve_keepalive_s`` — kiosks reuse one
+  socket for their whole heartbeat instead of a TCP handshake per poll. An
+  idle connection only keeps its worker while nobody else needs one: when a
+  new connection would have to queue, the longest-idle keep-alive sockets
+  are closed to make room (the client reconnects on its next request), and
+  a worker that finishes a request while connections are queued closes its
+  socket instead of waiting on it.
+- push streams hold a worker for as long as they are open, so
+  event_stream.limit_clients caps them at half the pool — the rest always
+  serve requests.
+- graceful drain on SIGTERM / SIGINT (``docker stop``): stop accepting, end
+  the push streams (event_stream.shutdown), close idle keep-alive
+  connections, let in-flight requests finish for up to ``serve_drain_s``,
+  then return to app.py, which exits. A request cut off after that is one
+  the client retries — the same as a crash, only rarer.
+
+``serve_mode`` (config, or the ``FCC_SERVE_MODE`` env var) picks ``pooled``
+(this server) or ``simple`` (``app.run``, the old behaviour). ``FCC_DEV=1``
+always uses ``simple`` — the reloader is werkzeug's. Startup work (the
+locations migrations, which run when app.py is imported, the Spoolman extras
+and the cancel monitor) happens in app.py before serve() binds the port, so
+no request is accepted ahead of it.
+
+Python 3.9 runtime (the container image) — keep syntax 3.9-safe.
+"""
+import os
+import queue
+import signal
+import socket
+import threading
+import time
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+from werkzeug.wsgi import LimitedStream
+
+import config_loader  # type: ignore
+import event_stream  # type: ignore
+import state  # type: ignore
+
+SERVE_MODES = ("pooled", "simple")
+
+_BUSY_BODY = b"Server busy, retry.\n"
+_BUSY_RESPONSE = (
+    b"HTTP/1.1 503 Service Unavailable\r\n"
+    b"Content-Type: text/plain\r\n"
+    b"Retry-After: 1\r\n"
+    b"Connection: close\r\n"
+    b"Content-Length: " + str(len(_BUSY_BODY)).encode() + b"\r\n\r\n" + _BUSY_BODY)
+
+# The running server (for get_stats); None outside serve().
+_SERVER = None
+
+
+def serve_mode():
+    """``FCC_SERVE_MODE`` if set to a known mode, else config serve_mode."""
+    env = str(os.environ.get("FCC_SERVE_MODE", "")).strip().lower()
+    if env in SERVE_MODES:
+        return env
+    default = config_loader.get_default("serve_mode")
+    mode = str(config_loader.load_config().get("serve_mode", default)).strip().lower()
+    return mode if mode in SERVE_MODES else default
+
+
+def settings():
+    """The pooled server's tunables from config, clamped to sane ranges."""
+    return {
+        "workers": config_loader.get_clamped("serve_workers", 4, 512, int),
+        "queue": config_loader.get_clamped("serve_queue", 0, 4096, int),
+        "keepalive_s": config_loader.get_clamped("serve_keepalive_s", 1.0, 300.0),
+        "drain_s": config_loader.get_clamped("serve_drain_s", 0.0, 300.0),
+    }
+
+
+class _Handler(WSGIRequestHandler):
+    """werkzeug's handler with keep-alive on, an idle timeout, and the
+    idle / busy bookkeeping the drain needs.
+
+    werkzeug answers every request with ``Connection: close`` because it
+    can't tell where a request body ends: after the response it reads
+    whatever the socket still holds, which on a kept-alive connection would
+    be the next request. Here the app reads the body through a stream
+    bounded by Content-Length, so that clean-up read stops at the body's end
+    and the ``close`` header can be dropped. A chunked request body, a
+    client asking to close or a draining server keeps werkzeug's behaviour."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        # StreamRequestHandler applies `timeout` to the socket: an idle
+        # keep-alive connection releases its worker after keepalive_s.
+        self.timeout = self.server.keepalive_s
+        self._requests = 0
+        self._keep_alive = False
+        super().setup()
+
+    def run_wsgi(self):
+        raw = self.rfile
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        self._keep_alive = (not self.close_connection and not self.server.draining
+                            and length >= 0
+                            and "chunked" not in self.headers.get("Transfer-Encoding", "").lower())
+        if self._keep_alive:
+            self.rfile = LimitedStream(raw, length)
+        else:
+            self.close_connection = True
+        try:
+            super().run_wsgi()
+        finally:
+            self.rfile = raw
+            self._keep_alive = False
+
+    def send_header(self, keyword, value):
+        if (self._keep_alive and keyword.lower() == "connection"
+                and str(value).lower() == "close"):
+            return
+        super().send_header(keyword, value)
+
+    def handle_one_request(self):
+        srv = self.server
+        if not srv._mark_idle(self.connection, self._requests > 0):
+            self.close_connection = True
+            return
+        try:
+            super().handle_one_request()
+        finally:
+            srv._mark_busy(self.connection)
+        if srv.draining:
+            self.close_connection = True
+
+    def parse_request(self):
+        # The request line has arrived: this connection is busy, not idle.
+        self.server._mark_busy(self.connection)
+        self.server._count_request(self._requests)
+        self._requests += 1
+        return super().parse_request()
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """BaseWSGIServer whose connections run on a fixed worker pool. See the
+    module docstring."""
+
+    multithread = True
+
+    def __init__(self, host, port, app, workers=None, queue_max=None, keepalive_s=None):
+        # Unset tunables come from config (settings()).
+        if None in (workers, queue_max, keepalive_s):
+            cfg = settings()
+            workers = cfg["workers"] if workers is None else workers
+            queue_max = cfg["queue"] if queue_max is None else queue_max
+            keepalive_s = cfg["keepalive_s"] if keepalive_s is None else keepalive_s
+        self.workers = max(1, int(workers))
+        self.queue_max = max(0, int(queue_max))
+        self.keepalive_s = float(keepalive_s)
+        # Listen backlog: what the kernel holds before the accept loop runs.
+        self.request_queue_size = max(16, self.workers + self.queue_max)
+        self.draining = False
+        # Guards everything below; the drain waits on it for _assigned to drop.
+        self._cond = threading.Condition()
+        self._assigned = 0  # connections queued or being served
+        self._running = 0   # of those, the ones a worker has picked up
+        # Keep-alive sockets waiting for their next request -> when they
+        # started waiting (time.monotonic()).
+        self._idle = {}
+        # Idle sockets closed to free their worker, until the worker lets go.
+        self._evicted = set()
+        self._serving = False
+        self._stats = {
+            "connections": 0,
+            "requests": 0,
+            "keepalive_reused": 0,
+            "keepalive_evicted": 0,
+            "rejected": 0,
+            "errors": 0,
+        }
+        self._jobs = queue.Queue()
+        super().__init__(host, port, app, handler=_Handler)
+        for i in range(self.workers):
+            threading.Thread(target=self._worker, name=f"http-{i}", daemon=True).start()
+
+    # --- accept side -----------------------------------------------------
+
+    def serve_forever(self, poll_interval=0.5):
+        with self._cond:
+            self._serving = True
+        super().serve_forever(poll_interval=poll_interval)
+
+    def process_request(self, request, client_address):
+        """Queue the connection for a worker — or refuse it when the queue is
+        full or the server is draining. Runs on the accept loop: never blocks."""
+        evict = []
+        with self._cond:
+            admit = not self.draining and self._assigned < self.workers + self.queue_max
+            if admit:
+                self._assigned += 1
+                self._stats["connections"] += 1
+                evict = self._evict_idle()
+            else:
+                self._stats["rejected"] += 1
+        for conn in evict:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)  # its worker's read returns at once
+            except OSError:
+                pass
+        if admit:
+            self._jobs.put((request, client_address))
+            return
+        # Best effort: the client may not have sent its request yet, and an
+        # unread request can turn the close into a reset. Either way it fails
+        # fast and retries instead of stalling.
+        try:
+            request.settimeout(1.0)
+            request.sendall(_BUSY_RESPONSE)
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    # --- worker side -----------------------------------------------------
+
+    def _worker(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            request, client_address = job
+            with self._cond:
+                self._running += 1
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                with self._cond:
+                    self._stats["errors"] += 1
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+                with self._cond:
+                    self._evicted.discard(request)
+                    self._running -= 1
+                    self._assigned -= 1
+                    self._cond.notify_all()
+
+    def _waiting(self):
+        """Queued connections no worker is on its way to: more than the
+        workers, less the ones an eviction is already freeing. Caller holds
+        _cond."""
+        return self._assigned - self.workers - len(self._evicted)
+
+    def _evict_idle(self):
+        """Take the longest-idle keep-alive sockets off their workers, one
+        per connection left waiting; returns them for the caller to shut
+        down outside the lock. Caller holds _cond."""
+        short = self._waiting()
+        if short <= 0 or not self._idle:
+            return []
+        oldest = sorted(self._idle, key=self._idle.get)[:short]
+        for conn in oldest:
+            del self._idle[conn]
+            self._evicted.add(conn)
+        self._stats["keepalive_evicted"] += len(oldest)
+        return oldest
+
+    def _mark_idle(self, conn, reused):
+        """Record `conn` as waiting for its next request. False when it
+        should close instead: the server is draining, or — for a connection
+        that has already been served (`reused`) — another connection is
+        queued for a worker."""
+        with self._cond:
+            if self.draining:
+                return False
+            if reused and self._waiting() > 0:
+                self._evicted.add(conn)  # its worker is on the way
+                self._stats["keepalive_evicted"] += 1
+                return False
+            self._idle[conn] = time.monotonic()
+            return True
+
+    def _mark_busy(self, conn):
+        with self._cond:
+            self._idle.pop(conn, None)
+
+    def _count_request(self, previous):
+        with self._cond:
+            self._stats["requests"] += 1
+            if previous:
+                self._stats["keepalive_reused"] += 1
+
+    # --- drain -----------------------------------------------------------
+
+    def drain(self, timeout=None):
+        """Stop accepting, end push streams, close idle keep-alive
+        connections and wait up to `timeout` s (None: config serve_drain_s)
+        for in-flight requests. Returns how many connections were still
+        being served when it gave up (0 = clean). Call from a thread other
+        than serve_forever's."""
+        if timeout is None:
+            timeout = settings()["drain_s"]
+        with self._cond:
+            if self.draining:
+                return self._assigned
+            self.draining = True
+            idle = list(self._idle)
+            serving = self._serving
+        event_stream.shutdown()
+        if serving:
+            self.shutdown()  # serve_forever returns and closes the listener
+        for conn in idle:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        deadline = time.monotonic() + max(0.0, timeout)
+        with self._cond:
+            while self._assigned:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            left = self._assigned
+        for _ in range(self.workers):
+            self._jobs.put(None)
+        return left
+
+    def stats(self):
+        with self._cond:
+            out = dict(self._stats)
+            out.update({
+                "workers": self.workers,
+                "queue_max": self.queue_max,
+                "busy": self._running,
+                "queued": self._assigned - self._running,
+                "idle_keepalive": len(self._idle),
+                "draining": self.draining,
+            })
+        return out
+
+
+def make_server(app, host, port, workers=None, queue_max=None, keepalive_s=None):
+    """A bound PooledWSGIServer (port 0 picks a free one: see
+    ``server.server_address``). Caps push streams at half its workers."""
+    server = PooledWSGIServer(host, port, app, workers=workers, queue_max=queue_max,
+                              keepalive_s=keepalive_s)
+    event_stream.limit_clients(max(1, server.workers // 2))
+    return server
+
+
+def serve(app, host="0.0.0.0", port=8000):
+    """Serve `app` until SIGTERM / SIGINT, then drain and return. Runs in the
+    main thread (signal handlers can only be installed there)."""
+    global _SERVER
+    cfg = settings()
+    server = make_server(app, host, port, workers=cfg["workers"], queue_max=cfg["queue"],
+                         keepalive_s=cfg["keepalive_s"])
+    _SERVER = server
+    drained = threading.Event()
+
+    def _drain():
+        left = server.drain(cfg["drain_s"])
+        if left:
+            state.logger.warning(f"🛑 HTTP drain timed out with {left} connection(s) still open")
+        drained.set()
+
+    def _on_signal(signum, _frame):
+        state.logger.info(f"🛑 Signal {signum}: draining HTTP server (up to {cfg['drain_s']:g}s)")
+        # shutdown() waits for serve_forever, which this handler interrupted:
+        # the drain has to run on another thread.
+        threading.Thread(target=_drain, name="http-drain", daemon=True).start()
+
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            signal.signal(sig, _on_signal)
+        except (ValueError, OSError):
+            pass
+    state.logger.info(
+        f"🌐 Serving on {host}:{port} (pooled: {cfg['workers']} workers, "
+        f"queue {cfg['queue']}, keep-alive {cfg['keepalive_s']:g}s)")
+    server.serve_forever()
+    drained.wait(cfg["drain_s"] + 1.0)
+    _SERVER = None
+    state.logger.info("🛑 HTTP server stopped")
+
+
+def get_stats():
+    """The pooled server's connection / request counters for /api/metrics."""
+    server = _SERVER
+    out = {"running": server is not None}
+    if server is not None:
+        out.update(server.stats())
+    return out